@@ -25,7 +25,9 @@
 # ════════════════════════════════════════════════════════════════════════════
 pytest_plugins = [
     'scripts.governance.pytest_arch_audit_plugin',
-    'framework.observability.pytest_enterprise_logging'  # Enterprise logging integration
+    'framework.observability.pytest_enterprise_logging',  # Enterprise logging integration
+    'framework.observability.pytest_profiling',  # Per-test profiles (--profile-tests)
+    'framework.ui.pytest_browser_server',  # Shared browser server (--browser-server)
 ]
 
 
@@ -739,21 +741,40 @@ def browser_type_launch_args(browser_type_launch_args, request):
     
     Scope: session (configured once, reused across all tests)
     """
+    return {
+        **browser_type_launch_args,
+        "args": _maximize_launch_args(request.config),
+    }
+
+
+def _maximize_launch_args(config):
+    """Browser CLI args that open the window maximized"""
     # Detect which browser is being used
-    browser_name = request.config.getoption("--test-browser", default="chromium")
-    
+    browser_name = config.getoption("--test-browser", default="chromium")
+
     if browser_name in ("firefox", "webkit", "safari"):
         # Firefox/WebKit: don't pass CLI args (Firefox misinterprets numbers as URLs)
         # Maximize is handled by setting viewport to screen size in browser_context_args
-        launch_args = []
-    else:
-        # Chromium, Chrome, Edge: --start-maximized works perfectly
-        launch_args = ["--start-maximized"]
-    
-    return {
-        **browser_type_launch_args,
-        "args": launch_args,
-    }
+        return []
+    # Chromium, Chrome, Edge: --start-maximized works perfectly
+    return ["--start-maximized"]
+
+
+def pytest_browser_server_launch_args(config):
+    """Launch the shared browser servers (--browser-server) maximized as well"""
+    return {"args": _maximize_launch_args(config)}
+
+
+@pytest.fixture(scope="session")
+def connect_options(connect_options, browser_server_endpoint):
+    """
+    Connect pytest-playwright's browser to the shared browser server
+
+    Only with --browser-server; otherwise each worker launches its own browser.
+    """
+    if not browser_server_endpoint:
+        return connect_options
+    return {**(connect_options or {}), "ws_endpoint": browser_server_endpoint, "timeout": 30000}
 
 
 
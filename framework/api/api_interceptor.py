@@ -9,13 +9,26 @@
 - Request/response modification
 - Pattern-based request/response mocking
 - Real-time message monitoring
+- Passive capture listeners; Playwright routes only for patterns with rules
 """
 
 import json
 import re
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Union
-
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
+
+from framework.api.body_capture import (
+    BodyCapturePolicy,
+    CapturedResponse,
+    content_length,
+    make_body_loader,
+    peek_body,
+)
+from framework.api.capture_store import CaptureStore
+from framework.api.har_writer import HARWriter, har_entry
+from framework.api.pattern_index import PatternIndex
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -55,18 +68,28 @@ class RequestModifier:
 
     def __init__(self):
         self.modifications: List[Dict[str, Any]] = []
+        self._index = PatternIndex()
 
     def add_header_modification(self, pattern: str, headers: Dict[str, str]):
         """Add header modification rule"""
-        self.modifications.append({"type": "headers", "pattern": pattern, "headers": headers})
+        self._add({"type": "headers", "pattern": pattern, "headers": headers})
 
     def add_body_modification(self, pattern: str, body_modifier: Callable):
         """Add body modification rule"""
-        self.modifications.append({"type": "body", "pattern": pattern, "modifier": body_modifier})
+        self._add({"type": "body", "pattern": pattern, "modifier": body_modifier})
 
     def add_url_modification(self, pattern: str, url_modifier: Callable):
         """Add URL modification rule"""
-        self.modifications.append({"type": "url", "pattern": pattern, "modifier": url_modifier})
+        self._add({"type": "url", "pattern": pattern, "modifier": url_modifier})
+
+    def _add(self, rule: Dict[str, Any]):
+        """Register a rule; its pattern is compiled once here"""
+        self._index.add(rule["pattern"])
+        self.modifications.append(rule)
+
+    def matching_rules(self, url: str) -> List[Dict[str, Any]]:
+        """Get modification rules matching a URL, in registration order"""
+        return _matching_rules(self._index, self.modifications, url)
 
     def apply_modifications(self, url: str, headers: Dict, post_data: Optional[str]) -> tuple:
         """Apply all matching modifications"""
@@ -74,10 +97,7 @@ def apply_modifications(self, url: str, headers: Dict, post_data: Optional[str])
         modified_url = url
         modified_body = post_data
 
-        for mod in self.modifications:
-            if not re.search(mod["pattern"], url):
-                continue
-
+        for mod in self.matching_rules(url):
             if mod["type"] == "headers":
                 modified_headers.update(mod["headers"])
             elif mod["type"] == "url" and "modifier" in mod:
@@ -94,11 +114,14 @@ class ResponseModifier:
     def __init__(self):
         self.mocks: List[Dict[str, Any]] = []
         self.modifications: List[Dict[str, Any]] = []
+        self._mock_index = PatternIndex()
+        self._modification_index = PatternIndex()
 
     def add_mock_response(
         self, pattern: str, status: int, body: Any, headers: Optional[Dict] = None
     ):
         """Add mock response for matching URLs"""
+        self._mock_index.add(pattern)
         self.mocks.append(
             {
                 "pattern": pattern,
@@ -110,26 +133,60 @@ def add_mock_response(
 
     def add_response_modification(self, pattern: str, body_modifier: Callable):
         """Add response body modification rule"""
+        self._modification_index.add(pattern)
         self.modifications.append({"pattern": pattern, "modifier": body_modifier})
 
     def get_mock_response(self, url: str) -> Optional[Dict[str, Any]]:
         """Get mock response if pattern matches"""
-        for mock in self.mocks:
-            if re.search(mock["pattern"], url):
-                return mock
-        return None
+        matches = _matching_rules(self._mock_index, self.mocks, url)
+        return matches[0] if matches else None
 
     def apply_modifications(self, url: str, response_body: Any) -> Any:
         """Apply response modifications"""
         modified_body = response_body
 
-        for mod in self.modifications:
-            if re.search(mod["pattern"], url):
-                modified_body = mod["modifier"](modified_body)
+        for mod in _matching_rules(self._modification_index, self.modifications, url):
+            modified_body = mod["modifier"](modified_body)
 
         return modified_body
 
 
+def _url_path(entry: Dict[str, Any]) -> Optional[str]:
+    url = entry.get("url")
+    return urlsplit(url).path if url else None
+
+
+def _request_method(entry: Dict[str, Any]) -> Optional[str]:
+    method = entry.get("method")
+    return method.upper() if method else None
+
+
+def _is_api_call(entry: Dict[str, Any]) -> Optional[bool]:
+    return True if "/api/" in (entry.get("url") or "") else None
+
+
+REQUEST_INDEXES = {
+    "method": _request_method,
+    "url": lambda entry: entry.get("url"),
+    "path": _url_path,
+    "api": _is_api_call,
+}
+
+RESPONSE_INDEXES = {
+    "method": _request_method,
+    "url": lambda entry: entry.get("url"),
+    "path": _url_path,
+    "status": lambda entry: entry.get("status"),
+}
+
+
+def _matching_rules(index: PatternIndex, rules: List[Dict[str, Any]], url: str) -> List[Dict]:
+    """Look up rules matching a URL, re-indexing if the rule list was edited directly"""
+    if len(index) != len(rules):
+        index.rebuild(rule["pattern"] for rule in rules)
+    return [rules[rule_id] for rule_id in index.match(url)]
+
+
 class APIInterceptor:
     """
     Enhanced API Interceptor with WebSocket support and request/response modification
@@ -142,16 +199,31 @@ class APIInterceptor:
     - Pattern-based filtering
     """
 
-    def __init__(self, ui_engine):
+    def __init__(
+        self,
+        ui_engine,
+        max_captured: Optional[int] = None,
+        spill_dir: Optional[Union[str, Path]] = None,
+        body_policy: Optional[BodyCapturePolicy] = None,
+    ):
         """
         Initialize API interceptor
 
         Args:
             ui_engine: PlaywrightEngine or SeleniumEngine instance
+            max_captured: Keep at most this many requests/responses in memory
+                (oldest are evicted first; None = unbounded)
+            spill_dir: Directory receiving evicted entries as requests.jsonl /
+                responses.jsonl (None = evicted entries are dropped)
+            body_policy: Which response bodies to capture and whether to load
+                them lazily (defaults to textual bodies up to 1 MiB, lazy)
         """
         self.ui_engine = ui_engine
-        self.captured_requests: List[Dict[str, Any]] = []
-        self.captured_responses: List[Dict[str, Any]] = []
+        self.max_captured = max_captured
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.body_policy = body_policy or BodyCapturePolicy()
+        self._requests = self._new_store(REQUEST_INDEXES, "requests.jsonl")
+        self._responses = self._new_store(RESPONSE_INDEXES, "responses.jsonl")
         self.captured_websockets: List[Dict[str, Any]] = []
         self.websocket_messages: List[WebSocketMessage] = []
         self.filters: List[Callable] = []
@@ -164,8 +236,44 @@ def __init__(self, ui_engine):
         # WebSocket tracking
         self.active_websockets: List[Any] = []
 
+        # Playwright routes, installed lazily per rule pattern
+        self._page = None
+        self._routed_patterns: Dict[str, Any] = {}
+
+        # Streaming HAR recording (see start_har_recording)
+        self._har_writer: Optional[HARWriter] = None
+        self._har_include_content = False
+
         self._setup_interception()
 
+    def _new_store(self, indexes: Dict[str, Callable], spill_name: str) -> CaptureStore:
+        """Create a capture store honoring the configured bound and spill directory"""
+        return CaptureStore(
+            indexes=indexes,
+            max_entries=self.max_captured,
+            spill_path=self.spill_dir / spill_name if self.spill_dir else None,
+        )
+
+    @property
+    def captured_requests(self) -> CaptureStore:
+        """Captured requests (list-like, bounded and indexed)"""
+        return self._requests
+
+    @captured_requests.setter
+    def captured_requests(self, entries: Iterable[Dict[str, Any]]):
+        self._requests.clear()
+        self._requests.extend(entries)
+
+    @property
+    def captured_responses(self) -> CaptureStore:
+        """Captured responses (list-like, bounded and indexed)"""
+        return self._responses
+
+    @captured_responses.setter
+    def captured_responses(self, entries: Iterable[Dict[str, Any]]):
+        self._responses.clear()
+        self._responses.extend(entries)
+
     def _setup_interception(self):
         """Setup interception based on engine type"""
         engine_type = type(self.ui_engine).__name__
@@ -178,19 +286,25 @@ def _setup_interception(self):
             logger.warning(f"Unknown engine type: {engine_type}. Interception not configured.")
 
     def _setup_playwright_interception(self):
-        """Setup Playwright network interception with WebSocket support"""
+        """
+        Setup Playwright network interception with WebSocket support
+
+        Capture uses passive page.on("request"/"response") listeners, so
+        requests are never paused for a Python round trip. Routes are only
+        installed for URL patterns that have a mock or request modification
+        registered (see _ensure_route).
+        """
         try:
             page = self.ui_engine.get_page()
+            self._page = page
 
-            def handle_request(route, request):
-                """Handle outgoing request with modification support"""
+            def handle_request(request):
+                """Capture outgoing request"""
                 if not self.enabled:
-                    route.continue_()
                     return
 
                 # Check filters
                 if not self._should_capture(request.url):
-                    route.continue_()
                     return
 
                 # Capture request data
@@ -208,45 +322,6 @@ def handle_request(route, request):
                 self.captured_requests.append(request_data)
                 logger.debug(f"Captured request: {request.method} {request.url}")
 
-                # Check for mock response
-                mock_response = self.response_modifier.get_mock_response(request.url)
-                if mock_response:
-                    logger.info(f"Using mock response for: {request.url}")
-                    route.fulfill(
-                        status=mock_response["status"],
-                        body=(
-                            json.dumps(mock_response["body"])
-                            if isinstance(mock_response["body"], dict)
-                            else str(mock_response["body"])
-                        ),
-                        headers=mock_response["headers"],
-                    )
-                    return
-
-                # Apply request modifications
-                modified_url, modified_headers, modified_body = (
-                    self.request_modifier.apply_modifications(
-                        request.url, dict(request.headers), request.post_data
-                    )
-                )
-
-                # Continue with modifications if any
-                if (
-                    modified_url != request.url
-                    or modified_headers != dict(request.headers)
-                    or modified_body != request.post_data
-                ):
-                    logger.debug(f"Modifying request: {request.url}")
-                    route.continue_(
-                        url=modified_url if modified_url != request.url else None,
-                        headers=(
-                            modified_headers if modified_headers != dict(request.headers) else None
-                        ),
-                        post_data=modified_body if modified_body != request.post_data else None,
-                    )
-                else:
-                    route.continue_()
-
             def handle_response(response):
                 """Handle incoming response with modification support"""
                 if not self.enabled:
@@ -256,31 +331,40 @@ def handle_response(response):
                     return
 
                 try:
-                    body = None
-                    if response.status != 204:  # No content
-                        try:
-                            body = response.json()
-                        except Exception:
-                            try:
-                                body = response.text()
-                            except Exception:
-                                body = None
-
-                    # Apply response modifications
-                    modified_body = self.response_modifier.apply_modifications(response.url, body)
+                    url = response.url
+                    headers = dict(response.headers)
+                    content_type = headers.get("content-type", "")
+                    size = content_length(headers)
+                    omitted = self.body_policy.omit_reason(response.status, content_type, size)
 
                     response_data = {
                         "timestamp": datetime.now().isoformat(),
                         "method": response.request.method,
-                        "url": response.url,
+                        "url": url,
                         "status": response.status,
                         "status_text": response.status_text,
-                        "headers": dict(response.headers),
-                        "body": modified_body,
-                        "original_body": body if modified_body != body else None,
+                        "headers": headers,
+                        "content_type": content_type,
+                        "body_size": size,
+                        "body_omitted": omitted,
                     }
 
-                    self.captured_responses.append(response_data)
+                    # The body is only fetched from the browser when read
+                    loader = None
+                    if omitted is None:
+                        loader = make_body_loader(
+                            response,
+                            self.body_policy,
+                            content_type,
+                            lambda body: self.response_modifier.apply_modifications(url, body),
+                        )
+                    entry = CapturedResponse(response_data, loader)
+                    if not self.body_policy.lazy:
+                        entry.materialize()
+
+                    self.captured_responses.append(entry)
+                    if self._har_writer is not None:
+                        self._record_har(response, entry)
                     logger.debug(f"Captured response: {response.status} {response.url}")
 
                 except Exception as e:
@@ -342,16 +426,94 @@ def on_socket_error(error):
                 except Exception as e:
                     logger.error(f"Error setting up WebSocket handlers: {e}")
 
-            # Enable route interception
-            page.route("**/*", handle_request)
+            # Passive capture listeners
+            page.on("request", handle_request)
             page.on("response", handle_response)
             page.on("websocket", handle_websocket)
 
+            # Routes for rules registered before the page was available
+            for pattern in self._rule_patterns():
+                self._ensure_route(pattern)
+
             logger.info("Playwright API interception enabled (HTTP + WebSocket)")
 
         except Exception as e:
             logger.error(f"Failed to setup Playwright interception: {e}")
 
+    def _rule_patterns(self) -> List[str]:
+        """URL patterns that need a route: mocks and request modifications"""
+        patterns = [mock["pattern"] for mock in self.response_modifier.mocks]
+        patterns += [mod["pattern"] for mod in self.request_modifier.modifications]
+        return list(dict.fromkeys(patterns))
+
+    def _ensure_route(self, pattern: str):
+        """
+        Install a Playwright route for a rule pattern, once per pattern
+
+        The pattern is passed to Playwright as a compiled regex so matching
+        happens inside the browser driver; only matching requests reach
+        Python. Patterns the driver cannot compile fall back to a Python
+        predicate.
+        """
+        if self._page is None or pattern in self._routed_patterns:
+            return
+
+        matcher = re.compile(pattern)
+        try:
+            self._page.route(matcher, self._handle_route)
+        except Exception as e:
+            logger.warning(
+                f"Route pattern {pattern!r} not supported by Playwright ({e}); "
+                f"matching it in Python instead"
+            )
+            matcher = lambda url, compiled=matcher: bool(compiled.search(url))  # noqa: E731
+            self._page.route(matcher, self._handle_route)
+
+        self._routed_patterns[pattern] = matcher
+        logger.debug(f"Installed interception route for pattern: {pattern}")
+
+    def _handle_route(self, route, request):
+        """Apply mocks and request modifications to a routed request"""
+        if not self.enabled or not self._should_capture(request.url):
+            route.fallback()
+            return
+
+        # Check for mock response
+        mock_response = self.response_modifier.get_mock_response(request.url)
+        if mock_response:
+            logger.info(f"Using mock response for: {request.url}")
+            route.fulfill(
+                status=mock_response["status"],
+                body=(
+                    json.dumps(mock_response["body"])
+                    if isinstance(mock_response["body"], dict)
+                    else str(mock_response["body"])
+                ),
+                headers=mock_response["headers"],
+            )
+            return
+
+        # Apply request modifications
+        original_headers = dict(request.headers)
+        modified_url, modified_headers, modified_body = self.request_modifier.apply_modifications(
+            request.url, original_headers, request.post_data
+        )
+
+        # Continue with modifications if any
+        if (
+            modified_url != request.url
+            or modified_headers != original_headers
+            or modified_body != request.post_data
+        ):
+            logger.debug(f"Modifying request: {request.url}")
+            route.continue_(
+                url=modified_url if modified_url != request.url else None,
+                headers=modified_headers if modified_headers != original_headers else None,
+                post_data=modified_body if modified_body != request.post_data else None,
+            )
+        else:
+            route.fallback()
+
     def _setup_selenium_interception(self):
         """Setup Selenium network interception (using BrowserMob Proxy or Chrome DevTools)"""
         # Note: Selenium doesn't have native network interception like Playwright
@@ -432,6 +594,7 @@ def modify_request_headers(self, url_pattern: str, headers: Dict[str, str]):
             )
         """
         self.request_modifier.add_header_modification(url_pattern, headers)
+        self._ensure_route(url_pattern)
         logger.info(f"Added request header modification for pattern: {url_pattern}")
 
     def modify_request_url(self, url_pattern: str, url_modifier: Callable[[str], str]):
@@ -446,6 +609,7 @@ def modify_request_url(self, url_pattern: str, url_modifier: Callable[[str], str
             interceptor.modify_request_url(r'/api/v1/', lambda url: url.replace('/v1/', '/v2/'))
         """
         self.request_modifier.add_url_modification(url_pattern, url_modifier)
+        self._ensure_route(url_pattern)
         logger.info(f"Added request URL modification for pattern: {url_pattern}")
 
     def modify_request_body(self, url_pattern: str, body_modifier: Callable[[Any], Any]):
@@ -464,6 +628,7 @@ def add_field(body):
             interceptor.modify_request_body(r'/api/orders', add_field)
         """
         self.request_modifier.add_body_modification(url_pattern, body_modifier)
+        self._ensure_route(url_pattern)
         logger.info(f"Added request body modification for pattern: {url_pattern}")
 
     def mock_response(
@@ -487,6 +652,7 @@ def mock_response(
             )
         """
         self.response_modifier.add_mock_response(url_pattern, status, body or {}, headers)
+        self._ensure_route(url_pattern)
         logger.info(f"Added mock response for pattern: {url_pattern}")
 
     def modify_response_body(self, url_pattern: str, body_modifier: Callable[[Any], Any]):
@@ -642,7 +808,7 @@ def get_captured_requests(self, filter_func: Optional[Callable] = None) -> List[
             List of captured request dictionaries
         """
         if filter_func:
-            return [r for r in self.captured_requests if filter_func(r)]
+            return self.captured_requests.filter(filter_func)
         return self.captured_requests.copy()
 
     def get_captured_responses(self, filter_func: Optional[Callable] = None) -> List[Dict]:
@@ -656,12 +822,12 @@ def get_captured_responses(self, filter_func: Optional[Callable] = None) -> List
             List of captured response dictionaries
         """
         if filter_func:
-            return [r for r in self.captured_responses if filter_func(r)]
+            return self.captured_responses.filter(filter_func)
         return self.captured_responses.copy()
 
     def get_requests_by_method(self, method: str) -> List[Dict]:
         """Get requests by HTTP method"""
-        return self.get_captured_requests(lambda r: r["method"].upper() == method.upper())
+        return self.captured_requests.lookup("method", method.upper())
 
     def get_requests_by_url_pattern(self, pattern: str) -> List[Dict]:
         """Get requests matching URL pattern"""
@@ -669,12 +835,11 @@ def get_requests_by_url_pattern(self, pattern: str) -> List[Dict]:
 
     def get_response_by_url(self, url: str) -> Optional[Dict]:
         """Get first response matching exact URL"""
-        responses = self.get_captured_responses(lambda r: r["url"] == url)
-        return responses[0] if responses else None
+        return self.captured_responses.first("url", url)
 
     def find_api_calls(self) -> List[Dict]:
         """Find all API calls (URLs containing /api/)"""
-        return self.get_captured_requests(lambda r: "/api/" in r["url"])
+        return self.captured_requests.lookup("api", True)
 
     def get_correlation_data(self) -> Dict[str, Any]:
         """
@@ -705,9 +870,13 @@ def get_correlation_data(self) -> Dict[str, Any]:
             "invoiceId",
         ]
 
-        # Search in response bodies
+        # Search in JSON response bodies; lazily captured bodies are read
+        # without being kept in the store
         for response in self.captured_responses:
-            body = response.get("body")
+            content_type = (response.get("content_type") or "").lower()
+            if content_type and "json" not in content_type:
+                continue
+            body = peek_body(response)
             if isinstance(body, dict):
                 for key in key_patterns:
                     if key in body:
@@ -750,76 +919,132 @@ def get_summary(self) -> Dict[str, Any]:
                 "response_modifications": len(self.response_modifier.modifications),
             },
             "api_calls": len(self.find_api_calls()),
+            # peek_body reads lazily captured bodies without keeping them
             "correlation_keys": list(self.get_correlation_data().keys()),
+            "response_bodies": self._get_body_summary(),
         }
 
+    def _get_body_summary(self) -> Dict[str, Any]:
+        """Get body sizes and omissions from metadata only (no body is loaded)"""
+        declared_bytes = 0
+        omitted: Dict[str, int] = {}
+        for response in self.captured_responses:
+            declared_bytes += response.get("body_size") or 0
+            # dict.get reads the placeholder instead of materializing a lazy body
+            reason = dict.get(response, "body_omitted")
+            if reason:
+                omitted[reason] = omitted.get(reason, 0) + 1
+        return {"declared_bytes": declared_bytes, "omitted": omitted}
+
     def _get_method_summary(self) -> Dict[str, int]:
         """Get count by HTTP method"""
-        methods = {}
-        for request in self.captured_requests:
-            method = request["method"]
-            methods[method] = methods.get(method, 0) + 1
-        return methods
+        return self.captured_requests.counts("method")
 
     def _get_status_summary(self) -> Dict[int, int]:
         """Get count by status code"""
-        statuses = {}
-        for response in self.captured_responses:
-            status = response["status"]
-            statuses[status] = statuses.get(status, 0) + 1
-        return statuses
+        return self.captured_responses.counts("status")
 
-    def export_to_har(self, filename: str):
+    def iter_har_entries(self, include_content: bool = True) -> Iterator[Dict[str, Any]]:
         """
-        Export captured data to HAR (HTTP Archive) format
+        Generate HAR entries for the captured requests, one at a time
+
+        Includes entries spilled to disk by a bounded capture store.
 
         Args:
-            filename: Output filename
+            include_content: Include response bodies
+
+        Yields:
+            HAR entry dictionaries in capture order
         """
-        import json
+        # Spilled responses are looked up by file offset, so neither store is
+        # loaded into memory
+        spilled = self.captured_responses.spilled_offsets(lambda entry: entry.get("url"))
+        for request in self.captured_requests.iter_all():
+            url = request.get("url")
+            if url in spilled:
+                response = self.captured_responses.read_spilled(spilled[url])
+            else:
+                response = self.captured_responses.first("url", url)
+            yield har_entry(request, response, include_content)
+
+    def export_to_har(
+        self,
+        filename: str,
+        compress: bool = False,
+        max_bytes: Optional[int] = None,
+        include_content: bool = True,
+    ) -> List[Path]:
+        """
+        Export captured data to HAR (HTTP Archive) format
 
-        har_data = {
-            "log": {
-                "version": "1.2",
-                "creator": {"name": "Automation Framework API Interceptor", "version": "1.0"},
-                "entries": [],
-            }
-        }
+        Entries are streamed to disk, so memory use does not grow with the
+        number of captured requests.
 
-        # Combine requests and responses
-        for i, request in enumerate(self.captured_requests):
-            entry = {
-                "startedDateTime": request["timestamp"],
-                "request": {
-                    "method": request["method"],
-                    "url": request["url"],
-                    "headers": [{"name": k, "value": v} for k, v in request["headers"].items()],
-                    "postData": (
-                        {"text": request.get("post_data", "")} if request.get("post_data") else {}
-                    ),
-                },
-                "response": {},
-                "cache": {},
-                "timings": {},
-            }
+        Args:
+            filename: Output filename
+            compress: Gzip the output (".gz" is appended)
+            max_bytes: Split into chunk files of at most this many bytes
+            include_content: Include response bodies
 
-            # Find matching response
-            matching_responses = [r for r in self.captured_responses if r["url"] == request["url"]]
-            if matching_responses:
-                response = matching_responses[0]
-                entry["response"] = {
-                    "status": response["status"],
-                    "statusText": response["status_text"],
-                    "headers": [{"name": k, "value": v} for k, v in response["headers"].items()],
-                    "content": {"text": str(response.get("body", ""))},
-                }
+        Returns:
+            Paths of the files written
+        """
+        writer = HARWriter(filename, compress=compress, max_bytes=max_bytes)
+        paths = writer.write_all(self.iter_har_entries(include_content))
+
+        logger.info(f"Exported {writer.entry_count} HAR entries to {', '.join(map(str, paths))}")
+        return paths
+
+    def start_har_recording(
+        self,
+        filename: str,
+        compress: bool = False,
+        max_bytes: Optional[int] = None,
+        include_content: bool = False,
+    ):
+        """
+        Stream a HAR entry to disk for every response as it is captured
 
-            har_data["log"]["entries"].append(entry)
+        Args:
+            filename: Output filename
+            compress: Gzip the output (".gz" is appended)
+            max_bytes: Split into chunk files of at most this many bytes
+            include_content: Include response bodies (forces lazily captured
+                bodies to be fetched while recording)
+        """
+        self.stop_har_recording()
+        self._har_writer = HARWriter(filename, compress=compress, max_bytes=max_bytes)
+        self._har_include_content = include_content
+        logger.info(f"Recording HAR to {filename}")
 
-        with open(filename, "w") as f:
-            json.dump(har_data, f, indent=2)
+    def stop_har_recording(self) -> List[Path]:
+        """
+        Stop streaming HAR recording
 
-        logger.info(f"Exported HAR data to {filename}")
+        Returns:
+            Paths of the files written (empty if no recording was active)
+        """
+        writer, self._har_writer = self._har_writer, None
+        if writer is None:
+            return []
+        writer.close()
+        logger.info(f"Recorded {writer.entry_count} HAR entries to {', '.join(map(str, writer.paths))}")
+        return writer.paths
+
+    def _record_har(self, response, entry: Dict[str, Any]):
+        """Write the HAR entry of a captured response to the active recording"""
+        request = response.request
+        request_data = {
+            "timestamp": entry["timestamp"],
+            "method": request.method,
+            "url": entry["url"],
+            "headers": dict(request.headers),
+            "post_data": request.post_data if request.method in ["POST", "PUT", "PATCH"] else None,
+        }
+        try:
+            self._har_writer.write(har_entry(request_data, entry, self._har_include_content))
+        except Exception as e:
+            logger.error(f"Error recording HAR entry: {e}")
 
 
 __all__ = ["APIInterceptor", "WebSocketMessage", "RequestModifier", "ResponseModifier"]
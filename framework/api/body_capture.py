@@ -0,0 +1,253 @@
+"""
+Body Capture - Lazy, size-capped response body capture for the API interceptor
+
+The response listener only records cheap metadata (content type, declared
+size). The body itself is fetched from the browser and decoded the first time
+``entry["body"]`` is read, and only if the content type is textual and the
+size is within the configured cap. Static bundles, images and fonts are never
+copied into Python.
+
+A lazily captured body is only available while the browser still holds the
+response; after the page navigates or closes, loading it fails. The entry is
+then marked ``body_unavailable`` and a warning is logged. Capture with
+``BodyCapturePolicy(lazy=False)`` when bodies are read after navigation.
+"""
+
+import contextlib
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_BODY_BYTES = 1024 * 1024
+
+DEFAULT_CONTENT_TYPES = (
+    "application/json",
+    "+json",
+    "text/",
+    "application/xml",
+    "+xml",
+    "application/x-www-form-urlencoded",
+    "application/graphql",
+)
+
+# Keys materialized by the body loader
+LAZY_KEYS = ("body", "original_body", "body_omitted", "body_unavailable")
+
+
+@dataclass
+class BodyCapturePolicy:
+    """Which response bodies are captured, and when"""
+
+    max_bytes: Optional[int] = DEFAULT_MAX_BODY_BYTES
+    content_types: Tuple[str, ...] = DEFAULT_CONTENT_TYPES
+    lazy: bool = True
+
+    def allows_content_type(self, content_type: str) -> bool:
+        """Check a Content-Type header against the allowed type fragments"""
+        if not content_type:
+            # Unknown type: leave the decision to the size cap
+            return True
+        content_type = content_type.lower()
+        return any(fragment in content_type for fragment in self.content_types)
+
+    def allows_size(self, size: Optional[int]) -> bool:
+        """Check a body size (None = unknown) against the cap"""
+        return self.max_bytes is None or size is None or size <= self.max_bytes
+
+    def omit_reason(self, status: int, content_type: str, size: Optional[int]) -> Optional[str]:
+        """
+        Decide up front whether a body must be skipped
+
+        Args:
+            status: HTTP status code
+            content_type: Content-Type header value
+            size: Declared Content-Length, if any
+
+        Returns:
+            Reason the body is omitted, or None when it may be captured
+        """
+        if status == 204 or 300 <= status < 400:
+            return "no-content"
+        if not self.allows_content_type(content_type):
+            return "content-type"
+        if not self.allows_size(size):
+            return "size"
+        return None
+
+
+def decode_body(raw: bytes, content_type: str) -> Any:
+    """Decode raw body bytes as JSON when possible, otherwise as text"""
+    text = raw.decode("utf-8", errors="replace")
+    if "json" in (content_type or "").lower() or text[:1] in ("{", "["):
+        with contextlib.suppress(ValueError):
+            return json.loads(text)
+    return text
+
+
+def content_length(headers: Dict[str, str]) -> Optional[int]:
+    """Read the Content-Length header, None if absent or invalid"""
+    value = headers.get("content-length")
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+BodyLoader = Callable[[], Tuple[Any, Any, Optional[str]]]
+
+
+class CapturedResponse(dict):
+    """
+    Captured response entry whose body is loaded on first access
+
+    Reading ``body``, ``original_body``, ``body_omitted`` or
+    ``body_unavailable`` (directly, via ``get``, iteration over items/values,
+    ``dict(entry)`` or JSON encoding) runs the loader once; the decoded values
+    then replace the placeholders. ``peek_body`` reads the body without
+    keeping it.
+    """
+
+    def __init__(self, data: Dict[str, Any], loader: Optional[BodyLoader] = None):
+        super().__init__(data)
+        super().setdefault("body_unavailable", False)
+        for key in LAZY_KEYS:
+            super().setdefault(key, None)
+        self._loader = loader
+
+    @property
+    def body_loaded(self) -> bool:
+        """Whether the body has been materialized"""
+        return self._loader is None
+
+    def materialize(self) -> "CapturedResponse":
+        """Load the body now (no-op once loaded)"""
+        loader, self._loader = self._loader, None
+        if loader is not None:
+            self._store(*self._run(loader))
+        return self
+
+    def peek_body(self) -> Any:
+        """
+        Read the body without keeping it in the entry
+
+        Returns:
+            The loaded body, or a one-off load of it when not yet loaded
+        """
+        if self._loader is None:
+            return super().get("body")
+        body, original_body, omitted = self._run(self._loader)
+        if omitted == "unavailable":
+            # It will not come back; remember that instead of retrying
+            self._loader = None
+            self._store(body, original_body, omitted)
+        return body
+
+    def _run(self, loader: BodyLoader) -> Tuple[Any, Any, Optional[str]]:
+        try:
+            return loader()
+        except Exception as e:
+            logger.warning(
+                f"Response body of {super().get('url')} is no longer available "
+                f"(read it before the page navigates or capture with lazy=False): {e}"
+            )
+            return None, None, "unavailable"
+
+    def _store(self, body: Any, original_body: Any, omitted: Optional[str]) -> None:
+        super().__setitem__("body", body)
+        super().__setitem__("original_body", original_body)
+        super().__setitem__("body_omitted", omitted)
+        super().__setitem__("body_unavailable", omitted == "unavailable")
+
+    def __getitem__(self, key):
+        if key in LAZY_KEYS:
+            self.materialize()
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        if key in LAZY_KEYS:
+            self.materialize()
+        super().__setitem__(key, value)
+
+    def __iter__(self):
+        # Defining __iter__ also disables dict's merge fast path, so
+        # dict(entry) and {**entry} go through keys()/__getitem__
+        return super().__iter__()
+
+    def get(self, key, default=None):
+        if key in LAZY_KEYS:
+            self.materialize()
+        return super().get(key, default)
+
+    def items(self):
+        self.materialize()
+        return super().items()
+
+    def values(self):
+        self.materialize()
+        return super().values()
+
+    def copy(self) -> Dict[str, Any]:
+        self.materialize()
+        return dict(super().items())
+
+    def __eq__(self, other):
+        self.materialize()
+        if isinstance(other, CapturedResponse):
+            other.materialize()
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        if self._loader is not None:
+            shown = {k: v for k, v in super().items() if k not in LAZY_KEYS}
+            return f"CapturedResponse({shown!r}, body=<not loaded>)"
+        return f"CapturedResponse({dict(super().items())!r})"
+
+
+def make_body_loader(
+    response: Any,
+    policy: BodyCapturePolicy,
+    content_type: str,
+    modify: Callable[[Any], Any],
+) -> BodyLoader:
+    """
+    Build the loader that fetches, caps, decodes and modifies a response body
+
+    Args:
+        response: Playwright response
+        policy: Capture policy (size cap is re-checked on the actual bytes)
+        content_type: Content-Type header value
+        modify: Response body modifier (e.g. ResponseModifier.apply_modifications)
+
+    Returns:
+        Callable returning (body, original_body, omitted_reason)
+    """
+
+    def load():
+        raw = response.body()
+        if not policy.allows_size(len(raw)):
+            return None, None, "size"
+        body = decode_body(raw, content_type)
+        modified = modify(body)
+        return modified, (body if modified != body else None), None
+
+    return load
+
+
+def peek_body(entry: Dict[str, Any]) -> Any:
+    """Body of a captured response (CapturedResponse or plain dict) without caching it"""
+    if isinstance(entry, CapturedResponse):
+        return entry.peek_body()
+    return entry.get("body")
+
+
+__all__ = [
+    "BodyCapturePolicy",
+    "CapturedResponse",
+    "DEFAULT_CONTENT_TYPES",
+    "DEFAULT_MAX_BODY_BYTES",
+    "peek_body",
+]
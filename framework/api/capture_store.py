@@ -0,0 +1,281 @@
+"""
+Capture Store - Bounded, indexed storage for intercepted API traffic
+
+Behaves like the plain list the API interceptor used to keep (len, iteration,
+indexing, append, clear, copy) and adds:
+- Ring-buffer bound: the oldest entries are evicted past ``max_entries``
+- Optional spill-to-disk: evicted entries are appended to a JSONL file
+- Secondary indexes (e.g. by method, URL, path, status) so lookups are
+  O(1)/O(k) instead of a full scan plus list copy
+
+Index buckets hold sequence numbers in insertion order. Eviction always
+removes the globally oldest entry, which is also the oldest entry of each of
+its buckets, so index maintenance is O(1) per index.
+"""
+
+import json
+import operator
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Union
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+KeyFunc = Callable[[Dict[str, Any]], Any]
+
+
+class CaptureStore:
+    """List-like ring buffer of captured entries with secondary indexes"""
+
+    def __init__(
+        self,
+        indexes: Optional[Dict[str, KeyFunc]] = None,
+        max_entries: Optional[int] = None,
+        spill_path: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Initialize capture store
+
+        Args:
+            indexes: Index name -> key function; entries whose key is None are not indexed
+            max_entries: Ring-buffer bound (None = unbounded)
+            spill_path: JSONL file receiving evicted entries (None = drop them)
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.evicted = 0
+
+        self._key_funcs: Dict[str, KeyFunc] = dict(indexes or {})
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        # Index keys as computed at insert time, so later mutation of an entry
+        # cannot desynchronize eviction
+        self._entry_keys: Dict[int, List[Any]] = {}
+        self._indexes: Dict[str, Dict[Any, Deque[int]]] = {name: {} for name in self._key_funcs}
+        self._next_seq = 0
+        self._spill_file = None
+
+    # ------------------------------------------------------------------
+    # List-compatible interface
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Walks sequence numbers instead of the dict, so entries appended or
+        # evicted while iterating neither raise nor require a copy
+        seq = self._first_seq()
+        while seq < self._next_seq:
+            entry = self._entries.get(seq)
+            if entry is not None:
+                yield entry
+            seq += 1
+
+    def __getitem__(self, item: Union[int, slice]):
+        # In-memory sequence numbers are contiguous, so positions map to them in O(1)
+        first = self._first_seq()
+        if isinstance(item, slice):
+            return [self._entries[first + i] for i in range(*item.indices(len(self._entries)))]
+        position = operator.index(item)
+        if position < 0:
+            position += len(self._entries)
+        if not 0 <= position < len(self._entries):
+            raise IndexError("CaptureStore index out of range")
+        return self._entries[first + position]
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CaptureStore):
+            return self.copy() == other.copy()
+        if isinstance(other, list):
+            return self.copy() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CaptureStore(entries={len(self)}, max_entries={self.max_entries}, evicted={self.evicted})"
+
+    def _first_seq(self) -> int:
+        return self._next_seq - len(self._entries)
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Add an entry, evicting the oldest one past the bound"""
+        seq = self._next_seq
+        self._next_seq += 1
+        self._entries[seq] = entry
+
+        keys = []
+        for name, key_func in self._key_funcs.items():
+            key = key_func(entry)
+            keys.append(key)
+            if key is not None:
+                self._indexes[name].setdefault(key, deque()).append(seq)
+        self._entry_keys[seq] = keys
+
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            self._evict_oldest()
+
+    def extend(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Add several entries"""
+        for entry in entries:
+            self.append(entry)
+
+    def clear(self) -> None:
+        """Drop all entries, in memory and spilled to disk"""
+        self._entries.clear()
+        self._entry_keys.clear()
+        for index in self._indexes.values():
+            index.clear()
+        self.close()
+        self.evicted = 0
+        if self.spill_path:
+            try:
+                self.spill_path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.error(f"Failed to remove capture spill file {self.spill_path}: {e}")
+
+    def copy(self) -> List[Dict[str, Any]]:
+        """Return in-memory entries as a new list"""
+        return list(self._entries.values())
+
+    # ------------------------------------------------------------------
+    # Indexed lookups
+    # ------------------------------------------------------------------
+
+    def lookup(self, index: str, key: Any) -> List[Dict[str, Any]]:
+        """
+        Get entries with the given index key, oldest first
+
+        Args:
+            index: Index name
+            key: Key as produced by the index's key function
+
+        Returns:
+            Matching entries (O(k))
+        """
+        bucket = self._indexes[index].get(key, ())
+        return [self._entries[seq] for seq in bucket]
+
+    def first(self, index: str, key: Any) -> Optional[Dict[str, Any]]:
+        """Get the oldest entry with the given index key (O(1))"""
+        bucket = self._indexes[index].get(key)
+        return self._entries[bucket[0]] if bucket else None
+
+    def counts(self, index: str) -> Dict[Any, int]:
+        """Get the number of entries per key of an index"""
+        return {key: len(bucket) for key, bucket in self._indexes[index].items()}
+
+    def filter(self, predicate: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+        """Get entries matching an arbitrary predicate (full scan)"""
+        return [entry for entry in self._entries.values() if predicate(entry)]
+
+    # ------------------------------------------------------------------
+    # Spill-to-disk
+    # ------------------------------------------------------------------
+
+    def iter_spilled(self) -> Iterator[Dict[str, Any]]:
+        """Iterate entries previously spilled to disk, oldest first"""
+        if not self.spill_path or not self.spill_path.exists():
+            return
+        if self._spill_file:
+            self._spill_file.flush()
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def spilled_offsets(self, key_func: KeyFunc) -> Dict[Any, int]:
+        """
+        Map keys of spilled entries to the file offset of their oldest entry
+
+        Only offsets are kept, so spilled entries can be looked up with
+        read_spilled without loading the spill file into memory.
+
+        Args:
+            key_func: Key function; entries whose key is None are skipped
+
+        Returns:
+            Key -> byte offset in the spill file
+        """
+        offsets: Dict[Any, int] = {}
+        if not self.spill_path or not self.spill_path.exists():
+            return offsets
+        if self._spill_file:
+            self._spill_file.flush()
+        with open(self.spill_path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    key = key_func(json.loads(line))
+                    if key is not None:
+                        offsets.setdefault(key, offset)
+                offset += len(line)
+        return offsets
+
+    def read_spilled(self, offset: int) -> Dict[str, Any]:
+        """Read the spilled entry starting at a byte offset (see spilled_offsets)"""
+        with open(self.spill_path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def iter_all(self) -> Iterator[Dict[str, Any]]:
+        """Iterate spilled entries followed by in-memory entries"""
+        yield from self.iter_spilled()
+        yield from self
+
+    def close(self) -> None:
+        """Close the spill file (it is reopened on the next eviction)"""
+        if self._spill_file:
+            try:
+                self._spill_file.close()
+            except Exception as e:
+                logger.debug(f"Error closing capture spill file: {e}")
+            self._spill_file = None
+
+    def _evict_oldest(self) -> None:
+        seq, entry = self._entries.popitem(last=False)
+        self.evicted += 1
+
+        for name, key in zip(self._key_funcs, self._entry_keys.pop(seq)):
+            if key is None:
+                continue
+            bucket = self._indexes[name][key]
+            bucket.popleft()
+            if not bucket:
+                del self._indexes[name][key]
+
+        if self.spill_path:
+            self._spill(entry)
+
+    def _spill(self, entry: Dict[str, Any]) -> None:
+        try:
+            if self._spill_file is None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                # Kept open for the store's lifetime, closed in close()
+                self._spill_file = open(self.spill_path, "a", encoding="utf-8", buffering=1)  # noqa: SIM115
+            self._spill_file.write(json.dumps(_spill_record(entry), default=str) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to spill captured entry to {self.spill_path}: {e}")
+
+
+def _spill_record(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Plain copy of an evicted entry, without loading deferred fields
+
+    dict.items bypasses overrides such as CapturedResponse.items(), which
+    would fetch a lazy body just to write it out. A body that was never
+    read is recorded as omitted ("not-loaded").
+    """
+    record = dict(dict.items(entry))
+    if getattr(entry, "body_loaded", True) is False:
+        record["body_omitted"] = "not-loaded"
+    return record
+
+
+__all__ = ["CaptureStore"]
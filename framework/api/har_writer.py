@@ -0,0 +1,188 @@
+"""
+HAR Writer - Streaming HTTP Archive output for the API interceptor
+
+Entries are serialized one at a time between a fixed HAR header and footer,
+so writing a session never holds more than one entry in memory. Output can
+be gzip-compressed and split into size-bounded chunk files, each of which is
+a complete, valid HAR document.
+"""
+
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from framework.api.body_capture import peek_body
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HAR_VERSION = "1.2"
+HAR_CREATOR = {"name": "Automation Framework API Interceptor", "version": "1.0"}
+
+_SEPARATOR = b",\n"
+_FOOTER = b"\n]}}\n"
+
+
+def har_entry(
+    request: Dict[str, Any],
+    response: Optional[Dict[str, Any]] = None,
+    include_content: bool = True,
+) -> Dict[str, Any]:
+    """
+    Build a HAR entry from captured request/response dictionaries
+
+    Args:
+        request: Captured request (method, url, headers, timestamp, post_data)
+        response: Matching captured response, if any
+        include_content: Include the response body text (a lazily captured
+            body is fetched from the browser but not kept in the response)
+
+    Returns:
+        HAR entry dictionary
+    """
+    entry = {
+        "startedDateTime": request.get("timestamp"),
+        "request": {
+            "method": request.get("method"),
+            "url": request.get("url"),
+            "headers": [{"name": k, "value": v} for k, v in (request.get("headers") or {}).items()],
+            "postData": {"text": request["post_data"]} if request.get("post_data") else {},
+        },
+        "response": {},
+        "cache": {},
+        "timings": {},
+    }
+
+    if response:
+        content: Dict[str, Any] = {}
+        if response.get("content_type"):
+            content["mimeType"] = response["content_type"]
+        if response.get("body_size") is not None:
+            content["size"] = response["body_size"]
+        if include_content:
+            body = peek_body(response)
+            if body is None:
+                content["text"] = ""
+            else:
+                content["text"] = body if isinstance(body, str) else json.dumps(body, default=str)
+        entry["response"] = {
+            "status": response.get("status"),
+            "statusText": response.get("status_text"),
+            "headers": [
+                {"name": k, "value": v} for k, v in (response.get("headers") or {}).items()
+            ],
+            "content": content,
+        }
+
+    return entry
+
+
+class HARWriter:
+    """Incremental, optionally gzipped and chunked HAR file writer"""
+
+    def __init__(
+        self,
+        filename: Union[str, Path],
+        compress: bool = False,
+        max_bytes: Optional[int] = None,
+        creator: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize HAR writer
+
+        Args:
+            filename: Output path; ".gz" is appended when compressing
+            compress: Write gzip-compressed files
+            max_bytes: Start a new chunk file before the current one would exceed
+                this many uncompressed bytes (None = single file).
+                Chunks are named "<stem>.001.har", "<stem>.002.har", ...
+            creator: HAR creator block
+        """
+        self.filename = Path(filename)
+        self.compress = compress
+        self.max_bytes = max_bytes
+        self.creator = creator or HAR_CREATOR
+        self.paths: List[Path] = []
+        self.entry_count = 0
+
+        self._file = None
+        self._chunk_bytes = 0
+        self._chunk_entries = 0
+
+    def __enter__(self) -> "HARWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Append one HAR entry"""
+        data = json.dumps(entry, default=str).encode("utf-8")
+        if self._file is None:
+            self._open_chunk()
+        elif (
+            self.max_bytes
+            and self._chunk_entries
+            and self._chunk_bytes + len(_SEPARATOR) + len(data) + len(_FOOTER) > self.max_bytes
+        ):
+            self._close_chunk()
+            self._open_chunk()
+
+        if self._chunk_entries:
+            data = _SEPARATOR + data
+        self._write(data)
+        self._chunk_entries += 1
+        self.entry_count += 1
+
+    def write_all(self, entries: Iterable[Dict[str, Any]]) -> List[Path]:
+        """Write every entry of an iterable, close the writer and return the files written"""
+        for entry in entries:
+            self.write(entry)
+        self.close()
+        return self.paths
+
+    def close(self) -> None:
+        """Finish the current chunk (an empty HAR is written if nothing was)"""
+        if self._file is None and not self.paths:
+            self._open_chunk()
+        self._close_chunk()
+
+    def _chunk_path(self) -> Path:
+        path = self.filename
+        if self.max_bytes:
+            path = path.with_name(f"{path.stem}.{len(self.paths) + 1:03d}{path.suffix or '.har'}")
+        if self.compress:
+            path = path.with_name(path.name + ".gz")
+        return path
+
+    def _open_chunk(self) -> None:
+        path = self._chunk_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Binary mode, so _chunk_bytes counts encoded bytes; closed in _close_chunk()
+        if self.compress:
+            self._file = gzip.open(path, "wb")  # noqa: SIM115
+        else:
+            self._file = open(path, "wb")  # noqa: SIM115
+        self.paths.append(path)
+        self._chunk_bytes = 0
+        self._chunk_entries = 0
+
+        header = json.dumps({"version": HAR_VERSION, "creator": self.creator})
+        # Reopen the log object so "entries" can be streamed
+        self._write(('{"log": ' + header[:-1] + ', "entries": [\n').encode("utf-8"))
+
+    def _close_chunk(self) -> None:
+        if self._file is None:
+            return
+        self._write(_FOOTER)
+        self._file.close()
+        self._file = None
+        logger.debug(f"Wrote HAR chunk {self.paths[-1]} ({self._chunk_entries} entries)")
+
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._chunk_bytes += len(data)
+
+
+__all__ = ["HARWriter", "har_entry"]
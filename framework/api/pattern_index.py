@@ -0,0 +1,211 @@
+"""
+Pattern Index - Compiled URL rule matching for the API interceptor
+
+Rules are regex patterns matched with ``re.search`` semantics. The index
+compiles each pattern once at registration and answers "which rules match
+this URL?" with three layers:
+
+1. LRU cache of recent URL -> matching rule ids (SPAs repeat URLs a lot)
+2. One combined alternation regex that rejects URLs matching no rule
+3. Per-rule required-literal check (``literal in url``) before the
+   individual regex runs
+
+Match results are rule ids in registration order, so callers keep their
+first-match / apply-in-order semantics.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_SIZE = 1024
+
+_METACHARS = set(".^$*+?{}[]|()\\")
+_QUANTIFIERS = set("*+?{")
+
+# Group references change meaning once patterns are concatenated
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+def literal_prefix(pattern: str) -> Optional[str]:
+    """
+    Extract the literal text every match of a pattern must contain
+
+    Only the leading run of literal characters is used. Patterns with
+    top-level alternation return None because no single literal is required.
+
+    Args:
+        pattern: Regex pattern
+
+    Returns:
+        Required literal substring, or None
+    """
+    if _has_top_level_alternation(pattern):
+        return None
+
+    chars: List[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            if i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+                char = pattern[i + 1]
+                i += 2
+            else:
+                break
+        elif char in _METACHARS:
+            break
+        else:
+            i += 1
+
+        # A quantifier makes the preceding character optional/repeated
+        if i < len(pattern) and pattern[i] in _QUANTIFIERS:
+            break
+        chars.append(char)
+
+    return "".join(chars) or None
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """Check for a ``|`` outside groups and character classes"""
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A leading "]" (or "^]") is literal inside the class
+            if pattern[i + 1 : i + 2] == "^":
+                i += 1
+            if pattern[i + 1 : i + 2] == "]":
+                i += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+class PatternIndex:
+    """Compiled, cached matcher for an ordered list of regex URL rules"""
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Initialize pattern index
+
+        Args:
+            cache_size: Number of recent URL lookups to cache (0 disables caching)
+        """
+        self.cache_size = cache_size
+        self._patterns: List[str] = []
+        self._compiled: List[Pattern] = []
+        self._literals: List[Optional[str]] = []
+        self._combined: Optional[Pattern] = None
+        self._dirty = False
+        self._cache: "OrderedDict[str, Tuple[int, ...]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def add(self, pattern: str) -> int:
+        """
+        Compile and register a pattern
+
+        Args:
+            pattern: Regex pattern
+
+        Returns:
+            Rule id (registration index)
+
+        Raises:
+            re.error: If the pattern is not a valid regex
+        """
+        self._compiled.append(re.compile(pattern))
+        self._patterns.append(pattern)
+        self._literals.append(literal_prefix(pattern))
+        self._invalidate()
+        return len(self._patterns) - 1
+
+    def rebuild(self, patterns: Iterable[str]) -> None:
+        """Replace all rules with the given patterns"""
+        self._patterns = []
+        self._compiled = []
+        self._literals = []
+        for pattern in patterns:
+            self._compiled.append(re.compile(pattern))
+            self._patterns.append(pattern)
+            self._literals.append(literal_prefix(pattern))
+        self._invalidate()
+
+    def match(self, url: str) -> Tuple[int, ...]:
+        """
+        Find all rules whose pattern matches the URL
+
+        Args:
+            url: Request URL
+
+        Returns:
+            Matching rule ids in registration order
+        """
+        if self._dirty:
+            self._rebuild_combined()
+
+        cached = self._cache.get(url)
+        if cached is not None:
+            self._cache.move_to_end(url)
+            return cached
+
+        if self._combined is not None and not self._combined.search(url):
+            result: Tuple[int, ...] = ()
+        else:
+            result = tuple(
+                rule_id
+                for rule_id, (regex, literal) in enumerate(zip(self._compiled, self._literals))
+                if (literal is None or literal in url) and regex.search(url)
+            )
+
+        if self.cache_size:
+            self._cache[url] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def first_match(self, url: str) -> Optional[int]:
+        """Return the first matching rule id, or None"""
+        matches = self.match(url)
+        return matches[0] if matches else None
+
+    def _invalidate(self) -> None:
+        """Drop cached lookups; the combined regex is rebuilt on the next match"""
+        self._cache.clear()
+        self._dirty = True
+
+    def _rebuild_combined(self) -> None:
+        """Rebuild the combined alternation regex"""
+        self._dirty = False
+        if not self._patterns or any(_GROUP_REFERENCE.search(p) for p in self._patterns):
+            self._combined = None
+            return
+        try:
+            self._combined = re.compile("|".join(f"(?:{p})" for p in self._patterns))
+        except re.error as e:
+            # Backreferences, inline global flags or duplicate group names do not
+            # survive concatenation; rules are then checked one by one.
+            logger.debug(f"Combined URL matcher unavailable, using per-rule matching: {e}")
+            self._combined = None
+
+
+__all__ = ["PatternIndex", "literal_prefix"]
@@ -9,5 +9,6 @@
 """
 
 from .auth_service import AuthenticationService, AuthMethod
+from .storage_state_cache import StorageStateCache
 
-__all__ = ["AuthenticationService", "AuthMethod"]
+__all__ = ["AuthenticationService", "AuthMethod", "StorageStateCache"]
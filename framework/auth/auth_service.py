@@ -3,6 +3,8 @@
 
 Provides unified authentication interface across Playwright and Selenium engines.
 Supports SSO (Okta, Azure AD, Google), MFA, OAuth, SAML, and Basic authentication.
+Logged-in state is cached per (project, environment, role) on disk, so the login
+UI runs once per role instead of once per test.
 
 Author: Principal QA Architect
 Date: January 31, 2026
@@ -10,9 +12,16 @@
 
 import logging
 import time
+from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
-
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from framework.auth.storage_state_cache import (
+    StorageStateCache,
+    capture_state,
+    session_storage_script,
+)
 from framework.core.session_manager import SessionData, SessionManager
 
 logger = logging.getLogger(__name__)
@@ -41,8 +50,13 @@ class AuthenticationService:
     - Session persistence across engines
     """
 
-    def __init__(self, session_manager: Optional[SessionManager] = None):
+    def __init__(
+        self,
+        session_manager: Optional[SessionManager] = None,
+        state_cache: Optional[StorageStateCache] = None,
+    ):
         self.session_manager = session_manager or SessionManager()
+        self.state_cache = state_cache or StorageStateCache()
         self.logger = logger
         self._current_session: Optional[SessionData] = None
         self._current_user: Optional[Dict[str, Any]] = None
@@ -130,13 +144,13 @@ def _authenticate_okta(
 
             # Fill password
             self.logger.info("Entering password...")
-            password_field = driver.find_element(By.ID, "okta-signin-password")
+            password_field = wait.until(EC.element_to_be_clickable((By.ID, "okta-signin-password")))
             password_field.clear()
             password_field.send_keys(password)
 
             # Click submit
             self.logger.info("Submitting credentials...")
-            submit_btn = driver.find_element(By.ID, "okta-signin-submit")
+            submit_btn = wait.until(EC.element_to_be_clickable((By.ID, "okta-signin-submit")))
             submit_btn.click()
 
             # Handle MFA if needed
@@ -146,8 +160,8 @@ def _authenticate_okta(
                 try:
                     mfa_field = wait.until(EC.presence_of_element_located((By.NAME, "answer")))
                     mfa_field.send_keys(mfa_token)
-                    mfa_submit = driver.find_element(
-                        By.CSS_SELECTOR, "input[type='submit'][value='Verify']"
+                    mfa_submit = wait.until(
+                        EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='submit'][value='Verify']"))
                     )
                     mfa_submit.click()
                 except Exception as e:
@@ -205,7 +219,7 @@ def _authenticate_azure_ad(
             username_field.send_keys(username)
 
             # Click Next
-            next_btn = driver.find_element(By.ID, "idSIButton9")
+            next_btn = wait.until(EC.element_to_be_clickable((By.ID, "idSIButton9")))
             next_btn.click()
 
             # Enter password
@@ -214,7 +228,7 @@ def _authenticate_azure_ad(
             password_field.send_keys(password)
 
             # Click Sign in
-            signin_btn = driver.find_element(By.ID, "idSIButton9")
+            signin_btn = wait.until(EC.element_to_be_clickable((By.ID, "idSIButton9")))
             signin_btn.click()
 
             # Handle MFA if needed
@@ -224,7 +238,7 @@ def _authenticate_azure_ad(
                 try:
                     mfa_field = wait.until(EC.presence_of_element_located((By.NAME, "otc")))
                     mfa_field.send_keys(mfa_token)
-                    verify_btn = driver.find_element(By.ID, "idSubmit_SAOTCC_Continue")
+                    verify_btn = wait.until(EC.element_to_be_clickable((By.ID, "idSubmit_SAOTCC_Continue")))
                     verify_btn.click()
                 except Exception as e:
                     self.logger.warning(f"MFA handling failed: {e}")
@@ -273,7 +287,7 @@ def _authenticate_google(
             email_field.send_keys(username)
 
             # Click Next
-            next_btn = driver.find_element(By.ID, "identifierNext")
+            next_btn = wait.until(EC.element_to_be_clickable((By.ID, "identifierNext")))
             next_btn.click()
 
             # Enter password
@@ -282,7 +296,7 @@ def _authenticate_google(
             password_field.send_keys(password)
 
             # Click Next
-            password_next_btn = driver.find_element(By.ID, "passwordNext")
+            password_next_btn = wait.until(EC.element_to_be_clickable((By.ID, "passwordNext")))
             password_next_btn.click()
 
             # Wait for authentication
@@ -366,22 +380,21 @@ def _authenticate_basic_selenium(
             username_field.send_keys(username)
 
             # Locate password field
-            password_field = driver.find_element(By.NAME, "password")
+            password_field = wait.until(EC.element_to_be_clickable((By.NAME, "password")))
             password_field.send_keys(password)
 
-            # Click login button (common variations)
-            login_btn = None
-            for xpath in [
-                "//button[contains(text(), 'Login')]",
-                "//button[contains(text(), 'Sign in')]",
-                "//button[contains(text(), 'Log in')]",
-                "//input[@type='submit']",
-            ]:
-                try:
-                    login_btn = driver.find_element(By.XPATH, xpath)
-                    break
-                except Exception:
-                    continue
+            # Click login button (common variations, one wait for whichever appears first)
+            try:
+                login_btn = wait.until(
+                    EC.any_of(
+                        EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Login')]")),
+                        EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Sign in')]")),
+                        EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Log in')]")),
+                        EC.element_to_be_clickable((By.XPATH, "//input[@type='submit']")),
+                    )
+                )
+            except Exception:
+                login_btn = None
 
             if not login_btn:
                 raise ValueError("Login button not found")
@@ -411,6 +424,155 @@ def _authenticate_basic_playwright(
         self.logger.warning("Playwright basic auth not yet implemented - use Selenium for auth")
         return None
 
+    # ========================================================================
+    # CACHED AUTHENTICATION
+    # ========================================================================
+
+    def new_authenticated_context(
+        self, browser, project: str, env: str, role: str, login: Callable[[Any], Any], **context_options
+    ):
+        """
+        New Playwright context that is already logged in as role
+
+        login(page) drives the login UI; it only runs when there is no valid
+        cached state for (project, env, role) - once per role across all
+        workers until the session expires.
+
+        Args:
+            browser: Playwright Browser (sync API)
+            project: Project name
+            env: Environment name
+            role: User role (one cache entry per role)
+            login: Logs in on the given page
+            **context_options: new_context() options for both contexts
+
+        Returns:
+            BrowserContext with cookies, localStorage and sessionStorage restored,
+            or None if the login failed
+        """
+        entry = self.state_cache.get_or_create(
+            project,
+            env,
+            role,
+            lambda: self._login_and_capture(browser, login, context_options),
+            user={"role": role, "auth_type": "CACHED"},
+        )
+        if entry is None:
+            self.logger.error(f"❌ Login for {project}/{env}/{role} failed")
+            return None
+        return self.create_context_from_state(browser, entry, **context_options)
+
+    def create_context_from_state(self, browser, entry: Dict[str, Any], **context_options):
+        """
+        New Playwright context from a cached entry (see StorageStateCache)
+
+        Args:
+            browser: Playwright Browser (sync API)
+            entry: Cache entry
+            **context_options: Further new_context() options
+
+        Returns:
+            BrowserContext
+        """
+        context = browser.new_context(storage_state=entry["storage_state"], **context_options)
+        script = session_storage_script(entry.get("session_storage") or {})
+        if script:
+            context.add_init_script(script)
+        self._current_session = self._session_from_entry(entry)
+        self._current_user = entry.get("user")
+        return context
+
+    def _login_and_capture(self, browser, login: Callable[[Any], Any], context_options: Dict[str, Any]):
+        context = browser.new_context(**context_options)
+        try:
+            login(context.new_page())
+            return capture_state(context)
+        except Exception as e:
+            self.logger.error(f"❌ Login failed: {e}")
+            return None
+        finally:
+            context.close()
+
+    def authenticate_cached(
+        self, project: str, env: str, role: str, login: Callable[[], Optional[SessionData]], origin: str
+    ) -> Optional[SessionData]:
+        """
+        Cached result of an engine-specific login (e.g. authenticate_sso with Selenium)
+
+        Args:
+            project: Project name
+            env: Environment name
+            role: User role
+            login: Performs the login and returns its SessionData
+            origin: Application origin the storage belongs to ('https://app.example.com')
+
+        Returns:
+            SessionData from the cache or from login(), None if the login failed
+        """
+
+        def run_login():
+            session_data = login()
+            return self._state_from_session(session_data, origin) if session_data else None
+
+        entry = self.state_cache.get_or_create(
+            project, env, role, run_login, user={"role": role, "auth_type": "CACHED"}
+        )
+        if entry is None:
+            return None
+        self._current_session = self._session_from_entry(entry)
+        self._current_user = entry.get("user")
+        return self._current_session
+
+    @staticmethod
+    def _state_from_session(session_data: SessionData, origin: str) -> Dict[str, Any]:
+        """SessionData (cookies + storage of one origin) as a storage state, with its tokens and headers"""
+        parts = urlsplit(origin)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        cookies = [
+            {
+                "name": cookie["name"],
+                "value": cookie["value"],
+                "domain": cookie.get("domain") or parts.hostname,
+                "path": cookie.get("path", "/"),
+                "expires": cookie.get("expiry", cookie.get("expires", -1)),
+                "httpOnly": cookie.get("httpOnly", False),
+                "secure": cookie.get("secure", False),
+                "sameSite": cookie.get("sameSite", "Lax"),
+            }
+            for cookie in session_data.cookies
+        ]
+        local_storage = [{"name": k, "value": v} for k, v in session_data.local_storage.items()]
+        return {
+            "storage_state": {
+                "cookies": cookies,
+                "origins": [{"origin": origin, "localStorage": local_storage}] if local_storage else [],
+            },
+            "session_storage": {origin: dict(session_data.session_storage)} if session_data.session_storage else {},
+            "tokens": dict(session_data.tokens),
+            "headers": dict(session_data.headers),
+            "user_id": session_data.user_id,
+        }
+
+    @staticmethod
+    def _session_from_entry(entry: Dict[str, Any]) -> SessionData:
+        storage_state = entry["storage_state"]
+        local_storage = {
+            item["name"]: item["value"]
+            for origin in storage_state.get("origins", [])
+            for item in origin.get("localStorage", [])
+        }
+        session_storage = {k: v for items in (entry.get("session_storage") or {}).values() for k, v in items.items()}
+        return SessionData(
+            cookies=storage_state.get("cookies", []),
+            local_storage=local_storage,
+            session_storage=session_storage,
+            tokens=dict(entry.get("tokens") or {}),
+            headers=dict(entry.get("headers") or {}),
+            created_at=datetime.fromtimestamp(entry["saved_at"]).isoformat(),
+            user_id=entry.get("user_id") or (entry.get("user") or {}).get("username"),
+            auth_type=(entry.get("user") or {}).get("auth_type"),
+        )
+
     # ========================================================================
     # SESSION TRANSFER
     # ========================================================================
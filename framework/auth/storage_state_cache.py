@@ -0,0 +1,365 @@
+"""
+Storage State Cache - Log in once per role, reuse the session everywhere
+
+Persists authenticated browser state per (project, environment, role):
+cookies and localStorage in Playwright's storage-state format, plus
+sessionStorage per origin (which Playwright does not save). New contexts
+are created with the cached state instead of driving the login UI again.
+
+- Validity: an entry expires at the earliest of saved_at + ttl, the
+  expiry of its cookies and the `exp` claim of any JWT found in cookies or
+  storage; it is refreshed `skew` seconds before that. Unless auth_cookies
+  names the cookies that matter, cookies that already expire within `skew`
+  of the login (analytics, CSRF) do not limit the entry
+- Sharing: entries are JSON files written atomically; a login for a key
+  runs under an advisory file lock, so parallel pytest-xdist workers wait
+  for the first login instead of logging in themselves
+- Storage states contain live credentials: keep the cache directory out of
+  version control and artifacts (.auth/ is git-ignored)
+
+Usage:
+    cache = StorageStateCache()
+    state = cache.get_or_create("bookslot", "staging", "admin", lambda: login(browser))
+    context = browser.new_context(storage_state=state["storage_state"])
+"""
+
+import base64
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    FCNTL_AVAILABLE = False
+
+DEFAULT_CACHE_DIR = ".auth"
+CACHE_VERSION = 1
+
+_JWT_PATTERN = re.compile(r"^(?:Bearer\s+)?([A-Za-z0-9_-]+)\.([A-Za-z0-9_-]+)\.[A-Za-z0-9_-]*$")
+_SAFE_NAME = re.compile(r"[^\w.-]+")
+
+# Restores sessionStorage saved per origin without overwriting values the page set itself
+_SESSION_STORAGE_SCRIPT = """(state => {
+    const items = state[window.location.origin];
+    if (!items) return;
+    for (const [key, value] of Object.entries(items)) {
+        if (window.sessionStorage.getItem(key) === null) window.sessionStorage.setItem(key, value);
+    }
+})(%s);"""
+
+_READ_SESSION_STORAGE = "() => Object.assign({}, window.sessionStorage)"
+
+CacheKey = Tuple[str, str, str]
+
+
+def jwt_expiry(value: str) -> Optional[float]:
+    """
+    `exp` claim of a JWT (optionally prefixed with "Bearer ")
+
+    Returns:
+        Expiry as a Unix timestamp, or None if value is not a JWT with exp
+    """
+    match = _JWT_PATTERN.match(value.strip()) if isinstance(value, str) else None
+    if not match:
+        return None
+    payload = match.group(2)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (ValueError, TypeError):
+        return None
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+def state_expiry(
+    storage_state: Dict[str, Any],
+    session_storage: Optional[Dict[str, Dict[str, str]]] = None,
+    auth_cookies: Optional[Sequence[str]] = None,
+    ignore_before: Optional[float] = None,
+) -> Optional[float]:
+    """
+    Earliest cookie expiry or JWT exp in a storage state
+
+    Args:
+        storage_state: Playwright storage state
+        session_storage: {origin: {key: value}}
+        auth_cookies: Only consider these cookie names (default: all cookies)
+        ignore_before: Skip cookie expiries earlier than this timestamp
+            (short-lived cookies that are not part of the session)
+
+    Returns:
+        Unix timestamp, or None if nothing in the state expires
+    """
+    expiries: List[float] = []
+    for cookie in storage_state.get("cookies", []):
+        if auth_cookies is not None and cookie.get("name") not in auth_cookies:
+            continue
+        expires = cookie.get("expires", -1)
+        if expires and expires > 0 and (ignore_before is None or expires >= ignore_before):
+            expiries.append(float(expires))
+        exp = jwt_expiry(cookie.get("value", ""))
+        if exp is not None:
+            expiries.append(exp)
+
+    values = [item.get("value") for origin in storage_state.get("origins", []) for item in origin.get("localStorage", [])]
+    for items in (session_storage or {}).values():
+        values.extend(items.values())
+    for value in values:
+        exp = jwt_expiry(value)
+        if exp is not None:
+            expiries.append(exp)
+    return min(expiries) if expiries else None
+
+
+def capture_state(context) -> Dict[str, Any]:
+    """
+    Cookies, localStorage and sessionStorage of a logged-in Playwright context
+
+    Args:
+        context: Playwright BrowserContext (sync API) with the authenticated pages open
+
+    Returns:
+        {"storage_state": ..., "session_storage": {origin: {key: value}}}
+    """
+    session_storage: Dict[str, Dict[str, str]] = {}
+    for page in context.pages:
+        parts = urlsplit(page.url)
+        if parts.scheme not in ("http", "https"):
+            continue
+        items = page.evaluate(_READ_SESSION_STORAGE)
+        if items:
+            session_storage.setdefault(f"{parts.scheme}://{parts.netloc}", {}).update(items)
+    return {"storage_state": context.storage_state(), "session_storage": session_storage}
+
+
+def session_storage_script(session_storage: Dict[str, Dict[str, str]]) -> Optional[str]:
+    """Init script restoring cached sessionStorage, or None if there is none"""
+    if not session_storage:
+        return None
+    return _SESSION_STORAGE_SCRIPT % json.dumps(session_storage)
+
+
+class StorageStateCache:
+    """File-backed storage states per (project, environment, role), shared across workers"""
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = DEFAULT_CACHE_DIR,
+        ttl: float = 8 * 3600,
+        skew: float = 300,
+        auth_cookies: Optional[Sequence[str]] = None,
+        lock_timeout: float = 300,
+    ):
+        """
+        Initialize storage state cache
+
+        Args:
+            directory: Cache directory (one JSON file per key)
+            ttl: Maximum age of an entry in seconds
+            skew: Refresh entries this many seconds before they expire
+            auth_cookies: Cookie names whose expiry matters (default: all cookies
+                that outlive skew)
+            lock_timeout: Seconds to wait for another worker's login
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.skew = skew
+        self.auth_cookies = auth_cookies
+        self.lock_timeout = lock_timeout
+        self._memory: Dict[CacheKey, Dict[str, Any]] = {}
+        self._locks: Dict[CacheKey, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "logins": 0, "expired": 0}
+
+    def path_for(self, project: str, env: str, role: str) -> Path:
+        names = [_SAFE_NAME.sub("_", part) for part in (project, env, role)]
+        return self.directory.joinpath(names[0], names[1], f"{names[2]}.json")
+
+    def is_valid(self, entry: Optional[Dict[str, Any]], now: Optional[float] = None) -> bool:
+        """Entry exists, has the current format and does not expire within skew seconds"""
+        if not entry or entry.get("version") != CACHE_VERSION:
+            return False
+        now = time.time() if now is None else now
+        return entry.get("expires_at", 0) - self.skew > now
+
+    def get(self, project: str, env: str, role: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached entry if still valid
+
+        Returns:
+            {"storage_state", "session_storage", "saved_at", "expires_at", ...} or None
+        """
+        key = (project, env, role)
+        entry = self._memory.get(key)
+        if not self.is_valid(entry):
+            entry = self._read(self.path_for(*key))
+            if not self.is_valid(entry):
+                if entry is not None:
+                    self.stats["expired"] += 1
+                self._memory.pop(key, None)
+                return None
+            self._memory[key] = entry
+        return entry
+
+    def put(self, project: str, env: str, role: str, state: Dict[str, Any], **metadata) -> Dict[str, Any]:
+        """
+        Store a captured state (see capture_state)
+
+        Args:
+            project: Project name
+            env: Environment name
+            role: User role
+            state: {"storage_state": ..., "session_storage": ...}; any other
+                JSON-serializable fields the login captured are saved with the entry
+            **metadata: Extra JSON-serializable fields saved with the entry (e.g. user)
+
+        Returns:
+            The stored entry
+        """
+        now = time.time()
+        storage_state = state.get("storage_state") or {"cookies": [], "origins": []}
+        session_storage = state.get("session_storage") or {}
+        # Without auth_cookies, a cookie that dies within skew (e.g. _gat) cannot be the session cookie
+        ignore_before = now + self.skew if self.auth_cookies is None else None
+        expiry = state_expiry(storage_state, session_storage, self.auth_cookies, ignore_before)
+        captured = {k: v for k, v in state.items() if k not in ("storage_state", "session_storage")}
+        entry = dict(
+            metadata,
+            **captured,
+            version=CACHE_VERSION,
+            saved_at=now,
+            expires_at=min(now + self.ttl, expiry) if expiry is not None else now + self.ttl,
+            storage_state=storage_state,
+            session_storage=session_storage,
+        )
+        self._write(self.path_for(project, env, role), entry)
+        self._memory[(project, env, role)] = entry
+        return entry
+
+    def get_or_create(
+        self, project: str, env: str, role: str, login: Callable[[], Optional[Dict[str, Any]]], **metadata
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cached entry, logging in first if there is no valid one
+
+        Only one process (and thread) logs in per key; the others wait for
+        the lock and then read the state it saved.
+
+        Args:
+            project: Project name
+            env: Environment name
+            role: User role
+            login: Performs the login and returns the captured state, or None on failure
+            **metadata: Saved with a new entry
+
+        Returns:
+            Entry, or None if the login failed
+        """
+        entry = self.get(project, env, role)
+        if entry is not None:
+            self.stats["hits"] += 1
+            return entry
+
+        with self._locked((project, env, role)):
+            # Another worker may have logged in while we waited for the lock
+            entry = self.get(project, env, role)
+            if entry is not None:
+                self.stats["hits"] += 1
+                return entry
+            self.stats["misses"] += 1
+            logger.info(f"No cached session for {project}/{env}/{role} - logging in")
+            state = login()
+            if not state:
+                return None
+            self.stats["logins"] += 1
+            return self.put(project, env, role, state, **metadata)
+
+    def invalidate(self, project: str, env: str, role: str) -> None:
+        """Drop an entry (e.g. after the application rejected the cached session)"""
+        self._memory.pop((project, env, role), None)
+        self.path_for(project, env, role).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._memory.clear()
+        for path in self.directory.rglob("*.json"):
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable storage state {path}: {e}")
+            return None
+
+    @staticmethod
+    def _write(path: Path, entry: Dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            # Readers never see a partial file: write aside, then rename over
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    @contextmanager
+    def _locked(self, key: CacheKey) -> Iterator[None]:
+        """Per-key lock across threads (threading.Lock) and processes (flock)"""
+        with self._guard:
+            thread_lock = self._locks.setdefault(key, threading.Lock())
+        with thread_lock:
+            if not FCNTL_AVAILABLE:
+                yield
+                return
+            lock_path = self.path_for(*key).with_suffix(".lock")
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                deadline = time.monotonic() + self.lock_timeout
+                while True:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        if time.monotonic() > deadline:
+                            raise TimeoutError(f"Timed out waiting for login lock {lock_path}") from None
+                        time.sleep(0.1)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                os.close(fd)
+
+
+__all__ = [
+    "CACHE_VERSION",
+    "DEFAULT_CACHE_DIR",
+    "StorageStateCache",
+    "capture_state",
+    "jwt_expiry",
+    "session_storage_script",
+    "state_expiry",
+]
@@ -8,8 +8,11 @@
 Date: January 31, 2026
 """
 
+import contextlib
+import hashlib
 import json
 import logging
+import weakref
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from enum import Enum
@@ -18,6 +21,34 @@
 
 logger = logging.getLogger(__name__)
 
+# Storage keys that hold auth tokens
+TOKEN_KEYS = (
+    "auth_token",
+    "access_token",
+    "id_token",
+    "refresh_token",
+    "jwt",
+    "bearer_token",
+    "token",
+    "Authorization",
+)
+
+# Origin plus both web storages in one WebDriver round trip
+_SNAPSHOT_SCRIPT = """
+    const read = name => {
+        const items = {};
+        try {
+            const storage = window[name];
+            for (let i = 0; i < storage.length; i++) {
+                const key = storage.key(i);
+                items[key] = storage.getItem(key);
+            }
+        } catch (e) {}
+        return items;
+    };
+    return {origin: window.location.origin, local: read('localStorage'), session: read('sessionStorage')};
+"""
+
 
 class SessionType(Enum):
     """Types of sessions that can be transferred"""
@@ -41,6 +72,12 @@ class SessionData:
     created_at: str
     user_id: Optional[str] = None
     auth_type: Optional[str] = None  # 'SSO', 'MFA', 'BASIC', 'OAUTH'
+    origin: Optional[str] = None  # Origin the storage was read from
+
+    def fingerprint(self) -> str:
+        """Hash of the transferable state (cookies, storage, tokens, headers)"""
+        state = [self.cookies, self.local_storage, self.session_storage, self.tokens, self.headers, self.origin]
+        return hashlib.sha1(json.dumps(state, sort_keys=True, default=str).encode()).hexdigest()
 
     @log_function(log_timing=True)
     def to_dict(self) -> Dict[str, Any]:
@@ -82,6 +119,26 @@ class SessionManager:
     def __init__(self, logger_instance: Optional[logging.Logger] = None):
         self.logger = logger_instance or logging.getLogger(__name__)
         self._session_cache: Dict[str, CacheEntry] = {}
+        # Fingerprint of the session last injected per browser context / driver
+        self._injected: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+    def _already_injected(self, target, session_data: SessionData, force: bool) -> bool:
+        try:
+            return not force and self._injected.get(target) == session_data.fingerprint()
+        except TypeError:  # target does not support weak references
+            return False
+
+    def _remember_injection(self, target, session_data: SessionData) -> None:
+        with contextlib.suppress(TypeError):
+            self._injected[target] = session_data.fingerprint()
+
+    @staticmethod
+    def _holds_cookies(cookies: List[Dict[str, Any]], session_data: SessionData) -> bool:
+        """Target still has every session cookie (a pool reset or logout clears them)"""
+        if not session_data.cookies:
+            return False
+        present = {(cookie.get("name"), cookie.get("value")) for cookie in cookies}
+        return all((cookie.get("name"), cookie.get("value")) in present for cookie in session_data.cookies)
 
     # ========================================================================
     # SELENIUM: EXTRACT SESSION
@@ -119,14 +176,13 @@ def extract_session_from_selenium(self, driver) -> SessionData:
                 for c in selenium_cookies
             ]
 
-            # Extract localStorage (if available)
-            local_storage = self._extract_storage_from_selenium(driver, "localStorage")
-
-            # Extract sessionStorage
-            session_storage = self._extract_storage_from_selenium(driver, "sessionStorage")
+            # localStorage and sessionStorage in a single script
+            snapshot = self._snapshot_storage_from_selenium(driver)
+            local_storage = snapshot["local"]
+            session_storage = snapshot["session"]
 
-            # Extract tokens from various storage locations
-            tokens = self._extract_tokens_from_selenium(driver)
+            # Tokens from the common storage keys
+            tokens = self._extract_tokens(local_storage, session_storage)
 
             # Extract headers if needed
             headers = self._extract_headers_from_selenium(driver)
@@ -146,6 +202,7 @@ def extract_session_from_selenium(self, driver) -> SessionData:
                 created_at=datetime.now().isoformat(),
                 user_id=user_id,
                 auth_type=auth_type,
+                origin=snapshot["origin"],
             )
 
             self.logger.info(
@@ -158,56 +215,25 @@ def extract_session_from_selenium(self, driver) -> SessionData:
             raise ValueError(f"Session extraction failed: {e}")
 
     @staticmethod
-    def _extract_storage_from_selenium(driver, storage_type: str) -> Dict[str, str]:
-        """Extract localStorage or sessionStorage from Selenium"""
+    def _snapshot_storage_from_selenium(driver) -> Dict[str, Any]:
+        """Origin, localStorage and sessionStorage from Selenium (one execute_script)"""
         try:
-            script = f"""
-                return Object.keys({storage_type})
-                    .reduce((obj, key) => {{
-                        obj[key] = {storage_type}.getItem(key);
-                        return obj;
-                    }}, {{}});
-            """
-            return driver.execute_script(script) or {}
+            snapshot = driver.execute_script(_SNAPSHOT_SCRIPT) or {}
         except Exception as e:
-            logging.warning(f"Could not extract {storage_type}: {e}")
-            return {}
+            logging.warning(f"Could not extract web storage: {e}")
+            snapshot = {}
+        origin = snapshot.get("origin")
+        return {
+            "origin": origin if origin and origin != "null" else None,
+            "local": snapshot.get("local") or {},
+            "session": snapshot.get("session") or {},
+        }
 
     @staticmethod
-    def _extract_tokens_from_selenium(driver) -> Dict[str, str]:
-        """Extract auth tokens from various locations"""
-        tokens = {}
-
-        # Common token locations
-        token_keys = [
-            "auth_token",
-            "access_token",
-            "id_token",
-            "refresh_token",
-            "jwt",
-            "bearer_token",
-            "token",
-            "Authorization",
-        ]
-
-        # Check localStorage
-        for key in token_keys:
-            try:
-                value = driver.execute_script(f"return localStorage.getItem('{key}');")
-                if value:
-                    tokens[key] = value
-            except Exception:
-                pass
-
-        # Check sessionStorage
-        for key in token_keys:
-            try:
-                value = driver.execute_script(f"return sessionStorage.getItem('{key}');")
-                if value:
-                    tokens[f"session_{key}"] = value
-            except Exception:
-                pass
-
+    def _extract_tokens(local_storage: Dict[str, str], session_storage: Dict[str, str]) -> Dict[str, str]:
+        """Auth tokens found under the common keys (sessionStorage ones prefixed 'session_')"""
+        tokens = {key: local_storage[key] for key in TOKEN_KEYS if local_storage.get(key)}
+        tokens.update({f"session_{key}": session_storage[key] for key in TOKEN_KEYS if session_storage.get(key)})
         return tokens
 
     @staticmethod
@@ -263,58 +289,49 @@ def _extract_user_id(tokens: Dict, session_storage: Dict, local_storage: Dict) -
     # ========================================================================
 
     @log_async_function(log_timing=True)
-    async def inject_session_to_playwright(self, page, session_data: SessionData) -> bool:
+    async def inject_session_to_playwright(self, page, session_data: SessionData, force: bool = False) -> bool:
         """
         Inject session data into Playwright Page
 
+        Cookies are added in one call; storage and tokens are applied once
+        by a single script on the current page, so later token refreshes or
+        a logout are not undone. Skipped if the same session was already
+        injected into the context and its cookies are still there.
+
         Args:
             page: Playwright Page instance
             session_data: SessionData object to inject
+            force: Inject even if this session was injected before
 
         Returns:
             True if injection successful, False otherwise
         """
+        context = page.context
+        if self._already_injected(context, session_data, force) and self._holds_cookies(
+            await context.cookies(), session_data
+        ):
+            self.logger.debug("Session unchanged since last transfer - skipping injection")
+            return True
+
         self.logger.info("Injecting session into Playwright...")
 
         try:
-            # Add cookies
             if session_data.cookies:
-                await page.context.add_cookies(session_data.cookies)
-                self.logger.info(f"✅ Added {len(session_data.cookies)} cookies")
-
-            # Navigate to app first (required before setting storage)
-            # This should be the same domain as the session
-            if not page.url or page.url == "about:blank":
-                # Use a dummy navigation if no URL set yet
-                self.logger.info("Page not yet navigated, waiting for navigation...")
-
-            # Inject localStorage
-            if session_data.local_storage:
-                js_code = self._generate_storage_injection_code(
-                    "localStorage", session_data.local_storage
-                )
-                await page.evaluate(js_code)
-                self.logger.info(
-                    f"✅ Injected {len(session_data.local_storage)} localStorage items"
-                )
-
-            # Inject sessionStorage
-            if session_data.session_storage:
-                js_code = self._generate_storage_injection_code(
-                    "sessionStorage", session_data.session_storage
-                )
-                await page.evaluate(js_code)
-                self.logger.info(
-                    f"✅ Injected {len(session_data.session_storage)} sessionStorage items"
-                )
-
-            # Set tokens if needed
-            if session_data.tokens:
-                js_code = self._generate_token_injection_code(session_data.tokens)
-                await page.evaluate(js_code)
-                self.logger.info(f"✅ Injected {len(session_data.tokens)} tokens")
-
-            self.logger.info("✅ Session injected into Playwright successfully")
+                await context.add_cookies(session_data.cookies)
+
+            script = self._generate_session_injection_code(session_data)
+            if script and page.url.startswith(("http://", "https://")):
+                await page.evaluate(script)
+                self._remember_injection(context, session_data)
+            elif script:
+                self.logger.warning("Page has not loaded the site yet - storage and tokens not injected")
+            else:
+                self._remember_injection(context, session_data)
+            self.logger.info(
+                f"✅ Session injected into Playwright: {len(session_data.cookies)} cookies, "
+                f"{len(session_data.local_storage)} localStorage, "
+                f"{len(session_data.session_storage)} sessionStorage, {len(session_data.tokens)} tokens"
+            )
             return True
 
         except Exception as e:
@@ -322,89 +339,133 @@ async def inject_session_to_playwright(self, page, session_data: SessionData) ->
             return False
 
     @log_function(log_timing=True)
-    def inject_session_to_playwright_sync(self, page, session_data: SessionData) -> bool:
+    def inject_session_to_playwright_sync(self, page, session_data: SessionData, force: bool = False) -> bool:
         """
         Inject session data into Playwright Page (Sync version)
 
         Args:
             page: Playwright Page instance (sync)
             session_data: SessionData object to inject
+            force: Inject even if this session was injected before
 
         Returns:
             True if injection successful, False otherwise
         """
+        context = page.context
+        if self._already_injected(context, session_data, force) and self._holds_cookies(
+            context.cookies(), session_data
+        ):
+            self.logger.debug("Session unchanged since last transfer - skipping injection")
+            return True
+
         self.logger.info("Injecting session into Playwright (sync)...")
 
         try:
-            # Add cookies
             if session_data.cookies:
-                page.context.add_cookies(session_data.cookies)
-                self.logger.info(f"✅ Added {len(session_data.cookies)} cookies")
+                context.add_cookies(session_data.cookies)
+
+            script = self._generate_session_injection_code(session_data)
+            if script and page.url.startswith(("http://", "https://")):
+                page.evaluate(script)
+                self._remember_injection(context, session_data)
+            elif script:
+                self.logger.warning("Page has not loaded the site yet - storage and tokens not injected")
+            else:
+                self._remember_injection(context, session_data)
+            self.logger.info(
+                f"✅ Session injected into Playwright: {len(session_data.cookies)} cookies, "
+                f"{len(session_data.local_storage)} localStorage, "
+                f"{len(session_data.session_storage)} sessionStorage, {len(session_data.tokens)} tokens"
+            )
+            return True
 
-            # Inject localStorage
-            if session_data.local_storage:
-                js_code = self._generate_storage_injection_code(
-                    "localStorage", session_data.local_storage
-                )
-                page.evaluate(js_code)
-                self.logger.info(
-                    f"✅ Injected {len(session_data.local_storage)} localStorage items"
-                )
+        except Exception as e:
+            self.logger.error(f"❌ Failed to inject session into Playwright: {e}")
+            return False
 
-            # Inject sessionStorage
-            if session_data.session_storage:
-                js_code = self._generate_storage_injection_code(
-                    "sessionStorage", session_data.session_storage
-                )
-                page.evaluate(js_code)
-                self.logger.info(
-                    f"✅ Injected {len(session_data.session_storage)} sessionStorage items"
-                )
+    # ========================================================================
+    # SELENIUM: INJECT SESSION
+    # ========================================================================
 
-            # Set tokens if needed
-            if session_data.tokens:
-                js_code = self._generate_token_injection_code(session_data.tokens)
-                page.evaluate(js_code)
-                self.logger.info(f"✅ Injected {len(session_data.tokens)} tokens")
+    @log_function(log_timing=True)
+    def inject_session_to_selenium(self, driver, session_data: SessionData, force: bool = False) -> bool:
+        """
+        Inject session data into Selenium WebDriver
+
+        The driver must be on the session's site: WebDriver only accepts
+        cookies for the current domain and storage is per origin. Cookies
+        need one add_cookie each (httpOnly cookies cannot be set from
+        script); storage and tokens are written by a single script.
+
+        Args:
+            driver: Selenium WebDriver instance
+            session_data: SessionData object to inject
+            force: Inject even if this session was injected before
 
-            self.logger.info("✅ Session injected into Playwright successfully")
+        Returns:
+            True if injection successful, False otherwise
+        """
+        if self._already_injected(driver, session_data, force) and self._holds_cookies(
+            driver.get_cookies(), session_data
+        ):
+            self.logger.debug("Session unchanged since last transfer - skipping injection")
+            return True
+
+        self.logger.info("Injecting session into Selenium...")
+
+        try:
+            for cookie in session_data.cookies:
+                selenium_cookie = {
+                    key: cookie[key]
+                    for key in ("name", "value", "path", "domain", "secure", "httpOnly", "sameSite", "expiry")
+                    if cookie.get(key) not in (None, "")
+                }
+                try:
+                    driver.add_cookie(selenium_cookie)
+                except Exception as e:
+                    self.logger.debug(f"Cookie {cookie.get('name')} not accepted: {e}")
+
+            script = self._generate_session_injection_code(session_data)
+            if script:
+                driver.execute_script(script)
+
+            self._remember_injection(driver, session_data)
+            self.logger.info("✅ Session injected into Selenium successfully")
             return True
 
         except Exception as e:
-            self.logger.error(f"❌ Failed to inject session into Playwright: {e}")
+            self.logger.error(f"❌ Failed to inject session into Selenium: {e}")
             return False
 
     @staticmethod
-    def _generate_storage_injection_code(storage_type: str, data: Dict[str, str]) -> str:
-        """Generate JavaScript code to inject storage data"""
-        items_json = json.dumps(data)
-        return f"""
-        (function() {{
-            const items = {items_json};
-            for (const [key, value] of Object.entries(items)) {{
-                {storage_type}.setItem(key, value);
-            }}
-        }})();
+    def _generate_session_injection_code(session_data: SessionData) -> Optional[str]:
         """
+        One script writing localStorage, sessionStorage and tokens
 
-    @staticmethod
-    def _generate_token_injection_code(tokens: Dict[str, str]) -> str:
-        """Generate JavaScript code to inject tokens"""
-        tokens_json = json.dumps(tokens)
+        Only applies on the origin the session was read from (when known).
+        Usable with page.evaluate and execute_script.
+        """
+        if not (session_data.local_storage or session_data.session_storage or session_data.tokens):
+            return None
+        payload = json.dumps(
+            {
+                "origin": session_data.origin,
+                "local": session_data.local_storage,
+                "session": session_data.session_storage,
+                "tokens": session_data.tokens,
+            }
+        )
         return f"""
-        (function() {{
-            const tokens = {tokens_json};
-            
-            // Inject into Authorization header (if your app uses it)
-            if (tokens.auth_token || tokens.access_token) {{
-                const token = tokens.auth_token || tokens.access_token;
-                window.__AUTH_TOKEN__ = token;
-            }}
-            
-            // Inject into localStorage
-            for (const [key, value] of Object.entries(tokens)) {{
-                localStorage.setItem(key, value);
-            }}
+        (() => {{
+            const state = {payload};
+            if (state.origin && window.location.origin !== state.origin) return;
+            try {{
+                for (const [key, value] of Object.entries(state.local)) window.localStorage.setItem(key, value);
+                for (const [key, value] of Object.entries(state.session)) window.sessionStorage.setItem(key, value);
+                for (const [key, value] of Object.entries(state.tokens)) window.localStorage.setItem(key, value);
+            }} catch (e) {{}}
+            const token = state.tokens.auth_token || state.tokens.access_token;
+            if (token) window.__AUTH_TOKEN__ = token;
         }})();
         """
 
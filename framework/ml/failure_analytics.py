@@ -0,0 +1,280 @@
+"""
+Failure Analytics - Single-pass, incremental test history aggregation
+
+FailureAggregator keeps running per-test statistics that MLTestOptimizer
+previously recomputed by rescanning the whole history:
+- run / failure counters
+- pass/fail transitions over a sliding window of recent runs (flakiness)
+- duration mean (running) and p90 (P-square streaming quantile sketch)
+- the last few failures, plus a changed-file -> test inverted index over them
+
+Each result is folded in with O(1) work, and file-impact queries only touch
+tests that actually failed with one of the changed files.
+"""
+
+import math
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from framework.ml.history_store import HistoryColumns
+
+FLAKINESS_WINDOW = 20
+FLAKINESS_MIN_RUNS = 5
+RECENT_FAILURES = 5
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate (P-square algorithm, Jain & Chlamtac 1985)
+
+    Uses five markers regardless of how many values are added. Exact while
+    fewer than five values have been seen.
+    """
+
+    __slots__ = ("p", "count", "heights", "positions", "desired", "increments")
+
+    def __init__(self, p: float):
+        self.p = p
+        self.count = 0
+        self.heights: List[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value: float) -> None:
+        """Fold one value into the estimate"""
+        self.count += 1
+        heights = self.heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= heights[k + 1]:
+                k += 1
+
+        positions = self.positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in range(1, 4):
+            delta = self.desired[i] - positions[i]
+            if (delta >= 1 and positions[i + 1] - positions[i] > 1) or (
+                delta <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if delta > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (
+                        positions[i + step] - positions[i]
+                    )
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float:
+        """Current quantile estimate (0.0 before any value)"""
+        if not self.heights:
+            return 0.0
+        if self.count <= 5:
+            # Nearest-rank on the exact samples
+            rank = max(1, math.ceil(self.p * len(self.heights)))
+            return self.heights[rank - 1]
+        return self.heights[2]
+
+
+class RunningStats:
+    """Running statistics of one test"""
+
+    __slots__ = (
+        "runs",
+        "failures",
+        "window",
+        "window_transitions",
+        "duration_total",
+        "duration_p90",
+        "recent_failures",
+    )
+
+    def __init__(self):
+        self.runs = 0
+        self.failures = 0
+        self.window: Deque[bool] = deque(maxlen=FLAKINESS_WINDOW)
+        self.window_transitions = 0
+        self.duration_total = 0.0
+        self.duration_p90 = P2Quantile(0.9)
+        self.recent_failures: Deque[Dict[str, Any]] = deque(maxlen=RECENT_FAILURES)
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.runs if self.runs else 0.0
+
+    @property
+    def mean_duration(self) -> float:
+        return self.duration_total / self.runs if self.runs else 0.0
+
+    @property
+    def flakiness(self) -> float:
+        """Share of pass/fail flips between consecutive recent runs (0-1)"""
+        if len(self.window) < FLAKINESS_MIN_RUNS:
+            return 0.0
+        return self.window_transitions / (len(self.window) - 1)
+
+    def add_outcome(self, passed: bool) -> None:
+        window = self.window
+        if len(window) == window.maxlen and len(window) > 1 and window[0] != window[1]:
+            # The flip between the two oldest runs leaves the window
+            self.window_transitions -= 1
+        if window and window[-1] != passed:
+            self.window_transitions += 1
+        window.append(passed)
+
+
+class FailureAggregator:
+    """Incremental per-test failure, flakiness and duration analytics"""
+
+    def __init__(self):
+        self.stats: Dict[str, RunningStats] = {}
+        # changed file -> test -> number of the test's recent failures with that file
+        self.file_index: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.total_results = 0
+
+    @classmethod
+    def from_columns(cls, columns: HistoryColumns) -> "FailureAggregator":
+        """Build an aggregator from loaded history columns in one pass"""
+        aggregator = cls()
+        names = columns.names
+        errors = columns.errors
+        changed_files = columns.changed_files
+        for row, (test_id, passed, duration) in enumerate(
+            zip(columns.test_ids, columns.passed, columns.durations)
+        ):
+            failure = None
+            if not passed:
+                failure = {
+                    "timestamp": datetime.fromtimestamp(columns.timestamps[row]).isoformat(),
+                    "error": errors.get(row),
+                    "changed_files": changed_files.get(row, []),
+                }
+            aggregator._add(names[test_id], bool(passed), duration, failure)
+        return aggregator
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """
+        Fold one test result into the statistics
+
+        Args:
+            result: Record dict (test_name, passed, duration, timestamp,
+                error, changed_files)
+        """
+        failure = None
+        if not result["passed"]:
+            failure = {
+                "timestamp": result.get("timestamp"),
+                "error": result.get("error"),
+                "changed_files": list(result.get("changed_files") or []),
+            }
+        self._add(result["test_name"], bool(result["passed"]), result.get("duration") or 0.0, failure)
+
+    def extend(self, results: Iterable[Dict[str, Any]]) -> None:
+        """Fold several results"""
+        for result in results:
+            self.add(result)
+
+    def _add(
+        self, test_name: str, passed: bool, duration: float, failure: Optional[Dict[str, Any]]
+    ) -> None:
+        stats = self.stats.get(test_name)
+        if stats is None:
+            stats = self.stats[test_name] = RunningStats()
+
+        self.total_results += 1
+        stats.runs += 1
+        stats.add_outcome(passed)
+        stats.duration_total += duration
+        stats.duration_p90.add(duration)
+
+        if failure is not None:
+            stats.failures += 1
+            recent = stats.recent_failures
+            if len(recent) == recent.maxlen:
+                self._unindex(test_name, recent[0])
+            recent.append(failure)
+            for path in set(failure["changed_files"]):
+                tests = self.file_index[path]
+                tests[test_name] = tests.get(test_name, 0) + 1
+
+    def _unindex(self, test_name: str, failure: Dict[str, Any]) -> None:
+        for path in set(failure["changed_files"]):
+            tests = self.file_index[path]
+            tests[test_name] -= 1
+            if not tests[test_name]:
+                del tests[test_name]
+                if not tests:
+                    del self.file_index[path]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def file_overlap(self, changed_files: Iterable[str]) -> Dict[str, int]:
+        """
+        Count, per test, the changed files found in its recent failures
+
+        Returns:
+            Test name -> sum over changed files of recent failures containing it
+        """
+        overlap: Dict[str, int] = defaultdict(int)
+        for path in set(changed_files):
+            for test_name, count in self.file_index.get(path, {}).items():
+                overlap[test_name] += count
+        return overlap
+
+    def failures_touching(self, test_name: str, changed_files: Iterable[str]) -> int:
+        """Number of the test's recent failures that share any changed file"""
+        changed = set(changed_files)
+        stats = self.stats.get(test_name)
+        if stats is None:
+            return 0
+        return sum(1 for failure in stats.recent_failures if changed & set(failure["changed_files"]))
+
+    def pattern(self, test_name: str) -> Dict[str, Any]:
+        """Failure pattern dict of one test (MLTestOptimizer.failure_patterns format)"""
+        stats = self.stats[test_name]
+        return {
+            "failure_rate": stats.failure_rate,
+            "total_runs": stats.runs,
+            "total_failures": stats.failures,
+            "recent_failures": list(stats.recent_failures),
+            "flakiness_score": stats.flakiness,
+            "avg_duration": stats.mean_duration,
+            "p90_duration": stats.duration_p90.value(),
+        }
+
+    def patterns(self) -> Dict[str, Dict[str, Any]]:
+        """Failure pattern dicts of all tests"""
+        return {test_name: self.pattern(test_name) for test_name in self.stats}
+
+    def mean_durations(self) -> List[Tuple[str, float]]:
+        """(test name, mean duration) for every test"""
+        return [(test_name, stats.mean_duration) for test_name, stats in self.stats.items()]
+
+
+__all__ = ["FailureAggregator", "P2Quantile", "RunningStats"]
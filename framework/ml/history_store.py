@@ -0,0 +1,475 @@
+"""
+History Store - Append-only test history backends for MLTestOptimizer
+
+Every test result is appended as one record; nothing is ever rewritten, so
+recording is O(1) and several pytest-xdist workers can write to the same
+history at once.
+
+Backends:
+- JSONL (default): one JSON object per line, appended with a single
+  ``O_APPEND`` write under an advisory file lock. A columnar snapshot
+  (``<history>.snapshot``) caches everything parsed so far, so loading only
+  parses the lines appended since.
+- SQLite (``.db`` / ``.sqlite`` / ``.sqlite3``): WAL-mode database.
+
+Both load into HistoryColumns: flat typed arrays (test id, passed, duration,
+timestamp) plus a per-test row index, with errors and changed files kept
+sparsely for failing rows only.
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    FCNTL_AVAILABLE = False
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+SNAPSHOT_SUFFIX = ".snapshot"
+SNAPSHOT_MAGIC = b"MLHS1\n"
+# Rewrite the snapshot once this many records were parsed from the JSONL tail
+SNAPSHOT_MIN_TAIL = 1000
+
+
+def _to_epoch(timestamp: Any) -> float:
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _encode(records: Iterable[Dict[str, Any]]) -> bytes:
+    return "".join(
+        json.dumps(record, default=str, separators=(",", ":")) + "\n" for record in records
+    ).encode("utf-8")
+
+
+class HistoryColumns:
+    """Columnar, append-friendly in-memory form of the test history"""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.name_ids: Dict[str, int] = {}
+        self.test_ids = array("i")
+        self.passed = array("b")
+        self.durations = array("d")
+        self.timestamps = array("d")
+        # Sparse columns: row -> value, only for rows that have one
+        self.errors: Dict[int, str] = {}
+        self.changed_files: Dict[int, List[str]] = {}
+        # Per-test row index (rows in chronological order)
+        self.rows: Dict[int, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.test_ids)
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """
+        Add one record
+
+        Args:
+            record: Dict with test_name, passed, duration, timestamp and
+                optional error / changed_files
+
+        Returns:
+            Row number of the record
+        """
+        name = record["test_name"]
+        test_id = self.name_ids.get(name)
+        if test_id is None:
+            test_id = self.name_ids[name] = len(self.names)
+            self.names.append(name)
+            self.rows[test_id] = array("i")
+
+        row = len(self.test_ids)
+        self.test_ids.append(test_id)
+        self.passed.append(1 if record.get("passed") else 0)
+        self.durations.append(float(record.get("duration") or 0.0))
+        self.timestamps.append(_to_epoch(record.get("timestamp")))
+        if record.get("error"):
+            self.errors[row] = record["error"]
+        if record.get("changed_files"):
+            self.changed_files[row] = list(record["changed_files"])
+        self.rows[test_id].append(row)
+        return row
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Add several records"""
+        for record in records:
+            self.append(record)
+
+    def test_rows(self, test_name: str) -> array:
+        """Get the rows of one test in chronological order"""
+        test_id = self.name_ids.get(test_name)
+        return self.rows[test_id] if test_id is not None else array("i")
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """Rebuild the record dict of a row"""
+        return {
+            "test_name": self.names[self.test_ids[row]],
+            "passed": bool(self.passed[row]),
+            "duration": self.durations[row],
+            "timestamp": datetime.fromtimestamp(self.timestamps[row]).isoformat(),
+            "error": self.errors.get(row),
+            "changed_files": self.changed_files.get(row, []),
+        }
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Iterate all records as dicts, oldest first"""
+        for row in range(len(self)):
+            yield self.record(row)
+
+    # ------------------------------------------------------------------
+    # Binary snapshot
+    # ------------------------------------------------------------------
+
+    def to_bytes(self, source_offset: int) -> bytes:
+        """Serialize to the snapshot format (header JSON + raw arrays)"""
+        # Per-test row index, stored as rows grouped by test id
+        grouped_rows = array("i")
+        for test_id in range(len(self.names)):
+            grouped_rows.extend(self.rows[test_id])
+        header = json.dumps(
+            {
+                "offset": source_offset,
+                "count": len(self),
+                "byteorder": sys.byteorder,
+                "names": self.names,
+                "row_counts": [len(self.rows[test_id]) for test_id in range(len(self.names))],
+                "errors": self.errors,
+                "changed_files": self.changed_files,
+            }
+        ).encode("utf-8")
+        return b"".join(
+            [
+                SNAPSHOT_MAGIC,
+                len(header).to_bytes(8, "little"),
+                header,
+                self.test_ids.tobytes(),
+                self.passed.tobytes(),
+                self.durations.tobytes(),
+                self.timestamps.tobytes(),
+                grouped_rows.tobytes(),
+            ]
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Tuple["HistoryColumns", int]:
+        """
+        Deserialize a snapshot
+
+        Returns:
+            (columns, JSONL byte offset the snapshot covers)
+
+        Raises:
+            ValueError: If the snapshot is malformed or from another platform
+        """
+        if not data.startswith(SNAPSHOT_MAGIC):
+            raise ValueError("not a history snapshot")
+        pos = len(SNAPSHOT_MAGIC)
+        header_len = int.from_bytes(data[pos : pos + 8], "little")
+        pos += 8
+        header = json.loads(data[pos : pos + header_len])
+        pos += header_len
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError("snapshot written on a different byte order")
+
+        columns = cls()
+        count = header["count"]
+        grouped_rows = array("i")
+        for column in (
+            columns.test_ids,
+            columns.passed,
+            columns.durations,
+            columns.timestamps,
+            grouped_rows,
+        ):
+            size = column.itemsize * count
+            column.frombytes(data[pos : pos + size])
+            pos += size
+            if len(column) != count:
+                raise ValueError("truncated history snapshot")
+
+        columns.names = header["names"]
+        columns.name_ids = {name: i for i, name in enumerate(columns.names)}
+        columns.errors = {int(row): error for row, error in header["errors"].items()}
+        columns.changed_files = {int(row): files for row, files in header["changed_files"].items()}
+        start = 0
+        for test_id, row_count in enumerate(header["row_counts"]):
+            columns.rows[test_id] = grouped_rows[start : start + row_count]
+            start += row_count
+        return columns, header["offset"]
+
+
+class JSONLHistoryStore:
+    """Append-only JSON Lines history with a columnar snapshot cache"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Initialize JSONL history store
+
+        Args:
+            path: History file path
+        """
+        self.path = Path(path)
+        self.snapshot_path = self.path.with_name(self.path.name + SNAPSHOT_SUFFIX)
+        self._fd: Optional[int] = None
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append one record with a single atomic write"""
+        self._locked_write(_encode([record]))
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Append several records in one write"""
+        data = _encode(records)
+        if data:
+            self._locked_write(data)
+
+    def load(self) -> HistoryColumns:
+        """
+        Load the history into columns
+
+        The snapshot (if valid) provides everything up to its offset; only
+        lines appended after it are parsed. A partially written last line
+        (another worker mid-write) is left for the next load.
+
+        Returns:
+            HistoryColumns with all complete records
+        """
+        columns, offset, tail_records = self._read()
+        if tail_records >= SNAPSHOT_MIN_TAIL:
+            self._write_snapshot(columns, offset)
+        return columns
+
+    def save_snapshot(self) -> None:
+        """Re-read the history and store it as the load snapshot"""
+        columns, offset, _ = self._read()
+        self._write_snapshot(columns, offset)
+
+    def _read(self) -> Tuple[HistoryColumns, int, int]:
+        """Return (columns, byte offset read up to, records parsed from the tail)"""
+        columns, offset = self._load_snapshot()
+        tail_records = 0
+        if self.path.exists():
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                tail = f.read()
+            end = tail.rfind(b"\n") + 1
+            if end:
+                records = self._parse_lines(tail[:end])
+                columns.extend(records)
+                tail_records = len(records)
+                offset += end
+        return columns, offset, tail_records
+
+    def _write_snapshot(self, columns: HistoryColumns, offset: int) -> None:
+        temp_path = self.snapshot_path.with_name(f"{self.snapshot_path.name}.{os.getpid()}.tmp")
+        try:
+            temp_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_bytes(columns.to_bytes(offset))
+            os.replace(temp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Could not write history snapshot: {e}")
+
+    def close(self) -> None:
+        """Close the append handle"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _open_for_append(self) -> int:
+        if self._fd is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def _locked_write(self, data: bytes) -> None:
+        self._open_for_append()
+        if FCNTL_AVAILABLE:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            os.write(self._fd, data)
+        finally:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _load_snapshot(self) -> Tuple[HistoryColumns, int]:
+        try:
+            columns, offset = HistoryColumns.from_bytes(self.snapshot_path.read_bytes())
+        except FileNotFoundError:
+            return HistoryColumns(), 0
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unusable history snapshot {self.snapshot_path}: {e}")
+            return HistoryColumns(), 0
+
+        # A history file shorter than the snapshot was truncated or replaced
+        try:
+            if self.path.stat().st_size < offset:
+                return HistoryColumns(), 0
+        except FileNotFoundError:
+            return HistoryColumns(), 0
+        return columns, offset
+
+    def _parse_lines(self, data: bytes) -> List[Dict[str, Any]]:
+        # One C-level parse for the whole block; per-line only if a line is bad
+        lines = [line for line in data.split(b"\n") if line.strip()]
+        with contextlib.suppress(ValueError):
+            return json.loads(b"[" + b",".join(lines) + b"]")
+        records = []
+        for number, line in enumerate(lines, 1):
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"Skipping corrupt history record {number} in {self.path}")
+        return records
+
+
+class SQLiteHistoryStore:
+    """Append-only SQLite history (WAL mode, safe for concurrent workers)"""
+
+    def __init__(self, path: Union[str, Path], timeout: float = 30.0):
+        """
+        Initialize SQLite history store
+
+        Args:
+            path: Database file path
+            timeout: Seconds to wait for another writer's lock
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), timeout=timeout)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS test_history ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, test_name TEXT NOT NULL, "
+            "passed INTEGER NOT NULL, duration REAL NOT NULL, timestamp TEXT, "
+            "error TEXT, changed_files TEXT)"
+        )
+        self._connection.commit()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Insert one record"""
+        self.extend([record])
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Insert several records in one transaction"""
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO test_history "
+                "(test_name, passed, duration, timestamp, error, changed_files) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        r["test_name"],
+                        1 if r.get("passed") else 0,
+                        float(r.get("duration") or 0.0),
+                        r.get("timestamp"),
+                        r.get("error"),
+                        json.dumps(r["changed_files"]) if r.get("changed_files") else None,
+                    )
+                    for r in records
+                ],
+            )
+
+    def load(self) -> HistoryColumns:
+        """Load the history into columns"""
+        columns = HistoryColumns()
+        cursor = self._connection.execute(
+            "SELECT test_name, passed, duration, timestamp, error, changed_files "
+            "FROM test_history ORDER BY id"
+        )
+        for test_name, passed, duration, timestamp, error, changed_files in cursor:
+            columns.append(
+                {
+                    "test_name": test_name,
+                    "passed": passed,
+                    "duration": duration,
+                    "timestamp": timestamp,
+                    "error": error,
+                    "changed_files": json.loads(changed_files) if changed_files else None,
+                }
+            )
+        return columns
+
+    def save_snapshot(self) -> None:
+        """No-op: SQLite loads need no snapshot"""
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._connection.close()
+
+
+HistoryStore = Union[JSONLHistoryStore, SQLiteHistoryStore]
+
+
+def open_history_store(path: Union[str, Path]) -> HistoryStore:
+    """
+    Open the history backend for a path
+
+    ``.db`` / ``.sqlite`` / ``.sqlite3`` use SQLite, anything else JSONL. A
+    legacy ``.json`` path (the whole history as one JSON list) is switched
+    to a ``.jsonl`` file next to it and imported once.
+
+    Args:
+        path: History file path
+
+    Returns:
+        History store
+    """
+    path = Path(path)
+    if path.suffix.lower() in SQLITE_SUFFIXES:
+        return SQLiteHistoryStore(path)
+    if path.suffix.lower() != ".json":
+        return JSONLHistoryStore(path)
+
+    store = JSONLHistoryStore(path.with_suffix(".jsonl"))
+    if path.exists() and not store.path.exists():
+        _migrate_legacy_json(path, store)
+    return store
+
+
+def _migrate_legacy_json(legacy_path: Path, store: JSONLHistoryStore) -> None:
+    try:
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read legacy history {legacy_path}: {e}")
+        return
+
+    fd = store._open_for_append()
+    if FCNTL_AVAILABLE:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        # Another worker may have migrated while we waited for the lock
+        if os.fstat(fd).st_size == 0:
+            os.write(fd, _encode(records))
+            logger.info(f"Migrated {len(records)} records from {legacy_path} to {store.path}")
+    finally:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+__all__ = [
+    "HistoryColumns",
+    "HistoryStore",
+    "JSONLHistoryStore",
+    "SQLiteHistoryStore",
+    "open_history_store",
+]
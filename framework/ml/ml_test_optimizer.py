@@ -6,10 +6,11 @@
 
 import json
 import os
-from collections import defaultdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
+from framework.ml.failure_analytics import FailureAggregator
+from framework.ml.history_store import HistoryColumns, open_history_store
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -18,37 +19,50 @@
 class MLTestOptimizer:
     """ML-based test optimization engine"""
 
-    def __init__(self, history_file: str = "reports/test_history.json"):
+    def __init__(self, history_file: str = "reports/test_history.jsonl"):
         """
         Initialize ML test optimizer
 
         Args:
-            history_file: Path to test history file
+            history_file: Path to test history file (.jsonl, or .db/.sqlite for
+                SQLite; a legacy .json history is migrated to .jsonl once)
         """
         self.history_file = history_file
-        self.test_history: List[Dict] = []
+        self.store = open_history_store(history_file)
+        self.history = HistoryColumns()
+        self.aggregator = FailureAggregator()
+        self._history_records: Optional[List[Dict]] = None
         self.failure_patterns: Dict[str, Any] = {}
         self.load_history()
 
+    @property
+    def test_history(self) -> List[Dict]:
+        """Test history as record dicts, oldest first (built on first access)"""
+        if self._history_records is None:
+            self._history_records = list(self.history.records())
+        return self._history_records
+
     def load_history(self):
         """Load test execution history"""
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, "r") as f:
-                    self.test_history = json.load(f)
-                logger.info(f"Loaded {len(self.test_history)} historical test runs")
-            except Exception as e:
-                logger.warning(f"Could not load history: {e}")
-                self.test_history = []
-        else:
-            self.test_history = []
+        try:
+            self.history = self.store.load()
+            self.aggregator = FailureAggregator.from_columns(self.history)
+            logger.info(f"Loaded {len(self.history)} historical test runs")
+        except Exception as e:
+            logger.warning(f"Could not load history: {e}")
+            self.history = HistoryColumns()
+            self.aggregator = FailureAggregator()
+        self._history_records = None
 
     def save_history(self):
-        """Save test execution history"""
-        os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
-        with open(self.history_file, "w") as f:
-            json.dump(self.test_history, f, indent=2)
-        logger.debug("Test history saved")
+        """
+        Persist a load snapshot of the history
+
+        Results are appended to the history as they are recorded; this only
+        refreshes the columnar snapshot that speeds up the next load.
+        """
+        self.store.save_snapshot()
+        logger.debug("Test history snapshot saved")
 
     def record_test_result(
         self,
@@ -77,41 +91,20 @@ def record_test_result(
             "changed_files": changed_files or [],
         }
 
-        self.test_history.append(result)
-        self.save_history()
+        self.store.append(result)
+        self.history.append(result)
+        self.aggregator.add(result)
+        if self._history_records is not None:
+            self._history_records.append(result)
 
     def analyze_failure_patterns(self):
-        """Analyze historical data to find failure patterns"""
-        failure_counts = defaultdict(int)
-        total_runs = defaultdict(int)
-        failure_context = defaultdict(list)
-
-        for result in self.test_history:
-            test_name = result["test_name"]
-            total_runs[test_name] += 1
-
-            if not result["passed"]:
-                failure_counts[test_name] += 1
-                failure_context[test_name].append(
-                    {
-                        "timestamp": result["timestamp"],
-                        "error": result.get("error"),
-                        "changed_files": result.get("changed_files", []),
-                    }
-                )
-
-        # Calculate failure rates
-        self.failure_patterns = {}
-        for test_name in total_runs:
-            failure_rate = failure_counts[test_name] / total_runs[test_name]
-            self.failure_patterns[test_name] = {
-                "failure_rate": failure_rate,
-                "total_runs": total_runs[test_name],
-                "total_failures": failure_counts[test_name],
-                "recent_failures": failure_context[test_name][-5:],  # Last 5 failures
-                "flakiness_score": self._calculate_flakiness(test_name),
-            }
+        """
+        Analyze historical data to find failure patterns
 
+        Patterns are read from the incremental aggregator, which already holds
+        per-test counters, flakiness windows and duration sketches.
+        """
+        self.failure_patterns = self.aggregator.patterns()
         logger.info(f"Analyzed {len(self.failure_patterns)} test patterns")
         return self.failure_patterns
 
@@ -119,24 +112,12 @@ def _calculate_flakiness(self, test_name: str) -> float:
         """
         Calculate test flakiness score (0-1)
 
-        A flaky test alternates between pass/fail without code changes.
+        A flaky test alternates between pass/fail without code changes. The
+        score is the share of pass/fail flips over the test's last 20 runs
+        (0 with fewer than 5 runs).
         """
-        recent_results = [
-            r for r in self.test_history[-20:] if r["test_name"] == test_name  # Last 20 runs
-        ]
-
-        if len(recent_results) < 5:
-            return 0.0
-
-        # Count transitions between pass/fail
-        transitions = 0
-        for i in range(1, len(recent_results)):
-            if recent_results[i]["passed"] != recent_results[i - 1]["passed"]:
-                transitions += 1
-
-        # Normalize: more transitions = more flaky
-        flakiness = transitions / (len(recent_results) - 1)
-        return flakiness
+        stats = self.aggregator.stats.get(test_name)
+        return stats.flakiness if stats else 0.0
 
     def predict_failure_probability(
         self, test_name: str, changed_files: Optional[List[str]] = None
@@ -151,29 +132,33 @@ def predict_failure_probability(
         Returns:
             Failure probability
         """
-        if not self.failure_patterns:
-            self.analyze_failure_patterns()
+        return self._failure_probability(
+            test_name, self.aggregator.failures_touching(test_name, changed_files or ())
+        )
 
-        if test_name not in self.failure_patterns:
-            return 0.5  # Unknown test, assume moderate risk
+    def _failure_probability(self, test_name: str, matching_failures: int) -> float:
+        """
+        Combine historical failure rate, flakiness and changed-file impact
+
+        Args:
+            test_name: Test name
+            matching_failures: Recent failures sharing a changed file
 
-        pattern = self.failure_patterns[test_name]
+        Returns:
+            Failure probability
+        """
+        stats = self.aggregator.stats.get(test_name)
+        if stats is None:
+            return 0.5  # Unknown test, assume moderate risk
 
         # Base probability from historical failure rate
-        base_prob = pattern["failure_rate"]
+        base_prob = stats.failure_rate
 
         # Adjust for flakiness
-        flakiness_weight = pattern["flakiness_score"] * 0.3
-
-        # Adjust for changed files
-        file_impact = 0.0
-        if changed_files:
-            # Check if any changed files were involved in previous failures
-            recent_failures = pattern["recent_failures"]
-            for failure in recent_failures:
-                failed_with_files = failure.get("changed_files", [])
-                if any(f in failed_with_files for f in changed_files):
-                    file_impact += 0.2
+        flakiness_weight = stats.flakiness * 0.3
+
+        # Adjust for changed files involved in previous failures
+        file_impact = 0.2 * matching_failures
 
         # Combine factors
         probability = min(1.0, base_prob + flakiness_weight + file_impact)
@@ -195,11 +180,17 @@ def get_optimal_test_order(
         Returns:
             List of (test_name, failure_probability) tuples, sorted by priority
         """
-        test_priorities = []
+        # Only tests that failed with one of the changed files need a closer look
+        candidates = self.aggregator.file_overlap(changed_files) if changed_files else {}
 
+        test_priorities = []
         for test_name in test_names:
-            probability = self.predict_failure_probability(test_name, changed_files)
-            test_priorities.append((test_name, probability))
+            matching = (
+                self.aggregator.failures_touching(test_name, changed_files)
+                if test_name in candidates
+                else 0
+            )
+            test_priorities.append((test_name, self._failure_probability(test_name, matching)))
 
         # Sort by failure probability (descending)
         test_priorities.sort(key=lambda x: x[1], reverse=True)
@@ -218,24 +209,13 @@ def get_recommended_tests(self, changed_files: List[str], max_tests: int = 10) -
         Returns:
             List of recommended test names
         """
-        if not self.failure_patterns:
-            self.analyze_failure_patterns()
-
-        # Find tests that historically failed with these files
-        relevant_tests = []
-
-        for test_name, pattern in self.failure_patterns.items():
-            relevance_score = 0.0
-
-            for failure in pattern["recent_failures"]:
-                failed_with_files = failure.get("changed_files", [])
-                # Check file overlap
-                overlap = len(set(changed_files) & set(failed_with_files))
-                if overlap > 0:
-                    relevance_score += overlap / len(changed_files)
-
-            if relevance_score > 0:
-                relevant_tests.append((test_name, relevance_score))
+        # Relevance: changed-file overlap with each test's recent failures
+        if not changed_files:
+            return []
+        overlap = self.aggregator.file_overlap(changed_files)
+        relevant_tests = [
+            (test_name, count / len(changed_files)) for test_name, count in overlap.items()
+        ]
 
         # Sort by relevance
         relevant_tests.sort(key=lambda x: x[1], reverse=True)
@@ -255,13 +235,10 @@ def get_flaky_tests(self, threshold: float = 0.3) -> List[str]:
         Returns:
             List of flaky test names
         """
-        if not self.failure_patterns:
-            self.analyze_failure_patterns()
-
         flaky = [
             test_name
-            for test_name, pattern in self.failure_patterns.items()
-            if pattern["flakiness_score"] >= threshold
+            for test_name, stats in self.aggregator.stats.items()
+            if stats.flakiness >= threshold
         ]
 
         logger.info(f"Found {len(flaky)} flaky tests (threshold: {threshold})")
@@ -277,16 +254,7 @@ def get_slow_tests(self, percentile: int = 90) -> List[Tuple[str, float]]:
         Returns:
             List of (test_name, avg_duration) tuples
         """
-        test_durations = defaultdict(list)
-
-        for result in self.test_history:
-            test_durations[result["test_name"]].append(result["duration"])
-
-        # Calculate average duration
-        avg_durations = []
-        for test_name, durations in test_durations.items():
-            avg_duration = sum(durations) / len(durations)
-            avg_durations.append((test_name, avg_duration))
+        avg_durations = self.aggregator.mean_durations()
 
         # Sort by duration
         avg_durations.sort(key=lambda x: x[1], reverse=True)
@@ -300,11 +268,10 @@ def get_slow_tests(self, percentile: int = 90) -> List[Tuple[str, float]]:
 
     def generate_insights_report(self, output_path: str = "reports/ml_insights.json"):
         """Generate ML insights report"""
-        if not self.failure_patterns:
-            self.analyze_failure_patterns()
+        self.analyze_failure_patterns()
 
         insights = {
-            "total_test_history": len(self.test_history),
+            "total_test_history": len(self.history),
             "unique_tests": len(self.failure_patterns),
             "flaky_tests": len(self.get_flaky_tests()),
             "high_failure_rate_tests": [
@@ -318,7 +285,11 @@ def generate_insights_report(self, output_path: str = "reports/ml_insights.json"
                 if pattern["flakiness_score"] > 0.3
             ],
             "slow_tests": [
-                {"test": name, "avg_duration": duration}
+                {
+                    "test": name,
+                    "avg_duration": duration,
+                    "p90_duration": self.failure_patterns[name]["p90_duration"],
+                }
                 for name, duration in self.get_slow_tests(90)
             ],
             "generated_at": datetime.now().isoformat(),
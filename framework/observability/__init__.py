@@ -3,6 +3,8 @@
 # Telemetry imports (optional dependency)
 try:
     from framework.observability.telemetry import (
+        JsonLinesSpanExporter,
+        PolicySampler,
         TelemetryConfig,
         TelemetryManager,
         TestTracer,
@@ -22,6 +24,8 @@
     TelemetryConfig = None
     TelemetryManager = None
     TestTracer = None
+    JsonLinesSpanExporter = None
+    PolicySampler = None
     
     def get_telemetry():
         return None
@@ -54,6 +58,27 @@ def decorator(func):
     with_correlation,
     with_trace,
     with_async_trace,
+    get_event_bus,
+)
+from framework.observability.event_bus import (
+    EventBus,
+    LogEvent,
+    Sink,
+    StreamSink,
+    FileSink,
+    CallbackSink,
+)
+from framework.observability.log_segments import (
+    SegmentSink,
+    SegmentMaintainer,
+    compress_segment,
+)
+from framework.observability.sampling_policy import (
+    SamplingPolicy,
+    SamplingRule,
+    TokenBucket,
+    configure_sampling,
+    get_sampling_policy,
 )
 
 # Configuration imports
@@ -83,6 +108,7 @@ def decorator(func):
         SIEMAdapterFactory,
         CircuitBreaker,
     )
+    from framework.observability.siem_shipper import SIEMShipper
     SIEM_AVAILABLE = True
 except ImportError:
     SIEM_AVAILABLE = False
@@ -94,9 +120,12 @@ def decorator(func):
     GrafanaLokiAdapter = None
     SIEMAdapterFactory = None
     CircuitBreaker = None
+    SIEMShipper = None
 
 # Universal Logger Decorators imports
 from framework.observability.universal_logger import (
+    configure_instrumentation,
+    get_instrumentation_settings,
     log_function,
     log_async_function,
     log_state_transition,
@@ -104,12 +133,20 @@ def decorator(func):
     log_operation,
     OperationLogger,
 )
+from framework.observability.log_serializer import (
+    SerializerLimits,
+    configure_serializer_limits,
+    register_summarizer,
+    summarize,
+)
 
 __all__ = [
     # Telemetry (optional)
     "TelemetryConfig",
     "TelemetryManager",
     "TestTracer",
+    "JsonLinesSpanExporter",
+    "PolicySampler",
     "get_telemetry",
     "initialize_telemetry",
     "shutdown_telemetry",
@@ -127,6 +164,22 @@ def decorator(func):
     "with_correlation",
     "with_trace",
     "with_async_trace",
+    # Log event bus
+    "get_event_bus",
+    "EventBus",
+    "LogEvent",
+    "Sink",
+    "StreamSink",
+    "FileSink",
+    "CallbackSink",
+    "SegmentSink",
+    "SegmentMaintainer",
+    "compress_segment",
+    "SamplingPolicy",
+    "SamplingRule",
+    "TokenBucket",
+    "configure_sampling",
+    "get_sampling_policy",
     # Configuration
     "Environment",
     "LogLevel",
@@ -148,12 +201,20 @@ def decorator(func):
     "GrafanaLokiAdapter",
     "SIEMAdapterFactory",
     "CircuitBreaker",
+    "SIEMShipper",
     "SIEM_AVAILABLE",
     # Universal Logger Decorators
+    "configure_instrumentation",
+    "get_instrumentation_settings",
     "log_function",
     "log_async_function",
     "log_state_transition",
     "log_retry_operation",
     "log_operation",
     "OperationLogger",
+    # Log argument/result serialization
+    "SerializerLimits",
+    "configure_serializer_limits",
+    "register_summarizer",
+    "summarize",
 ]
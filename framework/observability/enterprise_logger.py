@@ -31,12 +31,14 @@
 import uuid
 from contextvars import ContextVar
 from datetime import datetime, timezone
-from functools import wraps
-from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from functools import partial, wraps
 from pathlib import Path
-from queue import Queue
 from typing import Any, Dict, List, Optional, Callable, Union
 
+from framework.observability.event_bus import BusHandler, EventBus, LogEvent, StreamSink
+from framework.observability.log_segments import SegmentSink, get_segment_maintainer
+from framework.observability.sampling_policy import KEEP, get_sampling_policy
+
 # Context variables for distributed tracing
 correlation_id_var: ContextVar[Optional[str]] = ContextVar('correlation_id', default=None)
 request_id_var: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
@@ -55,8 +57,23 @@
     directory.mkdir(parents=True, exist_ok=True)
 
 
+def _mask_email(match: "re.Match") -> str:
+    # john.doe@company.com -> j***@c*****com
+    address = match.group(0)
+    domain = address.partition('@')[2]
+    return f"{address[0]}***@{domain[0]}*****{domain.rpartition('.')[2]}"
+
+
 class SensitiveDataMasker:
-    """Masks sensitive data in logs for security compliance"""
+    """
+    Masks sensitive data in logs for security compliance
+
+    All SENSITIVE_PATTERNS are compiled into one alternation so a string is
+    scanned once. Strings that cannot match (no '@' and no run of three
+    digits) are returned untouched without running the scanner, results for
+    short strings are cached, and mask_dict only copies containers in which
+    something was actually masked.
+    """
     
     SENSITIVE_KEYS = {
         'password', 'passwd', 'pwd', 'secret', 'api_key', 'apikey', 
@@ -67,9 +84,8 @@ class SensitiveDataMasker:
     
     SENSITIVE_PATTERNS = [
         # Email patterns - GDPR/HIPAA compliant: mask username and most of domain
-        # Example: john.doe@company.com -> j***@c*****.com
-        (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', 
-         lambda m: f"{m.group(0)[0]}***@{m.group(0).split('@')[1][0]}*****{m.group(0).split('@')[1].split('.')[-1]}"),
+        # Example: john.doe@company.com -> j***@c*****com
+        (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', _mask_email),
         # Credit card patterns
         (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', '****-****-****-****'),
         # SSN patterns
@@ -77,44 +93,99 @@ class SensitiveDataMasker:
         # Phone patterns (10+ digits)
         (r'\b\d{10,}\b', '**********'),
     ]
+
+    # Every pattern needs an '@' or at least three consecutive digits
+    _CANDIDATE = re.compile(r'\d{3}')
+    # Shortest possible match ("a@b.cc")
+    _MIN_MATCH_LENGTH = 6
+    _CACHE_MAX_LENGTH = 256
+    _CACHE_MAX_ENTRIES = 4096
     
+    # subn callables for strings with and without an '@'
+    _scan_with_at: Callable = None
+    _scan_without_at: Callable = None
+    _cache: Dict[str, str] = {}
+
+    @classmethod
+    def compile_patterns(cls) -> None:
+        """
+        (Re)build the combined scanners from SENSITIVE_PATTERNS
+
+        Patterns are tried in list order at each position, which gives the same
+        result as applying them one after another because no replacement can
+        form a new match. Strings without an '@' use a scanner limited to the
+        patterns that do not contain one; those must start with a digit, which
+        lets the regex engine jump straight to digit positions.
+        """
+        cls._scan_with_at = cls._build_scanner(cls.SENSITIVE_PATTERNS)
+        cls._scan_without_at = cls._build_scanner(
+            [entry for entry in cls.SENSITIVE_PATTERNS if '@' not in entry[0]], prefix=r'(?=\d)'
+        )
+        cls._cache = {}
+
+    @staticmethod
+    def _build_scanner(patterns: List[tuple], prefix: str = '') -> Callable:
+        replacements = [replacement for _, replacement in patterns]
+
+        def replace(match: "re.Match") -> str:
+            replacement = replacements[match.lastindex - 1]
+            return replacement if isinstance(replacement, str) else replacement(match)
+
+        scanner = re.compile(prefix + '(?:' + '|'.join(f'({pattern})' for pattern, _ in patterns) + ')')
+        return partial(scanner.subn, replace)
+
     @classmethod
     def mask_dict(cls, data: Dict[str, Any], mask_value: str = "***MASKED***") -> Dict[str, Any]:
-        """Recursively mask sensitive data in dictionaries"""
+        """
+        Recursively mask sensitive data in dictionaries
+
+        Copy-on-write: the input dict (or nested container) is returned as-is
+        when nothing in it needs masking, so treat the result as read-only.
+        """
         if not isinstance(data, dict):
             return data
         
-        masked = {}
+        masked = None
         for key, value in data.items():
-            # Convert key to string for comparison
-            key_str = str(key)
-            key_lower = key_str.lower()
-            
             # Check if key is exactly a sensitive key (not just contains it)
             # This prevents "credentials" from matching "credential"
-            is_sensitive = key_lower in cls.SENSITIVE_KEYS
-            
-            if is_sensitive:
-                masked[key] = mask_value
+            if str(key).lower() in cls.SENSITIVE_KEYS:
+                new_value = mask_value
             elif isinstance(value, dict):
                 # Recursively mask nested dictionaries
-                masked[key] = cls.mask_dict(value, mask_value)
+                new_value = cls.mask_dict(value, mask_value)
             elif isinstance(value, list):
-                # Recursively mask items in lists
-                masked[key] = [
-                    cls.mask_dict(item, mask_value) if isinstance(item, dict)
-                    else cls.mask_string(item) if isinstance(item, str)
-                    else item
-                    for item in value
-                ]
+                # Mask dict and string items of lists
+                new_value = cls._mask_list(value, mask_value)
             elif isinstance(value, str):
                 # Apply pattern-based masking to strings
-                masked[key] = cls.mask_string(value)
+                new_value = cls.mask_string(value)
             else:
                 # Keep other types as-is (int, float, bool, None, etc.)
-                masked[key] = value
+                continue
+
+            if new_value is not value and masked is None:
+                masked = dict(data)
+            if masked is not None:
+                masked[key] = new_value
         
-        return masked
+        return data if masked is None else masked
+
+    @classmethod
+    def _mask_list(cls, items: List[Any], mask_value: str) -> List[Any]:
+        masked = None
+        for index, item in enumerate(items):
+            if isinstance(item, dict):
+                new_item = cls.mask_dict(item, mask_value)
+            elif isinstance(item, str):
+                new_item = cls.mask_string(item)
+            else:
+                continue
+            if new_item is not item:
+                if masked is None:
+                    masked = list(items)
+                masked[index] = new_item
+        return items if masked is None else masked
     
     @classmethod
     def mask_sensitive_data(cls, data: Any) -> Any:
@@ -130,19 +201,35 @@ def mask_sensitive_data(cls, data: Any) -> Any:
     
     @classmethod
     def mask_string(cls, text: str, mask_value: str = "***") -> str:
-        """Mask sensitive patterns in strings"""
-        if not isinstance(text, str):
+        """Mask sensitive patterns in strings (returns the same object if nothing matched)"""
+        if not isinstance(text, str) or len(text) < cls._MIN_MATCH_LENGTH:
             return text
-        
-        masked = text
-        for pattern, replacement in cls.SENSITIVE_PATTERNS:
-            if isinstance(replacement, str):
-                masked = re.sub(pattern, replacement, masked)
-            else:
-                masked = re.sub(pattern, replacement, masked)
+        if '@' not in text and cls._CANDIDATE.search(text) is None:
+            return text
+
+        cacheable = len(text) <= cls._CACHE_MAX_LENGTH
+        if cacheable:
+            cached = cls._cache.get(text)
+            if cached is not None:
+                return cached
+
+        if '@' in text:
+            masked, count = cls._scan_with_at(text)
+        else:
+            masked, count = cls._scan_without_at(text)
+        if not count:
+            masked = text
+
+        if cacheable:
+            if len(cls._cache) >= cls._CACHE_MAX_ENTRIES:
+                cls._cache = {}
+            cls._cache[text] = masked
         return masked
 
 
+SensitiveDataMasker.compile_patterns()
+
+
 class CorrelationContext:
     """Manages correlation IDs and request context for distributed tracing"""
     
@@ -210,6 +297,30 @@ def clear_context():
         user_context_var.set(None)
 
 
+def _capture_context() -> tuple:
+    """Correlation context of the calling thread, captured when an event is created"""
+    return (
+        correlation_id_var.get(),
+        request_id_var.get(),
+        trace_id_var.get(),
+        user_context_var.get(),
+    )
+
+
+_SOURCE_FILE = os.path.normcase(__file__)
+
+
+def _find_caller() -> tuple:
+    """(file, function, line) of the first frame outside this module"""
+    frame = sys._getframe(2)
+    while frame is not None and os.path.normcase(frame.f_code.co_filename) == _SOURCE_FILE:
+        frame = frame.f_back
+    if frame is None:
+        return None
+    code = frame.f_code
+    return code.co_filename, code.co_name, frame.f_lineno
+
+
 class StructuredJSONFormatter(logging.Formatter):
     """Formats logs as structured JSON with all required metadata"""
     
@@ -320,17 +431,29 @@ def __init__(self):
         self.environment = os.getenv('TEST_ENV', 'development')
         self.log_level = self._get_log_level()
         
+        # One event bus feeds every sink (JSON files, console, subscribers)
+        self.event_bus = EventBus(
+            max_pending=50_000,
+            static_fields={
+                "environment": self.environment,
+                "hostname": socket.gethostname(),
+                "process_id": os.getpid(),
+            },
+            mask=SensitiveDataMasker.mask_dict,
+        )
+        self.log_queue = self.event_bus.queue
+        self.queue_listener = None
+        self.segment_sinks: Dict[str, SegmentSink] = {}
+        self.sampling_policy = get_sampling_policy()
+        self._shutdown_called = False
+
         # Initialize loggers
         self.app_logger = self._setup_application_logger()
         self.audit_logger = self._setup_audit_logger()
         self.security_logger = self._setup_security_logger()
         self.performance_logger = self._setup_performance_logger()
-        
-        # Async logging queue with bounded size to prevent OOM under high load
-        self.log_queue = Queue(maxsize=50_000)
-        self.queue_listener = None
-        self._shutdown_called = False
         self._setup_async_logging()
+        get_segment_maintainer().submit(self._load_config_policies)
         
         # Register atexit handler to ensure graceful shutdown on crashes
         atexit.register(self.shutdown)
@@ -359,116 +482,167 @@ def _get_log_level(self) -> int:
     
     def _setup_application_logger(self) -> logging.Logger:
         """Setup main application logger with structured JSON"""
-        logger = logging.getLogger('enterprise.app')
-        logger.setLevel(logging.DEBUG)
-        logger.propagate = False
+        logger = self._channel_logger('enterprise.app', logging.DEBUG)
         
-        if not logger.handlers:
-            # JSON formatted file handler
-            json_handler = RotatingFileHandler(
-                ENTERPRISE_LOG_DIR / f"app_{datetime.now().strftime('%Y%m%d')}.json",
-                maxBytes=100 * 1024 * 1024,  # 100MB
-                backupCount=30,
-                encoding='utf-8'
-            )
-            json_handler.setLevel(logging.DEBUG)
-            json_handler.setFormatter(StructuredJSONFormatter(self.environment))
-            logger.addHandler(json_handler)
-            
-            # Console handler for development
-            if self.environment in ['development', 'dev', 'testing']:
-                console_handler = logging.StreamHandler(sys.stdout)
-                console_handler.setLevel(logging.INFO)
-                console_handler.setFormatter(logging.Formatter(
-                    '%(asctime)s [%(levelname)8s] %(name)s:%(lineno)d - %(message)s',
-                    datefmt='%Y-%m-%d %H:%M:%S'
-                ))
-                logger.addHandler(console_handler)
+        # JSON segments: every channel, as before
+        self.segment_sinks['app'] = self.event_bus.subscribe(SegmentSink(
+            ENTERPRISE_LOG_DIR, 'app',
+            max_bytes=100 * 1024 * 1024,  # 100MB
+            retention_days=30,
+            level=logging.DEBUG,
+        ))
+        
+        # Console sink for development
+        if self.environment in ['development', 'dev', 'testing']:
+            self.event_bus.subscribe(StreamSink(sys.stdout, level=logging.INFO))
         
         return logger
     
     def _setup_audit_logger(self) -> logging.Logger:
         """Setup audit logger for compliance (SOC2/ISO27001)"""
-        logger = logging.getLogger('enterprise.audit')
-        logger.setLevel(logging.INFO)
-        logger.propagate = False
-        
-        if not logger.handlers:
-            audit_handler = RotatingFileHandler(
-                AUDIT_LOG_DIR / f"audit_{datetime.now().strftime('%Y%m%d')}.json",
-                maxBytes=50 * 1024 * 1024,  # 50MB
-                backupCount=365,  # 1 year retention for compliance
-                encoding='utf-8'
-            )
-            audit_handler.setLevel(logging.INFO)
-            audit_handler.setFormatter(StructuredJSONFormatter(self.environment))
-            logger.addHandler(audit_handler)
-        
+        logger = self._channel_logger('enterprise.audit', logging.INFO)
+        self.segment_sinks['audit'] = self.event_bus.subscribe(SegmentSink(
+            AUDIT_LOG_DIR, 'audit',
+            max_bytes=50 * 1024 * 1024,  # 50MB
+            retention_days=365,  # 1 year retention for compliance
+            level=logging.INFO,
+            channels={'enterprise.audit'},
+        ))
         return logger
     
     def _setup_security_logger(self) -> logging.Logger:
         """Setup security logger for auth/authz events"""
-        logger = logging.getLogger('enterprise.security')
-        logger.setLevel(logging.INFO)
-        logger.propagate = False
-        
-        if not logger.handlers:
-            security_handler = RotatingFileHandler(
-                SECURITY_LOG_DIR / f"security_{datetime.now().strftime('%Y%m%d')}.json",
-                maxBytes=50 * 1024 * 1024,
-                backupCount=180,  # 6 months retention
-                encoding='utf-8'
-            )
-            security_handler.setLevel(logging.INFO)
-            security_handler.setFormatter(StructuredJSONFormatter(self.environment))
-            logger.addHandler(security_handler)
-        
+        logger = self._channel_logger('enterprise.security', logging.INFO)
+        self.segment_sinks['security'] = self.event_bus.subscribe(SegmentSink(
+            SECURITY_LOG_DIR, 'security',
+            max_bytes=50 * 1024 * 1024,
+            retention_days=180,  # 6 months retention
+            level=logging.INFO,
+            channels={'enterprise.security'},
+        ))
         return logger
     
     def _setup_performance_logger(self) -> logging.Logger:
         """Setup performance logger for metrics and timing"""
-        logger = logging.getLogger('enterprise.performance')
-        logger.setLevel(logging.INFO)
-        logger.propagate = False
-        
-        if not logger.handlers:
-            perf_handler = RotatingFileHandler(
-                PERFORMANCE_LOG_DIR / f"performance_{datetime.now().strftime('%Y%m%d')}.json",
-                maxBytes=50 * 1024 * 1024,
-                backupCount=30,
-                encoding='utf-8'
-            )
-            perf_handler.setLevel(logging.INFO)
-            perf_handler.setFormatter(StructuredJSONFormatter(self.environment))
-            logger.addHandler(perf_handler)
+        logger = self._channel_logger('enterprise.performance', logging.INFO)
+        self.segment_sinks['performance'] = self.event_bus.subscribe(SegmentSink(
+            PERFORMANCE_LOG_DIR, 'performance',
+            max_bytes=50 * 1024 * 1024,
+            retention_days=30,
+            level=logging.INFO,
+            channels={'enterprise.performance'},
+        ))
+        return logger
+
+    def _load_config_policies(self) -> None:
+        # Runs on the segment maintenance thread: logging_config imports the
+        # logging decorators, which create this logger, so it cannot be
+        # imported while the logger is being constructed
+        try:
+            from framework.observability.logging_config import get_logging_config
+            config = get_logging_config(self.environment)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Logging config not loaded, keeping defaults: {e}")
+            return
+        self.apply_retention_policy(config.retention)
+        self.sampling_policy.configure_from(config.sampling, config.performance)
+
+    def apply_retention_policy(self, policy) -> None:
+        """Apply a logging_config.RetentionPolicy (segment size and days kept per channel)
         
+        Args:
+            policy: RetentionPolicy to enforce
+        """
+        days = {
+            'app': policy.app_logs_days,
+            'audit': policy.audit_logs_days,
+            'security': policy.security_logs_days,
+            'performance': policy.performance_logs_days,
+        }
+        for channel, sink in self.segment_sinks.items():
+            sink.max_bytes = policy.max_file_size_mb * 1024 * 1024
+            sink.retention_days = days[channel]
+            sink.schedule_prune()
+
+    @staticmethod
+    def _channel_logger(name: str, level: int) -> logging.Logger:
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        logger.propagate = False
         return logger
     
     def _setup_async_logging(self):
-        """Setup async logging to prevent blocking"""
-        queue_handler = QueueHandler(self.log_queue)
-        
-        # Get handlers from all loggers
-        handlers = []
+        """Route the standard loggers into the event bus (for direct logging.getLogger use)"""
+        bus_handler = BusHandler(self.event_bus, context=_capture_context)
         for logger in [self.app_logger, self.audit_logger, self.security_logger, self.performance_logger]:
-            handlers.extend(logger.handlers[:])
             logger.handlers.clear()
-            logger.addHandler(queue_handler)
+            logger.addHandler(bus_handler)
+
+    def _emit(
+        self,
+        logger: logging.Logger,
+        level: int,
+        message: str,
+        extra_fields: Optional[Dict[str, Any]],
+        exc_info: Any = None,
+        event_type: Optional[str] = None,
+    ) -> None:
+        """Create the event once and publish it (no LogRecord, no handler chain)
+        
+        The sampling policy decides first whether the event is kept; events
+        it drops are held so they can be replayed if the test fails.
+        """
+        if not logger.isEnabledFor(level):
+            return
+        context = _capture_context()
+        source = _find_caller()
+        policy = self.sampling_policy
+        decision = KEEP
+        if policy.enabled:
+            key = event_type or (source and (source[0], source[2]))
+            decision = policy.decide(logger.name, level, event_type, key, context[0])
+        event = LogEvent(
+            logger.name,
+            level,
+            message,
+            extra=extra_fields,
+            exc_info=exc_info,
+            context=context,
+            source=source,
+        )
+        if decision is KEEP:
+            self.event_bus.publish(event)
+        else:
+            policy.hold(event, context[0])
+
+    def escalate(self, correlation_id: Optional[str] = None) -> int:
+        """Log everything for a correlation id from now on and write its held events
         
-        # Start queue listener
-        self.queue_listener = QueueListener(self.log_queue, *handlers, respect_handler_level=True)
-        self.queue_listener.start()
+        Args:
+            correlation_id: Scope to escalate (default: the current correlation id)
+            
+        Returns:
+            Number of held events written
+        """
+        if correlation_id is None:
+            correlation_id = correlation_id_var.get()
+        held = self.sampling_policy.escalate(correlation_id)
+        for event in held:
+            self.event_bus.publish(event)
+        return len(held)
+    
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether messages of a level would be emitted (standard logging interface)"""
+        return self.app_logger.isEnabledFor(level)
     
     def log(self, level: int, message: str, extra: Optional[Dict] = None, **kwargs):
         """Log message with extra metadata"""
+        if not self.app_logger.isEnabledFor(level):
+            return
         extra_fields = extra or {}
         extra_fields.update(kwargs)
         
-        self.app_logger.log(
-            level,
-            message,
-            extra={'extra_fields': extra_fields}
-        )
+        self._emit(self.app_logger, level, message, extra_fields)
     
     def debug(self, message: str, **kwargs):
         """Log debug message"""
@@ -484,19 +658,11 @@ def warning(self, message: str, **kwargs):
     
     def error(self, message: str, exc_info: bool = False, **kwargs):
         """Log error message"""
-        self.app_logger.error(
-            message,
-            exc_info=exc_info,
-            extra={'extra_fields': kwargs}
-        )
+        self._emit(self.app_logger, logging.ERROR, message, kwargs, exc_info=exc_info)
     
     def critical(self, message: str, exc_info: bool = False, **kwargs):
         """Log critical message"""
-        self.app_logger.critical(
-            message,
-            exc_info=exc_info,
-            extra={'extra_fields': kwargs}
-        )
+        self._emit(self.app_logger, logging.CRITICAL, message, kwargs, exc_info=exc_info)
     
     def exception(self, message: str, **kwargs):
         """Log exception with traceback (convenience method)"""
@@ -518,15 +684,12 @@ def setLevel(self, level: int):
     
     def audit(self, event_type: str, details: Dict, status: str = "success"):
         """Log audit event for compliance"""
-        self.audit_logger.info(
-            f"Audit: {event_type}",
-            extra={'extra_fields': {
-                'event_type': event_type,
-                'status': status,
-                'details': details,
-                'audit': True
-            }}
-        )
+        self._emit(self.audit_logger, logging.INFO, f"Audit: {event_type}", {
+            'event_type': event_type,
+            'status': status,
+            'details': details,
+            'audit': True
+        }, event_type=event_type)
     
     def security(self, event_type: str, details: Dict, severity: str = "info"):
         """Log security event"""
@@ -536,27 +699,24 @@ def security(self, event_type: str, details: Dict, severity: str = "info"):
             'critical': logging.CRITICAL
         }
         
-        self.security_logger.log(
-            level_map.get(severity, logging.INFO),
-            f"Security: {event_type}",
-            extra={'extra_fields': {
-                'security_event': event_type,
-                'details': details
-            }}
-        )
+        self._emit(self.security_logger, level_map.get(severity, logging.INFO), f"Security: {event_type}", {
+            'security_event': event_type,
+            'details': details
+        }, event_type=event_type)
     
     def performance(self, operation: str, duration_ms: float, details: Optional[Dict] = None):
-        """Log performance metric"""
+        """Log performance metric (operations under the slow threshold are skipped when sampling)"""
+        policy = self.sampling_policy
+        if policy.enabled and not policy.keep_performance(duration_ms, correlation_id_var.get()):
+            return
         perf_data = {
             'operation': operation,
             'duration_ms': duration_ms,
             'details': details or {}
         }
         
-        self.performance_logger.info(
-            f"Performance: {operation}",
-            extra={'extra_fields': perf_data}
-        )
+        self._emit(self.performance_logger, logging.INFO, f"Performance: {operation}", perf_data,
+                   event_type=operation)
     
     def shutdown(self):
         """Gracefully shutdown async logging (idempotent - safe to call multiple times)"""
@@ -566,18 +726,18 @@ def shutdown(self):
         
         self._shutdown_called = True
         
-        # Safely stop queue listener if it exists and has a valid thread
-        if self.queue_listener and hasattr(self.queue_listener, '_thread'):
-            if self.queue_listener._thread is not None:
-                try:
-                    self.queue_listener.stop()
-                except Exception as e:
-                    # Log error but don't raise during shutdown
-                    import logging
-                    logging.getLogger(__name__).warning(
-                        f"Error stopping queue listener: {e}", 
-                        exc_info=True
-                    )
+        try:
+            self.event_bus.shutdown()
+        except Exception as e:
+            # Log error but don't raise during shutdown
+            logging.getLogger(__name__).warning(
+                f"Error stopping event bus: {e}",
+                exc_info=True
+            )
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Wait until every queued event has been written by its sinks"""
+        return self.event_bus.flush(timeout)
 
 
 # Singleton instance
@@ -598,6 +758,11 @@ def get_enterprise_logger(name: Optional[str] = None) -> EnterpriseLogger:
     return _enterprise_logger
 
 
+def get_event_bus() -> EventBus:
+    """Event bus behind the enterprise logger (subscribe extra sinks here)"""
+    return get_enterprise_logger().event_bus
+
+
 # Decorators for automatic tracing and logging
 
 def with_correlation(func: Callable) -> Callable:
@@ -843,6 +1008,7 @@ def log_threshold_violation(
 __all__ = [
     'EnterpriseLogger',
     'get_enterprise_logger',
+    'get_event_bus',
     'CorrelationContext',
     'SensitiveDataMasker',
     'AuditLogger',
@@ -0,0 +1,556 @@
+﻿"""
+Event Bus - One emission, many sinks
+====================================
+
+A log event is created once on the calling thread as a compact LogEvent
+(message, level, source, extra fields and the correlation context captured
+at that moment) and published to a single bounded queue. One dispatcher
+thread hands it to every subscribed sink whose channel and level match.
+
+Each event is rendered at most once per format, however many sinks want it:
+the JSON app, audit, security and performance files share one encoded
+document; SIEM adapters and report collectors share one masked dict.
+Sinks are flushed once per dispatched batch rather than once per record.
+
+Usage:
+    from framework.observability.enterprise_logger import get_event_bus
+    from framework.observability.event_bus import CallbackSink
+
+    collected = []
+    get_event_bus().subscribe(CallbackSink(collected.append, channels={"enterprise.audit"}))
+"""
+
+import contextlib
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Union
+
+SEVERITY_MAP = {
+    'DEBUG': 7,      # Informational
+    'INFO': 6,       # Informational
+    'WARNING': 4,    # Warning
+    'ERROR': 3,      # Error
+    'CRITICAL': 2    # Critical
+}
+
+
+class LogEvent:
+    """Structured log event, created once per emission"""
+
+    __slots__ = (
+        "channel", "level", "message", "created",
+        "module", "function", "file", "line", "thread", "thread_name",
+        "extra", "exception", "execution_time_ms",
+        "correlation_id", "request_id", "trace_id", "user_context",
+        "_rendered",
+    )
+
+    def __init__(
+        self,
+        channel: str,
+        level: int,
+        message: str,
+        extra: Optional[Dict[str, Any]] = None,
+        exc_info: Any = None,
+        context: tuple = (None, None, None, None),
+        source: Optional[tuple] = None,
+    ):
+        """
+        Initialize event
+
+        Args:
+            channel: Logger name the event belongs to (e.g. "enterprise.audit")
+            level: Numeric log level
+            message: Final message text
+            extra: Structured fields
+            exc_info: Exception tuple (or True for the current exception); the
+                traceback is formatted here, while the frames are still alive
+            context: (correlation_id, request_id, trace_id, user_context)
+            source: (file, function, line); defaults to "unknown"
+        """
+        self.channel = channel
+        self.level = level
+        self.message = message
+        self.created = time.time()
+        self.file, self.function, self.line = source or ("(unknown file)", "(unknown function)", 0)
+        self.module = os.path.splitext(os.path.basename(self.file))[0]
+        self.thread = threading.get_ident()
+        self.thread_name = threading.current_thread().name
+        self.extra = extra
+        self.execution_time_ms = None
+        self.correlation_id, self.request_id, self.trace_id, self.user_context = context
+        self._rendered: Optional[Dict[str, Any]] = None
+
+        if exc_info is True:
+            exc_info = sys.exc_info()
+        if exc_info and exc_info[0] is not None:
+            self.exception = {
+                "type": exc_info[0].__name__,
+                "message": str(exc_info[1]) if exc_info[1] else None,
+                "stacktrace": traceback.format_exception(*exc_info),
+            }
+        else:
+            self.exception = None
+
+    @classmethod
+    def from_record(cls, record: logging.LogRecord, context: tuple = (None, None, None, None)) -> "LogEvent":
+        """Build an event from a standard logging record"""
+        event = cls.__new__(cls)
+        event.channel = record.name
+        event.level = record.levelno
+        event.message = record.getMessage()
+        event.created = record.created
+        event.module = record.module
+        event.function = record.funcName
+        event.file = record.pathname
+        event.line = record.lineno
+        event.thread = record.thread
+        event.thread_name = record.threadName
+        event.extra = getattr(record, "extra_fields", None)
+        event.execution_time_ms = getattr(record, "execution_time_ms", None)
+        event.correlation_id, event.request_id, event.trace_id, event.user_context = context
+        event._rendered = None
+        if record.exc_info and record.exc_info[0] is not None:
+            event.exception = {
+                "type": record.exc_info[0].__name__,
+                "message": str(record.exc_info[1]) if record.exc_info[1] else None,
+                "stacktrace": traceback.format_exception(*record.exc_info),
+            }
+        else:
+            event.exception = None
+        return event
+
+    @property
+    def levelname(self) -> str:
+        return logging.getLevelName(self.level)
+
+
+# ============================================================================
+# Formats
+# ============================================================================
+
+def render_dict(event: LogEvent, bus: "EventBus") -> Dict[str, Any]:
+    """Masked structured document (the StructuredJSONFormatter layout)"""
+    levelname = event.levelname
+    data = {
+        # Timestamp in UTC ISO format
+        "timestamp": datetime.fromtimestamp(event.created, tz=timezone.utc).isoformat(),
+        "timestamp_ms": int(event.created * 1000),
+
+        # Severity
+        "level": levelname,
+        "severity": SEVERITY_MAP.get(levelname, 6),
+
+        # Source information
+        "logger": event.channel,
+        "module": event.module,
+        "function": event.function,
+        "file": event.file,
+        "line": event.line,
+        "thread": event.thread,
+        "thread_name": event.thread_name,
+
+        # Message
+        "message": event.message,
+
+        # Environment & System
+        **bus.static_fields,
+
+        # Distributed tracing
+        "correlation_id": event.correlation_id,
+        "request_id": event.request_id,
+        "trace_id": event.trace_id,
+
+        # User context
+        "user_context": event.user_context,
+    }
+    if event.exception:
+        data["exception"] = event.exception
+    if event.extra is not None:
+        data["extra"] = event.extra
+    if event.execution_time_ms is not None:
+        data["execution_time_ms"] = event.execution_time_ms
+    return bus.mask(data) if bus.mask else data
+
+
+def render_json(event: LogEvent, bus: "EventBus") -> str:
+    """JSON line of the structured document"""
+    return bus.json_dumps(bus.render(event, "dict"))
+
+
+def render_console(event: LogEvent, bus: "EventBus") -> str:
+    """Human-readable line: time [LEVEL] logger:line - message"""
+    line = (
+        f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(event.created))} "
+        f"[{event.levelname:>8}] {event.channel}:{event.line} - {event.message}"
+    )
+    if event.exception:
+        line += "\n" + "".join(event.exception["stacktrace"]).rstrip("\n")
+    return line
+
+
+def _default_json_dumps(data: Dict[str, Any]) -> str:
+    return json.dumps(data, default=str)
+
+
+# ============================================================================
+# Sinks
+# ============================================================================
+
+class Sink(ABC):
+    """Base subscriber: receives events of matching channel and level"""
+
+    def __init__(
+        self,
+        format: str = "json",
+        level: int = logging.NOTSET,
+        channels: Optional[Iterable[str]] = None,
+    ):
+        """
+        Initialize sink
+
+        Args:
+            format: Name of the format this sink consumes
+            level: Minimum level
+            channels: Channels to receive (None = all)
+        """
+        self.format = format
+        self.level = level
+        self.channels = frozenset(channels) if channels is not None else None
+
+    def accepts(self, event: LogEvent) -> bool:
+        return event.level >= self.level and (self.channels is None or event.channel in self.channels)
+
+    @abstractmethod
+    def handle(self, event: LogEvent, payload: Any) -> None:
+        """Consume one event rendered in this sink's format"""
+
+    def flush(self) -> None:  # noqa: B027 - optional hook, most sinks write per event
+        """Called once after every dispatched batch"""
+
+    def drain(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until handed-over events are written (sinks with their own writer)"""
+        return True
+
+    def close(self) -> None:
+        self.flush()
+
+
+class StreamSink(Sink):
+    """Text lines to a stream (console)"""
+
+    def __init__(self, stream: Optional[TextIO] = None, format: str = "console", **kwargs):
+        super().__init__(format=format, **kwargs)
+        self.stream = stream or sys.stdout
+
+    def handle(self, event: LogEvent, payload: str) -> None:
+        self.stream.write(payload + "\n")
+
+    def flush(self) -> None:
+        # ValueError/OSError: stream closed (e.g. pytest capture torn down)
+        with contextlib.suppress(ValueError, OSError):
+            self.stream.flush()
+
+
+class FileSink(Sink):
+    """Text lines to a size-rotated file (RotatingFileHandler naming: file.1 ... file.N)"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = 0,
+        backup_count: int = 0,
+        format: str = "json",
+        encoding: str = "utf-8",
+        **kwargs,
+    ):
+        super().__init__(format=format, **kwargs)
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.encoding = encoding
+        self._file = None
+        self._size = 0
+
+    def handle(self, event: LogEvent, payload: str) -> None:
+        data = payload + "\n"
+        if self._file is None:
+            self._open()
+        elif self.max_bytes and self._size + len(data) > self.max_bytes:
+            self._rollover()
+        self._file.write(data)
+        self._size += len(data)
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Kept open between writes, closed in close() and on rollover
+        self._file = open(self.path, "a", encoding=self.encoding)  # noqa: SIM115
+        self._size = self._file.tell()
+
+    def _rollover(self) -> None:
+        self.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self.path.with_name(f"{self.path.name}.{index}")
+                if source.exists():
+                    os.replace(source, self.path.with_name(f"{self.path.name}.{index + 1}"))
+            if self.path.exists():
+                os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        self._open()
+
+
+class CallbackSink(Sink):
+    """
+    Calls a function with each rendered event
+
+    Examples: a report collector (list.append), or a SIEM adapter's add_log,
+    both consuming the shared masked dict.
+    """
+
+    def __init__(self, callback: Callable[[Any], None], format: str = "dict", **kwargs):
+        super().__init__(format=format, **kwargs)
+        self.callback = callback
+
+    def handle(self, event: LogEvent, payload: Any) -> None:
+        self.callback(payload)
+
+
+# ============================================================================
+# Bus
+# ============================================================================
+
+class _FlushMarker:
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class EventBus:
+    """Bounded event queue with one dispatcher thread"""
+
+    def __init__(
+        self,
+        max_pending: int = 50_000,
+        batch_size: int = 256,
+        static_fields: Optional[Dict[str, Any]] = None,
+        mask: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        json_dumps: Callable[[Dict[str, Any]], str] = _default_json_dumps,
+    ):
+        """
+        Initialize event bus and start the dispatcher
+
+        Args:
+            max_pending: Queued events before new ones are dropped (and counted)
+            batch_size: Events dispatched between sink flushes
+            static_fields: Fields added to every structured document
+                (environment, hostname, process_id)
+            mask: Masking applied once to the structured document
+            json_dumps: Encoder of the "json" format
+        """
+        self.batch_size = batch_size
+        self.static_fields = static_fields or {}
+        self.mask = mask
+        self.json_dumps = json_dumps
+        self.dropped = 0
+        self.dispatched = 0
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._sinks: List[Sink] = []
+        self._formats: Dict[str, Callable[[LogEvent, "EventBus"], Any]] = {
+            "dict": render_dict,
+            "json": render_json,
+            "console": render_console,
+        }
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="event-bus", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+
+    def subscribe(self, sink: Sink) -> Sink:
+        """Add a sink; returns it for later unsubscribe()"""
+        if sink.format not in self._formats:
+            raise ValueError(f"Unknown format: {sink.format}")
+        self._sinks = self._sinks + [sink]
+        return sink
+
+    def unsubscribe(self, sink: Sink) -> None:
+        """Remove a sink (flushed and closed by the caller)"""
+        self._sinks = [s for s in self._sinks if s is not sink]
+
+    @property
+    def sinks(self) -> List[Sink]:
+        return list(self._sinks)
+
+    def register_format(self, name: str, renderer: Callable[[LogEvent, "EventBus"], Any]) -> None:
+        """Add a format: renderer(event, bus) -> payload, called at most once per event"""
+        self._formats[name] = renderer
+
+    def render(self, event: LogEvent, format: str) -> Any:
+        """Rendered payload of an event (memoized per format)"""
+        rendered = event._rendered
+        if rendered is None:
+            rendered = event._rendered = {}
+        elif format in rendered:
+            return rendered[format]
+        payload = rendered[format] = self._formats[format](event, self)
+        return payload
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def publish(self, event: LogEvent) -> bool:
+        """
+        Queue an event for dispatch
+
+        Returns:
+            False if the queue was full and the event was dropped
+        """
+        if self._stopped:
+            return False
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until every event published so far has reached its sinks"""
+        if self._stopped or not self._thread.is_alive():
+            return self.queue.empty()
+        marker = _FlushMarker()
+        self.queue.put(marker)
+        if not marker.done.wait(timeout):
+            return False
+        # Drain every sink, even after one has timed out
+        drained = True
+        for sink in self._sinks:
+            if not sink.drain(timeout):
+                drained = False
+        return drained
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> None:
+        """Dispatch what is queued, stop the dispatcher and close all sinks"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+        for sink in self._sinks:
+            with contextlib.suppress(Exception):
+                sink.close()
+
+    # ------------------------------------------------------------------
+    # Dispatcher thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        get = self.queue.get
+        get_nowait = self.queue.get_nowait
+        while True:
+            batch = [get()]
+            with contextlib.suppress(queue.Empty):
+                while len(batch) < self.batch_size:
+                    batch.append(get_nowait())
+            if self._dispatch(batch):
+                return
+
+    def _dispatch(self, batch: List[Any]) -> bool:
+        sinks = self._sinks
+        touched = set()
+        markers = []
+        stop = False
+        for item in batch:
+            if item is _STOP:
+                stop = True
+                continue
+            if isinstance(item, _FlushMarker):
+                markers.append(item)
+                continue
+            for sink in sinks:
+                if not sink.accepts(item):
+                    continue
+                try:
+                    sink.handle(item, self.render(item, sink.format))
+                    touched.add(sink)
+                except Exception:
+                    self._report_sink_error(sink)
+            self.dispatched += 1
+        for sink in touched:
+            try:
+                sink.flush()
+            except Exception:
+                self._report_sink_error(sink)
+        for marker in markers:
+            marker.done.set()
+        return stop
+
+    @staticmethod
+    def _report_sink_error(sink: Sink) -> None:
+        # Same policy as logging.Handler.handleError: report on stderr, keep going
+        if logging.raiseExceptions:
+            sys.stderr.write(f"--- Event bus sink error ({type(sink).__name__}) ---\n")
+            traceback.print_exc(file=sys.stderr)
+
+
+class BusHandler(logging.Handler):
+    """logging.Handler that publishes records to an event bus"""
+
+    def __init__(self, bus: EventBus, context: Optional[Callable[[], tuple]] = None):
+        """
+        Initialize handler
+
+        Args:
+            bus: Destination bus
+            context: Returns (correlation_id, request_id, trace_id, user_context)
+                of the calling thread
+        """
+        super().__init__()
+        self.bus = bus
+        self.context = context
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            context = self.context() if self.context else (None, None, None, None)
+            self.bus.publish(LogEvent.from_record(record, context))
+        except Exception:
+            self.handleError(record)
+
+
+__all__ = [
+    "BusHandler",
+    "CallbackSink",
+    "EventBus",
+    "FileSink",
+    "LogEvent",
+    "Sink",
+    "StreamSink",
+    "render_console",
+    "render_dict",
+    "render_json",
+]
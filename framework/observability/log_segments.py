@@ -0,0 +1,446 @@
+﻿"""
+Log Segments - Date- and size-rolled, compressed log files
+==========================================================
+
+SegmentSink writes the rendered lines of an event bus sink into daily
+segment files:
+
+    app_20261016.json            active segment of the day
+    app_20261016.001.json.gz     closed segments (size roll-overs, end of day)
+
+- events are routed by the day they were created, so a run crossing
+  midnight continues in the next day's file instead of the start-up one
+- a segment is closed when it reaches max_bytes or its day ends; closed
+  segments are gzip-compressed by one shared background thread
+  (SegmentMaintainer), which also deletes segments older than retention_days
+- every sink has its own queue and writer thread, so a slow disk behind one
+  sink does not hold up the event bus or the other sinks
+- files are opened with O_APPEND and written one batch per write, so xdist
+  workers sharing a file interleave whole batches
+"""
+
+import contextlib
+import gzip
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import date, datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Deque, List, Optional, Union
+
+from framework.observability.event_bus import LogEvent, Sink
+
+_DAY_FORMAT = "%Y%m%d"
+
+
+def compress_segment(path: Union[str, Path], level: int = 6) -> Path:
+    """
+    Gzip a closed segment next to itself and remove the original
+
+    Args:
+        path: Closed segment file
+        level: gzip compression level
+
+    Returns:
+        Path of the compressed file
+    """
+    path = Path(path)
+    target = path.with_name(path.name + ".gz")
+    # Unique temporary name: another process may compress the same segment
+    partial_path = path.with_name(f"{path.name}.gz.{os.getpid()}.tmp")
+    try:
+        with open(path, "rb") as source, gzip.open(partial_path, "wb", compresslevel=level) as compressed:
+            shutil.copyfileobj(source, compressed, 1024 * 1024)
+        os.replace(partial_path, target)
+    finally:
+        if partial_path.exists():
+            partial_path.unlink()
+    path.unlink()
+    return target
+
+
+class SegmentMaintainer:
+    """Runs compression and retention tasks, in order, on one background thread"""
+
+    def __init__(self):
+        self.failed = 0
+        self._tasks: Deque[Callable[[], Any]] = deque()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, task: Callable[[], Any]) -> None:
+        """Queue a task (started lazily on the first one)"""
+        self._tasks.append(task)
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="log-segment-maintainer", daemon=True)
+                    self._thread.start()
+        self._wakeup.set()
+
+    def wait(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Block until every task submitted so far has run
+
+        Args:
+            timeout: Seconds to wait (None = no limit)
+
+        Returns:
+            True if the tasks finished within the timeout
+        """
+        done = threading.Event()
+        self.submit(done.set)
+        return done.wait(timeout)
+
+    def _run(self) -> None:
+        tasks = self._tasks
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while tasks:
+                task = tasks.popleft()
+                try:
+                    task()
+                except Exception:
+                    self.failed += 1
+                    sys.stderr.write("--- Log segment maintenance error ---\n")
+                    traceback.print_exc(file=sys.stderr)
+
+
+_maintainer: Optional[SegmentMaintainer] = None
+_maintainer_lock = threading.Lock()
+
+
+def get_segment_maintainer() -> SegmentMaintainer:
+    """Shared maintainer used by sinks that are not given their own"""
+    global _maintainer
+    if _maintainer is None:
+        with _maintainer_lock:
+            if _maintainer is None:
+                _maintainer = SegmentMaintainer()
+    return _maintainer
+
+
+class SegmentSink(Sink):
+    """Daily, size-rolled, compressed file sink with its own writer thread"""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        prefix: str,
+        max_bytes: int = 100 * 1024 * 1024,
+        retention_days: int = 30,
+        compress: bool = True,
+        suffix: str = ".json",
+        format: str = "json",
+        batch_size: int = 512,
+        flush_interval: float = 0.5,
+        max_pending: int = 100_000,
+        maintainer: Optional[SegmentMaintainer] = None,
+        encoding: str = "utf-8",
+        **kwargs,
+    ):
+        """
+        Initialize sink and start its writer thread
+
+        Args:
+            directory: Directory holding the segments
+            prefix: File name prefix (app -> app_YYYYMMDD.json)
+            max_bytes: Size at which a segment is closed (0 = daily only)
+            retention_days: Days of segments to keep (0 = keep all)
+            compress: gzip closed segments
+            suffix: File extension of the segments
+            format: Name of the format this sink consumes
+            batch_size: Maximum lines per write
+            flush_interval: Seconds the writer waits before writing a partial batch
+            max_pending: Lines that may wait for the writer before new ones are
+                dropped (and counted) instead of stalling the event bus
+            maintainer: Thread for compression and retention (default: shared)
+            encoding: Text encoding of the segments
+            **kwargs: level / channels, see Sink
+        """
+        super().__init__(format=format, **kwargs)
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.retention_days = retention_days
+        self.compress = compress
+        self.suffix = suffix
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.encoding = encoding
+        self.maintainer = maintainer or get_segment_maintainer()
+        self.dropped = 0
+        self.written = 0
+        self.sealed = 0
+
+        self._pattern = re.compile(
+            rf"^{re.escape(prefix)}_(\d{{8}})(?:\.(\d+))?{re.escape(suffix)}(\.gz)?$"
+        )
+        self._queue: Deque[Any] = deque()
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        # Dispatcher side: day of the last event and its bounds (epoch seconds)
+        self._event_day: Optional[date] = None
+        self._day_start = 0.0
+        self._day_end = 0.0
+
+        # Writer side: open segment
+        self._fd: Optional[int] = None
+        self._day: Optional[date] = None
+        self._inode: Optional[int] = None
+        self._size = 0
+
+        self.maintainer.submit(partial(self._recover, date.today()))
+        self._thread = threading.Thread(target=self._run, name=f"log-segments-{prefix}", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Sink interface (event bus dispatcher thread)
+    # ------------------------------------------------------------------
+
+    def handle(self, event: LogEvent, payload: str) -> None:
+        created = event.created
+        if not self._day_start <= created < self._day_end:
+            self._set_event_day(created)
+        queue = self._queue
+        if len(queue) >= self.max_pending:
+            self.dropped += 1
+            return
+        queue.append((self._event_day, payload))
+        if len(queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        # Called once per dispatched batch: hand the lines to the writer
+        self._wakeup.set()
+
+    def drain(self, timeout: Optional[float] = 5.0) -> bool:
+        if self._closed or not self._thread.is_alive():
+            return not self._queue
+        marker = threading.Event()
+        self._queue.append(marker)
+        self._wakeup.set()
+        return marker.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Write everything still queued and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout)
+
+    def _set_event_day(self, created: float) -> None:
+        day = date.fromtimestamp(created)
+        self._event_day = day
+        self._day_start = time.mktime(day.timetuple())
+        self._day_end = time.mktime((day + timedelta(days=1)).timetuple())
+
+    # ------------------------------------------------------------------
+    # Paths and retention
+    # ------------------------------------------------------------------
+
+    def active_path(self, day: date) -> Path:
+        return self.directory / f"{self.prefix}_{day.strftime(_DAY_FORMAT)}{self.suffix}"
+
+    def closed_path(self, day: date, sequence: int) -> Path:
+        return self.directory / f"{self.prefix}_{day.strftime(_DAY_FORMAT)}.{sequence:03d}{self.suffix}"
+
+    def segments(self) -> List[Path]:
+        """Segment files of this sink, oldest first"""
+        if not self.directory.exists():
+            return []
+        return sorted(p for p in self.directory.glob(f"{self.prefix}_*") if self._pattern.match(p.name))
+
+    def prune(self, today: Optional[date] = None) -> List[Path]:
+        """
+        Delete segments older than retention_days
+
+        Args:
+            today: Reference day (default: today)
+
+        Returns:
+            Deleted files
+        """
+        if not self.retention_days:
+            return []
+        cutoff = (today or date.today()) - timedelta(days=self.retention_days)
+        removed = []
+        for path in self.segments():
+            day = self._segment_day(path)
+            if day is None or day >= cutoff or day == self._day:
+                continue
+            try:
+                path.unlink()
+                removed.append(path)
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def schedule_prune(self) -> None:
+        """Run prune() on the maintenance thread"""
+        self.maintainer.submit(self.prune)
+
+    def _segment_day(self, path: Path) -> Optional[date]:
+        match = self._pattern.match(path.name)
+        if not match:
+            return None
+        try:
+            return datetime.strptime(match.group(1), _DAY_FORMAT).date()
+        except ValueError:
+            return None
+
+    def _next_sequence(self, day: date) -> int:
+        stamp = day.strftime(_DAY_FORMAT)
+        sequence = 0
+        for path in self.segments():
+            match = self._pattern.match(path.name)
+            if match.group(1) == stamp and match.group(2):
+                sequence = max(sequence, int(match.group(2)))
+        return sequence + 1
+
+    def _recover(self, today: date) -> None:
+        # Segments left by earlier runs: active files of past days are closed,
+        # closed segments a crash left uncompressed are compressed
+        for path in self.segments():
+            match = self._pattern.match(path.name)
+            if match.group(3):
+                continue
+            if match.group(2):
+                if self.compress:
+                    self._compress(path)
+                continue
+            day = self._segment_day(path)
+            if day is not None and day < today:
+                self._close_segment(path, day)
+        self.prune(today)
+
+    def _close_segment(self, path: Path, day: date) -> None:
+        target = self.closed_path(day, self._next_sequence(day))
+        try:
+            os.replace(path, target)
+        except FileNotFoundError:
+            # Another process closed it first
+            return
+        self.sealed += 1
+        if self.compress:
+            self._compress(target)
+
+    def _compress(self, path: Path) -> None:
+        # FileNotFoundError: another process compressed it first
+        with contextlib.suppress(FileNotFoundError):
+            compress_segment(path)
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        try:
+            while True:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                self._drain()
+                if self._closed:
+                    self._drain()
+                    break
+        finally:
+            self._close_fd()
+
+    def _drain(self) -> None:
+        queue = self._queue
+        while queue:
+            day = None
+            lines: List[str] = []
+            markers: List[threading.Event] = []
+            while queue and len(lines) < self.batch_size:
+                item = queue[0]
+                if isinstance(item, threading.Event):
+                    queue.popleft()
+                    markers.append(item)
+                    break
+                if day is not None and item[0] != day:
+                    break
+                queue.popleft()
+                day = item[0]
+                lines.append(item[1])
+            if lines:
+                lines.append("")
+                self._write(day, "\n".join(lines).encode(self.encoding, "backslashreplace"), len(lines) - 1)
+            for marker in markers:
+                marker.set()
+
+    def _write(self, day: date, data: bytes, count: int) -> None:
+        try:
+            if self._fd is not None and not self._still_active():
+                # Closed by another process sharing the file
+                self._close_fd()
+            if self._fd is not None and (
+                day > self._day
+                or (self.max_bytes and self._size and self._size + len(data) > self.max_bytes)
+            ):
+                self._seal()
+            if self._fd is None:
+                # Late events (queued before midnight) stay in the current day
+                self._open(day if self._day is None else max(day, self._day))
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
+            self._size += len(data)
+            self.written += count
+        except OSError:
+            # Keep the writer alive; the batch is lost but later ones are retried
+            sys.stderr.write(f"--- Log segment write error ({self.prefix}) ---\n")
+            traceback.print_exc(file=sys.stderr)
+            self._close_fd()
+
+    def _still_active(self) -> bool:
+        try:
+            return os.stat(self.active_path(self._day)).st_ino == self._inode
+        except FileNotFoundError:
+            return False
+
+    def _open(self, day: date) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.active_path(day), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        stat = os.fstat(self._fd)
+        self._size = stat.st_size
+        self._inode = stat.st_ino
+        self._day = day
+
+    def _close_fd(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _seal(self) -> None:
+        # Renaming is cheap and done here; compression runs on the maintainer
+        self._close_fd()
+        day = self._day
+        target = self.closed_path(day, self._next_sequence(day))
+        try:
+            os.replace(self.active_path(day), target)
+        except FileNotFoundError:
+            return
+        self.sealed += 1
+        if self.compress:
+            self.maintainer.submit(partial(self._compress, target))
+        self.maintainer.submit(self.prune)
+
+
+__all__ = [
+    "SegmentMaintainer",
+    "SegmentSink",
+    "compress_segment",
+    "get_segment_maintainer",
+]
@@ -0,0 +1,364 @@
+﻿"""
+Log Serializer - Bounded, structured summaries of arguments and results
+=======================================================================
+
+Replaces ``repr()`` in the instrumentation decorators. Values are turned
+into small JSON-ready structures:
+
+- scalars as-is, strings truncated
+- collections as their first items plus a count of what was left out
+- DataFrames / arrays as shape, dtype and column names
+- HTTP responses as status + size
+- Playwright / Selenium objects as class + id (never a protocol round trip)
+- anything else as its class name, unless a summarizer is registered;
+  a class-defined ``repr()`` is not called, since its cost is unbounded
+  (register ``repr_summarizer`` for types whose repr is known to be small)
+
+The walk is lazy: it stops descending as soon as the depth, item or byte
+budget is exhausted, so the rest of a large payload is never visited and
+the summary size is bounded no matter how big the value is. Handlers are
+resolved once per type and memoized.
+
+Usage:
+    from framework.observability.log_serializer import summarize, register_summarizer
+
+    summarize(rows)            # ['{...}', ..., '… +9990 more'] style summary
+    register_summarizer(Order, lambda order, budget: {"order_id": order.id})
+    register_summarizer(LoginPage, repr_summarizer)
+"""
+
+import dataclasses
+import enum
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from pathlib import PurePath
+from typing import Any, Callable, Dict, Optional, Union
+from uuid import UUID
+
+ELLIPSIS = "…"
+
+
+@dataclass
+class SerializerLimits:
+    """Caps applied to every summarized value"""
+
+    max_depth: int = 3
+    max_items: int = 10
+    max_string: int = 256
+    max_bytes: int = 2048
+
+
+class Budget:
+    """Remaining output allowance of one summarize() call"""
+
+    __slots__ = ("limits", "remaining")
+
+    def __init__(self, limits: SerializerLimits):
+        self.limits = limits
+        self.remaining = limits.max_bytes
+
+    @property
+    def exhausted(self) -> bool:
+        return self.remaining <= 0
+
+    def text(self, value: str) -> str:
+        """Charge a string against the budget, truncating it to what is left"""
+        limit = min(self.limits.max_string, max(self.remaining, 0))
+        if len(value) > limit:
+            value = f"{value[:limit]}{ELLIPSIS}(+{len(value) - limit} chars)"
+        self.remaining -= len(value)
+        return value
+
+
+Summarizer = Callable[[Any, Budget], Any]
+
+
+class LogSerializer:
+    """Type-dispatched, budgeted value summarizer"""
+
+    def __init__(self, limits: Optional[SerializerLimits] = None):
+        """
+        Initialize serializer
+
+        Args:
+            limits: Depth/item/string/byte caps (defaults to SerializerLimits())
+        """
+        self.limits = limits or SerializerLimits()
+        self._by_type: Dict[type, Summarizer] = {}
+        self._by_name: Dict[str, Summarizer] = {}
+        self._handlers: Dict[type, Callable] = {}
+        self._lock = threading.Lock()
+
+    def register(self, target: Union[type, str], summarizer: Summarizer):
+        """
+        Register a summarizer for a type and its subclasses
+
+        Args:
+            target: Class, or "module.QualifiedName" for optional dependencies
+                that should not be imported just to register them
+            summarizer: Callable(value, budget) returning a JSON-ready summary
+        """
+        with self._lock:
+            if isinstance(target, str):
+                self._by_name[target] = summarizer
+            else:
+                self._by_type[target] = summarizer
+            self._handlers = {}
+
+    def summarize(self, value: Any, limits: Optional[SerializerLimits] = None) -> Any:
+        """
+        Summarize a value within the configured caps
+
+        Args:
+            value: Any value
+            limits: Override caps for this call
+
+        Returns:
+            JSON-ready summary
+        """
+        return self._walk(value, Budget(limits or self.limits), 0)
+
+    def _walk(self, value: Any, budget: Budget, depth: int) -> Any:
+        if budget.exhausted:
+            return ELLIPSIS
+        handler = self._handlers.get(type(value))
+        if handler is None:
+            handler = self._resolve(type(value))
+        try:
+            return handler(self, value, budget, depth)
+        except Exception as e:
+            marker = f"<{type(value).__name__}: unserializable ({type(e).__name__})>"
+            budget.remaining -= len(marker)
+            return marker
+
+    def _resolve(self, cls: type) -> Callable:
+        """Find (and memoize) the handler of a type"""
+        handler = None
+        for base in cls.__mro__:
+            summarizer = self._by_type.get(base) or self._by_name.get(_qualified_name(base))
+            if summarizer is not None:
+                handler = _custom(summarizer)
+                break
+            if base in _BUILTIN_HANDLERS:
+                handler = _BUILTIN_HANDLERS[base]
+                break
+        if handler is None:
+            handler = _duck_typed_handler(cls)
+        self._handlers[cls] = handler
+        return handler
+
+
+# ============================================================================
+# Handlers
+# ============================================================================
+
+def _qualified_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _custom(summarizer: Summarizer) -> Callable:
+    def handle(serializer, value, budget, depth):
+        return serializer._walk(summarizer(value, budget), budget, depth + 1)
+    return handle
+
+
+def _scalar(serializer, value, budget, depth):
+    budget.remaining -= 8
+    return value
+
+
+def _string(serializer, value, budget, depth):
+    return budget.text(value)
+
+
+def _as_text(serializer, value, budget, depth):
+    return budget.text(str(value))
+
+
+def _binary(serializer, value, budget, depth):
+    return budget.text(f"<{type(value).__name__} len={len(value)}>")
+
+
+def _isoformat(serializer, value, budget, depth):
+    return budget.text(value.isoformat())
+
+
+def _enum(serializer, value, budget, depth):
+    return budget.text(f"{type(value).__name__}.{value.name}")
+
+
+def _mapping(serializer, value, budget, depth):
+    if depth >= budget.limits.max_depth:
+        return budget.text(f"<{type(value).__name__} len={len(value)}>")
+    summary = {}
+    for index, (key, item) in enumerate(value.items()):
+        if index >= budget.limits.max_items or budget.exhausted:
+            summary[ELLIPSIS] = f"+{len(value) - index} more"
+            break
+        # Keys are never cut short by the byte budget, so key-based masking still matches
+        key = (key if isinstance(key, str) else str(key))[: budget.limits.max_string]
+        budget.remaining -= len(key)
+        summary[key] = serializer._walk(item, budget, depth + 1)
+    return summary
+
+
+def _sequence(serializer, value, budget, depth):
+    if depth >= budget.limits.max_depth:
+        return budget.text(f"<{type(value).__name__} len={len(value)}>")
+    summary = []
+    for index, item in enumerate(value):
+        if index >= budget.limits.max_items or budget.exhausted:
+            summary.append(f"{ELLIPSIS} +{len(value) - index} more")
+            break
+        summary.append(serializer._walk(item, budget, depth + 1))
+    return summary
+
+
+def _exception(serializer, value, budget, depth):
+    return budget.text(f"{type(value).__name__}: {value}")
+
+
+def _dataclass(serializer, value, budget, depth):
+    fields = {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    return {"type": type(value).__name__, **_mapping(serializer, fields, budget, depth)}
+
+
+def _opaque(serializer, value, budget, depth):
+    return budget.text(f"<{type(value).__name__}>")
+
+
+def _handle_object(serializer, value, budget, depth):
+    """Class + id, for driver/page/browser objects"""
+    summary = {"type": type(value).__name__, "id": hex(id(value))}
+    session_id = getattr(value, "session_id", None)
+    if isinstance(session_id, str):
+        summary["session_id"] = budget.text(session_id)
+    budget.remaining -= 32
+    return summary
+
+
+def _table(serializer, value, budget, depth):
+    """DataFrame / ndarray style objects: shape, dtype, columns"""
+    summary = {"type": type(value).__name__, "shape": list(value.shape)}
+    dtype = getattr(value, "dtype", None)
+    if dtype is not None:
+        summary["dtype"] = str(dtype)
+    columns = getattr(value, "columns", None)
+    if columns is not None:
+        summary["columns"] = _sequence(serializer, [str(c) for c in columns], budget, depth)
+    budget.remaining -= 32
+    return summary
+
+
+def _http_response(serializer, value, budget, depth):
+    """HTTP responses: status + size, without reading the body"""
+    status = getattr(value, "status_code", None)
+    if status is None:
+        status = getattr(value, "status", None)
+    if callable(status):
+        status = None
+    summary = {"type": type(value).__name__, "status": status}
+    headers = getattr(value, "headers", None)
+    size = None
+    try:
+        if headers is not None and not callable(headers):
+            size = headers.get("content-length") or headers.get("Content-Length")
+    except Exception:
+        size = None
+    if size is None:
+        # requests keeps a read body in _content (False while unread)
+        content = getattr(value, "_content", None)
+        if isinstance(content, (bytes, bytearray)):
+            size = len(content)
+    summary["size"] = int(size) if isinstance(size, (int, str)) and str(size).isdigit() else None
+    budget.remaining -= 48
+    return summary
+
+
+_BUILTIN_HANDLERS: Dict[type, Callable] = {
+    type(None): _scalar,
+    bool: _scalar,
+    int: _scalar,
+    float: _scalar,
+    str: _string,
+    bytes: _binary,
+    bytearray: _binary,
+    memoryview: _binary,
+    dict: _mapping,
+    list: _sequence,
+    tuple: _sequence,
+    set: _sequence,
+    frozenset: _sequence,
+    datetime: _isoformat,
+    date: _isoformat,
+    time: _isoformat,
+    Decimal: _as_text,
+    UUID: _as_text,
+    PurePath: _as_text,
+    enum.Enum: _enum,
+    BaseException: _exception,
+}
+
+_OBJECT_MODULE_PREFIXES = ("playwright.", "selenium.", "appium.")
+
+
+def _duck_typed_handler(cls: type) -> Callable:
+    """Pick a handler for a type without importing optional dependencies"""
+    module = cls.__module__ or ""
+    if module.startswith(_OBJECT_MODULE_PREFIXES):
+        if hasattr(cls, "status") and hasattr(cls, "headers") and hasattr(cls, "url"):
+            return _http_response
+        return _handle_object
+    if hasattr(cls, "shape") and (hasattr(cls, "dtype") or hasattr(cls, "dtypes")):
+        return _table
+    if hasattr(cls, "status_code") and hasattr(cls, "headers"):
+        return _http_response
+    if dataclasses.is_dataclass(cls):
+        return _dataclass
+    return _opaque
+
+
+# ============================================================================
+# Module-level default serializer
+# ============================================================================
+
+default_serializer = LogSerializer()
+
+
+def summarize(value: Any, limits: Optional[SerializerLimits] = None) -> Any:
+    """Summarize a value with the default serializer"""
+    return default_serializer.summarize(value, limits)
+
+
+def repr_summarizer(value: Any, budget: Budget) -> str:
+    """Summarizer for types whose __repr__ is known to be small: that repr, capped at max_string"""
+    return budget.text(repr(value))
+
+
+def register_summarizer(target: Union[type, str], summarizer: Summarizer):
+    """Register a summarizer on the default serializer"""
+    default_serializer.register(target, summarizer)
+
+
+def configure_serializer_limits(**limits):
+    """
+    Change the default serializer's caps
+
+    Example:
+        configure_serializer_limits(max_items=5, max_bytes=1024)
+    """
+    default_serializer.limits = dataclasses.replace(default_serializer.limits, **limits)
+
+
+__all__ = [
+    "Budget",
+    "LogSerializer",
+    "SerializerLimits",
+    "configure_serializer_limits",
+    "default_serializer",
+    "register_summarizer",
+    "repr_summarizer",
+    "summarize",
+]
@@ -6,15 +6,19 @@
 - Context variables
 - Correlation IDs
 - Log aggregation support (ELK, Splunk, etc.)
+- Optional routing into the enterprise event bus (LogConfig(event_bus=...)),
+  so structlog events share the bus's sinks and are rendered once per format
 """
 
 import logging
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 import structlog
 
+from framework.observability.event_bus import EventBus, LogEvent
+
 # Self-instrumentation for observability module
 try:
     from framework.observability.universal_logger import log_function
@@ -37,6 +41,7 @@ def __init__(
         include_timestamp: bool = True,
         include_caller: bool = True,
         include_thread: bool = False,
+        event_bus: Optional[EventBus] = None,
     ):
         """
         Initialize logging configuration.
@@ -48,6 +53,9 @@ def __init__(
             include_timestamp: Include timestamp in logs
             include_caller: Include caller information
             include_thread: Include thread information
+            event_bus: Publish events to this bus instead of rendering them here
+                (e.g. get_event_bus()); format and log_file are then left to
+                the bus's sinks
         """
         self.level = level
         self.format = format
@@ -55,6 +63,47 @@ def __init__(
         self.include_timestamp = include_timestamp
         self.include_caller = include_caller
         self.include_thread = include_thread
+        self.event_bus = event_bus
+
+
+class EventBusPublisher:
+    """Final structlog processor: publishes the event dict as a LogEvent"""
+
+    def __init__(self, bus: EventBus, context: Optional[Callable[[], tuple]] = None):
+        """
+        Initialize publisher
+
+        Args:
+            bus: Destination bus
+            context: Returns (correlation_id, request_id, trace_id, user_context)
+                of the calling thread
+        """
+        self.bus = bus
+        self.context = context
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        message = str(event_dict.pop("event", ""))
+        level = logging.getLevelName(str(event_dict.pop("level", method_name)).upper())
+        channel = event_dict.pop("logger", None) or getattr(logger, "name", None) or "structlog"
+        # The event carries its own creation time
+        event_dict.pop("timestamp", None)
+        source = None
+        if "lineno" in event_dict:
+            source = (
+                event_dict.pop("filename", "(unknown file)"),
+                event_dict.pop("func_name", "(unknown function)"),
+                event_dict.pop("lineno"),
+            )
+        self.bus.publish(LogEvent(
+            channel,
+            level if isinstance(level, int) else logging.INFO,
+            message,
+            extra=event_dict or None,
+            context=self.context() if self.context else (None, None, None, None),
+            source=source,
+        ))
+        # Rendering and output happen once, on the bus
+        raise structlog.DropEvent
 
 
 @log_function(log_args=True, log_timing=True)
@@ -116,7 +165,11 @@ def configure_logging(config: LogConfig) -> None:
     processors.append(structlog.processors.format_exc_info)
 
     # Choose output format
-    if config.format == "json":
+    if config.event_bus is not None:
+        from framework.observability.enterprise_logger import _capture_context
+
+        processors.append(EventBusPublisher(config.event_bus, context=_capture_context))
+    elif config.format == "json":
         processors.append(structlog.processors.JSONRenderer())
     else:
         processors.append(structlog.dev.ConsoleRenderer())
@@ -132,8 +185,8 @@ def configure_logging(config: LogConfig) -> None:
     # Configure standard logging
     logging.basicConfig(format="%(message)s", level=log_level, stream=sys.stdout)
 
-    # Add file handler if specified
-    if config.log_file:
+    # Add file handler if specified (with an event bus, its sinks write the output)
+    if config.log_file and config.event_bus is None:
         log_path = Path(config.log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -72,6 +72,10 @@ class SamplingConfig:
     sample_rate: float = 1.0  # 1.0 = log everything, 0.1 = log 10%
     debug_sample_rate: float = 0.1  # Sample DEBUG logs more aggressively
     always_log_errors: bool = True  # Always log errors regardless of sampling
+    rate_limit_per_second: float = 0.0  # Per event type / call site, 0 = unlimited
+    rate_limit_burst: float = 100.0  # Events allowed at once before the rate limit applies
+    escalate_on_failure: bool = True  # Log a failed test in full, including held events
+    replay_buffer_size: int = 256  # Sampled-out events of the current test held for replay
 
 
 @dataclass
@@ -380,7 +384,11 @@ def _parse_environment_config(self, env: Environment, data: Dict) -> Environment
             enabled=sampling_data.get('enabled', default_config.sampling.enabled),
             sample_rate=sampling_data.get('sample_rate', default_config.sampling.sample_rate),
             debug_sample_rate=sampling_data.get('debug_sample_rate', default_config.sampling.debug_sample_rate),
-            always_log_errors=sampling_data.get('always_log_errors', default_config.sampling.always_log_errors)
+            always_log_errors=sampling_data.get('always_log_errors', default_config.sampling.always_log_errors),
+            rate_limit_per_second=sampling_data.get('rate_limit_per_second', default_config.sampling.rate_limit_per_second),
+            rate_limit_burst=sampling_data.get('rate_limit_burst', default_config.sampling.rate_limit_burst),
+            escalate_on_failure=sampling_data.get('escalate_on_failure', default_config.sampling.escalate_on_failure),
+            replay_buffer_size=sampling_data.get('replay_buffer_size', default_config.sampling.replay_buffer_size)
         )
         
         # Parse SIEM config
@@ -513,7 +521,9 @@ def save_config_template(self, output_path: Optional[Path] = None):
                     },
                     'sampling': {
                         'enabled': True,
-                        'sample_rate': 0.1
+                        'sample_rate': 0.1,
+                        'rate_limit_per_second': 50,
+                        'escalate_on_failure': True
                     },
                     'siem': {
                         'enabled': True,
@@ -141,6 +141,9 @@ def pytest_runtest_setup(item):
     CorrelationContext.set_correlation_id(corr_id)
     CorrelationContext.set_request_id(req_id)
     
+    # Events sampled out during this test are held until it passes or fails
+    enterprise_logger.sampling_policy.begin_scope(corr_id)
+    
     # Store start time
     item.test_start_time = time.time()
     
@@ -200,6 +203,11 @@ def pytest_runtest_makereport(item, call):
     if not ENTERPRISE_LOGGING_AVAILABLE:
         return
     
+    # A failure in any phase switches this test to full logging and writes
+    # the events sampled out so far
+    if report.failed:
+        enterprise_logger.escalate()
+    
     # Only log the test execution phase (not setup/teardown)
     if report.when == "call":
         # Calculate test duration
@@ -0,0 +1,171 @@
+﻿"""
+Pytest Per-Test Profiling
+=========================
+
+Opt-in CPU/wall-time profile of every test (--profile-tests):
+- Samples the test thread's Python stack during setup, call and teardown
+  (StackSampler, default every 5 ms)
+- Attributes wall time to categories: browser, sleep, logging, masking,
+  db, http, framework, test
+- Writes <profile-dir>/<test>.folded (collapsed stacks for flame graphs)
+  and <test>.speedscope.json (open at https://www.speedscope.app)
+- Adds a per-test summary to the HTML report (pytest-html) and to the
+  report's user_properties, and writes <profile-dir>/summary.json
+
+Usage:
+    pytest --profile-tests
+    pytest --profile-tests --profile-interval-ms 2 --profile-dir reports/profiles
+"""
+
+import html
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pytest
+
+from framework.observability.stack_profiler import StackSampler
+
+try:
+    from pytest_html import extras as html_extras
+except ImportError:
+    html_extras = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("profiling", "Per-test stack profiling")
+    group.addoption(
+        "--profile-tests",
+        action="store_true",
+        default=False,
+        help="Sample each test's stack and write flame-graph profiles plus a time breakdown",
+    )
+    group.addoption(
+        "--profile-interval-ms",
+        action="store",
+        type=float,
+        default=5.0,
+        help="Stack sampling interval in milliseconds (default: 5)",
+    )
+    group.addoption(
+        "--profile-dir",
+        action="store",
+        default="reports/profiles",
+        help="Directory for profile files (default: reports/profiles)",
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("profile_tests", default=False):
+        config.pluginmanager.register(TestProfiler(config), "test-profiler")
+
+
+def _file_name(nodeid: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", nodeid).strip("_")[-150:]
+
+
+class TestProfiler:
+    """Registered by pytest_configure when --profile-tests is given"""
+
+    __test__ = False  # not a test class
+
+    def __init__(self, config):
+        self.config = config
+        self.directory = Path(config.getoption("profile_dir"))
+        worker = os.getenv("PYTEST_XDIST_WORKER")
+        if worker:
+            self.directory = self.directory / worker
+        self.sampler = StackSampler(interval=config.getoption("profile_interval_ms") / 1000)
+        self.summaries: Dict[str, Dict[str, Any]] = {}
+
+    def _phase(self, phase: str):
+        self.sampler.start()
+        self.sampler.phase = phase
+        try:
+            yield
+        finally:
+            self.sampler.phase = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        yield from self._phase("setup")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._phase("call")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        yield from self._phase("teardown")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        if call.when != "teardown":
+            return
+        report = outcome.get_result()
+        profile = self.sampler.take()
+        if not profile.weights:
+            return
+
+        name = _file_name(item.nodeid)
+        paths = profile.write(self.directory, name)
+        summary = profile.summary()
+        summary["speedscope"] = str(paths["speedscope"])
+        summary["collapsed"] = str(paths["collapsed"])
+        self.summaries[item.nodeid] = summary
+        report.user_properties.append(("profile", summary))
+
+        if html_extras is not None:
+            report.extras = getattr(report, "extras", []) + [html_extras.html(self._html(summary, paths))]
+
+    def _html(self, summary: Dict[str, Any], paths: Dict[str, Path]) -> str:
+        total = summary["total_ms"] or 1.0
+        rows = "".join(
+            f"<tr><td>{category}</td><td>{ms:.0f} ms</td><td>{ms / total:.0%}</td></tr>"
+            for category, ms in summary["categories"].items()
+        )
+        functions = "".join(
+            f"<li>{html.escape(function)}: {ms:.0f} ms</li>" for function, ms in summary["top_functions"]
+        )
+        link = self._link(paths["speedscope"])
+        return (
+            '<div class="profile"><b>Time profile</b> '
+            f'({summary["total_ms"]:.0f} ms, {summary["samples"]} samples, '
+            f'<a href="{html.escape(link)}" target="_blank">speedscope</a>)'
+            f'<table class="profile-categories">{rows}</table>'
+            f"<ul>{functions}</ul></div>"
+        )
+
+    def _link(self, path: Path) -> str:
+        report_path: Optional[str] = getattr(self.config.option, "htmlpath", None)
+        if report_path:
+            return os.path.relpath(path.resolve(), Path(report_path).resolve().parent).replace(os.sep, "/")
+        return path.resolve().as_uri()
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.sampler.stop()
+        if not self.summaries:
+            return
+        totals: Dict[str, float] = {}
+        for summary in self.summaries.values():
+            for category, ms in summary["categories"].items():
+                totals[category] = totals.get(category, 0.0) + ms
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / "summary.json").write_text(json.dumps({
+            "categories_ms": {name: round(ms, 1) for name, ms in sorted(totals.items(), key=lambda i: -i[1])},
+            "tests": self.summaries,
+        }, indent=2), encoding="utf-8")
+        self.totals = totals
+
+    def pytest_terminal_summary(self, terminalreporter):
+        totals = getattr(self, "totals", None)
+        if not totals:
+            return
+        overall = sum(totals.values()) or 1.0
+        terminalreporter.section("time profile")
+        for category, ms in sorted(totals.items(), key=lambda item: -item[1]):
+            terminalreporter.write_line(f"{category:<10} {ms / 1000:9.2f} s  {ms / overall:6.1%}")
+        terminalreporter.write_line(f"profiles: {self.directory}")
@@ -0,0 +1,360 @@
+﻿"""
+Sampling Policy - Head-based sampling, rate limits and failure escalation
+=========================================================================
+
+One process-wide SamplingPolicy decides, when an event is emitted, whether
+it is kept:
+
+1. events of an escalated scope (a test that has failed) are always kept
+2. events at or above always_keep_level (ERROR) and exempt channels
+   (audit, security) are always kept
+3. head-based sampling: the first SamplingRule matching the logger, level
+   and event type gives the share of events kept
+4. token-bucket rate limit per event key (event type or call site)
+
+Events dropped in the current scope are held in a small ring buffer. When
+the scope is escalated (the test fails) they are handed back so the full
+detail leading up to the failure is still written.
+
+The policy is configured from logging_config.SamplingConfig and
+PerformanceConfig and read by EnterpriseLogger, the logging decorators and
+the telemetry sampler.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+# Decisions
+KEEP = "keep"
+SAMPLED_OUT = "sampled_out"
+RATE_LIMITED = "rate_limited"
+
+DEFAULT_EXEMPT_CHANNELS = frozenset({"enterprise.audit", "enterprise.security"})
+
+# Refill is computed in floats; a full interval may come out a hair under one token
+_TOKEN_EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class SamplingRule:
+    """Share of events kept for a logger prefix, maximum level and/or event type"""
+    rate: float
+    logger: Optional[str] = None  # logger name or package prefix
+    max_level: Optional[int] = None  # applies to events at or below this level
+    event_type: Optional[str] = None
+
+    def matches(self, channel: str, level: int, event_type: Optional[str]) -> bool:
+        if self.max_level is not None and level > self.max_level:
+            return False
+        if self.event_type is not None and event_type != self.event_type:
+            return False
+        return self.logger is None or channel == self.logger or channel.startswith(self.logger + ".")
+
+
+class TokenBucket:
+    """Token bucket: `rate` events per second with bursts of up to `burst`"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "suppressed")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.suppressed = 0
+
+    def take(self, now: float) -> bool:
+        tokens = self.tokens + (now - self.updated) * self.rate
+        self.updated = now
+        if tokens > self.burst:
+            tokens = self.burst
+        if tokens >= 1.0 - _TOKEN_EPSILON:
+            self.tokens = max(tokens - 1.0, 0.0)
+            return True
+        self.tokens = tokens
+        self.suppressed += 1
+        return False
+
+
+class SamplingPolicy:
+    """Decides per emitted event whether it is written"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        default_rate: float = 1.0,
+        rules: Iterable[SamplingRule] = (),
+        always_keep_level: Optional[int] = logging.ERROR,
+        exempt_channels: Iterable[str] = DEFAULT_EXEMPT_CHANNELS,
+        rate_limit: float = 0.0,
+        rate_burst: float = 100.0,
+        key_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        escalate_on_failure: bool = True,
+        hold_size: int = 256,
+        slow_operation_threshold_ms: Optional[float] = None,
+        max_buckets: int = 10000,
+    ):
+        """
+        Initialize policy
+
+        Args:
+            enabled: False keeps every event (nothing below is applied)
+            default_rate: Share kept when no rule matches (0-1)
+            rules: Sampling rules, first match wins
+            always_keep_level: Events at or above this level are never dropped
+                (None = sample every level)
+            exempt_channels: Channels never sampled or rate limited
+            rate_limit: Events per second allowed per event key (0 = no limit)
+            rate_burst: Events a key may emit at once before the limit applies
+            key_limits: Event key -> (rate, burst) overriding the defaults
+            escalate_on_failure: Keep everything for a scope once it fails
+            hold_size: Dropped events of the current scope kept for replay on
+                escalation (0 = none)
+            slow_operation_threshold_ms: Performance events faster than this are
+                dropped (None = keep all)
+            max_buckets: Rate-limit keys tracked before the table is reset
+        """
+        self.enabled = enabled
+        self.default_rate = default_rate
+        self.rules: List[SamplingRule] = list(rules)
+        self.always_keep_level = always_keep_level
+        self.exempt_channels = frozenset(exempt_channels)
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self.key_limits = dict(key_limits or {})
+        self.escalate_on_failure = escalate_on_failure
+        self.hold_size = hold_size
+        self.slow_operation_threshold_ms = slow_operation_threshold_ms
+        self.max_buckets = max_buckets
+
+        self.stats: Dict[str, int] = {KEEP: 0, SAMPLED_OUT: 0, RATE_LIMITED: 0, "replayed": 0}
+        self._rates: Dict[Tuple[str, int, Optional[str]], float] = {}
+        self._buckets: Dict[Any, TokenBucket] = {}
+        self._escalated: "OrderedDict[str, None]" = OrderedDict()
+        self._scope: Optional[str] = None
+        self._held: Deque[Any] = deque(maxlen=max(hold_size, 1))
+        self._lock = threading.Lock()
+        self._random = random.random
+
+    @classmethod
+    def from_config(cls, sampling: Any, performance: Any = None, **kwargs) -> "SamplingPolicy":
+        """
+        Build a policy from logging_config.SamplingConfig (and PerformanceConfig)
+
+        Args:
+            sampling: SamplingConfig
+            performance: PerformanceConfig (slow-operation threshold)
+            **kwargs: Overrides of the constructor arguments
+
+        Returns:
+            Configured policy
+        """
+        policy = cls()
+        policy.configure_from(sampling, performance, **kwargs)
+        return policy
+
+    def configure_from(self, sampling: Any, performance: Any = None, **kwargs) -> None:
+        """Apply SamplingConfig / PerformanceConfig to this policy in place"""
+        settings = {
+            "enabled": sampling.enabled,
+            "default_rate": sampling.sample_rate,
+            "rules": [SamplingRule(rate=sampling.debug_sample_rate, max_level=logging.DEBUG)],
+            "always_keep_level": logging.ERROR if sampling.always_log_errors else None,
+            "rate_limit": getattr(sampling, "rate_limit_per_second", 0.0),
+            "rate_burst": getattr(sampling, "rate_limit_burst", 100.0),
+            "escalate_on_failure": getattr(sampling, "escalate_on_failure", True),
+            "hold_size": getattr(sampling, "replay_buffer_size", 256),
+        }
+        if performance is not None:
+            if performance.log_all_operations:
+                threshold = None
+            elif performance.log_slow_operations:
+                threshold = performance.slow_operation_threshold_ms
+            else:
+                threshold = float("inf")
+            settings["slow_operation_threshold_ms"] = threshold
+        settings.update(kwargs)
+        self.configure(**settings)
+
+    def configure(self, **settings: Any) -> None:
+        """Change settings at runtime (same names as the constructor arguments)"""
+        with self._lock:
+            for name, value in settings.items():
+                if not hasattr(self, name) or name.startswith("_"):
+                    raise ValueError(f"Unknown sampling setting: {name}")
+                if name == "rules":
+                    value = list(value)
+                elif name == "exempt_channels":
+                    value = frozenset(value)
+                elif name == "hold_size":
+                    self._held = deque(self._held, maxlen=max(value, 1))
+                setattr(self, name, value)
+            self._rates = {}
+            self._buckets = {}
+
+    # ------------------------------------------------------------------
+    # Decisions
+    # ------------------------------------------------------------------
+
+    def decide(
+        self,
+        channel: str,
+        level: int,
+        event_type: Optional[str] = None,
+        key: Any = None,
+        scope: Optional[str] = None,
+    ) -> str:
+        """
+        Decide whether an event is kept
+
+        Args:
+            channel: Logger name
+            level: Logging level
+            event_type: Audit/security event type or performance operation
+            key: Rate-limit key (defaults to event_type)
+            scope: Correlation id of the emitting test
+
+        Returns:
+            KEEP, SAMPLED_OUT or RATE_LIMITED
+        """
+        if not self.enabled or (scope is not None and scope in self._escalated):
+            return KEEP
+        if channel in self.exempt_channels or (
+            self.always_keep_level is not None and level >= self.always_keep_level
+        ):
+            return KEEP
+
+        rate = self.rate_for(channel, level, event_type)
+        if rate < 1.0 and (rate <= 0.0 or self._random() >= rate):
+            self.stats[SAMPLED_OUT] += 1
+            return SAMPLED_OUT
+
+        if key is None:
+            key = event_type
+        if key is not None and (self.rate_limit > 0 or key in self.key_limits):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._new_bucket(key)
+            if not bucket.take(time.monotonic()):
+                self.stats[RATE_LIMITED] += 1
+                return RATE_LIMITED
+
+        self.stats[KEEP] += 1
+        return KEEP
+
+    def rate_for(self, channel: str, level: int, event_type: Optional[str] = None) -> float:
+        """Sample rate of the first matching rule (memoized)"""
+        cache_key = (channel, level, event_type)
+        rate = self._rates.get(cache_key)
+        if rate is None:
+            rate = self.default_rate
+            for rule in self.rules:
+                if rule.matches(channel, level, event_type):
+                    rate = rule.rate
+                    break
+            if len(self._rates) >= 4096:
+                self._rates = {}
+            self._rates[cache_key] = rate
+        return rate
+
+    def keep_performance(self, duration_ms: float, scope: Optional[str] = None) -> bool:
+        """Whether a performance measurement passes the slow-operation threshold"""
+        threshold = self.slow_operation_threshold_ms
+        if threshold is None or not self.enabled or duration_ms >= threshold:
+            return True
+        return scope is not None and scope in self._escalated
+
+    def _new_bucket(self, key: Any) -> TokenBucket:
+        rate, burst = self.key_limits.get(key, (self.rate_limit, self.rate_burst))
+        if len(self._buckets) >= self.max_buckets:
+            self._buckets = {}
+        bucket = self._buckets[key] = TokenBucket(rate, burst)
+        return bucket
+
+    # ------------------------------------------------------------------
+    # Scopes and escalation
+    # ------------------------------------------------------------------
+
+    @property
+    def has_escalations(self) -> bool:
+        return bool(self._escalated)
+
+    def is_escalated(self, scope: Optional[str]) -> bool:
+        return scope is not None and scope in self._escalated
+
+    def begin_scope(self, scope: Optional[str]) -> None:
+        """Start a new scope (test): held events of the previous one are discarded"""
+        with self._lock:
+            self._scope = scope
+            self._held.clear()
+
+    def hold(self, event: Any, scope: Optional[str]) -> None:
+        """Keep a dropped event of the current scope for replay on escalation"""
+        if self.hold_size and scope is not None and scope == self._scope:
+            self._held.append(event)
+
+    def escalate(self, scope: Optional[str]) -> List[Any]:
+        """
+        Keep every later event of a scope and return its held events
+
+        Args:
+            scope: Correlation id of the failed test
+
+        Returns:
+            Events dropped earlier in the scope, oldest first
+        """
+        if scope is None or not self.escalate_on_failure:
+            return []
+        with self._lock:
+            self._escalated[scope] = None
+            while len(self._escalated) > 1000:
+                self._escalated.popitem(last=False)
+            if scope != self._scope:
+                return []
+            held = list(self._held)
+            self._held.clear()
+        self.stats["replayed"] += len(held)
+        return held
+
+    def reset_escalations(self) -> None:
+        with self._lock:
+            self._escalated.clear()
+
+
+_policy = SamplingPolicy()
+
+
+def get_sampling_policy() -> SamplingPolicy:
+    """Process-wide sampling policy (configure it in place)"""
+    return _policy
+
+
+def configure_sampling(**settings: Any) -> SamplingPolicy:
+    """
+    Change the process-wide sampling policy
+
+    Args:
+        **settings: SamplingPolicy constructor arguments
+
+    Returns:
+        The policy
+    """
+    _policy.configure(**settings)
+    return _policy
+
+
+__all__ = [
+    "KEEP",
+    "RATE_LIMITED",
+    "SAMPLED_OUT",
+    "SamplingPolicy",
+    "SamplingRule",
+    "TokenBucket",
+    "configure_sampling",
+    "get_sampling_policy",
+]
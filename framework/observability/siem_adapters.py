@@ -10,20 +10,29 @@
 - AWS CloudWatch
 - Azure Monitor
 
-Supports batching, retry logic, and circuit breaker patterns.
+Events are shipped by SIEMShipper (siem_shipper.py): batched by count,
+size and age, gzip-compressed and sent asynchronously over pooled
+keep-alive connections, with retries, a circuit breaker and an on-disk
+spool for outages. add_log() never performs I/O on the calling thread.
+
+Usage:
+    from framework.observability.enterprise_logger import get_event_bus
+    from framework.observability.event_bus import CallbackSink
+
+    adapter = SIEMAdapterFactory.create_adapter(SIEMProvider.ELK, {"endpoint": "http://elk:9200"})
+    get_event_bus().subscribe(CallbackSink(adapter.add_log))
 """
 
 import asyncio
 import json
 import time
 from abc import ABC, abstractmethod
-from collections import deque
-from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
 from urllib.parse import urljoin
 
-import requests
+from framework.observability.siem_shipper import SIEMShipper
 
 
 # Constants
@@ -70,13 +79,26 @@ def __init__(
         self.last_failure_time = None
         self.state = CircuitBreakerState.CLOSED
     
+    def allow_request(self) -> bool:
+        """Check whether a call may go out (moves OPEN to HALF_OPEN after the recovery timeout)"""
+        if self.state == CircuitBreakerState.OPEN:
+            if not self._should_attempt_reset():
+                return False
+            self.state = CircuitBreakerState.HALF_OPEN
+        return True
+    
+    def record_success(self):
+        """Record a successful call made after allow_request()"""
+        self._on_success()
+    
+    def record_failure(self):
+        """Record a failed call made after allow_request()"""
+        self._on_failure()
+    
     def call(self, func, *args, **kwargs):
         """Execute function with circuit breaker protection"""
-        if self.state == CircuitBreakerState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitBreakerState.HALF_OPEN
-            else:
-                raise SIEMConnectionError("Circuit breaker is OPEN - SIEM endpoint unavailable")
+        if not self.allow_request():
+            raise SIEMConnectionError("Circuit breaker is OPEN - SIEM endpoint unavailable")
         
         try:
             result = func(*args, **kwargs)
@@ -122,71 +144,113 @@ def __init__(
         api_key: Optional[str] = None,
         batch_size: int = 100,
         flush_interval: float = 10.0,
-        max_retries: int = 3
+        max_retries: int = 3,
+        max_batch_bytes: int = 1024 * 1024,
+        max_in_flight: int = 4,
+        compress: bool = True,
+        max_buffer: int = 10000,
+        spool_dir: Optional[Union[str, Path]] = None,
+        timeout: float = 30.0
     ):
         self.endpoint = endpoint
         self.api_key = api_key
         self.batch_size = batch_size
         self.flush_interval = flush_interval
         self.max_retries = max_retries
+        self.max_batch_bytes = max_batch_bytes
+        self.max_in_flight = max_in_flight
+        self.compress = compress
+        self.max_buffer = max_buffer
+        self.spool_dir = Path(spool_dir) if spool_dir else Path("logs") / "siem_spool" / type(self).__name__
+        self.timeout = timeout
         
-        self.buffer: deque = deque(maxlen=10000)  # Max 10k events in buffer
         self.last_flush = time.time()
         self.circuit_breaker = CircuitBreaker()
         
-        # Start background flush task
-        self._flush_task = None
+        # Shipper thread starts with the first event
+        self._shipper: Optional[SIEMShipper] = None
+    
+    @property
+    @abstractmethod
+    def push_url(self) -> str:
+        """URL batches are posted to"""
+        pass
+    
+    @abstractmethod
+    def request_headers(self) -> Dict[str, str]:
+        """Headers of a batch request (a new dict per call)"""
+        pass
     
     @abstractmethod
     def format_log(self, log_data: Dict) -> Dict:
-        """Format log for specific SIEM platform"""
+        """Format log for specific SIEM platform (must not modify log_data)"""
         pass
     
     @abstractmethod
-    def send_batch(self, logs: List[Dict]) -> bool:
-        """Send batch of logs to SIEM"""
+    def encode_batch(self, lines: List[bytes]) -> bytes:
+        """Build the request body from encoded events"""
         pass
     
-    def add_log(self, log_data: Dict):
-        """Add log to buffer"""
-        formatted_log = self.format_log(log_data)
-        self.buffer.append(formatted_log)
-        
-        # Flush if buffer is full
-        if len(self.buffer) >= self.batch_size:
-            self.flush()
-    
-    def flush(self):
-        """Flush buffered logs to SIEM"""
-        if not self.buffer:
-            return
-        
-        batch = []
-        while self.buffer and len(batch) < self.batch_size:
-            batch.append(self.buffer.popleft())
-        
-        if batch:
-            try:
-                self.circuit_breaker.call(self.send_batch, batch)
-            except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.exception(f"Failed to send logs to SIEM: {e}")
-                # Re-add to buffer for retry
-                self.buffer.extendleft(reversed(batch))
-        
+    def encode_log(self, formatted_log: Dict) -> bytes:
+        """Encode one formatted event"""
+        return json.dumps(formatted_log, default=str).encode("utf-8")
+    
+    @property
+    def shipper(self) -> SIEMShipper:
+        """Background shipper of this adapter"""
+        if self._shipper is None:
+            self._shipper = SIEMShipper(
+                self,
+                max_batch_bytes=self.max_batch_bytes,
+                max_in_flight=self.max_in_flight,
+                compress=self.compress,
+                max_buffer=self.max_buffer,
+                spool_dir=self.spool_dir,
+                timeout=self.timeout,
+            )
+        return self._shipper
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Delivery counters (sent, dropped, rejected, spooled, replayed...)"""
+        return dict(self.shipper.stats)
+    
+    @property
+    def pending(self) -> int:
+        """Events waiting to be batched"""
+        return self._shipper.pending if self._shipper is not None else 0
+    
+    def add_log(self, log_data: Dict) -> bool:
+        """Add log to the shipper buffer (formatting and I/O happen in the background)"""
+        return self.shipper.submit(log_data)
+    
+    def send_batch(self, logs: List[Dict]) -> bool:
+        """Send batch of logs to SIEM and wait for the outcome (spooled on failure)"""
+        return self.shipper.send(logs)
+    
+    def flush(self, timeout: Optional[float] = 30.0) -> bool:
+        """Send buffered logs and wait for in-flight batches"""
+        if self._shipper is None:
+            return True
+        flushed = self._shipper.flush(timeout)
         self.last_flush = time.time()
+        return flushed
+    
+    def close(self, timeout: Optional[float] = 30.0):
+        """Flush and stop the shipper"""
+        if self._shipper is not None:
+            self._shipper.close(timeout)
     
     def should_flush(self) -> bool:
         """Check if it's time to flush"""
         return (time.time() - self.last_flush) >= self.flush_interval
     
     async def auto_flush(self):
-        """Background task to periodically flush logs"""
+        """Background task to periodically flush logs (the shipper also sends every flush_interval)"""
         while True:
             await asyncio.sleep(self.flush_interval)
-            if self.buffer:
-                self.flush()
+            if self.pending:
+                await asyncio.get_running_loop().run_in_executor(None, self.flush)
 
 
 class ElasticsearchAdapter(BaseSIEMAdapter):
@@ -202,51 +266,31 @@ def __init__(
         super().__init__(endpoint, api_key, **kwargs)
         self.index_name = index_name
         self.bulk_endpoint = urljoin(endpoint, f"/{index_name}/_bulk")
+        self._action_line = json.dumps({"index": {"_index": index_name}}).encode("utf-8") + b"\n"
     
-    def format_log(self, log_data: Dict) -> Dict:
-        """Format for Elasticsearch"""
-        # Elasticsearch expects @timestamp for time-series data
-        if 'timestamp' in log_data:
-            log_data['@timestamp'] = log_data['timestamp']
-        return log_data
+    @property
+    def push_url(self) -> str:
+        return self.bulk_endpoint
     
-    def send_batch(self, logs: List[Dict]) -> bool:
-        """Send batch using Elasticsearch bulk API"""
-        # Elasticsearch bulk format: action line, then document
-        bulk_data = []
-        for log in logs:
-            action = {"index": {"_index": self.index_name}}
-            bulk_data.append(json.dumps(action))
-            bulk_data.append(json.dumps(log))
-        
-        payload = "\n".join(bulk_data) + "\n"
-        
+    def request_headers(self) -> Dict[str, str]:
         headers = {
             "Content-Type": "application/x-ndjson"
         }
         if self.api_key:
             headers["Authorization"] = f"ApiKey {self.api_key}"
-        
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.post(
-                    self.bulk_endpoint,
-                    data=payload,
-                    headers=headers,
-                    timeout=30
-                )
-                response.raise_for_status()
-                return True
-            except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Elasticsearch send attempt {attempt + 1} failed: {e}", exc_info=True)
-                if attempt == self.max_retries - 1:
-                    logger.error(f"All retry attempts exhausted for Elasticsearch: {e}", exc_info=True)
-                    raise
-                time.sleep(2 ** attempt)  # Exponential backoff
-        
-        return False
+        return headers
+    
+    def format_log(self, log_data: Dict) -> Dict:
+        """Format for Elasticsearch"""
+        # Elasticsearch expects @timestamp for time-series data
+        if 'timestamp' in log_data:
+            return {**log_data, '@timestamp': log_data['timestamp']}
+        return log_data
+    
+    def encode_batch(self, lines: List[bytes]) -> bytes:
+        """Elasticsearch bulk format: action line, then document"""
+        action = self._action_line
+        return b"".join(action + line + b"\n" for line in lines)
 
 
 class DatadogAdapter(BaseSIEMAdapter):
@@ -263,6 +307,16 @@ def __init__(
         super().__init__(endpoint, api_key, **kwargs)
         self.service = service
     
+    @property
+    def push_url(self) -> str:
+        return self.endpoint
+    
+    def request_headers(self) -> Dict[str, str]:
+        return {
+            "Content-Type": CONTENT_TYPE_JSON,
+            "DD-API-KEY": self.api_key
+        }
+    
     def format_log(self, log_data: Dict) -> Dict:
         """Format for Datadog"""
         # Datadog format
@@ -275,35 +329,9 @@ def format_log(self, log_data: Dict) -> Dict:
             **log_data
         }
     
-    def send_batch(self, logs: List[Dict]) -> bool:
-        """Send batch to Datadog"""
-        headers = {
-            "Content-Type": CONTENT_TYPE_JSON,
-            "DD-API-KEY": self.api_key
-        }
-        
-        payload = logs  # Datadog accepts JSON array
-        
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.post(
-                    self.endpoint,
-                    json=payload,
-                    headers=headers,
-                    timeout=30
-                )
-                response.raise_for_status()
-                return True
-            except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Datadog send attempt {attempt + 1} failed: {e}", exc_info=True)
-                if attempt == self.max_retries - 1:
-                    logger.error(f"All retry attempts exhausted for Datadog: {e}", exc_info=True)
-                    raise
-                time.sleep(2 ** attempt)
-        
-        return False
+    def encode_batch(self, lines: List[bytes]) -> bytes:
+        """Datadog accepts a JSON array"""
+        return b"[" + b",".join(lines) + b"]"
 
 
 class SplunkAdapter(BaseSIEMAdapter):
@@ -322,6 +350,16 @@ def __init__(
         self.source = source
         self.hec_endpoint = urljoin(endpoint, "/services/collector/event")
     
+    @property
+    def push_url(self) -> str:
+        return self.hec_endpoint
+    
+    def request_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Splunk {self.api_key}",
+            "Content-Type": CONTENT_TYPE_JSON
+        }
+    
     def format_log(self, log_data: Dict) -> Dict:
         """Format for Splunk HEC"""
         return {
@@ -333,37 +371,9 @@ def format_log(self, log_data: Dict) -> Dict:
             "event": log_data
         }
     
-    def send_batch(self, logs: List[Dict]) -> bool:
-        """Send batch to Splunk HEC"""
-        headers = {
-            "Authorization": f"Splunk {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        # Splunk HEC can accept multiple events in one request
-        # Each event should be on its own line (not a JSON array)
-        payload = "\n".join(json.dumps(log) for log in logs)
-        
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.post(
-                    self.hec_endpoint,
-                    data=payload,
-                    headers=headers,
-                    timeout=30
-                )
-                response.raise_for_status()
-                return True
-            except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Splunk send attempt {attempt + 1} failed: {e}", exc_info=True)
-                if attempt == self.max_retries - 1:
-                    logger.error(f"All retry attempts exhausted for Splunk: {e}", exc_info=True)
-                    raise
-                time.sleep(2 ** attempt)
-        
-        return False
+    def encode_batch(self, lines: List[bytes]) -> bytes:
+        """Splunk HEC takes one event per line (not a JSON array)"""
+        return b"\n".join(lines)
 
 
 class GrafanaLokiAdapter(BaseSIEMAdapter):
@@ -379,6 +389,13 @@ def __init__(
         self.push_endpoint = urljoin(endpoint, "/loki/api/v1/push")
         self.labels = labels or {"job": "test-automation"}
     
+    @property
+    def push_url(self) -> str:
+        return self.push_endpoint
+    
+    def request_headers(self) -> Dict[str, str]:
+        return {"Content-Type": CONTENT_TYPE_JSON}
+    
     def format_log(self, log_data: Dict) -> Dict:
         """Format for Loki"""
         # Loki stores logs as streams with labels
@@ -386,41 +403,27 @@ def format_log(self, log_data: Dict) -> Dict:
         
         return {
             "stream": self.labels,
-            "values": [[timestamp_ns, json.dumps(log_data)]]
+            "values": [[timestamp_ns, json.dumps(log_data, default=str)]]
         }
     
-    def send_batch(self, logs: List[Dict]) -> bool:
-        """Send batch to Loki"""
-        # Combine logs into streams
-        payload = {"streams": logs}
-        
-        headers = {"Content-Type": CONTENT_TYPE_JSON}
-        
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.post(
-                    self.push_endpoint,
-                    json=payload,
-                    headers=headers,
-                    timeout=30
-                )
-                response.raise_for_status()
-                return True
-            except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Grafana Loki send attempt {attempt + 1} failed: {e}", exc_info=True)
-                if attempt == self.max_retries - 1:
-                    logger.error(f"All retry attempts exhausted for Grafana Loki: {e}", exc_info=True)
-                    raise
-                time.sleep(2 ** attempt)
-        
-        return False
+    def encode_batch(self, lines: List[bytes]) -> bytes:
+        """Combine logs into one push request of streams"""
+        return b'{"streams":[' + b",".join(lines) + b"]}"
 
 
 class SIEMAdapterFactory:
     """Factory for creating SIEM adapters"""
     
+    SHIPPING_OPTIONS = (
+        'max_retries', 'max_batch_bytes', 'max_in_flight', 'compress',
+        'max_buffer', 'spool_dir', 'timeout',
+    )
+    
+    @staticmethod
+    def _shipping_options(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Shipper settings present in the config"""
+        return {key: config[key] for key in SIEMAdapterFactory.SHIPPING_OPTIONS if key in config}
+    
     @staticmethod
     def create_adapter(
         provider: SIEMProvider,
@@ -434,7 +437,8 @@ def create_adapter(
                 index_name=config.get('index_name', 'test-automation'),
                 api_key=config.get('api_key'),
                 batch_size=config.get('batch_size', 100),
-                flush_interval=config.get('flush_interval', 10.0)
+                flush_interval=config.get('flush_interval', 10.0),
+                **SIEMAdapterFactory._shipping_options(config)
             )
         
         elif provider == SIEMProvider.DATADOG:
@@ -443,7 +447,8 @@ def create_adapter(
                 site=config.get('site', 'datadoghq.com'),
                 service=config.get('service', 'test-automation'),
                 batch_size=config.get('batch_size', 100),
-                flush_interval=config.get('flush_interval', 10.0)
+                flush_interval=config.get('flush_interval', 10.0),
+                **SIEMAdapterFactory._shipping_options(config)
             )
         
         elif provider == SIEMProvider.SPLUNK:
@@ -453,7 +458,8 @@ def create_adapter(
                 index=config.get('index', 'main'),
                 source=config.get('source', 'test-automation'),
                 batch_size=config.get('batch_size', 100),
-                flush_interval=config.get('flush_interval', 10.0)
+                flush_interval=config.get('flush_interval', 10.0),
+                **SIEMAdapterFactory._shipping_options(config)
             )
         
         elif provider == SIEMProvider.GRAFANA_LOKI:
@@ -461,7 +467,8 @@ def create_adapter(
                 endpoint=config['endpoint'],
                 labels=config.get('labels', {"job": "test-automation"}),
                 batch_size=config.get('batch_size', 100),
-                flush_interval=config.get('flush_interval', 10.0)
+                flush_interval=config.get('flush_interval', 10.0),
+                **SIEMAdapterFactory._shipping_options(config)
             )
         
         else:
@@ -0,0 +1,460 @@
+"""
+SIEM Shipper - Asynchronous, pooled, compressed delivery of log batches
+=======================================================================
+
+Used by BaseSIEMAdapter. Logging threads only append events to a bounded
+buffer; one background thread runs an asyncio loop that:
+- cuts batches by event count (batch_size), encoded size (max_batch_bytes)
+  or age (flush_interval)
+- formats, encodes and gzip-compresses each batch off the logging thread
+- sends up to max_in_flight batches concurrently over pooled keep-alive
+  connections (httpx.AsyncClient)
+- retries transient failures (connection errors, 408/429/5xx) with backoff,
+  then writes the batch to an on-disk spool; spooled batches are re-sent,
+  oldest first, once the endpoint accepts requests again
+- counts everything it cannot deliver (stats) instead of dropping silently
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import contextlib
+import gzip
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Set, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+SENT = "sent"
+REJECTED = "rejected"
+FAILED = "failed"
+
+
+class SIEMShipper:
+    """Background batcher and sender for one SIEM adapter"""
+
+    def __init__(
+        self,
+        adapter: Any,
+        max_batch_bytes: int = 1024 * 1024,
+        max_in_flight: int = 4,
+        compress: bool = True,
+        compression_level: int = 6,
+        max_buffer: int = 10000,
+        spool_dir: Optional[Union[str, Path]] = None,
+        max_spool_bytes: int = 256 * 1024 * 1024,
+        timeout: float = 30.0,
+        retry_backoff: float = 1.0,
+        claim_timeout: float = 600.0,
+    ):
+        """
+        Initialize shipper and start its event loop thread
+
+        Args:
+            adapter: BaseSIEMAdapter providing batch_size, flush_interval,
+                max_retries, circuit_breaker, push_url, request_headers(),
+                format_log(), encode_log() and encode_batch()
+            max_batch_bytes: Encoded size at which a batch is cut
+            max_in_flight: Batches sent concurrently (also the connection pool size)
+            compress: gzip request bodies (Content-Encoding: gzip)
+            compression_level: gzip level
+            max_buffer: Events waiting for a batch before new ones are dropped
+            spool_dir: Directory for batches that could not be delivered
+                (None = count them as failed and drop them)
+            max_spool_bytes: Spool size beyond which the oldest batches are deleted
+            timeout: Request timeout in seconds
+            retry_backoff: First retry delay in seconds (doubled per attempt)
+            claim_timeout: Seconds after which a spooled batch claimed for
+                sending by a process that is still running is taken back
+        """
+        self.adapter = adapter
+        self.max_batch_bytes = max_batch_bytes
+        self.max_in_flight = max_in_flight
+        self.compress = compress
+        self.compression_level = compression_level
+        self.max_buffer = max_buffer
+        self.spool_dir = Path(spool_dir) if spool_dir is not None else None
+        self.max_spool_bytes = max_spool_bytes
+        self.timeout = timeout
+        self.retry_backoff = retry_backoff
+        self.claim_timeout = claim_timeout
+
+        self.stats: Dict[str, int] = {
+            "events_sent": 0,
+            "events_dropped": 0,
+            "batches_sent": 0,
+            "batches_rejected": 0,
+            "batches_failed": 0,
+            "batches_spooled": 0,
+            "batches_replayed": 0,
+            "batches_spool_dropped": 0,
+            "bytes_sent": 0,
+        }
+        self.latencies_ms: Deque[float] = deque(maxlen=1000)
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._wake_pending = False
+        self._closed = False
+        self._recover_claims()
+        self._spool_pending = bool(self._spool_files())
+        self._spool_sequence = 0
+        self._replaying: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"siem-shipper-{type(adapter).__name__}", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Caller side (any thread)
+    # ------------------------------------------------------------------
+
+    def submit(self, log_data: Dict[str, Any]) -> bool:
+        """
+        Queue one log event
+
+        Args:
+            log_data: Structured log document; must not be mutated afterwards
+
+        Returns:
+            False if the event was dropped (buffer full or shipper closed)
+        """
+        buffer = self._buffer
+        if self._closed or len(buffer) >= self.max_buffer:
+            self.stats["events_dropped"] += 1
+            return False
+        buffer.append(log_data)
+        if len(buffer) >= self.adapter.batch_size and not self._wake_pending:
+            self._wake_pending = True
+            self._loop.call_soon_threadsafe(self._wake.set)
+        return True
+
+    @property
+    def pending(self) -> int:
+        """Events waiting for a batch"""
+        return len(self._buffer)
+
+    def flush(self, timeout: Optional[float] = 30.0) -> bool:
+        """
+        Send everything buffered and wait for in-flight batches
+
+        Args:
+            timeout: Seconds to wait (None = no limit)
+
+        Returns:
+            True if every batch was sent, spooled or rejected within the timeout
+        """
+        return self._call(self._flush(), timeout)
+
+    def send(self, logs: List[Dict[str, Any]], timeout: Optional[float] = 60.0) -> bool:
+        """
+        Send one batch now and wait for the outcome (spooled on failure)
+
+        Args:
+            logs: Log documents
+            timeout: Seconds to wait
+
+        Returns:
+            True if the endpoint accepted the batch
+        """
+        return self._call(self._send_now(logs), timeout) is True
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Flush, then stop the event loop thread"""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._call(self._shutdown(), timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def _call(self, coroutine, timeout: Optional[float]) -> Any:
+        if not self._thread.is_alive():
+            coroutine.close()
+            return False
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        try:
+            result = future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            return False
+        return True if result is None else result
+
+    # ------------------------------------------------------------------
+    # Event loop thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._wake = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_in_flight,
+                max_keepalive_connections=self.max_in_flight,
+            ),
+        )
+        self._pump_task = self._loop.create_task(self._pump())
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _pump(self) -> None:
+        if self._spool_pending:
+            self._schedule_replay()
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self.adapter.flush_interval)
+            self._wake.clear()
+            self._wake_pending = False
+            await self._ship_buffer()
+            if self._spool_pending:
+                self._schedule_replay()
+
+    async def _ship_buffer(self) -> None:
+        while self._buffer:
+            body, count = self._next_batch()
+            if not count:
+                continue
+            await self._slots.acquire()
+            self._track(self._deliver(body, count))
+
+    async def _flush(self) -> None:
+        await self._ship_buffer()
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def _send_now(self, logs: List[Dict[str, Any]]) -> bool:
+        lines = [self.adapter.encode_log(self.adapter.format_log(log)) for log in logs]
+        async with self._slots:
+            return await self._deliver_batch(self._compress(self.adapter.encode_batch(lines)), len(lines))
+
+    async def _shutdown(self) -> None:
+        self._pump_task.cancel()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        # Let cancelled replays hand their claimed batches back to the spool
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._client.aclose()
+
+    def _track(self, coroutine) -> asyncio.Task:
+        task = self._loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _next_batch(self):
+        adapter = self.adapter
+        buffer = self._buffer
+        lines: List[bytes] = []
+        size = 0
+        while buffer and len(lines) < adapter.batch_size and size < self.max_batch_bytes:
+            log = buffer.popleft()
+            try:
+                line = adapter.encode_log(adapter.format_log(log))
+            except Exception as e:
+                self.stats["events_dropped"] += 1
+                logger.warning(f"{type(adapter).__name__} could not encode log event: {e}")
+                continue
+            lines.append(line)
+            size += len(line)
+        if not lines:
+            return b"", 0
+        return self._compress(adapter.encode_batch(lines)), len(lines)
+
+    def _compress(self, body: bytes) -> bytes:
+        return gzip.compress(body, self.compression_level) if self.compress else body
+
+    # ------------------------------------------------------------------
+    # Delivery
+    # ------------------------------------------------------------------
+
+    async def _deliver(self, body: bytes, count: int) -> None:
+        try:
+            await self._deliver_batch(body, count)
+        finally:
+            self._slots.release()
+
+    async def _deliver_batch(self, body: bytes, count: int) -> bool:
+        outcome = await self._post(body)
+        if outcome == SENT:
+            self.stats["batches_sent"] += 1
+            self.stats["events_sent"] += count
+            if self._spool_pending:
+                self._schedule_replay()
+            return True
+        if outcome == REJECTED:
+            self.stats["batches_rejected"] += 1
+        else:
+            self._spool(body)
+        return False
+
+    async def _post(self, body: bytes) -> str:
+        adapter = self.adapter
+        name = type(adapter).__name__
+        breaker = adapter.circuit_breaker
+        if not breaker.allow_request():
+            return FAILED
+
+        headers = adapter.request_headers()
+        if self.compress:
+            headers["Content-Encoding"] = "gzip"
+        attempts = max(1, adapter.max_retries)
+        error: Any = None
+        for attempt in range(attempts):
+            start = time.perf_counter()
+            try:
+                response = await self._client.post(adapter.push_url, content=body, headers=headers)
+            except httpx.HTTPError as e:
+                error = e
+            else:
+                status = response.status_code
+                if status < 300:
+                    self.latencies_ms.append((time.perf_counter() - start) * 1000)
+                    self.stats["bytes_sent"] += len(body)
+                    breaker.record_success()
+                    return SENT
+                if status not in _RETRYABLE_STATUS:
+                    # The endpoint is up but refuses this batch: resending will not help
+                    breaker.record_success()
+                    logger.error(f"{name} rejected batch: HTTP {status} {response.text[:200]}")
+                    return REJECTED
+                error = f"HTTP {status}"
+            logger.warning(f"{name} send attempt {attempt + 1} failed: {error}")
+            if attempt < attempts - 1:
+                await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+
+        breaker.record_failure()
+        logger.error(f"All retry attempts exhausted for {name}: {error}")
+        return FAILED
+
+    # ------------------------------------------------------------------
+    # Spool
+    # ------------------------------------------------------------------
+
+    def _spool_files(self) -> List[Path]:
+        if self.spool_dir is None or not self.spool_dir.exists():
+            return []
+        return sorted(self.spool_dir.glob("*.gz"))
+
+    def _recover_claims(self) -> None:
+        """Return batches claimed by a dead process, or claimed too long ago, to the spool"""
+        if self.spool_dir is None or not self.spool_dir.exists():
+            return
+        now = time.time()
+        for claimed in self.spool_dir.glob("*.gz.*.sending"):
+            name, pid, _ = claimed.name.rsplit(".", 2)
+            try:
+                age = now - claimed.stat().st_mtime
+                if pid.isdigit() and _pid_alive(int(pid)) and age < self.claim_timeout:
+                    continue
+                os.replace(claimed, claimed.with_name(name))
+            except FileNotFoundError:
+                continue
+            logger.warning(f"Recovered SIEM batch {name} left claimed by process {pid}")
+
+    def _spool(self, body: bytes) -> None:
+        if self.spool_dir is None:
+            self.stats["batches_failed"] += 1
+            return
+        data = body if self.compress else gzip.compress(body, self.compression_level)
+        self._spool_sequence += 1
+        name = f"{time.time_ns()}-{os.getpid()}-{self._spool_sequence:06d}"
+        try:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            partial_path = self.spool_dir / f"{name}.tmp"
+            partial_path.write_bytes(data)
+            os.replace(partial_path, self.spool_dir / f"{name}.gz")
+        except OSError as e:
+            self.stats["batches_failed"] += 1
+            logger.error(f"Could not spool SIEM batch: {e}")
+            return
+        self.stats["batches_spooled"] += 1
+        self._spool_pending = True
+        self._limit_spool()
+
+    def _limit_spool(self) -> None:
+        files = self._spool_files()
+        sizes = []
+        for path in files:
+            try:
+                sizes.append(path.stat().st_size)
+            except FileNotFoundError:
+                sizes.append(0)
+        total = sum(sizes)
+        for path, size in zip(files, sizes):
+            if total <= self.max_spool_bytes:
+                break
+            try:
+                path.unlink()
+                self.stats["batches_spool_dropped"] += 1
+                logger.warning(f"SIEM spool over {self.max_spool_bytes} bytes, deleted {path.name}")
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _schedule_replay(self) -> None:
+        if self._replaying is None or self._replaying.done():
+            self._replaying = self._track(self._replay())
+
+    async def _replay(self) -> None:
+        for path in self._spool_files():
+            # Claim the file so another process sharing the spool skips it
+            claimed = path.with_name(f"{path.name}.{os.getpid()}.sending")
+            try:
+                os.replace(path, claimed)
+                data = claimed.read_bytes()
+            except FileNotFoundError:
+                continue
+            body = data if self.compress else gzip.decompress(data)
+            try:
+                async with self._slots:
+                    outcome = await self._post(body)
+            except BaseException:
+                # Cancelled by close() (or failed unexpectedly): keep the batch spooled
+                with contextlib.suppress(OSError):
+                    os.replace(claimed, path)
+                raise
+            if outcome == FAILED:
+                os.replace(claimed, path)
+                return
+            claimed.unlink()
+            self.stats["batches_replayed" if outcome == SENT else "batches_rejected"] += 1
+        self._recover_claims()
+        self._spool_pending = bool(self._spool_files())
+
+
+def _pid_alive(pid: int) -> bool:
+    """True unless process `pid` is known to have exited"""
+    if pid == os.getpid() or os.name == "nt":
+        # os.kill() would terminate the process on Windows; rely on the claim age
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+__all__ = ["SIEMShipper"]
@@ -0,0 +1,313 @@
+﻿"""
+Stack Profiler - Low-overhead sampling of where test time goes
+==============================================================
+
+A background thread reads the Python stack of one thread (the test thread)
+every few milliseconds with sys._current_frames() and weights each stack
+by the wall time since the previous sample. Nothing is hooked into the
+profiled code, so the cost is one stack walk per interval (about 1% at
+the default 5 ms), independent of how many calls the test makes.
+
+Each sample is attributed to a category by the first matching frame from
+the innermost outwards:
+
+- sleep:   the innermost Python line calls sleep() (human behavior delays,
+           fixed waits; the C call itself has no frame)
+- masking: SensitiveDataMasker
+- browser: Playwright / Selenium client code (waiting for the browser)
+- db:      database drivers and framework.database
+- http:    HTTP client libraries
+- logging: framework.observability and the logging package
+- framework / test: anything else, inside framework/ or not
+
+Profiles are written as collapsed stacks (flamegraph.pl, speedscope,
+inferno) and as speedscope JSON.
+"""
+
+import json
+import linecache
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from types import CodeType
+from typing import Dict, List, Optional, Tuple, Union
+
+# (category, path fragments, qualified-name prefixes); first match wins
+CATEGORY_RULES: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+    ("masking", (), ("SensitiveDataMasker",)),
+    ("browser", ("/playwright/", "/selenium/", "/pyppeteer/"), ()),
+    ("db", ("/asyncpg/", "/aiomysql/", "/pymysql/", "/psycopg", "/sqlalchemy/", "/sqlite3/",
+            "/framework/database/"), ()),
+    ("http", ("/httpx/", "/httpcore/", "/requests/", "/urllib3/", "/http/client.py", "/aiohttp/",
+              "/ssl.py", "/socket.py"), ()),
+    ("logging", ("/framework/observability/", "/logging/", "/utils/logger.py", "/loguru/"), ()),
+)
+
+CATEGORIES = ("sleep",) + tuple(rule[0] for rule in CATEGORY_RULES) + ("framework", "test")
+
+# Test runner frames at the root of every stack, dropped from profiles
+_RUNNER_PATHS = ("/_pytest/", "/pluggy/", "/xdist/", "/execnet/")
+
+_Key = Tuple[Optional[str], Tuple[CodeType, ...], int]
+
+
+def _path(code: CodeType) -> str:
+    return code.co_filename.replace("\\", "/")
+
+
+class StackProfile:
+    """Weighted stack samples of one test (or any period), with reports"""
+
+    def __init__(self, weights: Dict[_Key, float], interval: float, samples: int = 0, overhead: float = 0.0):
+        """
+        Initialize profile
+
+        Args:
+            weights: (phase, innermost-first code objects, innermost line) -> seconds
+            interval: Sampling interval in seconds
+            samples: Number of samples taken
+            overhead: Seconds spent taking the samples
+        """
+        self.weights = weights
+        self.interval = interval
+        self.samples = samples
+        self.overhead = overhead
+        self._categorized: Optional[List[Tuple[str, Optional[str], Tuple[CodeType, ...], int, float]]] = None
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.weights.values()) * 1000
+
+    def _rows(self):
+        if self._categorized is None:
+            # Cached per profile only, so code objects are released with it
+            categories: Dict[Tuple[Tuple[CodeType, ...], int], str] = {}
+            rows = []
+            for (phase, codes, line), seconds in self.weights.items():
+                category = categories.get((codes, line))
+                if category is None:
+                    category = categories[(codes, line)] = _categorize(codes, line)
+                rows.append((category, phase, codes, line, seconds))
+            self._categorized = rows
+        return self._categorized
+
+    def categories(self) -> Dict[str, float]:
+        """Milliseconds per category, largest first"""
+        totals: Dict[str, float] = {}
+        for category, _, _, _, seconds in self._rows():
+            totals[category] = totals.get(category, 0.0) + seconds * 1000
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+    def top_functions(self, limit: int = 10) -> List[Tuple[str, float]]:
+        """Functions with the most self time (innermost frame), in milliseconds"""
+        totals: Dict[CodeType, float] = {}
+        for _, _, codes, _, seconds in self._rows():
+            if codes:
+                totals[codes[0]] = totals.get(codes[0], 0.0) + seconds * 1000
+        ranked = sorted(totals.items(), key=lambda item: -item[1])[:limit]
+        return [(_frame_name(code), ms) for code, ms in ranked]
+
+    def summary(self, limit: int = 5) -> Dict[str, object]:
+        """Compact per-test summary (JSON-serializable)"""
+        return {
+            "total_ms": round(self.total_ms, 1),
+            "samples": self.samples,
+            "interval_ms": self.interval * 1000,
+            "overhead_ms": round(self.overhead * 1000, 2),
+            "categories": {name: round(ms, 1) for name, ms in self.categories().items()},
+            "top_functions": [[name, round(ms, 1)] for name, ms in self.top_functions(limit)],
+        }
+
+    def _named_stacks(self):
+        """(category, root-first frame names, seconds)"""
+        for category, phase, codes, _, seconds in self._rows():
+            frames = list(reversed(codes))
+            names = [_frame_name(code) for code in frames[_first_user_frame(frames):]]
+            if phase:
+                names.insert(0, phase)
+            yield category, names, seconds
+
+    def collapsed(self) -> str:
+        """Collapsed stacks ("root;...;leaf microseconds" per line)"""
+        merged: Dict[str, float] = {}
+        for category, names, seconds in self._named_stacks():
+            stack = ";".join(names + [f"[{category}]"])
+            merged[stack] = merged.get(stack, 0.0) + seconds
+        return "".join(f"{stack} {round(seconds * 1e6)}\n" for stack, seconds in merged.items())
+
+    def speedscope(self, name: str) -> Dict[str, object]:
+        """Profile in speedscope's file format (one sampled profile, in milliseconds)"""
+        frames: List[Dict[str, str]] = []
+        index: Dict[str, int] = {}
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        for category, names, seconds in self._named_stacks():
+            stack = []
+            for frame in names + [f"[{category}]"]:
+                position = index.get(frame)
+                if position is None:
+                    position = index[frame] = len(frames)
+                    frames.append({"name": frame})
+                stack.append(position)
+            samples.append(stack)
+            weights.append(round(seconds * 1000, 3))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "framework.observability.stack_profiler",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+    def write(self, directory: Union[str, Path], name: str) -> Dict[str, Path]:
+        """
+        Write collapsed stacks and speedscope JSON
+
+        Args:
+            directory: Output directory (created if missing)
+            name: File name stem
+
+        Returns:
+            {"collapsed": path, "speedscope": path}
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        collapsed = directory / f"{name}.folded"
+        speedscope = directory / f"{name}.speedscope.json"
+        collapsed.write_text(self.collapsed(), encoding="utf-8")
+        speedscope.write_text(json.dumps(self.speedscope(name)), encoding="utf-8")
+        return {"collapsed": collapsed, "speedscope": speedscope}
+
+
+class StackSampler:
+    """Background thread sampling the stack of one thread while a phase is set"""
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        """
+        Initialize sampler
+
+        Args:
+            interval: Seconds between samples
+            thread_id: Thread to sample (default: the thread creating the sampler)
+        """
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        # Samples are only taken while phase is not None
+        self.phase: Optional[str] = None
+        self._weights: Dict[_Key, float] = {}
+        self._samples = 0
+        self._overhead = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StackSampler":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def take(self) -> StackProfile:
+        """Return the samples collected so far and start a new profile"""
+        with self._lock:
+            weights, self._weights = self._weights, {}
+            samples, self._samples = self._samples, 0
+            overhead, self._overhead = self._overhead, 0.0
+        return StackProfile(weights, self.interval, samples, overhead)
+
+    def _run(self) -> None:
+        target = self.thread_id
+        interval = self.interval
+        current_frames = sys._current_frames
+        perf_counter = time.perf_counter
+        last = perf_counter()
+        while not self._stop.wait(interval):
+            started = perf_counter()
+            elapsed, last = started - last, started
+            phase = self.phase
+            if phase is None:
+                continue
+            frame = current_frames().get(target)
+            if frame is None:
+                continue
+            line = frame.f_lineno
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            key = (phase, tuple(codes), line)
+            with self._lock:
+                self._weights[key] = self._weights.get(key, 0.0) + elapsed
+                self._samples += 1
+                self._overhead += perf_counter() - started
+
+    def __enter__(self) -> "StackSampler":
+        if self.phase is None:
+            self.phase = "run"
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+_names: Dict[CodeType, str] = {}
+_cwd = os.getcwd().replace("\\", "/").rstrip("/") + "/"
+
+
+def _frame_name(code: CodeType) -> str:
+    name = _names.get(code)
+    if name is None:
+        path = _path(code)
+        path = path[len(_cwd):] if path.startswith(_cwd) else "/".join(path.rsplit("/", 2)[-2:])
+        qualname = getattr(code, "co_qualname", code.co_name)
+        name = _names[code] = f"{qualname} ({path}:{code.co_firstlineno})".replace(";", ",")
+    return name
+
+
+def _first_user_frame(frames: List[CodeType]) -> int:
+    """Index of the first frame below the test runner (root-first frames)"""
+    start = 0
+    seen_runner = False
+    for position, code in enumerate(frames):
+        if any(part in _path(code) for part in _RUNNER_PATHS):
+            seen_runner = True
+            start = position + 1
+        elif seen_runner:
+            break
+    return min(start, len(frames) - 1)
+
+
+def _categorize(codes: Tuple[CodeType, ...], line: int) -> str:
+    # f_lineno is None while a frame is between line events
+    if codes and line and "sleep(" in linecache.getline(codes[0].co_filename, line):
+        return "sleep"
+    in_framework = False
+    for code in codes:
+        path = _path(code)
+        qualname = getattr(code, "co_qualname", code.co_name)
+        for category, fragments, prefixes in CATEGORY_RULES:
+            if any(part in path for part in fragments) or any(qualname.startswith(p) for p in prefixes):
+                return category
+        if "/framework/" in path:
+            in_framework = True
+    return "framework" if in_framework else "test"
+
+
+__all__ = ["CATEGORIES", "CATEGORY_RULES", "StackProfile", "StackSampler"]
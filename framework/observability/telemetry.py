@@ -6,34 +6,184 @@
 - Database operations (asyncpg, aiomysql)
 - Test execution
 - Custom spans for business logic
+
+Spans are exported in batches (BatchSpanProcessor) to the console, an OTLP
+collector, a local JSON-lines file or memory (offline runs). Root spans are
+sampled by rate or by the shared SamplingPolicy; children follow their parent.
+With tracing off (TelemetryConfig(enabled=False) or before initialize())
+span() returns a shared no-op context manager and traced functions are
+called directly.
 """
 
-import asyncio
-from contextlib import asynccontextmanager, contextmanager
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager, nullcontext
 from functools import wraps
-from typing import Any, Callable, Dict, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Union
 
 from opentelemetry import trace
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
 from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import (
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
 from opentelemetry.trace import Status, StatusCode
 
+# The OTLP exporter is only needed with enable_otlp
+try:
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+except ImportError:
+    OTLPSpanExporter = None
+
+from framework.observability.enterprise_logger import correlation_id_var
+from framework.observability.sampling_policy import SamplingPolicy, get_sampling_policy
+
 # Self-instrumentation for telemetry module
 try:
-    from framework.observability.universal_logger import log_function, log_async_function
+    from framework.observability.universal_logger import log_function
 except ImportError:
     # Fallback if universal_logger not available
     def log_function(*args, **kwargs):
         def decorator(func):
             return func
         return decorator
-    def log_async_function(*args, **kwargs):
-        def decorator(func):
-            return func
-        return decorator
+
+logger = logging.getLogger(__name__)
+
+# Returned by span()/async_span() while tracing is off; reusable and async-capable
+_NO_SPAN = nullcontext()
+
+_ATTRIBUTE_TYPES = (bool, str, int, float)
+
+
+def _attribute_value(value: Any) -> Any:
+    """OpenTelemetry attribute value: primitives and homogeneous sequences as-is, else str"""
+    if isinstance(value, _ATTRIBUTE_TYPES) or value is None:
+        return value
+    if isinstance(value, (list, tuple)) and value:
+        first = type(value[0])
+        if first in _ATTRIBUTE_TYPES and all(type(item) is first for item in value):
+            return tuple(value)
+    return str(value)
+
+
+def span_attributes(attributes: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Convert attributes to OpenTelemetry types without stringifying primitives.
+
+    Args:
+        attributes: Attribute mapping (None values are dropped)
+
+    Returns:
+        Attributes ready for a span, or None if there are none
+    """
+    if not attributes:
+        return None
+    typed = {}
+    for key, value in attributes.items():
+        value = _attribute_value(value)
+        if value is not None:
+            typed[key] = value
+    return typed
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """
+    Appends finished spans to a local file, one compact JSON document per line.
+
+    For offline runs without a collector; each batch is a single write.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Appended to by every export, closed in shutdown()
+        self._file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def to_dict(span: ReadableSpan) -> Dict[str, Any]:
+        context = span.context
+        parent = span.parent
+        start, end = span.start_time or 0, span.end_time or 0
+        document = {
+            "name": span.name,
+            "trace_id": format(context.trace_id, "032x"),
+            "span_id": format(context.span_id, "016x"),
+            "parent_id": format(parent.span_id, "016x") if parent else None,
+            "kind": span.kind.name,
+            "start_time_ns": start,
+            "duration_ms": (end - start) / 1e6,
+            "status": span.status.status_code.name,
+            "attributes": dict(span.attributes or {}),
+        }
+        if span.status.description:
+            document["status_description"] = span.status.description
+        if span.events:
+            document["events"] = [
+                {"name": event.name, "timestamp_ns": event.timestamp, "attributes": dict(event.attributes or {})}
+                for event in span.events
+            ]
+        return document
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(self.to_dict(span), default=str) + "\n" for span in spans)
+        try:
+            with self._lock:
+                self._file.write(lines)
+                self._file.flush()
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not write spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+class PolicySampler(Sampler):
+    """
+    Root-span sampler driven by the shared SamplingPolicy.
+
+    Keeps every trace while sampling is disabled and every trace of an
+    escalated (failed) test; otherwise keeps policy.default_rate of traces,
+    decided on the trace id so all processes agree. Wrapped in ParentBased,
+    child spans follow their root.
+    """
+
+    def __init__(self, policy: Optional[SamplingPolicy] = None):
+        self.policy = policy or get_sampling_policy()
+        self._ratio: Optional[TraceIdRatioBased] = None
+
+    def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+        policy = self.policy
+        if not policy.enabled or policy.default_rate >= 1.0 or policy.is_escalated(correlation_id_var.get()):
+            return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes)
+        ratio = self._ratio
+        if ratio is None or ratio.rate != policy.default_rate:
+            ratio = self._ratio = TraceIdRatioBased(policy.default_rate)
+        return ratio.should_sample(parent_context, trace_id, name, kind, attributes, links, trace_state)
+
+    def get_description(self) -> str:
+        return "PolicySampler"
 
 
 class TelemetryConfig:
@@ -47,6 +197,14 @@ def __init__(
         otlp_endpoint: Optional[str] = None,
         enable_console: bool = True,
         enable_otlp: bool = False,
+        enabled: bool = True,
+        export_path: Optional[Union[str, Path]] = None,
+        enable_memory: bool = False,
+        sample_rate: Optional[float] = None,
+        max_queue_size: int = 2048,
+        schedule_delay_ms: float = 1000,
+        max_export_batch_size: int = 512,
+        instrument_httpx: bool = True,
     ):
         """
         Initialize telemetry configuration.
@@ -57,12 +215,29 @@ def __init__(
             otlp_endpoint: OTLP collector endpoint (e.g., "http://localhost:4317")
             enable_console: Enable console exporter for debugging
             enable_otlp: Enable OTLP exporter for production
+            enabled: False turns tracing off (spans become no-ops)
+            export_path: Write spans to this JSON-lines file (offline runs)
+            enable_memory: Keep finished spans in memory (TelemetryManager.finished_spans)
+            sample_rate: Share of root spans (traces) recorded; None follows the
+                shared SamplingPolicy. Child spans always follow their parent.
+            max_queue_size: Spans buffered per exporter before new ones are dropped
+            schedule_delay_ms: Export interval of the batch processors
+            max_export_batch_size: Spans per export call
+            instrument_httpx: Trace httpx requests
         """
         self.service_name = service_name
         self.environment = environment
         self.otlp_endpoint = otlp_endpoint or "http://localhost:4317"
         self.enable_console = enable_console
         self.enable_otlp = enable_otlp
+        self.enabled = enabled
+        self.export_path = export_path
+        self.enable_memory = enable_memory
+        self.sample_rate = sample_rate
+        self.max_queue_size = max_queue_size
+        self.schedule_delay_ms = schedule_delay_ms
+        self.max_export_batch_size = max_export_batch_size
+        self.instrument_httpx = instrument_httpx
 
 
 class TelemetryManager:
@@ -102,7 +277,9 @@ def __init__(self, config: TelemetryConfig):
         """
         self.config = config
         self.tracer_provider: Optional[TracerProvider] = None
+        # None while tracing is off: every span path checks only this
         self.tracer: Optional[trace.Tracer] = None
+        self.memory_exporter: Optional[InMemorySpanExporter] = None
         self._initialized = False
 
     @log_function(log_timing=True)
@@ -111,13 +288,16 @@ def initialize(self) -> None:
         Initialize OpenTelemetry with configured exporters.
 
         Sets up:
-        - TracerProvider with service resource
-        - Console exporter (if enabled)
-        - OTLP exporter (if enabled)
+        - TracerProvider with service resource and parent-based sampling
+        - Console, OTLP, JSON-lines file and in-memory exporters (if enabled),
+          each behind a BatchSpanProcessor
         - HTTPX instrumentation
+
+        Does nothing when config.enabled is False.
         """
-        if self._initialized:
+        if self._initialized or not self.config.enabled:
             return
+        config = self.config
 
         # Create resource with service information
         resource = Resource.create(
@@ -128,34 +308,58 @@ def initialize(self) -> None:
             }
         )
 
-        # Create tracer provider
-        self.tracer_provider = TracerProvider(resource=resource)
+        # Create tracer provider (root spans sampled by rate or the shared
+        # sampling policy, child spans follow their parent)
+        if config.sample_rate is None:
+            root_sampler = PolicySampler()
+        else:
+            root_sampler = TraceIdRatioBased(config.sample_rate)
+        self.tracer_provider = TracerProvider(resource=resource, sampler=ParentBased(root_sampler))
 
         # Add console exporter
-        if self.config.enable_console:
-            console_exporter = ConsoleSpanExporter()
-            console_processor = BatchSpanProcessor(console_exporter)
-            self.tracer_provider.add_span_processor(console_processor)
+        if config.enable_console:
+            self._add_exporter(ConsoleSpanExporter())
 
         # Add OTLP exporter
-        if self.config.enable_otlp:
-            otlp_exporter = OTLPSpanExporter(endpoint=self.config.otlp_endpoint)
-            otlp_processor = BatchSpanProcessor(otlp_exporter)
-            self.tracer_provider.add_span_processor(otlp_processor)
+        if config.enable_otlp:
+            if OTLPSpanExporter is None:
+                logger.error("OTLP export requested but opentelemetry-exporter-otlp is not installed")
+            else:
+                self._add_exporter(OTLPSpanExporter(endpoint=config.otlp_endpoint))
+
+        # Add local exporters for offline runs
+        if config.export_path:
+            self._add_exporter(JsonLinesSpanExporter(config.export_path))
+        if config.enable_memory:
+            self.memory_exporter = InMemorySpanExporter()
+            self._add_exporter(self.memory_exporter)
 
         # Set global tracer provider
         trace.set_tracer_provider(self.tracer_provider)
 
-        # Get tracer
-        self.tracer = trace.get_tracer(__name__)
+        # Get tracer from our own provider (the global one can only be set once)
+        self.tracer = self.tracer_provider.get_tracer(__name__)
 
         # Instrument HTTPX
-        HTTPXClientInstrumentor().instrument()
+        if config.instrument_httpx:
+            HTTPXClientInstrumentor().instrument()
 
         self._initialized = True
 
-    @log_function(log_args=True)
-    @contextmanager
+    def _add_exporter(self, exporter: SpanExporter) -> None:
+        config = self.config
+        self.tracer_provider.add_span_processor(BatchSpanProcessor(
+            exporter,
+            max_queue_size=config.max_queue_size,
+            schedule_delay_millis=config.schedule_delay_ms,
+            max_export_batch_size=min(config.max_export_batch_size, config.max_queue_size),
+        ))
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are being recorded"""
+        return self.tracer is not None
+
     def span(
         self,
         name: str,
@@ -165,13 +369,16 @@ def span(
         """
         Create a traced span context.
 
+        Exceptions leaving the block are recorded on the span and set its
+        status to ERROR. Not wrapped in log_function: spans are a hot path.
+
         Args:
             name: Name of the span
-            attributes: Additional attributes for the span
+            attributes: Additional attributes for the span (kept typed)
             kind: Span kind (INTERNAL, CLIENT, SERVER, etc.)
 
-        Yields:
-            The created span
+        Returns:
+            Context manager yielding the span (None while tracing is off)
 
         Example:
             ```python
@@ -179,25 +386,12 @@ def span(
                 result = db.query("SELECT * FROM users")
             ```
         """
-        if not self._initialized or not self.tracer:
-            yield None
-            return
+        tracer = self.tracer
+        if tracer is None:
+            return _NO_SPAN
+        return tracer.start_as_current_span(name, kind=kind, attributes=span_attributes(attributes))
 
-        with self.tracer.start_as_current_span(name, kind=kind) as span:
-            if attributes:
-                for key, value in attributes.items():
-                    span.set_attribute(key, str(value))
-
-            try:
-                yield span
-            except Exception as e:
-                span.set_status(Status(StatusCode.ERROR))
-                span.record_exception(e)
-                raise
-
-    @log_async_function(log_args=True)
-    @asynccontextmanager
-    async def async_span(
+    def async_span(
         self,
         name: str,
         attributes: Optional[Dict[str, Any]] = None,
@@ -208,11 +402,11 @@ async def async_span(
 
         Args:
             name: Name of the span
-            attributes: Additional attributes for the span
+            attributes: Additional attributes for the span (kept typed)
             kind: Span kind
 
-        Yields:
-            The created span
+        Returns:
+            Async context manager yielding the span (None while tracing is off)
 
         Example:
             ```python
@@ -220,23 +414,11 @@ async def async_span(
                 response = await client.get("/api/users")
             ```
         """
-        if not self._initialized or not self.tracer:
-            yield None
-            return
-
-        with self.tracer.start_as_current_span(name, kind=kind) as span:
-            if attributes:
-                for key, value in attributes.items():
-                    span.set_attribute(key, str(value))
-
-            try:
-                yield span
-            except Exception as e:
-                span.set_status(Status(StatusCode.ERROR))
-                span.record_exception(e)
-                raise
+        tracer = self.tracer
+        if tracer is None:
+            return _NO_SPAN
+        return _async_span(tracer.start_as_current_span(name, kind=kind, attributes=span_attributes(attributes)))
 
-    @log_function(log_args=True)
     def trace_function(
         self, span_name: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None
     ):
@@ -259,19 +441,23 @@ def login(username: str, password: str):
             ```
         """
 
+        typed = span_attributes(attributes)
+
         def decorator(func: Callable):
             name = span_name or func.__name__
 
             @wraps(func)
             def wrapper(*args, **kwargs):
-                with self.span(name, attributes):
+                tracer = self.tracer
+                if tracer is None:
+                    return func(*args, **kwargs)
+                with tracer.start_as_current_span(name, attributes=typed):
                     return func(*args, **kwargs)
 
             return wrapper
 
         return decorator
 
-    @log_function(log_args=True)
     def trace_async_function(
         self, span_name: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None
     ):
@@ -294,19 +480,23 @@ async def fetch_user(user_id: int):
             ```
         """
 
+        typed = span_attributes(attributes)
+
         def decorator(func: Callable):
             name = span_name or func.__name__
 
             @wraps(func)
             async def wrapper(*args, **kwargs):
-                async with self.async_span(name, attributes):
+                tracer = self.tracer
+                if tracer is None:
+                    return await func(*args, **kwargs)
+                with tracer.start_as_current_span(name, attributes=typed):
                     return await func(*args, **kwargs)
 
             return wrapper
 
         return decorator
 
-    @log_function(log_args=True)
     def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
         """
         Add an event to the current span.
@@ -323,11 +513,10 @@ def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> N
                 telemetry.add_event("test_completed", {"result": "passed"})
             ```
         """
-        current_span = trace.get_current_span()
-        if current_span:
-            current_span.add_event(name, attributes or {})
+        if self.tracer is None:
+            return
+        trace.get_current_span().add_event(name, span_attributes(attributes))
 
-    @log_function(log_args=True)
     def set_attribute(self, key: str, value: Any) -> None:
         """
         Set an attribute on the current span.
@@ -336,11 +525,11 @@ def set_attribute(self, key: str, value: Any) -> None:
             key: Attribute key
             value: Attribute value
         """
-        current_span = trace.get_current_span()
-        if current_span:
-            current_span.set_attribute(key, str(value))
+        value = _attribute_value(value)
+        if self.tracer is None or value is None:
+            return
+        trace.get_current_span().set_attribute(key, value)
 
-    @log_function(log_args=True)
     def record_exception(self, exception: Exception) -> None:
         """
         Record an exception in the current span.
@@ -348,10 +537,38 @@ def record_exception(self, exception: Exception) -> None:
         Args:
             exception: The exception to record
         """
+        if self.tracer is None:
+            return
         current_span = trace.get_current_span()
-        if current_span:
-            current_span.record_exception(exception)
-            current_span.set_status(Status(StatusCode.ERROR))
+        current_span.record_exception(exception)
+        current_span.set_status(Status(StatusCode.ERROR))
+
+    def finished_spans(self) -> Sequence[ReadableSpan]:
+        """
+        Spans collected by the in-memory exporter (config.enable_memory).
+
+        Call force_flush() first: spans reach exporters in batches.
+
+        Returns:
+            Finished spans, oldest first
+        """
+        if self.memory_exporter is None:
+            return ()
+        return self.memory_exporter.get_finished_spans()
+
+    def force_flush(self, timeout_ms: int = 30000) -> bool:
+        """
+        Export every span buffered by the batch processors.
+
+        Args:
+            timeout_ms: Time to wait in milliseconds
+
+        Returns:
+            True if all exporters finished in time
+        """
+        if self.tracer_provider is None:
+            return True
+        return self.tracer_provider.force_flush(timeout_ms)
 
     @log_function(log_timing=True)
     def shutdown(self) -> None:
@@ -360,12 +577,19 @@ def shutdown(self) -> None:
 
         Call this before application exit to ensure all spans are exported.
         """
+        self.tracer = None
         if self.tracer_provider:
             self.tracer_provider.shutdown()
 
         self._initialized = False
 
 
+@asynccontextmanager
+async def _async_span(span_context):
+    with span_context as span:
+        yield span
+
+
 # ============================================================================
 # Global Telemetry Instance
 # ============================================================================
@@ -505,13 +729,16 @@ def start_test(self, test_name: str, attributes: Optional[Dict[str, Any]] = None
             except RuntimeError:
                 return
 
-        attrs = attributes or {}
-        attrs["test.name"] = test_name
+        tracer = self.telemetry.tracer
+        if tracer is None:
+            return
 
-        span = self.telemetry.tracer.start_span(f"test:{test_name}", kind=trace.SpanKind.INTERNAL)
+        attrs = dict(attributes or {})
+        attrs["test.name"] = test_name
 
-        for key, value in attrs.items():
-            span.set_attribute(key, str(value))
+        span = tracer.start_span(
+            f"test:{test_name}", kind=trace.SpanKind.INTERNAL, attributes=span_attributes(attrs)
+        )
 
         self._test_spans[test_name] = span
 
@@ -556,7 +783,7 @@ def add_test_event(
         """
         if test_name in self._test_spans:
             span = self._test_spans[test_name]
-            span.add_event(event, attributes or {})
+            span.add_event(event, span_attributes(attributes))
 
 
 # ============================================================================
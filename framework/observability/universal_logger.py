@@ -7,12 +7,14 @@
 
 Features:
 - Automatic entry/exit logging
-- Argument capture (with PII masking)
+- Argument capture (with PII masking), bounded by log_serializer caps
 - Execution timing
 - Exception capture with full stack traces
 - Success/failure indicators
 - State transition tracking
 - Async/sync support
+- Zero-formatting fast path when the log level is disabled
+- Per-module sampling and a global "instrumentation off" mode
 
 Usage:
     from framework.observability.universal_logger import log_function, log_async_function, log_state_transition
@@ -29,6 +31,10 @@ async def my_async_function():
     def activate():
         pass
 
+    # Log 10% of calls from framework.database.*, none at all in CI smoke runs
+    configure_instrumentation(sample_rates={"framework.database": 0.1})
+    configure_instrumentation(enabled=False)   # or FRAMEWORK_INSTRUMENTATION=off
+
 Author: Lokendra Singh
 Email: lokendra.singh@centerforvein.com
 Website: www.centerforvein.com
@@ -37,14 +43,144 @@ def activate():
 import asyncio
 import functools
 import inspect
+import logging
+import os
+import random
 import time
 import traceback
 from typing import Any, Callable, Dict, List, Optional, Union
-from framework.observability.enterprise_logger import get_enterprise_logger, SensitiveDataMasker
+from framework.observability.enterprise_logger import get_enterprise_logger, SensitiveDataMasker, correlation_id_var
+from framework.observability.sampling_policy import get_sampling_policy
+from framework.observability.log_serializer import summarize
 
 logger = get_enterprise_logger()
 
 
+# ============================================================================
+# Instrumentation settings (global on/off and per-module sampling)
+# ============================================================================
+
+# What a decorated call logs
+SKIP_ALL = 0        # instrumentation off: nothing, not even failures
+FAILURES_ONLY = 1   # level disabled or sampled out: failures only
+FULL = 2            # entry, exit, arguments, result
+
+
+class InstrumentationSettings:
+    """Process-wide switches read by the logging decorators"""
+
+    def __init__(self):
+        self.enabled = os.getenv("FRAMEWORK_INSTRUMENTATION", "on").lower() not in ("off", "0", "false")
+        self.default_sample_rate = float(os.getenv("FRAMEWORK_INSTRUMENTATION_SAMPLE_RATE", "1.0"))
+        self.sample_rates: Dict[str, float] = {}
+        self.always_log_errors = True
+        # Bumped on every change so call sites re-resolve their cached rate
+        self.version = 0
+
+    def sample_rate_for(self, module_name: str) -> float:
+        """Resolve the sample rate of a module (longest matching package prefix wins)"""
+        best, rate = -1, self.default_sample_rate
+        for prefix, prefix_rate in self.sample_rates.items():
+            if (module_name == prefix or module_name.startswith(prefix + ".")) and len(prefix) > best:
+                best, rate = len(prefix), prefix_rate
+        return rate
+
+
+_settings = InstrumentationSettings()
+_policy = get_sampling_policy()
+
+
+def configure_instrumentation(
+    enabled: Optional[bool] = None,
+    default_sample_rate: Optional[float] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+    always_log_errors: Optional[bool] = None,
+):
+    """
+    Configure the logging decorators at runtime
+    
+    Args:
+        enabled: False turns all decorator logging off (failures included)
+        default_sample_rate: Share of calls logged for modules without a rate (0-1)
+        sample_rates: Module/package name -> sample rate; merged into existing
+            rates (a rate of None removes the entry)
+        always_log_errors: Log failures of calls that were sampled out
+    """
+    if enabled is not None:
+        _settings.enabled = enabled
+    if default_sample_rate is not None:
+        _settings.default_sample_rate = default_sample_rate
+    for module_name, rate in (sample_rates or {}).items():
+        if rate is None:
+            _settings.sample_rates.pop(module_name, None)
+        else:
+            _settings.sample_rates[module_name] = rate
+    if always_log_errors is not None:
+        _settings.always_log_errors = always_log_errors
+    _settings.version += 1
+
+
+def get_instrumentation_settings() -> InstrumentationSettings:
+    """Get the active instrumentation settings"""
+    return _settings
+
+
+class _CallSite:
+    """Per-decorated-function state, resolved once and refreshed on config changes"""
+    
+    __slots__ = ("module_name", "func_name", "level", "rate", "version")
+    
+    def __init__(self, func: Callable, log_level: str):
+        self.module_name = func.__module__
+        self.func_name = func.__name__
+        self.level = logging.getLevelName(log_level.upper())
+        if not isinstance(self.level, int):
+            self.level = logging.DEBUG
+        self.rate = 1.0
+        self.version = -1
+    
+    def mode(self) -> int:
+        """Decide what to log for this call (SKIP_ALL, FAILURES_ONLY or FULL)"""
+        if self.version != _settings.version:
+            self.rate = self.rate_now()
+            self.version = _settings.version
+        rate = self.rate
+        if rate < 0:
+            return SKIP_ALL
+        if (
+            rate == 0.0
+            or not logger.isEnabledFor(self.level)
+            or (rate < 1.0 and random.random() >= rate)
+        ):
+            # A test that has failed is logged in full from then on
+            if _policy.has_escalations and _policy.is_escalated(correlation_id_var.get()):
+                return FULL
+            return FAILURES_ONLY if _settings.always_log_errors else SKIP_ALL
+        return FULL
+    
+    def rate_now(self) -> float:
+        # -1 encodes "instrumentation off"
+        return _settings.sample_rate_for(self.module_name) if _settings.enabled else -1.0
+
+
+def _log_failure(site: _CallSite, exc: Exception, start_time: Optional[float], call_type: str):
+    """Log a failed call that was not otherwise logged"""
+    context = {
+        "function": site.func_name,
+        "module": site.module_name,
+        "type": call_type,
+        "exception_type": type(exc).__name__,
+        "exception_message": str(exc),
+    }
+    if start_time is not None:
+        context["execution_time_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+    logger.error(
+        f"✗ EXIT: {site.module_name}.{site.func_name} - FAILED",
+        exc_info=True,
+        **context
+    )
+
+
 def log_function(
     log_args: bool = True,
     log_result: bool = True,
@@ -70,10 +206,24 @@ def process_order(order_id, amount):
             return {"status": "success"}
     """
     def decorator(func: Callable) -> Callable:
+        site = _CallSite(func, log_level)
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            func_name = func.__name__
-            module_name =func.__module__
+            mode = site.mode()
+            if mode != FULL:
+                # Fast path: no context, no repr, no masking
+                if mode == SKIP_ALL:
+                    return func(*args, **kwargs)
+                start_time = time.perf_counter() if log_timing else None
+                try:
+                    return func(*args, **kwargs)
+                except Exception as exc:
+                    _log_failure(site, exc, start_time, "sync_function")
+                    raise
+            
+            func_name = site.func_name
+            module_name = site.module_name
             
             # Prepare context
             context = {
@@ -91,8 +241,8 @@ def wrapper(*args, **kwargs):
             
             # Log arguments
             if log_args and (args or kwargs):
-                args_repr = [repr(a) for a in args]
-                kwargs_repr = {k: repr(v) for k, v in kwargs.items()}
+                args_repr = [summarize(a) for a in args]
+                kwargs_repr = {k: summarize(v) for k, v in kwargs.items()}
                 
                 if mask_sensitive:
                     kwargs_repr = SensitiveDataMasker.mask_dict(kwargs_repr)
@@ -101,7 +251,7 @@ def wrapper(*args, **kwargs):
                 context["kwargs"] = kwargs_repr
             
             # Log function entry
-            log_method = getattr(logger, log_level.lower(), logger.debug)
+            log_method = functools.partial(logger.log, site.level)
             log_method(f"→ ENTER: {module_name}.{func_name}", **context)
             
             start_time = time.time()
@@ -119,9 +269,9 @@ def wrapper(*args, **kwargs):
                     success_context["execution_time_ms"] = round(execution_time * 1000, 2)
                 
                 if log_result and result is not None:
-                    result_repr = repr(result)
-                    if mask_sensitive and isinstance(result, dict):
-                        result_repr = SensitiveDataMasker.mask_dict(result)
+                    result_repr = summarize(result)
+                    if mask_sensitive and isinstance(result_repr, dict):
+                        result_repr = SensitiveDataMasker.mask_dict(result_repr)
                     success_context["result"] = result_repr
                 
                 log_method(f"✓ EXIT: {module_name}.{func_name} - SUCCESS", **success_context)
@@ -176,10 +326,24 @@ async def fetch_data(user_id):
             return await db.query(...)
     """
     def decorator(func: Callable) -> Callable:
+        site = _CallSite(func, log_level)
+        
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            func_name = func.__name__
-            module_name = func.__module__
+            mode = site.mode()
+            if mode != FULL:
+                # Fast path: no context, no repr, no masking
+                if mode == SKIP_ALL:
+                    return await func(*args, **kwargs)
+                start_time = time.perf_counter() if log_timing else None
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as exc:
+                    _log_failure(site, exc, start_time, "async_function")
+                    raise
+            
+            func_name = site.func_name
+            module_name = site.module_name
             
             # Prepare context
             context = {
@@ -190,8 +354,8 @@ async def wrapper(*args, **kwargs):
             
             # Log arguments
             if log_args and (args or kwargs):
-                args_repr = [repr(a) for a in args]
-                kwargs_repr = {k: repr(v) for k, v in kwargs.items()}
+                args_repr = [summarize(a) for a in args]
+                kwargs_repr = {k: summarize(v) for k, v in kwargs.items()}
                 
                 if mask_sensitive:
                     kwargs_repr = SensitiveDataMasker.mask_dict(kwargs_repr)
@@ -200,7 +364,7 @@ async def wrapper(*args, **kwargs):
                 context["kwargs"] = kwargs_repr
             
             # Log function entry
-            log_method = getattr(logger, log_level.lower(), logger.debug)
+            log_method = functools.partial(logger.log, site.level)
             log_method(f"→ ENTER [ASYNC]: {module_name}.{func_name}", **context)
             
             start_time = time.time()
@@ -218,9 +382,9 @@ async def wrapper(*args, **kwargs):
                     success_context["await_duration"] = execution_time
                 
                 if log_result and result is not None:
-                    result_repr = repr(result)
-                    if mask_sensitive and isinstance(result, dict):
-                        result_repr = SensitiveDataMasker.mask_dict(result)
+                    result_repr = summarize(result)
+                    if mask_sensitive and isinstance(result_repr, dict):
+                        result_repr = SensitiveDataMasker.mask_dict(result_repr)
                     success_context["result"] = result_repr
                 
                 log_method(f"✓ EXIT [ASYNC]: {module_name}.{func_name} - SUCCESS", **success_context)
@@ -510,6 +674,9 @@ def log_operation(operation_name: str, log_level: str = "INFO", **metadata):
 
 
 __all__ = [
+    'configure_instrumentation',
+    'get_instrumentation_settings',
+    'InstrumentationSettings',
     'log_function',
     'log_async_function',
     'log_state_transition',
@@ -6,18 +6,29 @@
 - Baseline management
 - Diff generation
 - Configurable thresholds
+- Tile-hash short-circuit and region-of-interest comparison
+- Deferred, process-pool batch comparison
 """
 
-import asyncio
 import json
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from playwright.async_api import Locator, Page
+
+from framework.visual.batch import run_in_pool
+from framework.visual.tile_hash import (
+    Box,
+    TileHashGrid,
+    apply_roi,
+    load_sidecar,
+    write_sidecar,
+)
+
 # Self-instrumentation for visual testing module
 try:
-    from framework.observability.universal_logger import log_function, log_async_function
+    from framework.observability.universal_logger import log_async_function, log_function
 except ImportError:
     def log_function(*args, **kwargs):
         def decorator(func):
@@ -38,6 +49,7 @@ class VisualConfig:
     max_diff_pixels: Optional[int] = None
     animations: str = "disabled"  # disabled, allow
     caret: str = "hide"  # hide, initial
+    tile_size: int = 64  # Tile edge length for baseline tile hashes
 
 
 class VisualTester:
@@ -126,6 +138,7 @@ async def compare_page(
                 animations=self.config.animations,
                 caret=self.config.caret,
             )
+            write_sidecar(baseline_path, self.config.tile_size)
             return True
 
         # Compare mode
@@ -183,6 +196,7 @@ async def compare_element(
             await element.screenshot(
                 path=str(baseline_path), animations=self.config.animations, caret=self.config.caret
             )
+            write_sidecar(baseline_path, self.config.tile_size)
             return True
 
         # Compare mode
@@ -197,9 +211,8 @@ async def compare_element(
 
         except AssertionError as e:
             # Visual mismatch detected
-            diff_path = Path(self.config.diff_dir) / f"{name}-diff.png"
             import logging
-            logging.getLogger(__name__).warning(f\"Element visual regression detected for {name}: {e}\")
+            logging.getLogger(__name__).warning(f"Element visual regression detected for {name}: {e}")
             return False
 
     @log_async_function(log_args=True, log_timing=True)
@@ -234,6 +247,8 @@ async def compare_with_threshold(
         name: str,
         threshold: Optional[float] = None,
         max_diff_pixels: Optional[int] = None,
+        regions: Optional[list] = None,
+        ignore_regions: Optional[list] = None,
     ) -> Dict[str, Any]:
         """
         Compare with custom threshold and get detailed results.
@@ -243,6 +258,8 @@ async def compare_with_threshold(
             name: Test name
             threshold: Custom threshold (overrides config)
             max_diff_pixels: Maximum allowed different pixels
+            regions: Only compare pixels inside these (left, top, right, bottom) boxes
+            ignore_regions: Ignore pixels inside these (left, top, right, bottom) boxes
 
         Returns:
             Dictionary with comparison results
@@ -280,6 +297,8 @@ async def compare_with_threshold(
             current_path,
             threshold or self.config.threshold,
             max_diff_pixels or self.config.max_diff_pixels,
+            regions,
+            ignore_regions,
         )
 
         return result
@@ -290,34 +309,84 @@ async def _compare_images(
         current_path: Path,
         threshold: float,
         max_diff_pixels: Optional[int],
+        regions: Optional[List[Box]] = None,
+        ignore_regions: Optional[List[Box]] = None,
     ) -> Dict[str, Any]:
         """
         Compare two images and return detailed results.
 
+        See compare_files().
+        """
+        return self.compare_files(
+            baseline_path, current_path, threshold, max_diff_pixels, regions, ignore_regions
+        )
+
+    def compare_files(
+        self,
+        baseline_path: Path,
+        current_path: Path,
+        threshold: float,
+        max_diff_pixels: Optional[int],
+        regions: Optional[List[Box]] = None,
+        ignore_regions: Optional[List[Box]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compare two image files and return detailed results.
+
+        The current screenshot is hashed tile by tile first. When every tile
+        matches the baseline's sidecar hashes the baseline is never decoded;
+        otherwise only the changed tiles are diffed.
+
         Args:
             baseline_path: Path to baseline image
             current_path: Path to current image
             threshold: Difference threshold
             max_diff_pixels: Maximum allowed different pixels
+            regions: Only compare pixels inside these boxes
+            ignore_regions: Ignore pixels inside these boxes
 
         Returns:
             Comparison results dictionary
         """
         try:
             import numpy as np
-            from PIL import Image, ImageChops
+            from PIL import Image
+
+            current = Image.open(current_path).convert("RGB")
+            current_grid = TileHashGrid.from_image(current, self.config.tile_size)
+            total_pixels = current.width * current.height * 3
+
+            baseline_grid = load_sidecar(baseline_path)
+            baseline = None
+            if baseline_grid is None or not current_grid.is_compatible(baseline_grid):
+                baseline = Image.open(baseline_path).convert("RGB")
+                baseline_grid = TileHashGrid.from_image(baseline, self.config.tile_size)
+                if current_grid.is_compatible(baseline_grid):
+                    write_sidecar(baseline_path, grid=baseline_grid)
+
+            if not current_grid.is_compatible(baseline_grid):
+                # Different sizes: every pixel counts as changed
+                changed_tiles = None
+                diff_pixels = total_pixels
+            else:
+                changed_tiles = current_grid.changed_tiles(baseline_grid, regions, ignore_regions)
+                diff_pixels = 0
+
+            if changed_tiles:
+                if baseline is None:
+                    baseline = Image.open(baseline_path).convert("RGB")
+                if regions or ignore_regions:
+                    baseline = apply_roi(baseline, regions, ignore_regions)
+                    current = apply_roi(current, regions, ignore_regions)
+
+                baseline_array = np.asarray(baseline)
+                current_array = np.asarray(current)
+                for left, top, right, bottom in changed_tiles:
+                    diff_pixels += np.count_nonzero(
+                        baseline_array[top:bottom, left:right]
+                        != current_array[top:bottom, left:right]
+                    )
 
-            baseline = Image.open(baseline_path)
-            current = Image.open(current_path)
-
-            # Convert to numpy arrays
-            baseline_array = np.array(baseline)
-            current_array = np.array(current)
-
-            # Calculate difference
-            diff = np.abs(baseline_array - current_array)
-            diff_pixels = np.count_nonzero(diff)
-            total_pixels = baseline_array.size
             diff_percentage = diff_pixels / total_pixels
 
             # Determine if match
@@ -331,6 +400,7 @@ async def _compare_images(
                 "diff_percentage": diff_percentage,
                 "diff_pixels": int(diff_pixels),
                 "total_pixels": int(total_pixels),
+                "changed_tiles": len(changed_tiles) if changed_tiles is not None else None,
                 "threshold": threshold,
                 "baseline_path": str(baseline_path),
                 "current_path": str(current_path),
@@ -387,6 +457,11 @@ def export_report(self, output_path: str) -> None:
             json.dump(report, f, indent=2)
 
 
+def _compare_files_in_worker(config: Dict[str, Any], *args) -> Dict[str, Any]:
+    """Process-pool entry point for PytestVisualPlugin.compare_pending()"""
+    return VisualTester(VisualConfig(**config)).compare_files(*args)
+
+
 # ============================================================================
 # Pytest Integration
 # ============================================================================
@@ -415,6 +490,14 @@ async def test_homepage_visual(page, visual):
             await page.goto("https://example.com")
             assert await visual.compare_page(page, "homepage")
         ```
+
+    Batch mode (capture during tests, compare in parallel afterwards):
+        ```python
+        await visual.capture_page(page, "homepage")
+
+        # e.g. in pytest_sessionfinish
+        results = config.visual_tester.compare_pending()
+        ```
     """
 
     def __init__(self, config: Optional[VisualConfig] = None):
@@ -426,6 +509,7 @@ def __init__(self, config: Optional[VisualConfig] = None):
         """
         self.tester = VisualTester(config)
         self.results = []
+        self.pending: List[Dict[str, Any]] = []
 
     async def compare_page(self, page: Page, name: str, **kwargs) -> bool:
         """
@@ -463,6 +547,103 @@ async def compare_element(self, element: Locator, name: str, **kwargs) -> bool:
 
         return result
 
+    async def capture_page(
+        self,
+        page: Page,
+        name: str,
+        full_page: bool = True,
+        threshold: Optional[float] = None,
+        max_diff_pixels: Optional[int] = None,
+        regions: Optional[list] = None,
+        ignore_regions: Optional[list] = None,
+    ) -> Path:
+        """
+        Capture a page screenshot now and defer the comparison.
+
+        Pending comparisons run in parallel with compare_pending(), typically
+        once at session end. A missing baseline is created immediately.
+
+        Args:
+            page: Playwright Page
+            name: Test name for baseline
+            full_page: Capture full page or viewport only
+            threshold: Custom threshold (overrides config)
+            max_diff_pixels: Maximum allowed different pixels
+            regions: Only compare pixels inside these boxes
+            ignore_regions: Ignore pixels inside these boxes
+
+        Returns:
+            Path of the captured screenshot
+        """
+        config = self.tester.config
+        baseline_path = Path(config.baseline_dir) / f"{name}.png"
+        if not baseline_path.exists():
+            await self.tester.compare_page(page, name, full_page=full_page)
+            self.results.append({"name": name, "type": "page", "result": True})
+            return baseline_path
+
+        # Unique per capture: the same name may be captured again before compare_pending()
+        current_path = Path(config.diff_dir) / f"{name}-current-{len(self.pending)}.png"
+        await page.screenshot(
+            path=str(current_path),
+            full_page=full_page,
+            animations=config.animations,
+            caret=config.caret,
+        )
+        self.pending.append(
+            {
+                "name": name,
+                "baseline_path": str(baseline_path),
+                "current_path": str(current_path),
+                "threshold": threshold or config.threshold,
+                "max_diff_pixels": max_diff_pixels or config.max_diff_pixels,
+                "regions": regions,
+                "ignore_regions": ignore_regions,
+            }
+        )
+        return current_path
+
+    def compare_pending(self, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Compare every captured screenshot against its baseline in parallel.
+
+        Args:
+            max_workers: Pool size (defaults to the CPU count, 1 = in-process)
+
+        Returns:
+            Detailed comparison results in capture order
+        """
+        pending, self.pending = self.pending, []
+        config = asdict(self.tester.config)
+        jobs = [
+            (
+                config,
+                job["baseline_path"],
+                job["current_path"],
+                job["threshold"],
+                job["max_diff_pixels"],
+                job["regions"],
+                job["ignore_regions"],
+            )
+            for job in pending
+        ]
+
+        details: List[Optional[Dict[str, Any]]] = [None] * len(pending)
+        for index, result, error in run_in_pool(_compare_files_in_worker, jobs, max_workers):
+            if error is not None:
+                result = {"is_match": False, "error": str(error)}
+            details[index] = result
+            self.results.append(
+                {
+                    "name": pending[index]["name"],
+                    "type": "page",
+                    "result": result["is_match"],
+                    "details": result,
+                }
+            )
+
+        return details
+
     def generate_html_report(self, output_path: str) -> None:
         """
         Generate HTML report with visual diffs.
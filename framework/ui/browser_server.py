@@ -0,0 +1,318 @@
+"""
+Browser Server - One browser process shared by many Playwright clients
+
+Starting Playwright in every pytest-xdist worker costs a Node driver plus a
+full browser (launch time and a few hundred MB of RSS) per worker. A browser
+server is launched once per host with Playwright's launchServer(); workers
+connect to its WebSocket endpoint (BrowserType.connect) and only create
+their own contexts, which stay isolated from each other.
+
+The server runs in the Node driver bundled with the playwright package, so
+no extra installation is needed. It closes the browser on SIGTERM/SIGINT
+and when its stdin is closed, so it never outlives the process that
+started it.
+
+Usage:
+    with BrowserServer("chromium") as server:
+        browser = sync_playwright().start().chromium.connect(server.ws_endpoint)
+"""
+
+import contextlib
+import json
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from framework.ui.playwright_engine import BrowserStartupError
+from utils.logger import get_logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    from playwright._impl._driver import compute_driver_executable
+except ImportError:
+    compute_driver_executable = None
+
+logger = get_logger(__name__)
+
+_SERVER_SCRIPT = """
+const playwright = require(process.env.PW_PACKAGE);
+const options = JSON.parse(process.env.PW_LAUNCH_OPTIONS);
+playwright[process.env.PW_BROWSER].launchServer(options).then(server => {
+  let closing = false;
+  const close = () => {
+    if (closing) return;
+    closing = true;
+    server.close().then(() => process.exit(0), () => process.exit(1));
+  };
+  process.on('SIGTERM', close);
+  process.on('SIGINT', close);
+  process.stdin.on('end', close);
+  process.stdin.resume();
+  process.stdout.write(server.wsEndpoint() + '\\n');
+}, error => {
+  process.stderr.write(error.message + '\\n');
+  process.exit(1);
+});
+"""
+
+
+def driver_command() -> List[str]:
+    """Node executable and playwright-core package bundled with playwright"""
+    if compute_driver_executable is not None:
+        executable = compute_driver_executable()
+        if isinstance(executable, tuple):
+            node, cli = executable
+            return [str(node), str(Path(cli).parent)]
+    import playwright
+
+    driver = Path(playwright.__file__).parent / "driver"
+    node = driver / ("node.exe" if os.name == "nt" else "node")
+    return [str(node), str(driver / "package")]
+
+
+class BrowserServer:
+    """A browser launched with launchServer() in the Playwright Node driver"""
+
+    def __init__(
+        self,
+        browser_type: str = "chromium",
+        headless: bool = True,
+        channel: Optional[str] = None,
+        args: Optional[Sequence[str]] = None,
+        launch_options: Optional[Dict[str, Any]] = None,
+        command: Optional[List[str]] = None,
+    ):
+        """
+        Initialize browser server
+
+        Args:
+            browser_type: Browser type ('chromium', 'firefox', 'webkit')
+            headless: Run browser in headless mode
+            channel: Browser channel ('chrome', 'msedge', ...)
+            args: Extra browser command line arguments
+            launch_options: Further launchServer() options (camelCase, as in JavaScript)
+            command: Process to run instead of the Node driver; must print the
+                WebSocket endpoint on its first stdout line
+        """
+        self.browser_type = browser_type
+        self.launch_options: Dict[str, Any] = {"headless": headless}
+        if channel:
+            self.launch_options["channel"] = channel
+        if args:
+            self.launch_options["args"] = list(args)
+        self.launch_options.update(launch_options or {})
+        self.command = command
+        self.ws_endpoint: Optional[str] = None
+        self.startup_seconds: Optional[float] = None
+        self.process: Optional[subprocess.Popen] = None
+        self._stderr = None
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process is not None else None
+
+    def start(self, timeout: float = 60.0) -> str:
+        """
+        Launch the server and wait for its WebSocket endpoint
+
+        Args:
+            timeout: Seconds to wait for the browser to come up
+
+        Returns:
+            WebSocket endpoint for BrowserType.connect()
+
+        Raises:
+            BrowserStartupError: If the server exits or times out before printing its endpoint
+        """
+        if self.running:
+            return self.ws_endpoint
+        started = time.perf_counter()
+        if self.command is not None:
+            command = list(self.command)
+            env = os.environ.copy()
+        else:
+            node, package = driver_command()
+            command = [node, "-e", _SERVER_SCRIPT]
+            env = dict(
+                os.environ,
+                PW_PACKAGE=package,
+                PW_BROWSER=self.browser_type,
+                PW_LAUNCH_OPTIONS=json.dumps(self.launch_options),
+            )
+        # Kept open for the server's lifetime; closed in stop()
+        self._stderr = tempfile.TemporaryFile()  # noqa: SIM115
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            env=env,
+            text=True,
+        )
+
+        lines: "queue.Queue[str]" = queue.Queue()
+        threading.Thread(target=lambda: lines.put(self.process.stdout.readline()), daemon=True).start()
+        try:
+            line = lines.get(timeout=timeout).strip()
+        except queue.Empty:
+            self.stop()
+            raise BrowserStartupError(f"Browser server did not start within {timeout:.0f}s") from None
+        if not line:
+            self.process.wait()
+            error = self._read_stderr()
+            self.stop()
+            if "Executable doesn't exist" in error:
+                raise BrowserStartupError(f"Browser not installed. Run: playwright install {self.browser_type}")
+            raise BrowserStartupError(f"Browser server exited: {error or 'no output'}")
+
+        self.ws_endpoint = line
+        self.startup_seconds = time.perf_counter() - started
+        logger.info(
+            f"{self.browser_type} server listening on {self.ws_endpoint} "
+            f"(pid {self.pid}, {self.startup_seconds:.2f}s)"
+        )
+        return self.ws_endpoint
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Close the browser and end the server process"""
+        process, self.process = self.process, None
+        if process is not None:
+            if process.poll() is None:
+                try:
+                    # Closing stdin makes the server close the browser and exit
+                    process.stdin.close()
+                    process.wait(timeout=timeout)
+                except (OSError, subprocess.TimeoutExpired):
+                    process.kill()
+                    process.wait()
+            if process.stdout is not None:
+                process.stdout.close()
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
+        self.ws_endpoint = None
+
+    def rss_bytes(self) -> Optional[int]:
+        """Resident memory of the server and its browser processes"""
+        return process_tree_rss(self.pid) if self.running else None
+
+    def _read_stderr(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read().decode("utf-8", "replace").strip()
+
+    def __enter__(self) -> "BrowserServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def start_browser_servers(count: int, timeout: float = 60.0, **options) -> List[BrowserServer]:
+    """
+    Start browser servers concurrently
+
+    Args:
+        count: Number of servers
+        timeout: Seconds to wait for each server
+        **options: BrowserServer arguments
+
+    Returns:
+        Started servers (all stopped again if any fails)
+    """
+    servers = [BrowserServer(**options) for _ in range(count)]
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(server.start, timeout) for server in servers]
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+        for server in servers:
+            server.stop()
+        raise errors[0]
+    return servers
+
+
+def select_endpoint(endpoints: Sequence[str], worker_id: Optional[str]) -> Optional[str]:
+    """
+    Endpoint for a pytest-xdist worker, spreading workers round-robin
+
+    Args:
+        endpoints: Server endpoints
+        worker_id: xdist worker id ('gw0', 'gw1', ...) or None for the controller
+
+    Returns:
+        Endpoint, or None when there are no endpoints
+    """
+    if not endpoints:
+        return None
+    digits = "".join(ch for ch in worker_id or "" if ch.isdigit())
+    return endpoints[int(digits or 0) % len(endpoints)]
+
+
+def process_tree_rss(pid: Optional[int]) -> Optional[int]:
+    """
+    Resident memory of a process and all its descendants in bytes
+
+    Uses psutil when installed, else /proc (Linux); None if neither is available.
+    """
+    if pid is None:
+        return None
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            with contextlib.suppress(psutil.Error):
+                total += process.memory_info().rss
+        return total
+
+    proc = Path("/proc")
+    if not proc.is_dir():
+        return None
+    children: Dict[int, List[int]] = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # Fields after "(comm)": state ppid ...
+        parent = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(parent, []).append(int(entry.name))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            total += int((proc / str(current) / "statm").read_text().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+        pending.extend(children.get(current, ()))
+    return total
+
+
+__all__ = [
+    "BrowserServer",
+    "driver_command",
+    "process_tree_rss",
+    "select_endpoint",
+    "start_browser_servers",
+]
@@ -0,0 +1,26 @@
+"""
+Hook specifications of the shared browser server plugin
+
+Implement them in a conftest.py to adjust how the browser servers started
+by --browser-server are launched.
+"""
+
+import pytest
+
+
+@pytest.hookspec
+def pytest_browser_server_launch_args(config):
+    """
+    Launch options for the shared browser servers
+
+    The servers start in pytest_configure, before any fixture runs, so
+    options set in the browser_type_launch_args fixture have to be provided
+    here as well.
+
+    Args:
+        config: pytest config
+
+    Returns:
+        Dict with "args" (list of browser arguments, appended in plugin
+        order) and/or further launchServer() options, or None
+    """
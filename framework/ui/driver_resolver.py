@@ -0,0 +1,231 @@
+"""
+Driver Resolver - Resolve Selenium driver binaries once per host
+
+ChromeDriverManager().install() asks the network for the matching driver
+release on every call, even when the binary is already downloaded. The
+resolver keys an on-disk cache by browser and installed browser version
+(read locally from the browser binary), so the manager only runs when the
+browser was updated, the cached binary disappeared, or the entry is older
+than cache_valid_days. Concurrent pytest-xdist workers share the cache
+file; a miss is resolved under a file lock by one worker. When the browser
+version cannot be read, the manager runs and nothing is cached on disk,
+since a browser update could not be detected.
+
+If the manager fails (offline, blocked download), None is returned and
+Selenium Manager, built into Selenium 4.6+, resolves the driver instead.
+
+Usage:
+    service = ChromeService(resolve_driver("chrome"))
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    FCNTL_AVAILABLE = False
+
+try:
+    from webdriver_manager.chrome import ChromeDriverManager
+    from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+    from webdriver_manager.firefox import GeckoDriverManager
+    from webdriver_manager.microsoft import EdgeChromiumDriverManager
+
+    WDM_AVAILABLE = True
+except ImportError:
+    WDM_AVAILABLE = False
+
+DEFAULT_CACHE_FILE = Path.home() / ".cache" / "selenium-drivers" / "resolved.json"
+
+
+def _default_managers() -> Dict[str, Callable[[], Any]]:
+    if not WDM_AVAILABLE:
+        return {}
+    return {"chrome": ChromeDriverManager, "firefox": GeckoDriverManager, "edge": EdgeChromiumDriverManager}
+
+
+def _installed_version(browser_type: str) -> Optional[str]:
+    if not WDM_AVAILABLE:
+        return None
+    os_browser = {"chrome": ChromeType.GOOGLE, "firefox": "firefox", "edge": ChromeType.MSEDGE}.get(browser_type)
+    if os_browser is None:
+        return None
+    try:
+        return OperationSystemManager().get_browser_version_from_os(os_browser)
+    except Exception as e:
+        logger.debug(f"Could not read {browser_type} version: {e}")
+        return None
+
+
+class DriverResolver:
+    """Driver binary paths cached per (browser, installed browser version)"""
+
+    def __init__(
+        self,
+        cache_file: Union[str, Path] = DEFAULT_CACHE_FILE,
+        cache_valid_days: float = 7,
+        managers: Optional[Dict[str, Callable[[], Any]]] = None,
+        version_reader: Callable[[str], Optional[str]] = _installed_version,
+    ):
+        """
+        Initialize resolver
+
+        Args:
+            cache_file: JSON file shared by all processes on the host
+            cache_valid_days: Days before an entry is resolved again
+            managers: browser -> driver manager factory with install() (default: webdriver_manager)
+            version_reader: browser -> installed browser version (None if unknown)
+        """
+        self.cache_file = Path(cache_file)
+        self.cache_valid_days = cache_valid_days
+        self.managers = _default_managers() if managers is None else managers
+        self.version_reader = version_reader
+        self._resolved: Dict[Tuple[str, float], Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, browser_type: str, cache_valid_days: Optional[float] = None) -> Optional[str]:
+        """
+        Driver binary path for browser_type
+
+        Args:
+            browser_type: 'chrome', 'firefox' or 'edge'
+            cache_valid_days: Overrides the resolver's cache_valid_days for this call
+
+        Returns:
+            Path to the driver, or None to let Selenium Manager resolve it
+        """
+        valid_days = self.cache_valid_days if cache_valid_days is None else cache_valid_days
+        memo_key = (browser_type, valid_days)
+        if memo_key in self._resolved:
+            return self._resolved[memo_key]
+        with self._lock:
+            if memo_key not in self._resolved:
+                self._resolved[memo_key] = self._resolve(browser_type, valid_days)
+        return self._resolved[memo_key]
+
+    def _resolve(self, browser_type: str, valid_days: float) -> Optional[str]:
+        version = self.version_reader(browser_type)
+        key = f"{browser_type}:{version}"
+        if version:
+            path = self._cached(key, valid_days)
+            if path:
+                logger.debug(f"Driver for {key} from cache: {path}")
+                return path
+
+        manager = self.managers.get(browser_type)
+        if manager is None:
+            return None
+        if not version:
+            return self._install(browser_type, manager)
+        with self._file_lock():
+            # Another worker may have resolved it while we waited for the lock
+            path = self._cached(key, valid_days)
+            if path:
+                return path
+            path = self._install(browser_type, manager)
+            if path:
+                entries = self._read()
+                entries[key] = {"path": path, "resolved_at": time.time()}
+                self._write(entries)
+            return path
+
+    @staticmethod
+    def _install(browser_type: str, manager: Callable[[], Any]) -> Optional[str]:
+        started = time.perf_counter()
+        try:
+            path = manager().install()
+        except Exception as e:
+            logger.warning(f"Driver download for {browser_type} failed, using Selenium Manager: {e}")
+            return None
+        logger.info(f"Resolved driver for {browser_type} in {time.perf_counter() - started:.1f}s: {path}")
+        return path
+
+    def _cached(self, key: str, valid_days: float) -> Optional[str]:
+        entry = self._read().get(key)
+        if not entry:
+            return None
+        if time.time() - entry.get("resolved_at", 0) > valid_days * 86400:
+            return None
+        path = entry.get("path")
+        return path if path and os.path.exists(path) else None
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable driver cache {self.cache_file}: {e}")
+            return {}
+
+    def _write(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp, self.cache_file)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _file_lock(self):
+        return _FileLock(self.cache_file.with_suffix(".lock"))
+
+    def clear(self) -> None:
+        """Forget resolved paths (in memory and on disk)"""
+        self._resolved.clear()
+        self.cache_file.unlink(missing_ok=True)
+
+
+class _FileLock:
+    """Exclusive advisory lock on a file (no-op without fcntl)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def __enter__(self):
+        if FCNTL_AVAILABLE:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+_default_resolver: Optional[DriverResolver] = None
+
+
+def get_driver_resolver() -> DriverResolver:
+    """Process-wide resolver using the host cache file"""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = DriverResolver()
+    return _default_resolver
+
+
+def resolve_driver(browser_type: str, cache_valid_days: Optional[float] = None) -> Optional[str]:
+    """Driver path for browser_type from the process-wide resolver"""
+    return get_driver_resolver().resolve(browser_type, cache_valid_days)
+
+
+__all__ = ["DEFAULT_CACHE_FILE", "DriverResolver", "get_driver_resolver", "resolve_driver"]
@@ -8,12 +8,16 @@
 - Browser context pooling for parallel execution
 - Automatic retry on transient failures
 - Resource cleanup and management
+- Connecting to a shared browser server instead of launching a browser
 """
 
+import os
 import threading
 import time
-from queue import Empty, Queue
-from typing import Any, Dict, List, Optional
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+from urllib.parse import urlsplit
 
 from playwright.sync_api import Browser, BrowserContext
 from playwright.sync_api import Error as PlaywrightError
@@ -25,6 +29,9 @@
 logger = get_logger(__name__)
 audit_logger = get_audit_logger()
 
+# Set by the browser server plugin (framework.ui.pytest_browser_server)
+WS_ENDPOINT_ENV = "PLAYWRIGHT_WS_ENDPOINT"
+
 
 class BrowserStartupError(Exception):
     """Custom exception for browser startup failures"""
@@ -57,6 +64,7 @@ def __init__(
         retry_delay: float = 2.0,
         enable_context_pool: bool = False,
         pool_size: int = 5,
+        ws_endpoint: Optional[str] = None,
     ):
         """
         Initialize Playwright Engine
@@ -68,6 +76,8 @@ def __init__(
             retry_delay: Delay between retries in seconds
             enable_context_pool: Enable browser context pooling
             pool_size: Number of contexts in the pool
+            ws_endpoint: Browser server to connect to instead of launching a
+                browser (default: $PLAYWRIGHT_WS_ENDPOINT)
         """
         self.playwright = None
         self.browser: Optional[Browser] = None
@@ -77,6 +87,7 @@ def __init__(
         self.slow_mo = slow_mo
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.ws_endpoint = ws_endpoint or os.getenv(WS_ENDPOINT_ENV)
 
         # Context pooling
         self.enable_context_pool = enable_context_pool
@@ -112,14 +123,22 @@ def start(self, browser_type: str = "chromium"):
 
                 browser_launcher = getattr(self.playwright, browser_type)
 
-                # Launch browser with timeout
+                # Connect to the shared browser server, or launch our own browser
                 try:
-                    self.browser = browser_launcher.launch(
-                        headless=self.headless,
-                        slow_mo=self.slow_mo,
-                        timeout=30000,  # 30 second timeout
-                    )
-                    logger.debug(f"Browser launched successfully")
+                    if self.ws_endpoint:
+                        self.browser = browser_launcher.connect(
+                            self.ws_endpoint,
+                            slow_mo=self.slow_mo,
+                            timeout=30000,
+                        )
+                        logger.debug(f"Connected to browser server {self.ws_endpoint}")
+                    else:
+                        self.browser = browser_launcher.launch(
+                            headless=self.headless,
+                            slow_mo=self.slow_mo,
+                            timeout=30000,  # 30 second timeout
+                        )
+                        logger.debug(f"Browser launched successfully")
                 except PlaywrightError as e:
                     if "Executable doesn't exist" in str(e):
                         raise BrowserStartupError(
@@ -189,9 +208,8 @@ def _create_context(self) -> BrowserContext:
                 java_script_enabled=True,
             )
 
-            # Enable request interception
-            context.route("**/*", lambda route: route.continue_())
-
+            # No catch-all route: every routed request costs a Python round trip.
+            # APIInterceptor installs routes only for patterns with mocks/modifications.
             return context
 
         except PlaywrightError as e:
@@ -250,7 +268,7 @@ def stop(self):
                 finally:
                     self.context_pool = None
 
-            # Close browser
+            # Close browser (only disconnects from a shared browser server)
             if self.browser:
                 try:
                     self.browser.close()
@@ -374,17 +392,18 @@ def acquire_pooled_context(self, timeout: float = 5.0) -> BrowserContext:
 
         return self.context_pool.acquire_context(timeout=timeout)
 
-    def release_pooled_context(self, context: BrowserContext):
+    def release_pooled_context(self, context: BrowserContext, recycle: bool = False):
         """
         Release a context back to the pool
 
         Args:
             context: Context to release
+            recycle: Close the context instead of resetting it for reuse
         """
         if not self.enable_context_pool or not self.context_pool:
             raise RuntimeError("Context pooling not enabled")
 
-        self.context_pool.release_context(context)
+        self.context_pool.release_context(context, recycle=recycle)
 
     "PlaywrightEngine",
     "PlaywrightPage",
@@ -398,81 +417,211 @@ def release_pooled_context(self, context: BrowserContext):
 # ========================================================================
 
 
+class LatencyHistogram:
+    """Latencies counted in fixed millisecond buckets, with percentiles of recent samples"""
+
+    BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self, recent: int = 1024):
+        """
+        Initialize histogram
+
+        Args:
+            recent: Number of most recent samples kept for percentiles
+        """
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._recent: Deque[float] = deque(maxlen=recent)
+
+    def record(self, ms: float):
+        self.counts[bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self._recent.append(ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Count, mean, p50/p95/p99, max and per-bucket counts"""
+        recent = sorted(self._recent)
+
+        def percentile(q: float) -> float:
+            return round(recent[min(len(recent) - 1, int(q * len(recent)))], 3) if recent else 0.0
+
+        buckets = {f"<={bound}ms": count for bound, count in zip(self.BOUNDS_MS, self.counts)}
+        buckets[f">{self.BOUNDS_MS[-1]}ms"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": buckets,
+        }
+
+
+# Clears web storage of the page's origin (IndexedDB where the browser can list databases)
+_CLEAR_STORAGE_JS = """async () => {
+    try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}
+    try {
+        if (indexedDB.databases) {
+            for (const db of await indexedDB.databases()) indexedDB.deleteDatabase(db.name);
+        }
+    } catch (e) {}
+}"""
+
+
+def _origin(url: str) -> Optional[str]:
+    parts = urlsplit(url)
+    if parts.scheme in ("http", "https") and parts.netloc:
+        return f"{parts.scheme}://{parts.netloc}"
+    return None
+
+
 class ContextPool:
     """
     Browser context pool for parallel test execution
 
     Features:
-    - Reusable browser contexts
+    - Reusable browser contexts, reset on release (cookies, web storage,
+      permissions, routes) instead of being recreated
+    - Recycling (close and replace) after max_uses acquisitions, when a
+      reset fails, or on request
+    - Elastic size between min_size and max_size, created on demand
+    - Warm spares: idle contexts kept ready, refilled on release
     - Thread-safe acquisition/release
-    - Automatic context cleanup
-    - Pool statistics
+    - Pool statistics with an acquire-latency histogram
     """
 
-    def __init__(self, browser: Browser, pool_size: int = 5, headless: bool = True):
+    DEFAULT_CONTEXT_OPTIONS: Dict[str, Any] = {
+        "viewport": {"width": 1920, "height": 1080},
+        "record_video_dir": None,  # Disable video for pool contexts
+        "ignore_https_errors": True,
+        "java_script_enabled": True,
+    }
+
+    def __init__(
+        self,
+        browser: Browser,
+        pool_size: int = 5,
+        headless: bool = True,
+        min_size: int = 0,
+        max_size: Optional[int] = None,
+        warm_spares: int = 1,
+        max_uses: int = 50,
+        idle_timeout: float = 60.0,
+        context_options: Optional[Dict[str, Any]] = None,
+        init_scripts: Optional[List[str]] = None,
+    ):
         """
         Initialize context pool
 
         Args:
             browser: Playwright browser instance
-            pool_size: Number of contexts to create
+            pool_size: Maximum number of contexts (unless max_size is given)
             headless: Whether browser is in headless mode
+            min_size: Contexts kept open even when idle
+            max_size: Maximum number of contexts (default: pool_size)
+            warm_spares: Idle contexts kept ready for the next acquisition
+            max_uses: Acquisitions before a context is recycled (0: never)
+            idle_timeout: Seconds before an idle context above min_size/warm_spares is closed
+            context_options: new_context() options (default: DEFAULT_CONTEXT_OPTIONS)
+            init_scripts: Scripts added to every context with add_init_script()
         """
         self.browser = browser
-        self.pool_size = pool_size
+        self.max_size = max_size or pool_size
+        self.pool_size = self.max_size
+        self.min_size = min(min_size, self.max_size)
+        self.warm_spares = min(warm_spares, self.max_size)
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
         self.headless = headless
+        self.context_options = dict(self.DEFAULT_CONTEXT_OPTIONS if context_options is None else context_options)
+        self.init_scripts = list(init_scripts or [])
 
-        # Thread-safe queue for available contexts
-        self.available_contexts: Queue[BrowserContext] = Queue(maxsize=pool_size)
         self.all_contexts: List[BrowserContext] = []
+        self._idle: Deque[BrowserContext] = deque()
+        self._idle_since: Dict[BrowserContext, float] = {}
+        self._in_use: Set[BrowserContext] = set()
+        self._uses: Dict[BrowserContext, int] = {}
+        self._origins: Dict[BrowserContext, Set[str]] = {}
+        self._creating = 0
 
         # Statistics
         self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._acquire_latency = LatencyHistogram()
         self._stats = {
             "total_acquisitions": 0,
             "total_releases": 0,
-            "contexts_in_use": 0,
-            "contexts_available": 0,
             "wait_timeouts": 0,
+            "contexts_created": 0,
+            "contexts_recycled": 0,
+            "contexts_trimmed": 0,
+            "resets": 0,
         }
+        self._recycle_reasons: Dict[str, int] = {}
 
         # Initialize pool
         self._initialize_pool()
 
     def _initialize_pool(self):
-        """Create initial pool of contexts"""
-        logger.info(f"Initializing context pool with {self.pool_size} contexts")
+        """Create the minimum and warm-spare contexts"""
+        initial = max(self.min_size, self.warm_spares)
+        logger.info(f"Initializing context pool with {initial} contexts (max {self.max_size})")
+        self._top_up(initial)
+        logger.info(f"Context pool initialized with {len(self.all_contexts)} contexts")
 
-        for i in range(self.pool_size):
+    def _create_context(self) -> BrowserContext:
+        context = self.browser.new_context(**self.context_options)
+        for script in self.init_scripts:
+            context.add_init_script(script)
+        origins: Set[str] = set()
+
+        def record_origin(frame):
+            if frame.parent_frame is None:
+                origin = _origin(frame.url)
+                if origin:
+                    origins.add(origin)
+
+        context.on("page", lambda page: page.on("framenavigated", record_origin))
+        with self._lock:
+            self.all_contexts.append(context)
+            self._uses[context] = 0
+            self._origins[context] = origins
+            self._stats["contexts_created"] += 1
+        return context
+
+    def _top_up(self, target: Optional[int] = None):
+        """Create idle contexts until target (default: warm_spares) are ready"""
+        target = self.warm_spares if target is None else target
+        while True:
+            with self._lock:
+                if len(self._idle) >= target or len(self.all_contexts) + self._creating >= self.max_size:
+                    return
+                self._creating += 1
             try:
-                context = self.browser.new_context(
-                    viewport={"width": 1920, "height": 1080},
-                    record_video_dir=None,  # Disable video for pool contexts
-                    ignore_https_errors=True,
-                    java_script_enabled=True,
-                )
-
-                # Enable request interception
-                context.route("**/*", lambda route: route.continue_())
-
-                self.all_contexts.append(context)
-                self.available_contexts.put(context)
-
-                logger.debug(f"Context {i + 1}/{self.pool_size} created")
-
+                context = self._create_context()
             except Exception as e:
-                logger.error(f"Failed to create context {i + 1}: {e}")
-                # Continue creating remaining contexts
-
-        with self._lock:
-            self._stats["contexts_available"] = self.available_contexts.qsize()
-
-        logger.info(f"Context pool initialized with {len(self.all_contexts)} contexts")
+                logger.error(f"Failed to create pooled context: {e}")
+                return
+            finally:
+                with self._lock:
+                    self._creating -= 1
+            with self._available:
+                self._idle.append(context)
+                self._idle_since[context] = time.monotonic()
+                self._available.notify()
 
     def acquire_context(self, timeout: float = 5.0) -> BrowserContext:
         """
         Acquire a context from the pool
 
+        Takes a warm idle context if there is one, else creates a context
+        while the pool is below max_size, else waits for a release.
+
         Args:
             timeout: Maximum wait time in seconds
 
@@ -482,90 +631,192 @@ def acquire_context(self, timeout: float = 5.0) -> BrowserContext:
         Raises:
             ContextPoolExhausted: If no context available
         """
-        try:
-            context = self.available_contexts.get(timeout=timeout)
-
-            with self._lock:
-                self._stats["total_acquisitions"] += 1
-                self._stats["contexts_in_use"] += 1
-                self._stats["contexts_available"] = self.available_contexts.qsize()
-
-            logger.debug(f"Context acquired (available: {self.available_contexts.qsize()})")
-            return context
+        started = time.monotonic()
+        deadline = started + timeout
+        context = None
+        with self._available:
+            while True:
+                if self._idle:
+                    context = self._idle.pop()
+                    self._idle_since.pop(context, None)
+                    break
+                if len(self.all_contexts) + self._creating < self.max_size:
+                    self._creating += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["wait_timeouts"] += 1
+                    error_msg = f"No context available in pool after {timeout}s"
+                    logger.error(error_msg)
+                    raise ContextPoolExhausted(error_msg)
+                self._available.wait(remaining)
+
+        if context is None:
+            try:
+                context = self._create_context()
+            finally:
+                with self._lock:
+                    self._creating -= 1
 
-        except Empty:
-            with self._lock:
-                self._stats["wait_timeouts"] += 1
+        with self._lock:
+            self._in_use.add(context)
+            self._uses[context] += 1
+            self._stats["total_acquisitions"] += 1
+            self._acquire_latency.record((time.monotonic() - started) * 1000)
+            available = len(self._idle)
 
-            error_msg = f"No context available in pool after {timeout}s"
-            logger.error(error_msg)
-            raise ContextPoolExhausted(error_msg)
+        logger.debug(f"Context acquired (available: {available})")
+        return context
 
-    def release_context(self, context: BrowserContext):
+    def release_context(self, context: BrowserContext, recycle: bool = False):
         """
         Release a context back to the pool
 
+        The context is reset for the next test, or recycled (closed and
+        replaced) after max_uses acquisitions, if the reset fails, or when
+        requested - e.g. after a test added init scripts or exposed bindings,
+        which cannot be removed from a context.
+
         Args:
             context: Context to release
+            recycle: Close the context instead of reusing it
+        """
+        with self._lock:
+            if context not in self._in_use:
+                logger.warning("Attempted to release context not from this pool")
+                return
+            uses = self._uses[context]
+
+        reason = None
+        if recycle:
+            reason = "requested"
+        elif self.max_uses and uses >= self.max_uses:
+            reason = "max_uses"
+        else:
+            try:
+                if not self._reset(context):
+                    reason = "storage"
+            except Exception as e:
+                logger.debug(f"Context reset failed, recycling: {e}")
+                reason = "reset_error"
+
+        if reason is not None:
+            self._discard(context)
+
+        with self._available:
+            self._in_use.discard(context)
+            self._stats["total_releases"] += 1
+            if reason is None:
+                self._stats["resets"] += 1
+                self._idle.append(context)
+                self._idle_since[context] = time.monotonic()
+            else:
+                self._stats["contexts_recycled"] += 1
+                self._recycle_reasons[reason] = self._recycle_reasons.get(reason, 0) + 1
+            self._available.notify()
+            available = len(self._idle)
+
+        logger.debug(f"Context {'recycled (' + reason + ')' if reason else 'released'} (available: {available})")
+        self._trim()
+        self._top_up()
+
+    def _reset(self, context: BrowserContext) -> bool:
         """
-        if context not in self.all_contexts:
-            logger.warning("Attempted to release context not from this pool")
-            return
+        Reset a context to a fresh state
 
+        Returns:
+            False if origins visited by already closed pages still hold web
+            storage (it can only be cleared from a page of that origin)
+        """
+        cleared: Set[str] = set()
+        for page in list(context.pages):
+            origin = _origin(page.url)
+            if origin and origin not in cleared:
+                page.evaluate(_CLEAR_STORAGE_JS)
+                cleared.add(origin)
+            page.close()
+
+        origins = self._origins[context]
+        if origins - cleared:
+            return False
+        origins.clear()
+
+        context.clear_cookies()
+        context.clear_permissions()
+        if self.context_options.get("permissions"):
+            context.grant_permissions(self.context_options["permissions"])
+        context.unroute_all()  # Playwright >= 1.41
+        context.set_offline(bool(self.context_options.get("offline", False)))
+        context.set_extra_http_headers(self.context_options.get("extra_http_headers") or {})
+        return True
+
+    def _discard(self, context: BrowserContext):
+        with self._lock:
+            if context in self.all_contexts:
+                self.all_contexts.remove(context)
+            self._uses.pop(context, None)
+            self._origins.pop(context, None)
         try:
-            # Clean up context before returning to pool
-            pages = context.pages
-            for page in pages:
-                try:
-                    page.close()
-                except Exception as e:
-                    logger.debug(f"Error closing page during cleanup: {e}")
-
-            # Return to pool
-            self.available_contexts.put(context)
-
-            with self._lock:
-                self._stats["total_releases"] += 1
-                self._stats["contexts_in_use"] -= 1
-                self._stats["contexts_available"] = self.available_contexts.qsize()
-
-            logger.debug(f"Context released (available: {self.available_contexts.qsize()})")
-
+            context.close()
         except Exception as e:
-            logger.error(f"Error releasing context: {e}")
+            logger.debug(f"Error closing pooled context: {e}")
+
+    def _trim(self):
+        """Close contexts idle longer than idle_timeout, down to min_size/warm_spares"""
+        floor = max(self.min_size, self.warm_spares)
+        expired = []
+        now = time.monotonic()
+        with self._lock:
+            # Oldest idle contexts are at the left
+            while len(self._idle) > floor and now - self._idle_since[self._idle[0]] > self.idle_timeout:
+                context = self._idle.popleft()
+                self._idle_since.pop(context, None)
+                expired.append(context)
+            self._stats["contexts_trimmed"] += len(expired)
+        for context in expired:
+            self._discard(context)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get pool statistics"""
         with self._lock:
             return {
                 "enabled": True,
-                "pool_size": self.pool_size,
-                "contexts_available": self._stats["contexts_available"],
-                "contexts_in_use": self._stats["contexts_in_use"],
+                "pool_size": self.max_size,
+                "min_size": self.min_size,
+                "warm_spares": self.warm_spares,
+                "contexts_open": len(self.all_contexts),
+                "contexts_available": len(self._idle),
+                "contexts_in_use": len(self._in_use),
                 "total_acquisitions": self._stats["total_acquisitions"],
                 "total_releases": self._stats["total_releases"],
                 "wait_timeouts": self._stats["wait_timeouts"],
+                "contexts_created": self._stats["contexts_created"],
+                "contexts_recycled": self._stats["contexts_recycled"],
+                "contexts_trimmed": self._stats["contexts_trimmed"],
+                "resets": self._stats["resets"],
+                "recycle_reasons": dict(self._recycle_reasons),
+                "acquire_latency": self._acquire_latency.snapshot(),
             }
 
     def close_all(self):
         """Close all contexts in the pool"""
         logger.info("Closing all contexts in pool")
 
-        for context in self.all_contexts:
+        with self._available:
+            contexts = list(self.all_contexts)
+            self.all_contexts.clear()
+            self._idle.clear()
+            self._idle_since.clear()
+            self._in_use.clear()
+            self._uses.clear()
+            self._origins.clear()
+
+        for context in contexts:
             try:
                 context.close()
             except Exception as e:
                 logger.debug(f"Error closing pooled context: {e}")
 
-        self.all_contexts.clear()
-
-        # Clear queue
-        while not self.available_contexts.empty():
-            try:
-                self.available_contexts.get_nowait()
-            except Empty:
-                break
-
         logger.info("All pooled contexts closed")
 
 
@@ -0,0 +1,132 @@
+"""
+Pytest Shared Browser Server
+============================
+
+Opt-in (--browser-server): instead of every pytest-xdist worker starting
+its own Playwright driver and browser, the controller launches one (or
+--browser-server-count N) browser servers per host and publishes their
+WebSocket endpoints to the workers. Each worker connects to one endpoint
+(round-robin by worker id) and creates its own isolated contexts:
+
+- pytest-playwright's browser fixture connects through connect_options
+  (overridden in conftest.py with the browser_server_endpoint fixture)
+- PlaywrightEngine / ContextPool connect via $PLAYWRIGHT_WS_ENDPOINT
+
+Endpoints reach the workers through workerinput (pytest_configure_node);
+without xdist the single process uses the first server. Server startup
+time and memory are reported in the terminal summary. Launch arguments
+the browser_type_launch_args fixture would add are supplied through the
+pytest_browser_server_launch_args hook (see browser_server_hooks.py).
+
+Usage:
+    pytest -n 8 --browser-server
+    pytest -n 32 --browser-server --browser-server-count 4
+"""
+
+import os
+from typing import List, Optional
+
+import pytest
+
+from framework.ui import browser_server_hooks
+from framework.ui.browser_server import BrowserServer, select_endpoint, start_browser_servers
+from framework.ui.playwright_engine import WS_ENDPOINT_ENV, BrowserStartupError
+
+_ENDPOINTS_KEY = "browser_ws_endpoints"
+
+
+def pytest_addhooks(pluginmanager):
+    pluginmanager.add_hookspecs(browser_server_hooks)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("browser-server", "Shared browser server")
+    group.addoption(
+        "--browser-server",
+        action="store_true",
+        default=False,
+        help="Launch shared browser server(s) once and connect all workers to them",
+    )
+    group.addoption(
+        "--browser-server-count",
+        action="store",
+        type=int,
+        default=1,
+        help="Number of browser servers per host; workers are spread round-robin (default: 1)",
+    )
+
+
+def _browser_options(config) -> dict:
+    """Browser, channel and headless mode as selected for pytest-playwright"""
+    browsers = config.getoption("browser", default=None) or ["chromium"]
+    args: List[str] = []
+    launch_options: dict = {}
+    for result in config.hook.pytest_browser_server_launch_args(config=config):
+        result = dict(result or {})
+        args.extend(result.pop("args", None) or [])
+        launch_options.update(result)
+    return {
+        "browser_type": browsers[0],
+        "channel": config.getoption("browser_channel", default=None),
+        "headless": not config.getoption("headed", default=False),
+        "args": args,
+        "launch_options": launch_options,
+    }
+
+
+def browser_ws_endpoint(config) -> Optional[str]:
+    """Endpoint of the browser server this process should connect to, if any"""
+    return getattr(config, "_browser_ws_endpoint", None)
+
+
+@pytest.fixture(scope="session")
+def browser_server_endpoint(pytestconfig) -> Optional[str]:
+    """Endpoint of the shared browser server (None without --browser-server)"""
+    return browser_ws_endpoint(pytestconfig)
+
+
+def pytest_configure(config):
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        endpoint = select_endpoint(workerinput.get(_ENDPOINTS_KEY, []), workerinput.get("workerid"))
+    elif config.getoption("browser_server", default=False):
+        count = max(1, config.getoption("browser_server_count"))
+        try:
+            servers: List[BrowserServer] = start_browser_servers(count, **_browser_options(config))
+        except BrowserStartupError as e:
+            raise pytest.UsageError(f"--browser-server: {e}") from e
+        config._browser_servers = servers
+        endpoint = servers[0].ws_endpoint
+    else:
+        return
+    if endpoint:
+        config._browser_ws_endpoint = endpoint
+        os.environ[WS_ENDPOINT_ENV] = endpoint
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """xdist: hand the endpoints to each worker as it is created"""
+    servers = getattr(node.config, "_browser_servers", None)
+    if servers:
+        node.workerinput[_ENDPOINTS_KEY] = [server.ws_endpoint for server in servers]
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    servers = getattr(config, "_browser_servers", None)
+    if not servers:
+        return
+    terminalreporter.section("browser server")
+    for server in servers:
+        rss = server.rss_bytes()
+        memory = f"{rss / 2**20:.0f} MiB" if rss is not None else "n/a"
+        terminalreporter.write_line(
+            f"{server.ws_endpoint}  startup {server.startup_seconds:.2f} s  RSS {memory}"
+        )
+
+
+def pytest_unconfigure(config):
+    for server in getattr(config, "_browser_servers", None) or []:
+        server.stop()
+    if getattr(config, "_browser_ws_endpoint", None):
+        os.environ.pop(WS_ENDPOINT_ENV, None)
@@ -8,12 +8,18 @@
 - Better browser driver management with auto-download
 - Multiple browser support (Chrome, Firefox, Edge, Safari)
 - Remote WebDriver capabilities
-- Driver version management
+- Driver version management (resolved once per host, cached by browser version)
+- Pre-launched driver pool, reset between tests instead of quit
+- Explicit waits (no implicit wait, so negative lookups return immediately)
 """
 
+import atexit
 import os
 import platform
-from typing import Any, Dict, Optional
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
@@ -23,12 +29,11 @@
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.core.os_manager import ChromeType
-from webdriver_manager.firefox import GeckoDriverManager
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
 
 from framework.ui.base_page import BasePage
+from framework.ui.driver_resolver import resolve_driver
 from utils.logger import get_logger
 
 # Self-instrumentation for selenium engine module
@@ -55,6 +60,48 @@ class GridConnectionError(Exception):
     pass
 
 
+class DriverPoolExhausted(Exception):
+    """Exception when the driver pool has no available driver"""
+
+    pass
+
+
+def build_driver(browser_type: str = "chrome", headless: bool = True, cache_valid_days: Optional[float] = None):
+    """
+    Launch a local WebDriver session
+
+    Args:
+        browser_type: 'chrome' or 'firefox'
+        headless: Run browser in headless mode
+        cache_valid_days: Days before the host driver cache resolves a driver again
+            (default: the resolver's setting)
+
+    Returns:
+        WebDriver instance
+    """
+    if browser_type == "chrome":
+        options = webdriver.ChromeOptions()
+        if headless:
+            options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--start-maximized")
+
+        # A None path lets Selenium Manager resolve the driver
+        service = ChromeService(resolve_driver("chrome", cache_valid_days))
+        return webdriver.Chrome(service=service, options=options)
+
+    if browser_type == "firefox":
+        options = webdriver.FirefoxOptions()
+        if headless:
+            options.add_argument("--headless")
+
+        service = FirefoxService(resolve_driver("firefox", cache_valid_days))
+        return webdriver.Firefox(service=service, options=options)
+
+    raise ValueError(f"Unsupported browser: {browser_type}")
+
+
 class SeleniumEngine:
     """
     Enhanced Selenium WebDriver engine
@@ -75,6 +122,9 @@ def __init__(
         platform_name: Optional[str] = None,
         driver_cache_valid_range: int = 7,
         enable_logging: bool = True,
+        enable_driver_pool: bool = False,
+        pool_size: int = 2,
+        default_timeout: float = 10,
     ):
         """
         Initialize Selenium Engine
@@ -84,8 +134,12 @@ def __init__(
             grid_url: Selenium Grid hub URL (e.g., 'http://localhost:4444/wd/hub')
             browser_version: Specific browser version to use
             platform_name: Platform for Grid execution (e.g., 'LINUX', 'WINDOWS', 'MAC')
-            driver_cache_valid_range: Days to cache driver (default 7)
+            driver_cache_valid_range: Days before the host driver cache resolves a driver again (default 7)
             enable_logging: Enable driver logging
+            enable_driver_pool: Take the driver from a pool of pre-launched sessions
+                and return it on stop() instead of quitting
+            pool_size: Pre-launched sessions kept ready in the pool
+            default_timeout: Seconds explicit waits wait for elements
         """
         self.driver: Optional[webdriver.Remote] = None
         self.headless = headless
@@ -95,48 +149,49 @@ def __init__(
         self.driver_cache_valid_range = driver_cache_valid_range
         self.enable_logging = enable_logging
         self._is_remote = bool(grid_url)
+        self.enable_driver_pool = enable_driver_pool
+        self.pool_size = pool_size
+        self.default_timeout = default_timeout
+        self.driver_pool: Optional["DriverPool"] = None
 
     @log_function(log_args=True, log_timing=True)
     def start(self, browser_type: str = "chrome"):
-        """Start Selenium browser"""
-        if browser_type == "chrome":
-            options = webdriver.ChromeOptions()
-            if self.headless:
-                options.add_argument("--headless=new")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--start-maximized")
-
-            service = ChromeService(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
-
-        elif browser_type == "firefox":
-            options = webdriver.FirefoxOptions()
-            if self.headless:
-                options.add_argument("--headless")
-
-            service = FirefoxService(GeckoDriverManager().install())
-            self.driver = webdriver.Firefox(service=service, options=options)
-
+        """Start Selenium browser (or take a pre-launched one from the pool)"""
+        if self.enable_driver_pool:
+            self.driver_pool = get_driver_pool(
+                browser_type, self.headless, self.pool_size, self.driver_cache_valid_range
+            )
+            self.driver = self.driver_pool.acquire()
         else:
-            raise ValueError(f"Unsupported browser: {browser_type}")
+            self.driver = build_driver(browser_type, self.headless, self.driver_cache_valid_range)
 
-        self.driver.implicitly_wait(10)
         logger.info(f"Selenium {browser_type} started (headless={self.headless})")
 
     @log_function(log_timing=True)
-    def stop(self):
-        """Stop Selenium browser"""
+    def stop(self, recycle: bool = False):
+        """
+        Stop Selenium browser
+
+        Args:
+            recycle: With a driver pool, quit the session instead of resetting it for reuse
+        """
         try:
             if self.driver:
                 session_id = getattr(self.driver, "session_id", None)
-                self.driver.quit()
-                logger.info(f"Selenium stopped (session: {session_id})")
+                if self.driver_pool is not None:
+                    self.driver_pool.release(self.driver, recycle=recycle)
+                    logger.info(f"Selenium session returned to pool (session: {session_id})")
+                else:
+                    self.driver.quit()
+                    logger.info(f"Selenium stopped (session: {session_id})")
         except Exception as e:
             logger.warning(f"Error stopping Selenium: {e}")
         finally:
             self.driver = None
 
+    def _wait(self, timeout: Optional[float] = None) -> WebDriverWait:
+        return WebDriverWait(self.driver, self.default_timeout if timeout is None else timeout)
+
     @log_function(log_result=True)
     def get_driver_info(self) -> Dict[str, Any]:
         """Get driver information"""
@@ -179,39 +234,38 @@ def navigate(self, url: str):
 
     @log_function(log_args=True)
     def click(self, locator: str, by: By = By.CSS_SELECTOR):
-        """Click element"""
-        element = self.driver.find_element(by, locator)
+        """Click element (waits until clickable)"""
+        element = self._wait().until(EC.element_to_be_clickable((by, locator)))
         element.click()
         logger.debug(f"Clicked: {locator}")
 
     @log_function(log_args=True)
     def fill(self, locator: str, text: str, by: By = By.CSS_SELECTOR):
-        """Fill input field"""
-        element = self.driver.find_element(by, locator)
+        """Fill input field (waits until present)"""
+        element = self._wait().until(EC.presence_of_element_located((by, locator)))
         element.clear()
         element.send_keys(text)
         logger.debug(f"Filled {locator} with text")
 
     @log_function(log_args=True, log_result=True)
     def get_text(self, locator: str, by: By = By.CSS_SELECTOR) -> str:
-        """Get element text"""
-        element = self.driver.find_element(by, locator)
+        """Get element text (waits until present)"""
+        element = self._wait().until(EC.presence_of_element_located((by, locator)))
         return element.text
 
     @log_function(log_args=True, log_result=True)
     def is_visible(self, locator: str, by: By = By.CSS_SELECTOR) -> bool:
-        """Check if element is visible"""
+        """Check if element is visible right now (does not wait)"""
         try:
-            element = self.driver.find_element(by, locator)
-            return element.is_displayed()
+            elements = self.driver.find_elements(by, locator)
+            return bool(elements) and elements[0].is_displayed()
         except Exception:
             return False
 
     @log_function(log_args=True)
-    def wait_for_element(self, locator: str, timeout: int = 10, by: By = By.CSS_SELECTOR):
+    def wait_for_element(self, locator: str, timeout: Optional[float] = None, by: By = By.CSS_SELECTOR):
         """Wait for element"""
-        wait = WebDriverWait(self.driver, timeout)
-        wait.until(EC.presence_of_element_located((by, locator)))
+        self._wait(timeout).until(EC.presence_of_element_located((by, locator)))
 
     @log_function(log_args=True)
     def take_screenshot(self, filename: str):
@@ -224,6 +278,313 @@ def get_driver(self):
         return self.driver
 
 
+# ========================================================================
+# DRIVER POOL IMPLEMENTATION
+# ========================================================================
+
+
+class DriverPool:
+    """
+    Pool of pre-launched WebDriver sessions reused across tests
+
+    Features:
+    - Keeps `size` idle sessions launched ahead of time, refilled in a
+      background thread after each acquisition (and never more than that)
+    - Resets sessions on release (windows, cookies, web storage of the
+      current origin, about:blank) instead of quitting them; see _reset
+      for what a reset does not clear
+    - Recycles a session after max_uses, when its reset fails, or on request
+    - Thread-safe acquisition/release
+    """
+
+    # Web storage can only be cleared from a page of its own origin
+    _CLEAR_STORAGE_JS = "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = 2,
+        max_size: Optional[int] = None,
+        max_uses: int = 50,
+        reset_url: str = "about:blank",
+        prelaunch: bool = True,
+    ):
+        """
+        Initialize driver pool
+
+        Args:
+            factory: Launches a new WebDriver session
+            size: Idle sessions kept ready
+            max_size: Maximum sessions open at once (default: unlimited)
+            max_uses: Acquisitions before a session is quit and replaced (0: never)
+            reset_url: Page each session is left on after a reset
+            prelaunch: Launch the idle sessions in the background right away
+        """
+        self.factory = factory
+        self.size = size
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.reset_url = reset_url
+
+        self._idle: Deque[Any] = deque()
+        self._in_use: Set[Any] = set()
+        self._uses: Dict[Any, int] = {}
+        self._launching = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._stats = {
+            "total_acquisitions": 0,
+            "total_releases": 0,
+            "warm_acquisitions": 0,
+            "sessions_launched": 0,
+            "sessions_recycled": 0,
+            "launch_failures": 0,
+            "acquire_ms_total": 0.0,
+        }
+
+        if prelaunch:
+            self._refill_async()
+
+    def _open_count(self) -> int:
+        return len(self._idle) + len(self._in_use) + self._launching
+
+    def _launch(self):
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._stats["launch_failures"] += 1
+            raise
+        with self._lock:
+            self._uses[driver] = 0
+            self._stats["sessions_launched"] += 1
+        return driver
+
+    def _refill(self):
+        """Launch sessions until `size` are idle"""
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) + self._launching >= self.size:
+                    return
+                if self.max_size is not None and self._open_count() >= self.max_size:
+                    return
+                self._launching += 1
+            try:
+                driver = self._launch()
+            except Exception as e:
+                logger.warning(f"Pre-launching WebDriver session failed: {e}")
+                with self._available:
+                    self._launching -= 1
+                    # Waiters counting on this session launch one themselves
+                    self._available.notify()
+                return
+            with self._available:
+                self._launching -= 1
+                if self._closed:
+                    driver.quit()
+                    return
+                self._idle.append(driver)
+                self._available.notify()
+
+    def _refill_async(self):
+        threading.Thread(target=self._refill, name="driver-pool-refill", daemon=True).start()
+
+    def acquire(self, timeout: float = 120.0):
+        """
+        Acquire a WebDriver session
+
+        Takes an idle session, waits for one being pre-launched, or
+        launches one if none is on the way.
+
+        Args:
+            timeout: Maximum wait time in seconds
+
+        Returns:
+            WebDriver instance
+
+        Raises:
+            DriverPoolExhausted: If no session is available within timeout
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        driver = None
+        launch = False
+        with self._available:
+            while True:
+                if self._idle:
+                    driver = self._idle.popleft()
+                    self._stats["warm_acquisitions"] += 1
+                    break
+                if self._launching == 0 and (self.max_size is None or self._open_count() < self.max_size):
+                    self._launching += 1
+                    launch = True
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DriverPoolExhausted(f"No WebDriver session available after {timeout}s")
+                self._available.wait(remaining)
+
+        if launch:
+            try:
+                driver = self._launch()
+            finally:
+                with self._available:
+                    self._launching -= 1
+                    self._available.notify()
+
+        with self._lock:
+            self._in_use.add(driver)
+            self._uses[driver] += 1
+            self._stats["total_acquisitions"] += 1
+            self._stats["acquire_ms_total"] += (time.monotonic() - started) * 1000
+
+        self._refill_async()
+        return driver
+
+    def release(self, driver, recycle: bool = False):
+        """
+        Return a session to the pool
+
+        Args:
+            driver: WebDriver from acquire()
+            recycle: Quit the session instead of resetting it
+        """
+        with self._lock:
+            if driver not in self._in_use:
+                logger.warning("Attempted to release driver not from this pool")
+                return
+            uses = self._uses[driver]
+
+        reuse = not recycle and not (self.max_uses and uses >= self.max_uses)
+        if reuse:
+            try:
+                self._reset(driver)
+            except Exception as e:
+                logger.debug(f"WebDriver reset failed, recycling: {e}")
+                reuse = False
+
+        surplus = []
+        with self._available:
+            self._in_use.discard(driver)
+            self._stats["total_releases"] += 1
+            if reuse and not self._closed:
+                # Reused first; sessions beyond `size` idle are quit
+                self._idle.appendleft(driver)
+                while len(self._idle) > max(self.size, 1):
+                    surplus.append(self._idle.pop())
+                for extra in surplus:
+                    self._uses.pop(extra, None)
+                self._available.notify()
+            else:
+                self._uses.pop(driver, None)
+                self._stats["sessions_recycled"] += 1
+                reuse = False
+
+        for extra in surplus if reuse else [driver]:
+            try:
+                extra.quit()
+            except Exception as e:
+                logger.debug(f"Error quitting WebDriver: {e}")
+        if not reuse:
+            self._refill_async()
+
+    def _reset(self, driver):
+        """
+        Single window on reset_url, cookies and current-origin storage cleared
+
+        localStorage/sessionStorage are cleared for the origin the session is
+        on at release only; storage of other origins visited during the test
+        survives, as do cookies of other domains on Firefox. Release with
+        recycle=True after tests that depend on a clean state across origins.
+        """
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.execute_script(self._CLEAR_STORAGE_JS)
+        driver.delete_all_cookies()
+        # Cookies of every domain through CDP where available (Chromium);
+        # WebDriver's delete_all_cookies only covers the current document's domain
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.get(self.reset_url)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        with self._lock:
+            acquisitions = self._stats["total_acquisitions"]
+            return {
+                "enabled": True,
+                "pool_size": self.size,
+                "sessions_available": len(self._idle),
+                "sessions_in_use": len(self._in_use),
+                "sessions_launching": self._launching,
+                "total_acquisitions": acquisitions,
+                "total_releases": self._stats["total_releases"],
+                "warm_acquisitions": self._stats["warm_acquisitions"],
+                "sessions_launched": self._stats["sessions_launched"],
+                "sessions_recycled": self._stats["sessions_recycled"],
+                "launch_failures": self._stats["launch_failures"],
+                "avg_acquire_ms": round(self._stats["acquire_ms_total"] / acquisitions, 2) if acquisitions else 0.0,
+            }
+
+    def close_all(self):
+        """Quit all sessions"""
+        with self._available:
+            self._closed = True
+            drivers = list(self._idle) + list(self._in_use)
+            self._idle.clear()
+            self._in_use.clear()
+            self._uses.clear()
+            self._available.notify_all()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug(f"Error quitting pooled WebDriver: {e}")
+
+
+_driver_pools: Dict[Tuple[str, bool], DriverPool] = {}
+_driver_pools_lock = threading.Lock()
+
+
+def get_driver_pool(
+    browser_type: str = "chrome", headless: bool = True, size: int = 2, cache_valid_days: Optional[float] = None
+) -> DriverPool:
+    """
+    Process-wide driver pool per (browser, headless), closed at exit
+
+    Args:
+        browser_type: 'chrome' or 'firefox'
+        headless: Run browser in headless mode
+        size: Idle sessions kept ready (used when the pool is created)
+        cache_valid_days: Driver cache validity for the pool's sessions (used when the pool is created)
+
+    Returns:
+        DriverPool
+    """
+    key = (browser_type, headless)
+    with _driver_pools_lock:
+        pool = _driver_pools.get(key)
+        if pool is None:
+            pool = _driver_pools[key] = DriverPool(
+                lambda: build_driver(browser_type, headless, cache_valid_days), size=size
+            )
+    return pool
+
+
+@atexit.register
+def close_driver_pools():
+    """Quit every pooled session"""
+    with _driver_pools_lock:
+        pools = list(_driver_pools.values())
+        _driver_pools.clear()
+    for pool in pools:
+        pool.close_all()
+
+
 class SeleniumPage(BasePage):
     """Selenium-based page object"""
 
@@ -255,8 +616,8 @@ def get_text(self, locator: str, by: By = By.CSS_SELECTOR) -> str:
     @log_function(log_args=True, log_result=True)
     def is_visible(self, locator: str, by: By = By.CSS_SELECTOR) -> bool:
         try:
-            element = self.driver.find_element(by, locator)
-            return element.is_displayed()
+            elements = self.driver.find_elements(by, locator)
+            return bool(elements) and elements[0].is_displayed()
         except Exception:
             return False
 
@@ -278,4 +639,13 @@ def get_title(self) -> str:
         return self.driver.title
 
 
-__all__ = ["SeleniumEngine", "SeleniumPage", "DriverManagerError", "GridConnectionError"]
+__all__ = [
+    "SeleniumEngine",
+    "SeleniumPage",
+    "DriverManagerError",
+    "GridConnectionError",
+    "DriverPool",
+    "DriverPoolExhausted",
+    "build_driver",
+    "get_driver_pool",
+]
@@ -1,5 +1,6 @@
 """Visual regression testing module"""
 
+from framework.visual.tile_hash import TileHashGrid
 from framework.visual.visual_regression import VisualRegression
 
-__all__ = ["VisualRegression"]
+__all__ = ["TileHashGrid", "VisualRegression"]
@@ -0,0 +1,126 @@
+"""
+Batch Comparison - Process-pool fan-out for visual comparisons
+
+Tests only capture screenshots; the decode/diff/diff-image work for the whole
+suite runs afterwards across a process pool. Results are yielded as each
+comparison finishes so callers can stream them into their own result lists.
+
+Manifest format (JSON list, or the equivalent Python objects):
+    [
+        {"screenshot_path": "shots/home.png", "name": "home"},
+        {"screenshot_path": "shots/cart.png", "name": "cart", "viewport": [1280, 720],
+         "threshold": 0.05, "ignore_regions": [[0, 0, 1280, 80]]}
+    ]
+"""
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from framework.visual.tile_hash import Box
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class BatchItem:
+    """One (screenshot, baseline) comparison in a batch manifest"""
+
+    screenshot_path: str
+    name: str
+    viewport: Optional[Tuple[int, int]] = None
+    threshold: Optional[float] = None
+    regions: Optional[List[Box]] = None
+    ignore_regions: Optional[List[Box]] = None
+
+    @classmethod
+    def from_entry(cls, entry: Union["BatchItem", Dict[str, Any], Sequence]) -> "BatchItem":
+        """Build an item from a BatchItem, a manifest dict or a (screenshot_path, name) tuple"""
+        if isinstance(entry, cls):
+            return entry
+        if isinstance(entry, dict):
+            known = {f.name for f in fields(cls)}
+            unknown = set(entry) - known
+            if unknown:
+                raise ValueError(f"Unknown manifest keys: {', '.join(sorted(unknown))}")
+            item = cls(**entry)
+        else:
+            item = cls(*entry)
+        # JSON manifests deliver lists; normalize to tuples
+        if item.viewport is not None:
+            item.viewport = tuple(item.viewport)
+        if item.regions:
+            item.regions = [tuple(box) for box in item.regions]
+        if item.ignore_regions:
+            item.ignore_regions = [tuple(box) for box in item.ignore_regions]
+        return item
+
+
+ManifestLike = Union[str, Path, Iterable[Union[BatchItem, Dict[str, Any], Sequence]]]
+
+
+def load_manifest(manifest: ManifestLike) -> List[BatchItem]:
+    """
+    Normalize a manifest into batch items
+
+    Args:
+        manifest: Path to a JSON manifest file, or an iterable of entries
+
+    Returns:
+        List of BatchItem
+    """
+    if isinstance(manifest, (str, Path)):
+        with open(manifest, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    return [BatchItem.from_entry(entry) for entry in manifest]
+
+
+def run_in_pool(
+    worker: Callable[..., Any],
+    jobs: Sequence[Tuple],
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[int, Any, Optional[BaseException]]]:
+    """
+    Run worker(*job) for every job, yielding results as they complete
+
+    A spawn context is used so workers never inherit logging threads or
+    locks from the test process. With one worker (or one job) everything
+    runs in-process.
+
+    Args:
+        worker: Picklable module-level function
+        jobs: Argument tuples, one per call
+        max_workers: Pool size (defaults to the CPU count)
+
+    Yields:
+        (job index, result, exception) tuples in completion order
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    workers = min(max_workers, len(jobs))
+
+    if workers <= 1:
+        for index, job in enumerate(jobs):
+            try:
+                yield index, worker(*job), None
+            except Exception as e:
+                yield index, None, e
+        return
+
+    logger.info(f"Running {len(jobs)} visual comparison(s) across {workers} process(es)")
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(worker, *job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                yield index, future.result(), None
+            except Exception as e:
+                yield index, None, e
+
+
+__all__ = ["BatchItem", "load_manifest", "run_in_pool"]
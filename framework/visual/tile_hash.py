@@ -0,0 +1,258 @@
+"""
+Tile Hashing - Content-addressed grid of screenshot tiles
+
+Each baseline is stored with a sidecar file holding one content hash per
+fixed-size tile. Comparing a new screenshot then only needs to hash its own
+tiles: identical tiles are skipped entirely and the pixel diff runs only on
+tiles whose hash changed. Unchanged pages never decode the baseline image.
+
+Regions of interest are expressed as ``(left, top, right, bottom)`` boxes:
+- ``regions``: only pixels inside these boxes are compared
+- ``ignore_regions``: pixels inside these boxes are ignored
+Ignored pixels are neutralized (painted black) in both images before diffing,
+the same way Playwright masks are applied.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TILE_SIZE = 64
+SIDECAR_SUFFIX = ".tiles.json"
+SIDECAR_VERSION = 1
+
+Box = Tuple[int, int, int, int]
+
+
+@dataclass
+class TileHashGrid:
+    """Per-tile content hashes of an RGB image, stored row-major"""
+
+    width: int
+    height: int
+    tile_size: int = DEFAULT_TILE_SIZE
+    hashes: List[str] = field(default_factory=list)
+
+    @property
+    def columns(self) -> int:
+        return -(-self.width // self.tile_size)
+
+    @property
+    def rows(self) -> int:
+        return -(-self.height // self.tile_size)
+
+    @classmethod
+    def from_image(cls, image: Image.Image, tile_size: int = DEFAULT_TILE_SIZE) -> "TileHashGrid":
+        """
+        Hash every tile of an image
+
+        Args:
+            image: Image to hash (converted to RGB)
+            tile_size: Tile edge length in pixels
+
+        Returns:
+            TileHashGrid for the image
+        """
+        pixels = np.asarray(image.convert("RGB"))
+        height, width = pixels.shape[:2]
+        hashes = []
+        for top in range(0, height, tile_size):
+            for left in range(0, width, tile_size):
+                tile = pixels[top : top + tile_size, left : left + tile_size]
+                hashes.append(hashlib.blake2b(tile.tobytes(), digest_size=8).hexdigest())
+        return cls(width=width, height=height, tile_size=tile_size, hashes=hashes)
+
+    def tile_box(self, index: int) -> Box:
+        """Return the (left, top, right, bottom) pixel box of a tile"""
+        row, column = divmod(index, self.columns)
+        left = column * self.tile_size
+        top = row * self.tile_size
+        return (
+            left,
+            top,
+            min(left + self.tile_size, self.width),
+            min(top + self.tile_size, self.height),
+        )
+
+    def is_compatible(self, other: "TileHashGrid") -> bool:
+        """Check that two grids cover the same image size with the same tiling"""
+        return (self.width, self.height, self.tile_size) == (
+            other.width,
+            other.height,
+            other.tile_size,
+        )
+
+    def changed_tiles(
+        self,
+        other: "TileHashGrid",
+        regions: Optional[Sequence[Box]] = None,
+        ignore_regions: Optional[Sequence[Box]] = None,
+    ) -> List[Box]:
+        """
+        List tiles whose content differs from another grid
+
+        Args:
+            other: Grid to compare against (must be compatible)
+            regions: Only report tiles intersecting these boxes
+            ignore_regions: Skip tiles fully covered by these boxes
+
+        Returns:
+            Pixel boxes of changed tiles
+        """
+        if not self.is_compatible(other):
+            raise ValueError("Tile grids differ in size or tile size")
+
+        changed = []
+        for index, (mine, theirs) in enumerate(zip(self.hashes, other.hashes)):
+            if mine == theirs:
+                continue
+            box = self.tile_box(index)
+            if regions and not any(_intersects(box, region) for region in regions):
+                continue
+            if ignore_regions and any(_contains(ignored, box) for ignored in ignore_regions):
+                continue
+            changed.append(box)
+        return changed
+
+    def save(self, path: Path, source: Optional[List[int]] = None) -> None:
+        """Write the grid to a JSON sidecar file with the source file's [size, mtime_ns]"""
+        data = {
+            "version": SIDECAR_VERSION,
+            "source": source,
+            "width": self.width,
+            "height": self.height,
+            "tile_size": self.tile_size,
+            "hashes": self.hashes,
+        }
+        Path(path).write_text(json.dumps(data), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> Tuple[Optional["TileHashGrid"], Optional[List[int]]]:
+        """Load (grid, source signature) from a JSON sidecar file, (None, None) if unusable"""
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            if data.get("version") != SIDECAR_VERSION:
+                return None, None
+            grid = cls(
+                width=data["width"],
+                height=data["height"],
+                tile_size=data["tile_size"],
+                hashes=list(data["hashes"]),
+            )
+            return grid, data.get("source")
+        except FileNotFoundError:
+            return None, None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable tile hash sidecar {path}: {e}")
+            return None, None
+
+
+def sidecar_path(image_path: Path) -> Path:
+    """Return the tile hash sidecar path for an image"""
+    image_path = Path(image_path)
+    return image_path.with_name(image_path.stem + SIDECAR_SUFFIX)
+
+
+def write_sidecar(
+    image_path: Path, tile_size: int = DEFAULT_TILE_SIZE, grid: Optional[TileHashGrid] = None
+) -> TileHashGrid:
+    """
+    Store the tile hash sidecar next to an image file
+
+    Args:
+        image_path: Image the sidecar describes
+        tile_size: Tile edge length (ignored when grid is given)
+        grid: Precomputed grid for the image; hashed from disk if omitted
+
+    Returns:
+        The stored grid
+    """
+    image_path = Path(image_path)
+    if grid is None:
+        with Image.open(image_path) as image:
+            grid = TileHashGrid.from_image(image, tile_size)
+    grid.save(sidecar_path(image_path), _file_signature(image_path))
+    return grid
+
+
+def load_sidecar(image_path: Path) -> Optional[TileHashGrid]:
+    """
+    Load the tile hash sidecar of an image file
+
+    Returns None when there is no sidecar or the image was rewritten after
+    the sidecar was stored, so callers fall back to hashing the image.
+    """
+    image_path = Path(image_path)
+    grid, signature = TileHashGrid.load(sidecar_path(image_path))
+    if grid is None:
+        return None
+    try:
+        if signature != _file_signature(image_path):
+            return None
+    except OSError:
+        return None
+    return grid
+
+
+def _file_signature(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def apply_roi(
+    image: Image.Image,
+    regions: Optional[Sequence[Box]] = None,
+    ignore_regions: Optional[Sequence[Box]] = None,
+) -> Image.Image:
+    """
+    Neutralize pixels outside regions and inside ignore_regions
+
+    Args:
+        image: Source image (not modified)
+        regions: Boxes to keep; everything else is painted black
+        ignore_regions: Boxes to paint black
+
+    Returns:
+        RGB copy of the image with ignored pixels neutralized
+    """
+    image = image.convert("RGB")
+    if regions:
+        kept = Image.new("RGB", image.size, (0, 0, 0))
+        for region in regions:
+            kept.paste(image.crop(region), region[:2])
+        image = kept
+    for box in ignore_regions or ():
+        image.paste((0, 0, 0), box)
+    return image
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _contains(outer: Box, inner: Box) -> bool:
+    return (
+        outer[0] <= inner[0]
+        and outer[1] <= inner[1]
+        and outer[2] >= inner[2]
+        and outer[3] >= inner[3]
+    )
+
+
+__all__ = [
+    "DEFAULT_TILE_SIZE",
+    "TileHashGrid",
+    "apply_roi",
+    "load_sidecar",
+    "sidecar_path",
+    "write_sidecar",
+]
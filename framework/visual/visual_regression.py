@@ -3,6 +3,22 @@
 
 Provides automated visual regression testing with baseline management.
 Supports full page, element-level, and responsive screenshots.
+
+Two diff backends are available:
+- ``numpy`` (default): builds the pixel-diff mask, difference percentage and
+  red highlight overlay as array operations
+- ``pillow``: the original per-pixel Python implementation, kept for
+  comparison and debugging
+
+The backend is selected with the ``diff_backend`` argument or the
+``VISUAL_DIFF_BACKEND`` environment variable.
+
+With the numpy backend, baselines carry a per-tile hash sidecar (see
+``framework.visual.tile_hash``). Unchanged screenshots are decided by hashing
+alone, and the pixel diff only runs on tiles whose hash changed.
+
+``compare_batch`` runs a manifest of comparisons across a process pool after
+screenshots have been captured (see ``framework.visual.batch``).
 """
 
 import os
@@ -11,18 +27,37 @@
 from typing import Dict, List, Optional, Tuple
 
 import imagehash
+import numpy as np
 from PIL import Image, ImageChops, ImageDraw
 
+from framework.visual.batch import BatchItem, ManifestLike, load_manifest, run_in_pool
+from framework.visual.tile_hash import (
+    DEFAULT_TILE_SIZE,
+    Box,
+    TileHashGrid,
+    apply_roi,
+    load_sidecar,
+    write_sidecar,
+)
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+DIFF_BACKENDS = ("numpy", "pillow")
+
+# Sum of per-channel RGB deltas above which a pixel counts as "different"
+PIXEL_DIFF_THRESHOLD = 30
+
 
 class VisualRegression:
     """Visual regression testing engine"""
 
     def __init__(
-        self, baseline_dir: str = "tests/visual_baselines", report_dir: str = "reports/visual"
+        self,
+        baseline_dir: str = "tests/visual_baselines",
+        report_dir: str = "reports/visual",
+        diff_backend: Optional[str] = None,
+        tile_size: int = DEFAULT_TILE_SIZE,
     ):
         """
         Initialize visual regression tester
@@ -30,6 +65,9 @@ def __init__(
         Args:
             baseline_dir: Directory to store baseline images
             report_dir: Directory for visual diff reports
+            diff_backend: Diff implementation ("numpy" or "pillow").
+                Defaults to $VISUAL_DIFF_BACKEND, then "numpy".
+            tile_size: Tile edge length for baseline tile hashes (numpy backend)
         """
         self.baseline_dir = Path(baseline_dir)
         self.report_dir = Path(report_dir)
@@ -37,8 +75,20 @@ def __init__(
         self.report_dir.mkdir(parents=True, exist_ok=True)
 
         self.threshold = 0.1  # 10% difference threshold
+        self.diff_backend = self._resolve_diff_backend(diff_backend)
+        self.tile_size = tile_size
         self.results: List[Dict] = []
 
+    @staticmethod
+    def _resolve_diff_backend(diff_backend: Optional[str]) -> str:
+        """Resolve the configured diff backend"""
+        backend = (diff_backend or os.getenv("VISUAL_DIFF_BACKEND", "numpy")).lower()
+        if backend not in DIFF_BACKENDS:
+            raise ValueError(
+                f"Unknown visual diff backend '{backend}'. Expected one of: {', '.join(DIFF_BACKENDS)}"
+            )
+        return backend
+
     def capture_baseline(
         self, screenshot_path: str, name: str, viewport: Optional[Tuple[int, int]] = None
     ):
@@ -58,6 +108,9 @@ def capture_baseline(
 
         shutil.copy(screenshot_path, baseline_path)
 
+        if self.diff_backend == "numpy":
+            write_sidecar(baseline_path, self.tile_size)
+
         logger.info(f"Baseline captured: {baseline_name}")
 
         return baseline_path
@@ -68,6 +121,8 @@ def compare(
         name: str,
         viewport: Optional[Tuple[int, int]] = None,
         threshold: Optional[float] = None,
+        regions: Optional[List[Box]] = None,
+        ignore_regions: Optional[List[Box]] = None,
     ) -> Dict:
         """
         Compare screenshot against baseline
@@ -77,6 +132,8 @@ def compare(
             name: Baseline name identifier
             viewport: Optional viewport size
             threshold: Custom threshold (overrides default)
+            regions: Only compare pixels inside these (left, top, right, bottom) boxes
+            ignore_regions: Ignore pixels inside these (left, top, right, bottom) boxes
 
         Returns:
             Comparison result dictionary
@@ -95,23 +152,135 @@ def compare(
                 "passed": True,
             }
 
-        # Compare images
         current_img = Image.open(screenshot_path)
+
+        # Tile-hash short-circuit: unchanged screenshots never decode the baseline
+        current_grid = None
+        changed_tiles = None
+        if self.diff_backend == "numpy":
+            current_grid = TileHashGrid.from_image(current_img, self.tile_size)
+            baseline_grid = load_sidecar(baseline_path)
+            if baseline_grid is not None and current_grid.is_compatible(baseline_grid):
+                changed_tiles = current_grid.changed_tiles(baseline_grid, regions, ignore_regions)
+                if not changed_tiles:
+                    return self._record_result(
+                        name, viewport, 0.0, threshold, baseline_path, screenshot_path, None, 0
+                    )
+
         baseline_img = Image.open(baseline_path)
 
         # Ensure same size
-        if current_img.size != baseline_img.size:
+        size_matches = current_img.size == baseline_img.size
+        if not size_matches:
             logger.warning(
                 f"Size mismatch: current={current_img.size}, baseline={baseline_img.size}"
             )
             baseline_img = baseline_img.resize(current_img.size, Image.Resampling.LANCZOS)
 
+        # Baselines without a current sidecar (older or rewritten files) get one backfilled
+        if current_grid is not None and changed_tiles is None:
+            baseline_grid = TileHashGrid.from_image(baseline_img, self.tile_size)
+            if size_matches:
+                write_sidecar(baseline_path, grid=baseline_grid)
+            changed_tiles = current_grid.changed_tiles(baseline_grid, regions, ignore_regions)
+            if not changed_tiles:
+                return self._record_result(
+                    name, viewport, 0.0, threshold, baseline_path, screenshot_path, None, 0
+                )
+
+        if regions or ignore_regions:
+            current_img = apply_roi(current_img, regions, ignore_regions)
+            baseline_img = apply_roi(baseline_img, regions, ignore_regions)
+
+        # Build the pixel-diff mask once and share it between scoring and the diff image
+        diff_mask = self._compute_diff_mask(current_img, baseline_img, changed_tiles)
+
         # Calculate difference
-        diff_percentage = self._calculate_difference(current_img, baseline_img)
+        diff_percentage = self._calculate_difference(current_img, baseline_img, diff_mask)
 
         # Generate diff image
-        diff_image_path = self._generate_diff_image(current_img, baseline_img, name, viewport)
+        diff_image_path = self._generate_diff_image(
+            current_img, baseline_img, name, viewport, diff_mask
+        )
+
+        return self._record_result(
+            name,
+            viewport,
+            diff_percentage,
+            threshold,
+            baseline_path,
+            screenshot_path,
+            diff_image_path,
+            len(changed_tiles) if changed_tiles is not None else None,
+        )
+
+    def compare_batch(
+        self, manifest: ManifestLike, max_workers: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Compare many screenshots against their baselines in parallel
 
+        Decode, diff and diff-image writes run in a process pool; each result
+        is appended to self.results as soon as its comparison finishes.
+        Entries must have distinct baseline names.
+
+        Args:
+            manifest: JSON manifest path, or entries (BatchItem, dict or
+                (screenshot_path, name) tuple)
+            max_workers: Pool size (defaults to the CPU count, 1 = in-process)
+
+        Returns:
+            Comparison result dictionaries in manifest order
+        """
+        items = load_manifest(manifest)
+        settings = (
+            str(self.baseline_dir),
+            str(self.report_dir),
+            self.diff_backend,
+            self.tile_size,
+            self.threshold,
+        )
+        jobs = [(settings, item) for item in items]
+
+        results: List[Optional[Dict]] = [None] * len(items)
+        for index, result, error in run_in_pool(_compare_in_worker, jobs, max_workers):
+            if error is not None:
+                item = items[index]
+                logger.error(f"✗ Visual comparison errored: {item.name} ({error})")
+                result = {
+                    "name": item.name,
+                    "viewport": item.viewport,
+                    "status": "error",
+                    "difference_percentage": 1.0,
+                    "threshold": item.threshold if item.threshold is not None else self.threshold,
+                    "passed": False,
+                    "error": str(error),
+                    "baseline_path": str(
+                        self.baseline_dir / self._get_baseline_name(item.name, item.viewport)
+                    ),
+                    "current_path": item.screenshot_path,
+                    "diff_path": None,
+                    "timestamp": datetime.now().isoformat(),
+                }
+            # Mirror compare(): newly created baselines are not recorded as results
+            if result["status"] != "baseline_created":
+                self.results.append(result)
+            results[index] = result
+
+        return results
+
+    def _record_result(
+        self,
+        name: str,
+        viewport: Optional[Tuple[int, int]],
+        diff_percentage: float,
+        threshold: Optional[float],
+        baseline_path: Path,
+        screenshot_path: str,
+        diff_image_path: Optional[Path],
+        changed_tiles: Optional[int],
+    ) -> Dict:
+        """Build the comparison result, store it in self.results and log the outcome"""
         # Determine pass/fail
         threshold_value = threshold if threshold is not None else self.threshold
         passed = diff_percentage <= threshold_value
@@ -126,6 +295,7 @@ def compare(
             "baseline_path": str(baseline_path),
             "current_path": screenshot_path,
             "diff_path": str(diff_image_path) if diff_image_path else None,
+            "changed_tiles": changed_tiles,
             "timestamp": datetime.now().isoformat(),
         }
 
@@ -140,28 +310,67 @@ def compare(
 
         return result
 
-    def _calculate_difference(self, img1: Image.Image, img2: Image.Image) -> float:
+    def _compute_diff_mask(
+        self, img1: Image.Image, img2: Image.Image, boxes: Optional[List[Box]] = None
+    ):
+        """
+        Build a boolean (height, width) mask of pixels that differ
+
+        Args:
+            img1: First image
+            img2: Second image
+            boxes: Only diff inside these boxes; pixels elsewhere are treated as equal
+
+        Returns:
+            NumPy mask for the numpy backend, None for the pillow backend
+        """
+        if self.diff_backend != "numpy":
+            return None
+
+        if boxes is None:
+            diff = ImageChops.difference(img1.convert("RGB"), img2.convert("RGB"))
+            channel_sum = np.asarray(diff).sum(axis=2, dtype=np.uint16)
+            return channel_sum > PIXEL_DIFF_THRESHOLD
+
+        pixels1 = np.asarray(img1.convert("RGB"), dtype=np.int16)
+        pixels2 = np.asarray(img2.convert("RGB"), dtype=np.int16)
+        mask = np.zeros(pixels1.shape[:2], dtype=bool)
+        for left, top, right, bottom in boxes:
+            delta = np.abs(pixels1[top:bottom, left:right] - pixels2[top:bottom, left:right])
+            mask[top:bottom, left:right] = delta.sum(axis=2) > PIXEL_DIFF_THRESHOLD
+        return mask
+
+    def _calculate_difference(
+        self, img1: Image.Image, img2: Image.Image, diff_mask=None
+    ) -> float:
         """
         Calculate pixel difference percentage between images
 
         Args:
             img1: First image
             img2: Second image
+            diff_mask: Precomputed mask from _compute_diff_mask (optional)
 
         Returns:
             Difference percentage (0.0 to 1.0)
         """
         # Method 1: Pixel-by-pixel comparison
-        diff = ImageChops.difference(img1.convert("RGB"), img2.convert("RGB"))
-        diff_array = list(diff.getdata())
+        if diff_mask is None:
+            diff_mask = self._compute_diff_mask(img1, img2)
+
+        if diff_mask is not None:
+            pixel_diff_percentage = float(np.count_nonzero(diff_mask)) / diff_mask.size
+        else:
+            diff = ImageChops.difference(img1.convert("RGB"), img2.convert("RGB"))
+            diff_array = list(diff.getdata())
 
-        # Calculate percentage of different pixels
-        total_pixels = len(diff_array)
-        different_pixels = sum(
-            1 for pixel in diff_array if sum(pixel) > 30
-        )  # Threshold for "different"
+            # Calculate percentage of different pixels
+            total_pixels = len(diff_array)
+            different_pixels = sum(
+                1 for pixel in diff_array if sum(pixel) > PIXEL_DIFF_THRESHOLD
+            )  # Threshold for "different"
 
-        pixel_diff_percentage = different_pixels / total_pixels
+            pixel_diff_percentage = different_pixels / total_pixels
 
         # Method 2: Perceptual hash (for major differences)
         hash1 = imagehash.average_hash(img1)
@@ -179,6 +388,7 @@ def _generate_diff_image(
         baseline: Image.Image,
         name: str,
         viewport: Optional[Tuple[int, int]],
+        diff_mask=None,
     ) -> Optional[Path]:
         """
         Generate visual diff image highlighting differences
@@ -188,26 +398,33 @@ def _generate_diff_image(
             baseline: Baseline screenshot
             name: Test name
             viewport: Viewport size
+            diff_mask: Precomputed mask from _compute_diff_mask (optional)
 
         Returns:
             Path to diff image
         """
         try:
-            # Create difference image
-            diff = ImageChops.difference(current.convert("RGB"), baseline.convert("RGB"))
+            if diff_mask is None:
+                diff_mask = self._compute_diff_mask(current, baseline)
 
             # Highlight differences in red
-            diff_highlighted = Image.new("RGB", current.size)
-            diff_pixels = diff.load()
-            highlight_pixels = diff_highlighted.load()
-
-            for y in range(diff.height):
-                for x in range(diff.width):
-                    pixel = diff_pixels[x, y]
-                    if sum(pixel) > 30:  # Different pixel
-                        highlight_pixels[x, y] = (255, 0, 0)  # Red
-                    else:
-                        highlight_pixels[x, y] = (0, 0, 0)  # Black
+            if diff_mask is not None:
+                red = Image.fromarray(diff_mask.astype(np.uint8) * 255)
+                black = Image.new("L", current.size, 0)
+                diff_highlighted = Image.merge("RGB", (red, black, black))
+            else:
+                diff = ImageChops.difference(current.convert("RGB"), baseline.convert("RGB"))
+                diff_highlighted = Image.new("RGB", current.size)
+                diff_pixels = diff.load()
+                highlight_pixels = diff_highlighted.load()
+
+                for y in range(diff.height):
+                    for x in range(diff.width):
+                        pixel = diff_pixels[x, y]
+                        if sum(pixel) > PIXEL_DIFF_THRESHOLD:  # Different pixel
+                            highlight_pixels[x, y] = (255, 0, 0)  # Red
+                        else:
+                            highlight_pixels[x, y] = (0, 0, 0)  # Black
 
             # Create side-by-side comparison
             comparison = Image.new("RGB", (current.width * 3, current.height))
@@ -342,4 +559,28 @@ def generate_html_report(self, output_path: str = "reports/visual/report.html"):
         return output_path
 
 
+# Per-process VisualRegression instances reused across batch jobs
+_worker_instances: Dict[Tuple, VisualRegression] = {}
+
+
+def _compare_in_worker(settings: Tuple, item: BatchItem) -> Dict:
+    """Process-pool entry point: compare one batch item"""
+    visual = _worker_instances.get(settings)
+    if visual is None:
+        baseline_dir, report_dir, diff_backend, tile_size, threshold = settings
+        visual = VisualRegression(baseline_dir, report_dir, diff_backend, tile_size)
+        visual.threshold = threshold
+        _worker_instances[settings] = visual
+
+    visual.results.clear()
+    return visual.compare(
+        item.screenshot_path,
+        item.name,
+        item.viewport,
+        item.threshold,
+        item.regions,
+        item.ignore_regions,
+    )
+
+
 __all__ = ["VisualRegression"]
@@ -0,0 +1,101 @@
+"""
+Benchmark: caller-side cost of TestAuditLogger
+
+Times log_ui_action on the calling thread with the batched audit writer,
+against the previous synchronous path (json.dumps + a
+TimedRotatingFileHandler write per event). "saturated" runs the writer
+concurrently with a tight caller loop (both share the GIL); "writer idle"
+defers the drain until after the loop, which is closer to a real test where
+the writer runs while the caller waits on the browser. Files go to a
+temporary directory.
+
+Usage:
+    python scripts/benchmarks/benchmark_audit_logger.py
+    python scripts/benchmarks/benchmark_audit_logger.py --events 200000
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from datetime import datetime
+from logging.handlers import TimedRotatingFileHandler
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from utils.audit_writer import AuditWriter  # noqa: E402
+from utils.logger import TestAuditLogger, _SafeAuditJsonFormatter  # noqa: E402
+
+
+def _legacy_logger(path: Path) -> logging.Logger:
+    legacy = logging.getLogger("audit-benchmark-legacy")
+    legacy.propagate = False
+    legacy.setLevel(logging.INFO)
+    handler = TimedRotatingFileHandler(path, when="midnight", encoding="utf-8")
+    handler.setFormatter(_SafeAuditJsonFormatter())
+    legacy.addHandler(handler)
+    return legacy
+
+
+def _legacy_log_action(legacy, action_type, details, status="success"):
+    event = {
+        "action_type": action_type,
+        "status": status,
+        "details": details,
+        "timestamp_ms": datetime.now().timestamp() * 1000,
+        "correlation_id": None,
+        "trace_id": None,
+        "request_id": None,
+    }
+    legacy.info(json.dumps(event))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        legacy = _legacy_logger(tmp / "legacy.log")
+        start = time.perf_counter()
+        for i in range(args.events):
+            _legacy_log_action(legacy, "ui_action", {"action": "click", "element": f"#row-{i}"})
+        legacy_us = (time.perf_counter() - start) / args.events * 1e6
+
+        writer = AuditWriter(tmp / "audit.log", base_fields={"level": "INFO", "logger": "audit"})
+        audit = TestAuditLogger(writer=writer)
+        start = time.perf_counter()
+        for i in range(args.events):
+            audit.log_ui_action("click", f"#row-{i}")
+        saturated_us = (time.perf_counter() - start) / args.events * 1e6
+        audit.flush(timeout=None)
+        writer.close()
+
+        idle_writer = AuditWriter(
+            tmp / "audit-idle.log", batch_size=args.events + 1, flush_interval=3600,
+            max_pending=args.events + 1, base_fields={"level": "INFO", "logger": "audit"},
+        )
+        audit = TestAuditLogger(writer=idle_writer)
+        start = time.perf_counter()
+        for i in range(args.events):
+            audit.log_ui_action("click", f"#row-{i}")
+        idle_us = (time.perf_counter() - start) / args.events * 1e6
+        start = time.perf_counter()
+        audit.flush(timeout=None)
+        drain_us = (time.perf_counter() - start) / args.events * 1e6
+        idle_writer.close()
+
+        print(f"events:                        {args.events:,}")
+        print(f"legacy synchronous:            {legacy_us:8.2f} µs/event")
+        print(f"batched, saturated:            {saturated_us:8.2f} µs/event")
+        print(f"batched, writer idle (caller): {idle_us:8.2f} µs/event")
+        print(f"writer drain (background):     {drain_us:8.2f} µs/event")
+        print(f"dropped:                       {writer.dropped + idle_writer.dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: response listener cost with lazy vs eager body capture
+
+Feeds a synthetic SPA response mix (large JS bundles, images, fonts, a few
+JSON API calls) through the APIInterceptor response listener and reports
+per-response handler latency and retained memory (tracemalloc) for:
+
+- eager:  every body fetched and decoded in the listener, no caps (legacy)
+- lazy:   default BodyCapturePolicy, bodies fetched on first access only
+
+Response bodies are served from in-memory bytes, so the numbers exclude the
+browser round trip the eager mode also pays per response.
+
+Usage:
+    python scripts/benchmarks/benchmark_body_capture.py
+    python scripts/benchmarks/benchmark_body_capture.py --responses 5000
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from framework.api.api_interceptor import APIInterceptor  # noqa: E402
+from framework.api.body_capture import BodyCapturePolicy  # noqa: E402
+
+BUNDLE = b"function f(){return 1}\n" * 20000  # ~450 KB
+IMAGE = bytes(range(256)) * 400  # ~100 KB
+API = json.dumps({"items": [{"id": i, "name": f"user {i}"} for i in range(50)]}).encode()
+
+
+class _FakeRequest:
+    method = "GET"
+
+
+class _FakeResponse:
+    status = 200
+    status_text = "OK"
+    request = _FakeRequest()
+
+    def __init__(self, url, content_type, body):
+        self.url = url
+        self._body = body
+        self.headers = {"content-type": content_type, "content-length": str(len(body))}
+
+    def body(self):
+        return bytes(self._body)
+
+    def json(self):
+        return json.loads(self._body)
+
+    def text(self):
+        return self._body.decode("utf-8", errors="replace")
+
+
+def _responses(count: int) -> list:
+    mix = [
+        ("application/javascript", BUNDLE, "js"),
+        ("image/png", IMAGE, "png"),
+        ("image/png", IMAGE, "png"),
+        ("text/css", b".a{color:red}" * 2000, "css"),
+        ("application/json", API, "api"),
+    ]
+    responses = []
+    for i in range(count):
+        content_type, body, kind = mix[i % len(mix)]
+        responses.append(_FakeResponse(f"https://app.example.com/{kind}/{i}", content_type, body))
+    return responses
+
+
+def _listener(policy: BodyCapturePolicy):
+    ui_engine = Mock()
+    ui_engine.__class__.__name__ = "PlaywrightEngine"
+    interceptor = APIInterceptor(ui_engine, body_policy=policy)
+    page = ui_engine.get_page.return_value
+    listener = next(c.args[1] for c in page.on.call_args_list if c.args[0] == "response")
+    return interceptor, listener
+
+
+def _measure(policy: BodyCapturePolicy, responses: list):
+    interceptor, listener = _listener(policy)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for response in responses:
+        listener(response)
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(interceptor.captured_responses) == len(responses)
+    return elapsed / len(responses), retained
+
+
+def run(count: int) -> None:
+    responses = _responses(count)
+    modes = {
+        "eager": BodyCapturePolicy(max_bytes=None, content_types=("",), lazy=False),
+        "lazy": BodyCapturePolicy(),
+    }
+    print(f"Body capture benchmark: {count} responses")
+    print("-" * 60)
+    results = {}
+    for name, policy in modes.items():
+        per_response, retained = _measure(policy, responses)
+        results[name] = (per_response, retained)
+        print(
+            f"{name:>6}: {per_response * 1e6:8.1f} us/response   "
+            f"retained {retained / 1024 / 1024:8.1f} MiB"
+        )
+    eager, lazy = results["eager"], results["lazy"]
+    print("-" * 60)
+    print(f"latency {eager[0] / lazy[0]:.1f}x faster, memory {eager[1] / max(lazy[1], 1):.1f}x lower")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--responses", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.responses)
@@ -0,0 +1,110 @@
+"""
+Benchmark: per-worker browsers vs a shared browser server
+
+Starts W worker processes at once (like pytest -n W) that each get a page
+ready, in two modes:
+
+- launch:  every worker runs sync_playwright().start() and launches its
+           own browser (the current PlaywrightEngine.start())
+- server:  --servers browser servers are launched once; workers connect to
+           their WebSocket endpoint (round-robin) and only create a context
+
+Reports the time until all W workers have a page (including server startup)
+and the total RSS of workers, drivers and browsers while all pages are open.
+Needs installed browsers (playwright install chromium).
+
+Usage:
+    python scripts/benchmarks/benchmark_browser_server.py
+    python scripts/benchmarks/benchmark_browser_server.py --workers 1 8 32 --servers 2
+"""
+
+import argparse
+import multiprocessing
+import queue
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from framework.ui.browser_server import (  # noqa: E402
+    process_tree_rss,
+    select_endpoint,
+    start_browser_servers,
+)
+
+
+def _worker(browser_type, endpoint, ready, done):
+    from playwright.sync_api import sync_playwright
+
+    playwright = sync_playwright().start()
+    try:
+        launcher = getattr(playwright, browser_type)
+        browser = launcher.connect(endpoint) if endpoint else launcher.launch(headless=True)
+        context = browser.new_context()
+        context.new_page().goto("about:blank")
+        ready.put(time.perf_counter())
+        done.wait()
+        context.close()
+        browser.close()
+    finally:
+        playwright.stop()
+
+
+def _wait_ready(ready, processes) -> float:
+    while True:
+        try:
+            return ready.get(timeout=1)
+        except queue.Empty:
+            failed = [process for process in processes if process.exitcode]
+            if failed:
+                for process in processes:
+                    process.kill()
+                raise SystemExit(f"{len(failed)} worker(s) failed to open a page") from None
+
+
+def _run(mode: str, workers: int, servers: int, browser_type: str):
+    ctx = multiprocessing.get_context("spawn")
+    ready, done = ctx.Queue(), ctx.Event()
+    started = time.perf_counter()
+    shared = start_browser_servers(servers, browser_type=browser_type) if mode == "server" else []
+    endpoints = [server.ws_endpoint for server in shared]
+    processes = [
+        ctx.Process(target=_worker, args=(browser_type, select_endpoint(endpoints, f"gw{i}"), ready, done))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    last_ready = max(_wait_ready(ready, processes) for _ in processes)
+
+    pids = [process.pid for process in processes] + [server.pid for server in shared]
+    rss = sum(process_tree_rss(pid) or 0 for pid in pids)
+
+    done.set()
+    for process in processes:
+        process.join(60)
+    for server in shared:
+        server.stop()
+    return last_ready - started, rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--servers", type=int, default=1)
+    parser.add_argument("--browser", default="chromium")
+    args = parser.parse_args()
+
+    print(f"{'workers':>8}{'mode':>8}{'startup':>12}{'RSS':>12}{'RSS/worker':>14}")
+    for workers in args.workers:
+        for mode in ("launch", "server"):
+            servers = min(args.servers, workers)
+            seconds, rss = _run(mode, workers, servers, args.browser)
+            print(
+                f"{workers:>8}{mode:>8}{seconds:>10.2f} s{rss / 2**20:>8.0f} MiB"
+                f"{rss / workers / 2**20:>10.0f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Benchmark: end-to-end logging CPU per test
+
+Replays the events EnterpriseLogger receives for one test from the pytest
+plugin (setup, report and teardown: four app events, three audit events and
+one performance event) and measures process CPU time (caller plus
+background threads) until everything has been written.
+
+"legacy" rebuilds the previous pipeline: a QueueHandler per logger feeding
+one QueueListener that runs every record through five handlers (app, audit,
+security, performance JSON files and console), each formatting the record
+with its own StructuredJSONFormatter. "event bus" is the EnterpriseLogger
+fan-out: one LogEvent per call, rendered once per format and routed to
+the sinks subscribed to its channel. Files go to a temporary directory and
+the console goes to os.devnull.
+
+"full test" adds the rest of what conftest.py logs for every test and
+which is not routed through the bus: TestAuditLogger.log_test_start /
+log_test_end (the audit trail keeps its own AuditWriter, which never drops
+records) and three lines of the conftest logger (console plus daily file,
+as utils.logger.get_logger configures it). These costs are the same in
+both variants, so the difference is the bus's saving on the whole test.
+
+Usage:
+    python scripts/benchmarks/benchmark_event_bus.py
+    python scripts/benchmarks/benchmark_event_bus.py --tests 5000
+"""
+
+import argparse
+import logging
+import os
+import queue
+import sys
+import tempfile
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from framework.observability.enterprise_logger import (  # noqa: E402
+    EnterpriseLogger,
+    SensitiveDataMasker,
+    StructuredJSONFormatter,
+)
+from framework.observability.event_bus import (  # noqa: E402
+    EventBus,
+    FileSink,
+    StreamSink,
+)
+from utils.audit_writer import AuditWriter  # noqa: E402
+from utils.logger import TestAuditLogger  # noqa: E402
+
+CHANNELS = ("app", "audit", "security", "performance")
+
+
+def _one_test(info, audit, performance, index):
+    test_id = f"tests/test_checkout.py::test_case_{index}"
+    info("Test setup started", test_id=test_id, markers=["smoke", "ui"])
+    audit("test_setup", {"test_id": test_id, "status": "started"})
+    info("Test call passed", test_id=test_id, duration_ms=412.5)
+    audit("test_execution", {"test_id": test_id, "outcome": "passed"})
+    performance(f"test_{index}", 412.5, {"phase": "call"})
+    info("Test completed", test_id=test_id, outcome="passed")
+    info("Test teardown", test_id=test_id)
+    audit("test_teardown", {"test_id": test_id, "status": "completed"})
+
+
+def _conftest_path(tmp: Path, console):
+    """Per-test logging outside the enterprise logger: audit trail and conftest logger"""
+    writer = AuditWriter(tmp / "audit.log")
+    audit = TestAuditLogger(writer=writer)
+    logger = logging.getLogger("benchmark.conftest")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    console_handler = logging.StreamHandler(console)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(logging.Formatter(
+        "%(asctime)s [%(levelname)8s] %(name)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S",
+    ))
+    file_handler = logging.FileHandler(tmp / "framework.log", encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(
+        "%(asctime)s [%(levelname)8s] %(name)s:%(lineno)d - %(message)s", datefmt="%Y-%m-%d %H:%M:%S",
+    ))
+    logger.handlers = [console_handler, file_handler]
+
+    def one_test(index):
+        test_id = f"tests/test_checkout.py::test_case_{index}"
+        audit.log_test_start(test_id, "test_checkout.py")
+        logger.info(f"→ Setting up test: {test_id}")
+        logger.info(f"✓ TEST PASSED: {test_id}")
+        audit.log_test_end(test_id, "passed", 0.4125)
+        logger.info(f"← Tearing down test: {test_id}")
+
+    def finish():
+        writer.close(timeout=None)
+        for handler in logger.handlers:
+            handler.close()
+
+    return one_test, finish
+
+
+def _legacy(tmp: Path, console):
+    log_queue = queue.Queue(-1)
+    handlers = []
+    for channel in CHANNELS:
+        handler = RotatingFileHandler(tmp / f"legacy_{channel}.json", maxBytes=100 * 1024 * 1024, encoding="utf-8")
+        handler.setFormatter(StructuredJSONFormatter("testing"))
+        handlers.append(handler)
+    console_handler = logging.StreamHandler(console)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(logging.Formatter(
+        "%(asctime)s [%(levelname)8s] %(name)s:%(lineno)d - %(message)s", datefmt="%Y-%m-%d %H:%M:%S",
+    ))
+    handlers.append(console_handler)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+    loggers = {}
+    for channel in CHANNELS:
+        logger = logging.getLogger(f"benchmark.legacy.{channel}")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.handlers = [QueueHandler(log_queue)]
+        loggers[channel] = logger
+
+    def info(message, **kwargs):
+        loggers["app"].info(message, extra={"extra_fields": kwargs})
+
+    def audit(event_type, details, status="success"):
+        loggers["audit"].info(f"Audit: {event_type}", extra={"extra_fields": {
+            "event_type": event_type, "status": status, "details": details, "audit": True,
+        }})
+
+    def performance(operation, duration_ms, details=None):
+        loggers["performance"].info(f"Performance: {operation}", extra={"extra_fields": {
+            "operation": operation, "duration_ms": duration_ms, "details": details or {},
+        }})
+
+    def finish():
+        listener.stop()
+        for handler in handlers:
+            handler.close()
+
+    return info, audit, performance, finish
+
+
+def _event_bus(tmp: Path, console):
+    bus = EventBus(
+        static_fields={"environment": "testing", "hostname": "bench", "process_id": os.getpid()},
+        mask=SensitiveDataMasker.mask_dict,
+    )
+    bus.subscribe(FileSink(tmp / "bus_app.json", max_bytes=100 * 1024 * 1024))
+    for channel in CHANNELS[1:]:
+        bus.subscribe(FileSink(tmp / f"bus_{channel}.json", channels={f"enterprise.{channel}"}))
+    bus.subscribe(StreamSink(console, level=logging.INFO))
+
+    # Unbound EnterpriseLogger methods on a bare instance: the real emission
+    # path without the singleton's log directories
+    enterprise = EnterpriseLogger.__new__(EnterpriseLogger)
+    enterprise.event_bus = bus
+    for channel in CHANNELS:
+        logger = EnterpriseLogger._channel_logger(f"enterprise.{channel}", logging.DEBUG)
+        setattr(enterprise, f"{channel}_logger", logger)
+
+    def finish():
+        bus.shutdown(timeout=None)
+
+    return enterprise.info, enterprise.audit, enterprise.performance, finish
+
+
+def _measure(build, tmp: Path, tests: int, full: bool = False) -> float:
+    with open(os.devnull, "w") as console:
+        info, audit, performance, finish = build(tmp, console)
+        conftest_test, conftest_finish = _conftest_path(tmp, console) if full else (None, None)
+        start = time.process_time()
+        for index in range(tests):
+            _one_test(info, audit, performance, index)
+            if conftest_test:
+                conftest_test(index)
+        finish()
+        if conftest_finish:
+            conftest_finish()
+        return (time.process_time() - start) / tests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        legacy_us = _measure(_legacy, tmp, args.tests)
+        bus_us = _measure(_event_bus, tmp, args.tests)
+        legacy_full_us = _measure(_legacy, tmp, args.tests, full=True)
+        bus_full_us = _measure(_event_bus, tmp, args.tests, full=True)
+
+    print(f"tests:                 {args.tests:,} (8 enterprise events, 2 audit records, 3 conftest lines each)")
+    print(f"{'':23}{'enterprise':>12}{'full test':>12}")
+    print(f"legacy queue listener: {legacy_us:9.1f} µs {legacy_full_us:9.1f} µs CPU/test")
+    print(f"event bus:             {bus_us:9.1f} µs {bus_full_us:9.1f} µs CPU/test")
+    print(f"speedup:               {legacy_us / bus_us:9.2f}x  {legacy_full_us / bus_full_us:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
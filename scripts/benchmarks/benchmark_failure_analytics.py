@@ -0,0 +1,148 @@
+"""
+Benchmark: MLTestOptimizer analytics on a large history
+
+Builds a synthetic history (10k tests, several runs each, failures tied to
+changed files) and times the legacy rescanning analytics against the
+incremental FailureAggregator for:
+
+- analyze_failure_patterns
+- get_optimal_test_order for every test against a changed-file list
+- get_recommended_tests
+
+Usage:
+    python scripts/benchmarks/benchmark_failure_analytics.py
+    python scripts/benchmarks/benchmark_failure_analytics.py --tests 20000 --runs 10
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from framework.ml.history_store import JSONLHistoryStore  # noqa: E402
+from framework.ml.ml_test_optimizer import MLTestOptimizer  # noqa: E402
+
+
+def _history(tests: int, runs: int) -> list:
+    rng = random.Random(11)
+    history = []
+    for run in range(runs):
+        for t in range(tests):
+            passed = rng.random() > 0.08
+            history.append(
+                {
+                    "test_name": f"test_{t}",
+                    "passed": passed,
+                    "duration": rng.random() * 3,
+                    "timestamp": f"2026-01-{run + 1:02d}T00:00:00",
+                    "error": None if passed else "boom",
+                    "changed_files": [] if passed else [f"src/m{rng.randrange(300)}.py"],
+                }
+            )
+    return history
+
+
+class _LegacyAnalytics:
+    """The rescanning analytics MLTestOptimizer used before the aggregator"""
+
+    def __init__(self, history):
+        self.test_history = history
+        self.failure_patterns = {}
+
+    def analyze(self):
+        failure_counts, total_runs, context = defaultdict(int), defaultdict(int), defaultdict(list)
+        for result in self.test_history:
+            name = result["test_name"]
+            total_runs[name] += 1
+            if not result["passed"]:
+                failure_counts[name] += 1
+                context[name].append({"changed_files": result.get("changed_files", [])})
+        self.failure_patterns = {
+            name: {
+                "failure_rate": failure_counts[name] / total_runs[name],
+                "recent_failures": context[name][-5:],
+                "flakiness_score": self._flakiness(name),
+            }
+            for name in total_runs
+        }
+
+    def _flakiness(self, name):
+        recent = [r for r in self.test_history[-20:] if r["test_name"] == name]
+        if len(recent) < 5:
+            return 0.0
+        flips = sum(recent[i]["passed"] != recent[i - 1]["passed"] for i in range(1, len(recent)))
+        return flips / (len(recent) - 1)
+
+    def order(self, names, changed_files):
+        result = []
+        for name in names:
+            pattern = self.failure_patterns.get(name)
+            if pattern is None:
+                result.append((name, 0.5))
+                continue
+            impact = sum(
+                0.2
+                for failure in pattern["recent_failures"]
+                if any(f in failure["changed_files"] for f in changed_files)
+            )
+            result.append(
+                (name, min(1.0, pattern["failure_rate"] + pattern["flakiness_score"] * 0.3 + impact))
+            )
+        result.sort(key=lambda x: x[1], reverse=True)
+        return result
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(tests: int, runs: int) -> None:
+    import logging
+
+    logging.disable(logging.INFO)
+    history = _history(tests, runs)
+    names = [f"test_{t}" for t in range(tests)]
+    changed = [f"src/m{i}.py" for i in range(10)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "history.jsonl"
+        store = JSONLHistoryStore(path)
+        store.extend(history)
+        store.close()
+
+        legacy = _LegacyAnalytics(history)
+        load = _timed(lambda: MLTestOptimizer(str(path)))
+        optimizer = MLTestOptimizer(str(path))
+
+        print(f"Analytics benchmark: {tests} tests x {runs} runs = {len(history)} results")
+        print(f"(optimizer load incl. aggregation: {load * 1000:.1f} ms)")
+        print("-" * 60)
+        rows = [
+            ("analyze_failure_patterns", legacy.analyze, optimizer.analyze_failure_patterns),
+            (
+                "get_optimal_test_order",
+                lambda: legacy.order(names, changed),
+                lambda: optimizer.get_optimal_test_order(names, changed),
+            ),
+            ("get_recommended_tests", None, lambda: optimizer.get_recommended_tests(changed)),
+        ]
+        for label, old, new in rows:
+            old_time = _timed(old) if old else None
+            new_time = _timed(new)
+            old_text = f"{old_time * 1000:9.1f} ms" if old_time is not None else "        n/a"
+            print(f"{label:>25}: legacy {old_text}   incremental {new_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tests", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    run(args.tests, args.runs)
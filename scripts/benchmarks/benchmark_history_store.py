@@ -0,0 +1,105 @@
+"""
+Benchmark: MLTestOptimizer history load and record cost
+
+Compares the legacy single JSON document (json.load of the whole list, full
+rewrite per recorded result) with the append-only JSONL store:
+
+- load: legacy json.load vs JSONL cold parse vs JSONL + columnar snapshot
+- record: legacy rewrite-per-result vs one appended line per result
+
+Usage:
+    python scripts/benchmarks/benchmark_history_store.py
+    python scripts/benchmarks/benchmark_history_store.py --records 200000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from framework.ml.history_store import JSONLHistoryStore  # noqa: E402
+
+
+def _records(count: int) -> list:
+    rng = random.Random(3)
+    start = datetime(2026, 1, 1)
+    records = []
+    for i in range(count):
+        passed = rng.random() > 0.1
+        records.append(
+            {
+                "test_name": f"tests/test_module_{i % 500}.py::test_case_{i % 40}",
+                "passed": passed,
+                "duration": rng.random() * 5,
+                "timestamp": (start + timedelta(seconds=i)).isoformat(),
+                "error": None if passed else "AssertionError: expected 200, got 500",
+                "changed_files": [] if passed else [f"src/module_{i % 50}.py"],
+            }
+        )
+    return records
+
+
+def _timed(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(count: int, appends: int) -> None:
+    records = _records(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "test_history.json"
+        legacy_path.write_text(json.dumps(records, indent=2))
+
+        store = JSONLHistoryStore(Path(tmp) / "test_history.jsonl")
+        store.extend(records)
+
+        def load_legacy():
+            with open(legacy_path) as f:
+                json.load(f)
+
+        def load_cold():
+            store.snapshot_path.unlink(missing_ok=True)
+            store._read()
+
+        print(f"History benchmark: {count} records")
+        print("-" * 60)
+        print(f"load legacy json     : {_timed(load_legacy) * 1000:9.1f} ms")
+        print(f"load jsonl (cold)    : {_timed(load_cold) * 1000:9.1f} ms")
+        store.save_snapshot()
+        print(f"load jsonl + snapshot: {_timed(store.load) * 1000:9.1f} ms")
+
+        history = list(records)
+
+        def record_legacy():
+            for i in range(appends):
+                history.append(records[i])
+                with open(legacy_path, "w") as f:
+                    json.dump(history, f, indent=2)
+
+        def record_append():
+            for i in range(appends):
+                store.append(records[i])
+
+        legacy = _timed(record_legacy, repeat=1) / appends
+        appended = _timed(record_append, repeat=1) / appends
+        print(f"record legacy        : {legacy * 1000:9.3f} ms/result")
+        print(f"record append        : {appended * 1000:9.3f} ms/result")
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--appends", type=int, default=5)
+    args = parser.parse_args()
+    run(args.records, args.appends)
@@ -0,0 +1,118 @@
+"""
+Benchmark: page-load latency with API interception
+
+Serves a static page with many images, scripts and stylesheets from a local
+HTTP server and measures page.goto(..., wait_until="load") latency for:
+
+- baseline:      no routes, no interceptor
+- catch_all:     legacy context.route("**/*", continue_) Python round trip
+- capture_only:  APIInterceptor with passive request/response listeners
+- one_mock:      APIInterceptor with a single mocked API pattern
+
+Usage:
+    python scripts/benchmarks/benchmark_interception.py
+    python scripts/benchmarks/benchmark_interception.py --assets 200 --iterations 10
+"""
+
+import argparse
+import functools
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from framework.api.api_interceptor import APIInterceptor  # noqa: E402
+from framework.ui.playwright_engine import PlaywrightEngine  # noqa: E402
+
+# 1x1 transparent PNG
+PIXEL_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def _build_site(root: Path, assets: int) -> None:
+    """Write index.html referencing `assets` images, scripts and stylesheets"""
+    tags = []
+    for i in range(assets):
+        kind = i % 3
+        if kind == 0:
+            (root / f"img_{i}.png").write_bytes(PIXEL_PNG)
+            tags.append(f'<img src="img_{i}.png">')
+        elif kind == 1:
+            (root / f"script_{i}.js").write_text(f"window.v{i} = {i};")
+            tags.append(f'<script src="script_{i}.js"></script>')
+        else:
+            (root / f"style_{i}.css").write_text(f".c{i} {{ color: red; }}")
+            tags.append(f'<link rel="stylesheet" href="style_{i}.css">')
+    (root / "index.html").write_text(
+        "<!DOCTYPE html><html><head><title>bench</title></head><body>"
+        + "".join(tags)
+        + "<script>fetch('/api/users/1').catch(() => {});</script></body></html>"
+    )
+
+
+def _measure(engine: PlaywrightEngine, url: str, mode: str, iterations: int) -> list:
+    context = engine.browser.new_context()
+    engine.page = context.new_page()
+
+    if mode == "catch_all":
+        context.route("**/*", lambda route: route.continue_())
+    elif mode in ("capture_only", "one_mock"):
+        interceptor = APIInterceptor(engine)
+        if mode == "one_mock":
+            interceptor.mock_response(r"/api/users/\d+", body={"id": 1})
+
+    samples = []
+    engine.page.goto(url, wait_until="load")  # warm-up
+    for _ in range(iterations):
+        start = time.perf_counter()
+        engine.page.goto(url, wait_until="load")
+        samples.append(time.perf_counter() - start)
+
+    context.close()
+    return samples
+
+
+def run(assets: int, iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _build_site(root, assets)
+
+        handler = functools.partial(_QuietHandler, directory=str(root))
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+
+        engine = PlaywrightEngine(headless=True)
+        engine.start()
+        try:
+            print(f"Interception benchmark: {assets} assets, {iterations} iteration(s)")
+            print("-" * 60)
+            for mode in ("baseline", "catch_all", "capture_only", "one_mock"):
+                samples = _measure(engine, url, mode, iterations)
+                print(
+                    f"{mode:>13}: median {statistics.median(samples) * 1000:8.1f} ms   "
+                    f"min {min(samples) * 1000:8.1f} ms"
+                )
+        finally:
+            engine.stop()
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--assets", type=int, default=150)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+    run(args.assets, args.iterations)
@@ -0,0 +1,57 @@
+"""
+Benchmark: argument/result formatting cost of the logging decorators
+
+Formats payloads of growing size the old way (repr) and with the bounded
+log serializer, reporting time, peak allocation and output size per call.
+
+Usage:
+    python scripts/benchmarks/benchmark_log_serializer.py
+    python scripts/benchmarks/benchmark_log_serializer.py --calls 200
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from framework.observability.log_serializer import summarize  # noqa: E402
+
+
+def _rows(count: int):
+    return [{"id": i, "email": f"user{i}@example.com", "tags": ["a", "b", "c"]} for i in range(count)]
+
+
+def _measure(format_value, value, calls: int):
+    start = time.perf_counter()
+    for _ in range(calls):
+        output = format_value(value)
+    elapsed = (time.perf_counter() - start) / calls
+
+    tracemalloc.start()
+    format_value(value)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = len(output) if isinstance(output, str) else len(json.dumps(output, default=str))
+    return elapsed, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'formatter':>10} {'µs/call':>10} {'peak KiB':>10} {'output B':>10}")
+    for count in (10, 1_000, 100_000):
+        rows = _rows(count)
+        for name, formatter in (("repr", repr), ("summarize", summarize)):
+            elapsed, peak, size = _measure(formatter, rows, args.calls)
+            print(f"{count:>8} {name:>10} {elapsed * 1e6:>10.1f} {peak / 1024:>10.1f} {size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: SensitiveDataMasker throughput
+
+Masks a corpus of log-like strings (mostly clean, some with emails, card
+numbers, SSNs and phone numbers) and reports MB/s for the original
+four-pass re.sub implementation and the combined scanner, with unique
+strings (no cache hits) and with repeated strings (cache hits), plus
+mask_dict on structured log records.
+
+Usage:
+    python scripts/benchmarks/benchmark_masking.py
+    python scripts/benchmarks/benchmark_masking.py --strings 50000 --pii-ratio 0.2
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from framework.observability.enterprise_logger import SensitiveDataMasker  # noqa: E402
+
+LEGACY_PATTERNS = [
+    (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+     lambda m: f"{m.group(0)[0]}***@{m.group(0).split('@')[1][0]}*****{m.group(0).split('@')[1].split('.')[-1]}"),
+    (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', '****-****-****-****'),
+    (r'\b\d{3}-\d{2}-\d{4}\b', '***-**-****'),
+    (r'\b\d{10,}\b', '**********'),
+]
+
+CLEAN = [
+    "Navigating to {} dashboard",
+    "Clicked element #submit-{} after 12ms",
+    "GET /api/v1/orders/{} returned 200",
+    "Waiting for selector .row-{} to be visible",
+]
+PII = [
+    "Login as user{}@example.com",
+    "Card 4532-1234-5678-{:04d} charged",
+    "SSN 123-45-{:04d} verified",
+    "Calling 555123{:04d}",
+]
+
+
+def legacy_mask_string(text: str) -> str:
+    for pattern, replacement in LEGACY_PATTERNS:
+        text = re.sub(pattern, replacement, text)
+    return text
+
+
+def legacy_mask_dict(data):
+    masked = {}
+    for key, value in data.items():
+        if str(key).lower() in SensitiveDataMasker.SENSITIVE_KEYS:
+            masked[key] = "***MASKED***"
+        elif isinstance(value, dict):
+            masked[key] = legacy_mask_dict(value)
+        elif isinstance(value, str):
+            masked[key] = legacy_mask_string(value)
+        else:
+            masked[key] = value
+    return masked
+
+
+def _corpus(count: int, pii_ratio: float, seed: int = 1):
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        templates = PII if rng.random() < pii_ratio else CLEAN
+        texts.append(rng.choice(templates).format(i % 10000))
+    return texts
+
+
+def _throughput(mask, texts) -> float:
+    size = sum(len(t) for t in texts)
+    start = time.perf_counter()
+    for text in texts:
+        mask(text)
+    return size / (time.perf_counter() - start) / 1e6
+
+
+def _records_per_second(mask_dict, records) -> float:
+    start = time.perf_counter()
+    for record in records:
+        mask_dict(record)
+    return len(records) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--strings", type=int, default=100_000)
+    parser.add_argument("--pii-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    unique = _corpus(args.strings, args.pii_ratio)
+    # Force cache misses: every string longer than the cacheable length
+    long_unique = [text + " " + "." * 300 for text in unique[: args.strings // 10]]
+    repeated = _corpus(200, args.pii_ratio) * (args.strings // 200)
+
+    print(f"{'corpus':>16} {'legacy MB/s':>12} {'scanner MB/s':>13}")
+    for name, texts in (("unique", unique), ("uncacheable", long_unique), ("repeated", repeated)):
+        SensitiveDataMasker._cache = {}
+        legacy = _throughput(legacy_mask_string, texts)
+        scanner = _throughput(SensitiveDataMasker.mask_string, texts)
+        print(f"{name:>16} {legacy:>12.1f} {scanner:>13.1f}")
+
+    records = [
+        {"message": text, "level": "INFO", "module": "pages.login", "line": 42,
+         "extra": {"user": "jane", "password": "x", "step": text}}
+        for text in unique[:20000]
+    ]
+    SensitiveDataMasker._cache = {}
+    legacy = _records_per_second(legacy_mask_dict, records)
+    scanner = _records_per_second(SensitiveDataMasker.mask_dict, records)
+    print(f"{'mask_dict rec/s':>16} {legacy:>12,.0f} {scanner:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
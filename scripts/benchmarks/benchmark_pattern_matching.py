@@ -0,0 +1,78 @@
+"""
+Benchmark: API interceptor rule matching
+
+Compares the legacy per-rule ``re.search(pattern, url)`` loop with the
+compiled PatternIndex used by RequestModifier/ResponseModifier, for a
+contract-test sized rule set and a realistic SPA URL stream (mostly static
+assets, repeated API calls).
+
+Usage:
+    python scripts/benchmarks/benchmark_pattern_matching.py
+    python scripts/benchmarks/benchmark_pattern_matching.py --rules 500 --urls 50000
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from framework.api.api_interceptor import ResponseModifier  # noqa: E402
+
+
+def _legacy_get_mock(mocks, url):
+    for mock in mocks:
+        if re.search(mock["pattern"], url):
+            return mock
+    return None
+
+
+def _url_stream(count: int, resources: int) -> list:
+    rng = random.Random(7)
+    urls = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.7:
+            ext = rng.choice(["png", "js", "css", "woff2", "svg"])
+            urls.append(f"https://app.example.com/static/{rng.randrange(400)}.{ext}")
+        else:
+            urls.append(
+                f"https://app.example.com/api/v1/resource{rng.randrange(resources * 2)}/"
+                f"{rng.randrange(50)}"
+            )
+    return urls
+
+
+def run(rules: int, url_count: int) -> None:
+    modifier = ResponseModifier()
+    for i in range(rules):
+        modifier.add_mock_response(rf"/api/v1/resource{i}/\d+$", 200, {"id": i})
+
+    urls = _url_stream(url_count, rules)
+
+    start = time.perf_counter()
+    legacy = [_legacy_get_mock(modifier.mocks, url) for url in urls]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [modifier.get_mock_response(url) for url in urls]
+    indexed_time = time.perf_counter() - start
+
+    assert legacy == indexed, "indexed matching diverged from re.search loop"
+
+    print(f"Rule matching benchmark: {rules} mocks, {url_count} URLs")
+    print("-" * 60)
+    print(f"  legacy re.search loop: {legacy_time / url_count * 1e6:8.2f} us/URL")
+    print(f"  PatternIndex:          {indexed_time / url_count * 1e6:8.2f} us/URL")
+    print(f"  Speedup: {legacy_time / indexed_time:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rules", type=int, default=300)
+    parser.add_argument("--urls", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.rules, args.urls)
@@ -0,0 +1,173 @@
+"""
+Benchmark: SIEM shipping against a local stub endpoint
+
+Sends the same events through an ElasticsearchAdapter to a local stub
+bulk endpoint that answers after --latency-ms, in two ways:
+
+- "legacy": the previous path, a synchronous requests.post of an
+  uncompressed batch on the logging thread every batch_size events, with
+  no connection reuse
+- "shipper": add_log() on the logging thread; batches are compressed and
+  sent by the background shipper over pooled keep-alive connections with
+  up to --in-flight concurrent requests
+
+Reported per mode: time spent on the logging thread per event, end-to-end
+throughput until the last batch is acknowledged, request latency
+(p50/p95), bytes on the wire and TCP connections opened.
+
+Usage:
+    python scripts/benchmarks/benchmark_siem_shipper.py
+    python scripts/benchmarks/benchmark_siem_shipper.py --events 50000 --latency-ms 20
+"""
+
+import argparse
+import gzip
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from framework.observability.siem_adapters import ElasticsearchAdapter  # noqa: E402
+
+
+class _Stub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        self.bytes = 0
+        self.events = 0
+        self.connections = set()
+        self.lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Like real endpoints (TCP_NODELAY): otherwise keep-alive replies wait
+    # for the client's delayed ACK and every request costs an extra 40 ms
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        size = len(body)
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        with self.server.lock:
+            self.server.bytes += size
+            self.server.events += body.count(b"\n") // 2
+            self.server.connections.add(self.client_address)
+        time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+def _event(i: int) -> dict:
+    return {
+        "timestamp": "2026-10-16T12:00:00+00:00",
+        "level": "INFO",
+        "logger": "enterprise.app",
+        "message": f"Test step {i} completed",
+        "environment": "testing",
+        "hostname": "ci-runner-07",
+        "correlation_id": f"corr-{i // 50}",
+        "extra": {"test_id": f"tests/test_checkout.py::test_case_{i // 20}", "duration_ms": 12.5},
+    }
+
+
+def _legacy(url: str, events: int, batch_size: int):
+    """Previous behaviour: synchronous, uncompressed bulk post per batch"""
+    bulk = f"{url}/test-automation/_bulk"
+    action = json.dumps({"index": {"_index": "test-automation"}})
+    latencies, buffer = [], []
+    caller = 0.0
+    start = time.perf_counter()
+    for i in range(events):
+        t0 = time.perf_counter()
+        buffer.append(_event(i))
+        if len(buffer) >= batch_size:
+            payload = "".join(f"{action}\n{json.dumps(log)}\n" for log in buffer)
+            buffer.clear()
+            r0 = time.perf_counter()
+            requests.post(bulk, data=payload, headers={"Content-Type": "application/x-ndjson"}, timeout=30)
+            latencies.append((time.perf_counter() - r0) * 1000)
+        caller += time.perf_counter() - t0
+    return caller, time.perf_counter() - start, latencies
+
+
+def _shipper(url: str, events: int, batch_size: int, in_flight: int, spool: Path):
+    adapter = ElasticsearchAdapter(
+        url, batch_size=batch_size, flush_interval=0.2, max_in_flight=in_flight, spool_dir=spool,
+        max_buffer=events,
+    )
+    _ = adapter.shipper  # start the thread outside the measurement
+    caller = 0.0
+    start = time.perf_counter()
+    for i in range(events):
+        t0 = time.perf_counter()
+        adapter.add_log(_event(i))
+        caller += time.perf_counter() - t0
+    adapter.flush(timeout=None)
+    elapsed = time.perf_counter() - start
+    latencies = list(adapter.shipper.latencies_ms)
+    stats = adapter.stats
+    adapter.close()
+    return caller, elapsed, latencies, stats
+
+
+def _report(name, stub, events, caller, elapsed, latencies):
+    latencies = sorted(latencies) or [0.0]
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{name}")
+    print(f"  logging thread:   {caller / events * 1e6:8.2f} µs/event")
+    print(f"  throughput:       {events / elapsed:10,.0f} events/s  ({elapsed:.2f} s)")
+    print(f"  request latency:  p50 {statistics.median(latencies):6.1f} ms   p95 {p95:6.1f} ms")
+    print(f"  bytes on wire:    {stub.bytes / 1024:10,.0f} KiB   connections: {len(stub.connections)}")
+    print(f"  events received:  {stub.events:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--in-flight", type=int, default=4)
+    args = parser.parse_args()
+
+    for name in ("legacy", "shipper"):
+        stub = _Stub(args.latency_ms / 1000)
+        threading.Thread(target=stub.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{stub.server_address[1]}"
+        try:
+            if name == "legacy":
+                caller, elapsed, latencies = _legacy(url, args.events, args.batch_size)
+                _report("legacy (sync, uncompressed, new connection per batch)", stub, args.events,
+                        caller, elapsed, latencies)
+            else:
+                with tempfile.TemporaryDirectory() as spool:
+                    caller, elapsed, latencies, stats = _shipper(
+                        url, args.events, args.batch_size, args.in_flight, Path(spool),
+                    )
+                _report(f"shipper (async, gzip, pooled, {args.in_flight} in flight)", stub, args.events,
+                        caller, elapsed, latencies)
+                print(f"  dropped/spooled:  {stats['events_dropped']}/{stats['batches_spooled']}")
+        finally:
+            stub.shutdown()
+            stub.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: per-span overhead of TelemetryManager
+
+Times `with telemetry.span(name, attributes)` (three attributes) and a
+trace_function-decorated no-op in each tracing mode:
+
+- legacy:   the previous span(): wrapped in log_function(log_args=True),
+            a generator context manager and str() for every attribute,
+            exported in batches to memory
+- off:      TelemetryConfig(enabled=False) - shared no-op context manager
+- sampled:  tracing on, sample_rate=0.0 (root spans not recorded)
+- memory:   tracing on, every span batched to the in-memory exporter
+- file:     tracing on, every span batched to a JSON-lines file
+
+Logging runs at DEBUG (development/testing), where the legacy span also
+writes its log_function entry/exit lines; --log-level INFO shows staging.
+
+Usage:
+    python scripts/benchmarks/benchmark_telemetry_spans.py
+    python scripts/benchmarks/benchmark_telemetry_spans.py --spans 200000 --log-level INFO
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from opentelemetry.trace import Status, StatusCode  # noqa: E402
+
+from framework.observability.telemetry import TelemetryConfig, TelemetryManager  # noqa: E402
+from framework.observability.universal_logger import log_function, logger  # noqa: E402
+
+ATTRIBUTES = {"test.id": "tests/test_checkout.py::test_pay", "step": 3, "retry": False}
+
+
+def _legacy_span(manager: TelemetryManager):
+    """Previous TelemetryManager.span implementation"""
+    @log_function(log_args=True)
+    @contextmanager
+    def span(name, attributes=None):
+        with manager.tracer.start_as_current_span(name) as current:
+            if attributes:
+                for key, value in attributes.items():
+                    current.set_attribute(key, str(value))
+            try:
+                yield current
+            except Exception as e:
+                current.set_status(Status(StatusCode.ERROR))
+                current.record_exception(e)
+                raise
+    return span
+
+
+def _manager(spans: int, **kwargs) -> TelemetryManager:
+    options = {
+        "enable_console": False,
+        "instrument_httpx": False,
+        "sample_rate": 1.0,
+        "max_queue_size": spans * 2,
+    }
+    options.update(kwargs)
+    manager = TelemetryManager(TelemetryConfig(**options))
+    manager.initialize()
+    return manager
+
+
+def _per_span(span, spans: int) -> float:
+    start = time.perf_counter()
+    for _ in range(spans):
+        with span("step", ATTRIBUTES):
+            pass
+    return (time.perf_counter() - start) / spans
+
+
+def _per_call(func, spans: int) -> float:
+    start = time.perf_counter()
+    for _ in range(spans):
+        func()
+    return (time.perf_counter() - start) / spans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--spans", type=int, default=50_000)
+    parser.add_argument("--log-level", default="DEBUG")
+    args = parser.parse_args()
+    logger.setLevel(getattr(logging, args.log_level.upper()))
+    logging.getLogger("opentelemetry").setLevel(logging.ERROR)  # provider override warnings
+
+    with tempfile.TemporaryDirectory() as tmp:
+        modes = {
+            "legacy": {"enable_memory": True},
+            "off": {"enabled": False},
+            "sampled": {"sample_rate": 0.0, "enable_memory": True},
+            "memory": {"enable_memory": True},
+            "file": {"export_path": Path(tmp) / "spans.jsonl"},
+        }
+        print(f"{'mode':<10}{'span()':>14}{'trace_function':>18}")
+        for name, options in modes.items():
+            manager = _manager(args.spans, **options)
+            span = _legacy_span(manager) if name == "legacy" else manager.span
+            traced = manager.trace_function("step", ATTRIBUTES)(lambda: None)
+            _per_span(span, 1000)  # warm up
+            per_span = _per_span(span, args.spans)
+            per_call = _per_call(traced, args.spans)
+            flush_start = time.perf_counter()
+            manager.force_flush()
+            flush = time.perf_counter() - flush_start
+            manager.shutdown()
+            print(f"{name:<10}{per_span * 1e6:11.2f} µs{per_call * 1e6:15.2f} µs   (export drain {flush:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: VisualRegression diff backends
+
+Measures per-image latency of VisualRegression.compare() for the "pillow"
+(per-pixel Python loops) and "numpy" (vectorized, tile-hashed) diff backends
+on synthetic full-page screenshots, for both a changed and an unchanged page.
+
+Usage:
+    python scripts/benchmarks/benchmark_visual_diff.py
+    python scripts/benchmarks/benchmark_visual_diff.py --width 1920 --height 1080 --iterations 5
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from framework.visual.visual_regression import DIFF_BACKENDS, VisualRegression  # noqa: E402
+
+
+def _make_screenshots(workdir: Path, width: int, height: int) -> Path:
+    """Create a baseline and a slightly changed screenshot, return the current path"""
+    rng = random.Random(42)
+    baseline = Image.new("RGB", (width, height), (245, 245, 245))
+    draw = ImageDraw.Draw(baseline)
+    for _ in range(200):
+        x, y = rng.randrange(width), rng.randrange(height)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.rectangle((x, y, x + rng.randrange(200), y + rng.randrange(60)), fill=color)
+
+    current = baseline.copy()
+    ImageDraw.Draw(current).rectangle((100, 100, 400, 180), fill=(200, 30, 30))
+
+    baseline.save(workdir / "baseline_src.png")
+    current_path = workdir / "current.png"
+    current.save(current_path)
+    return current_path
+
+
+def run(width: int, height: int, iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        current_path = _make_screenshots(workdir, width, height)
+
+        print(f"Visual diff benchmark: {width}x{height}, {iterations} iteration(s)")
+        print("-" * 60)
+        timings = {}
+        for backend in DIFF_BACKENDS:
+            visual = VisualRegression(
+                baseline_dir=str(workdir / backend / "baselines"),
+                report_dir=str(workdir / backend / "reports"),
+                diff_backend=backend,
+            )
+            visual.capture_baseline(str(workdir / "baseline_src.png"), "page")
+
+            for scenario, path in (
+                ("changed", current_path),
+                ("unchanged", workdir / "baseline_src.png"),
+            ):
+                samples = []
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    result = visual.compare(str(path), "page")
+                    samples.append(time.perf_counter() - start)
+
+                timings[(backend, scenario)] = min(samples)
+                print(
+                    f"{backend:>8} {scenario:>9}: best {min(samples) * 1000:9.1f} ms   "
+                    f"mean {sum(samples) / len(samples) * 1000:9.1f} ms   "
+                    f"diff={result['difference_percentage']:.4%}"
+                )
+
+        print("-" * 60)
+        for scenario in ("changed", "unchanged"):
+            speedup = timings[("pillow", scenario)] / timings[("numpy", scenario)]
+            print(f"Speedup {scenario:>9} (pillow / numpy): {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+    run(args.width, args.height, args.iterations)
@@ -210,3 +210,75 @@ def test_get_summary(self):
         assert summary["methods"]["POST"] == 1
         assert summary["status_codes"][200] == 2
         assert summary["status_codes"][201] == 1
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestAPIInterceptorRouting:
+    """Test rule-scoped Playwright routing"""
+
+    def _interceptor(self):
+        ui_engine = Mock()
+        ui_engine.__class__.__name__ = "PlaywrightEngine"
+        interceptor = APIInterceptor(ui_engine)
+        return interceptor, ui_engine.get_page.return_value
+
+    def _listener(self, page, event):
+        return next(c.args[1] for c in page.on.call_args_list if c.args[0] == event)
+
+    def test_capture_only_installs_no_routes(self):
+        """Test capture-only mode uses passive listeners without routes"""
+        interceptor, page = self._interceptor()
+
+        page.route.assert_not_called()
+        events = [c.args[0] for c in page.on.call_args_list]
+        assert events == ["request", "response", "websocket"]
+
+    def test_passive_request_capture(self):
+        """Test request listener captures without touching a route"""
+        interceptor, page = self._interceptor()
+        request = Mock(url="https://example.com/api/users", method="GET", headers={})
+
+        self._listener(page, "request")(request)
+
+        assert len(interceptor.captured_requests) == 1
+        assert interceptor.captured_requests[0]["url"] == request.url
+
+    def test_route_installed_once_per_pattern(self):
+        """Test routes are installed only for patterns with rules"""
+        interceptor, page = self._interceptor()
+
+        interceptor.mock_response(r"/api/users/\d+", body={"id": 1})
+        interceptor.modify_request_headers(r"/api/users/\d+", {"X-Test": "1"})
+        interceptor.modify_request_url(r"/api/v1/", lambda url: url.replace("/v1/", "/v2/"))
+
+        assert page.route.call_count == 2
+        matcher = page.route.call_args_list[0].args[0]
+        assert matcher.search("https://example.com/api/users/42")
+
+    def test_route_handler_fulfills_mock(self):
+        """Test routed requests matching a mock are fulfilled"""
+        interceptor, page = self._interceptor()
+        interceptor.mock_response(r"/api/users", status=201, body={"id": 1})
+        handler = page.route.call_args.args[1]
+        route = Mock()
+
+        handler(route, Mock(url="https://example.com/api/users", headers={}, post_data=None))
+
+        route.fulfill.assert_called_once()
+        assert route.fulfill.call_args.kwargs["status"] == 201
+
+    def test_route_handler_falls_back_without_changes(self):
+        """Test routed requests with nothing to change fall through"""
+        interceptor, page = self._interceptor()
+        interceptor.modify_request_headers(r"/api/", {"X-Test": "1"})
+        handler = page.route.call_args.args[1]
+        route = Mock()
+
+        handler(route, Mock(url="https://example.com/api/x", headers={"X-Test": "1"}, post_data=None))
+        route.fallback.assert_called_once()
+
+        interceptor.disable()
+        handler(route, Mock(url="https://example.com/api/x", headers={}, post_data=None))
+        assert route.fallback.call_count == 2
+        route.continue_.assert_not_called()
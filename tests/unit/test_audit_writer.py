@@ -0,0 +1,165 @@
+"""
+Unit Tests for AuditWriter and TestAuditLogger
+
+Tests batching, backpressure, encoding and daily rollover of the
+background audit writer.
+"""
+
+import json
+import logging
+from datetime import date, timedelta
+
+import pytest
+
+from utils import logger as audit_logging
+from utils.audit_writer import AuditWriter, encode_record
+
+
+def _read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.fixture
+def writer(tmp_path):
+    audit_writer = AuditWriter(tmp_path / "audit.log", base_fields={"logger": "audit"})
+    yield audit_writer
+    audit_writer.close()
+
+
+@pytest.mark.unit
+class TestAuditWriter:
+    """Test AuditWriter behaviour"""
+
+    def test_records_written_in_order_after_flush(self, writer):
+        """Test every submitted record is written once, in order"""
+        for i in range(1200):
+            writer.submit({"seq": i})
+
+        assert writer.flush()
+        records = _read_lines(writer.path)
+        assert [r["seq"] for r in records] == list(range(1200))
+        assert writer.written == 1200
+
+    def test_base_fields_and_timestamp(self, writer):
+        """Test base fields fill in missing fields only and timestamp_ms is formatted"""
+        writer.submit({"logger": "other", "timestamp_ms": 0.0})
+        writer.submit({"seq": 1})
+        writer.flush()
+
+        first, second = _read_lines(writer.path)
+        assert first["logger"] == "other"
+        assert second["logger"] == "audit"
+        assert len(first["timestamp"]) == len("1970-01-01 00:00:00")
+
+    def test_submit_after_close_is_dropped(self, tmp_path):
+        """Test records submitted to a closed writer are refused and counted"""
+        audit_writer = AuditWriter(tmp_path / "audit.log")
+        audit_writer.close()
+
+        assert audit_writer.submit({"seq": 1}) is False
+        assert audit_writer.dropped == 1
+
+    def test_drop_when_full_without_blocking(self, tmp_path):
+        """Test records beyond max_pending are dropped and counted"""
+        audit_writer = AuditWriter(
+            tmp_path / "audit.log", batch_size=100, flush_interval=60,
+            max_pending=2, block_timeout=0,
+        )
+        try:
+            results = [audit_writer.submit({"seq": i}) for i in range(3)]
+
+            assert results == [True, True, False]
+            assert audit_writer.dropped == 1
+        finally:
+            audit_writer.close()
+        assert len(_read_lines(audit_writer.path)) == 2
+
+    def test_blocking_backpressure_waits_for_writer(self, tmp_path):
+        """Test a full queue blocks the caller until the writer drains it"""
+        audit_writer = AuditWriter(
+            tmp_path / "audit.log", batch_size=10, flush_interval=60,
+            max_pending=5, block_timeout=5,
+        )
+        try:
+            assert all(audit_writer.submit({"seq": i}) for i in range(50))
+            assert audit_writer.dropped == 0
+        finally:
+            audit_writer.close()
+        assert len(_read_lines(audit_writer.path)) == 50
+
+    def test_close_writes_pending_records(self, tmp_path):
+        """Test close drains the queue"""
+        audit_writer = AuditWriter(tmp_path / "audit.log", flush_interval=60)
+        audit_writer.submit({"seq": 1})
+        audit_writer.close()
+
+        assert _read_lines(audit_writer.path) == [{"seq": 1}]
+
+    def test_daily_rollover(self, writer):
+        """Test the file is rolled over when the day changes"""
+        writer.submit({"day": "yesterday"})
+        writer.flush()
+        yesterday = date.today() - timedelta(days=1)
+        writer._day = yesterday
+
+        writer.submit({"day": "today"})
+        writer.flush()
+
+        rolled = writer.path.with_name(f"audit.log.{yesterday:%Y%m%d}")
+        assert _read_lines(rolled) == [{"day": "yesterday", "logger": "audit"}]
+        assert _read_lines(writer.path) == [{"day": "today", "logger": "audit"}]
+
+
+@pytest.mark.unit
+class TestEncodeRecord:
+    """Test JSONL encoding"""
+
+    def test_binary_safe_values(self):
+        """Test surrogates, bytes and objects still produce one JSON line"""
+        line = encode_record({"text": "bad \udcff byte", "raw": b"\x00\x01", "obj": object(), 1: "x"})
+
+        assert line.endswith(b"\n") and line.count(b"\n") == 1
+        record = json.loads(line)
+        assert record["text"] == "bad \udcff byte"
+        assert record["raw"] == str(b"\x00\x01")
+        assert record["1"] == "x"
+
+
+@pytest.mark.unit
+class TestTestAuditLogger:
+    """Test TestAuditLogger on a private writer"""
+
+    def test_log_action_enqueues_event(self, writer):
+        """Test helpers produce the flat audit document"""
+        audit = audit_logging.TestAuditLogger(writer=writer)
+
+        audit.log_ui_action("click", "#submit")
+        audit.log_api_call("GET", "/api/users", 404, 12.5)
+        assert audit.flush()
+
+        ui_event, api_event = _read_lines(writer.path)
+        assert ui_event["action_type"] == "ui_action"
+        assert ui_event["details"] == {"action": "click", "element": "#submit"}
+        assert "timestamp" in ui_event and "correlation_id" in ui_event
+        assert api_event["status"] == "failure"
+
+    def test_logged_level_is_kept(self, tmp_path):
+        """Test audit warnings and errors keep their level over the INFO default"""
+        audit_writer = AuditWriter(tmp_path / "audit.log", base_fields={"level": "INFO", "logger": "audit"})
+        handler = audit_logging._AuditWriterHandler(audit_writer)
+        for level in (logging.ERROR, logging.INFO):
+            handler.emit(logging.LogRecord("audit", level, __file__, 1, '{"event": "x"}', None, None))
+        audit_writer.close()
+
+        assert [r["level"] for r in _read_lines(audit_writer.path)] == ["ERROR", "INFO"]
+
+    def test_details_copied(self, writer):
+        """Test later changes to the details dict do not reach the log"""
+        audit = audit_logging.TestAuditLogger(writer=writer)
+        details = {"step": 1}
+
+        audit.log_action("custom", details)
+        details["step"] = 2
+        audit.flush()
+
+        assert _read_lines(writer.path)[0]["details"] == {"step": 1}
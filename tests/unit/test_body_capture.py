@@ -0,0 +1,180 @@
+"""
+Unit Tests for Body Capture
+
+Tests lazy, size-capped response body capture in APIInterceptor.
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from framework.api.api_interceptor import APIInterceptor
+from framework.api.body_capture import BodyCapturePolicy, CapturedResponse
+
+
+def _response(body: bytes, content_type="application/json", status=200, length=True):
+    headers = {"content-type": content_type}
+    if length:
+        headers["content-length"] = str(len(body))
+    response = Mock(
+        url="https://example.com/api/users/1",
+        status=status,
+        status_text="OK",
+        headers=headers,
+    )
+    response.request.method = "GET"
+    response.body.return_value = body
+    return response
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestBodyCapturePolicy:
+    """Test up-front capture decisions"""
+
+    @pytest.mark.parametrize(
+        "status, content_type, size, expected",
+        [
+            (200, "application/json; charset=utf-8", 10, None),
+            (200, "application/problem+json", 10, None),
+            (200, "text/html", 10, None),
+            (200, "image/png", 10, "content-type"),
+            (200, "application/javascript", 10, "content-type"),
+            (200, "application/json", 2048, "size"),
+            (204, "application/json", 0, "no-content"),
+            (302, "text/html", 0, "no-content"),
+            (200, "", None, None),
+        ],
+    )
+    def test_omit_reason(self, status, content_type, size, expected):
+        """Test content type, size and status rules"""
+        policy = BodyCapturePolicy(max_bytes=1024)
+        assert policy.omit_reason(status, content_type, size) == expected
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestCapturedResponse:
+    """Test lazy materialization of captured bodies"""
+
+    def test_loader_runs_once_on_access(self):
+        """Test the body is loaded on first read only"""
+        loader = Mock(return_value=({"id": 1}, None, None))
+        entry = CapturedResponse({"url": "u", "status": 200}, loader)
+
+        assert not entry.body_loaded
+        assert entry["status"] == 200
+        loader.assert_not_called()
+
+        assert entry["body"] == {"id": 1}
+        assert entry.get("body") == {"id": 1}
+        loader.assert_called_once()
+
+    def test_dict_conversions_materialize(self):
+        """Test dict(), JSON encoding and equality see the loaded body"""
+        entry = CapturedResponse({"url": "u"}, lambda: ("text", None, None))
+        assert json.loads(json.dumps(entry))["body"] == "text"
+
+        entry = CapturedResponse({"url": "u"}, lambda: ("text", None, None))
+        assert dict(entry)["body"] == "text"
+        assert entry == {
+            "url": "u",
+            "body": "text",
+            "original_body": None,
+            "body_omitted": None,
+            "body_unavailable": False,
+        }
+
+    def test_loader_failure_marks_unavailable(self):
+        """Test a body the browser no longer holds degrades to None"""
+
+        def fail():
+            raise RuntimeError("Target closed")
+
+        entry = CapturedResponse({"url": "u"}, fail)
+
+        assert entry["body"] is None
+        assert entry["body_omitted"] == "unavailable"
+        assert entry["body_unavailable"] is True
+
+    def test_peek_does_not_keep_body(self):
+        """Test peek_body reads through the loader without caching the body"""
+        loader = Mock(return_value=({"id": 1}, None, None))
+        entry = CapturedResponse({"url": "u"}, loader)
+
+        assert entry.peek_body() == {"id": 1}
+        assert entry.peek_body() == {"id": 1}
+        assert not entry.body_loaded
+        assert loader.call_count == 2
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestInterceptorBodyCapture:
+    """Test the response listener records metadata and defers the body"""
+
+    def _capture(self, response, **kwargs):
+        ui_engine = Mock()
+        ui_engine.__class__.__name__ = "PlaywrightEngine"
+        interceptor = APIInterceptor(ui_engine, **kwargs)
+        page = ui_engine.get_page.return_value
+        listener = next(c.args[1] for c in page.on.call_args_list if c.args[0] == "response")
+        listener(response)
+        return interceptor, interceptor.captured_responses[0]
+
+    def test_body_fetched_lazily(self):
+        """Test the browser is not asked for the body until it is read"""
+        response = _response(b'{"id": 1}')
+        interceptor, entry = self._capture(response)
+
+        response.body.assert_not_called()
+        assert entry["content_type"] == "application/json"
+        assert entry["body_size"] == 9
+        assert entry["body"] == {"id": 1}
+        response.body.assert_called_once()
+
+    def test_summary_and_correlation_do_not_keep_bodies(self):
+        """Test summaries and correlation read bodies without keeping them"""
+        response = _response(b'{"order_id": "ORD-1"}')
+        interceptor, entry = self._capture(response)
+
+        summary = interceptor.get_summary()
+        assert summary["correlation_keys"] == ["order_id"]
+        assert summary["response_bodies"] == {"declared_bytes": 21, "omitted": {}}
+        assert not entry.body_loaded
+
+        assert interceptor.get_correlation_data() == {"order_id": "ORD-1"}
+        assert not entry.body_loaded
+
+    def test_binary_body_never_fetched(self):
+        """Test non-textual content types are skipped"""
+        response = _response(b"\x89PNG", content_type="image/png")
+        _, entry = self._capture(response)
+
+        assert entry["body"] is None
+        assert entry["body_omitted"] == "content-type"
+        response.body.assert_not_called()
+
+    def test_size_cap_without_content_length(self):
+        """Test the cap is enforced on the actual bytes when no length is declared"""
+        response = _response(b"x" * 100, content_type="text/plain", length=False)
+        _, entry = self._capture(response, body_policy=BodyCapturePolicy(max_bytes=10))
+
+        assert entry["body"] is None
+        assert entry["body_omitted"] == "size"
+
+    def test_eager_policy_and_modifications(self):
+        """Test lazy=False loads immediately and modifiers apply on load"""
+        response = _response(b'{"email": "a@b.c"}')
+        ui_engine = Mock()
+        ui_engine.__class__.__name__ = "PlaywrightEngine"
+        interceptor = APIInterceptor(ui_engine, body_policy=BodyCapturePolicy(lazy=False))
+        interceptor.modify_response_body(r"/api/users", lambda body: {**body, "email": "***"})
+        page = ui_engine.get_page.return_value
+        next(c.args[1] for c in page.on.call_args_list if c.args[0] == "response")(response)
+
+        entry = interceptor.captured_responses[0]
+        assert entry.body_loaded
+        assert entry["body"] == {"email": "***"}
+        assert entry["original_body"] == {"email": "a@b.c"}
@@ -0,0 +1,102 @@
+"""
+Unit Tests for BrowserServer and the shared browser server plugin
+
+A stand-in server process (prints an endpoint, exits when stdin closes)
+replaces the Node driver, so no browser is needed.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from framework.ui import pytest_browser_server
+from framework.ui.browser_server import BrowserServer, process_tree_rss, select_endpoint
+from framework.ui.playwright_engine import WS_ENDPOINT_ENV, BrowserStartupError, PlaywrightEngine
+
+FAKE_SERVER = [
+    sys.executable,
+    "-c",
+    "import sys; print('ws://127.0.0.1:9/abc', flush=True); sys.stdin.read()",
+]
+
+
+def _failing(message):
+    return [sys.executable, "-c", f"import sys; sys.stderr.write({message!r}); sys.exit(1)"]
+
+
+@pytest.mark.unit
+class TestBrowserServer:
+    """Test server process lifecycle"""
+
+    def test_start_reads_endpoint_and_stop_ends_process(self):
+        """Test the first stdout line is the endpoint and closing stdin stops the server"""
+        server = BrowserServer(command=FAKE_SERVER)
+
+        assert server.start(timeout=30) == "ws://127.0.0.1:9/abc"
+        process = server.process
+        assert server.running and server.startup_seconds > 0
+        assert server.rss_bytes() > 0
+
+        server.stop()
+        assert process.returncode == 0
+        assert not server.running and server.ws_endpoint is None
+
+    def test_startup_failure_reports_stderr(self):
+        """Test a server exiting without an endpoint raises BrowserStartupError"""
+        with pytest.raises(BrowserStartupError, match="port in use"):
+            BrowserServer(command=_failing("port in use")).start(timeout=30)
+
+    def test_missing_browser_suggests_install(self):
+        """Test a missing browser executable maps to the install hint"""
+        server = BrowserServer("firefox", command=_failing("Executable doesn't exist at /x"))
+
+        with pytest.raises(BrowserStartupError, match="playwright install firefox"):
+            server.start(timeout=30)
+
+    def test_launch_options(self):
+        """Test options are passed to launchServer() in JavaScript naming"""
+        server = BrowserServer(headless=False, channel="chrome", args=["--a"], launch_options={"port": 9})
+
+        assert server.launch_options == {"headless": False, "channel": "chrome", "args": ["--a"], "port": 9}
+
+    def test_process_tree_rss(self):
+        """Test memory is measured for a live process"""
+        assert process_tree_rss(os.getpid()) > 0
+        assert process_tree_rss(None) is None
+
+
+@pytest.mark.unit
+class TestEndpointPublication:
+    """Test endpoints reach xdist workers"""
+
+    def test_select_endpoint_round_robin(self):
+        """Test workers are spread over the servers by worker number"""
+        endpoints = ["ws://a", "ws://b", "ws://c"]
+
+        assert [select_endpoint(endpoints, f"gw{i}") for i in range(4)] == ["ws://a", "ws://b", "ws://c", "ws://a"]
+        assert select_endpoint(endpoints, None) == "ws://a"
+        assert select_endpoint([], "gw1") is None
+
+    def test_worker_connects_to_published_endpoint(self, monkeypatch):
+        """Test the controller's servers are published and picked up by a worker"""
+        monkeypatch.delenv(WS_ENDPOINT_ENV, raising=False)
+        servers = [SimpleNamespace(ws_endpoint="ws://a"), SimpleNamespace(ws_endpoint="ws://b")]
+        node = SimpleNamespace(config=SimpleNamespace(_browser_servers=servers), workerinput={"workerid": "gw5"})
+        pytest_browser_server.pytest_configure_node(node)
+
+        worker = SimpleNamespace(workerinput=node.workerinput)
+        pytest_browser_server.pytest_configure(worker)
+
+        assert pytest_browser_server.browser_ws_endpoint(worker) == "ws://b"
+        assert PlaywrightEngine().ws_endpoint == "ws://b"
+        pytest_browser_server.pytest_unconfigure(worker)
+        assert WS_ENDPOINT_ENV not in os.environ
+
+    def test_launch_args_hook_reaches_servers(self, pytestconfig):
+        """Test conftest launch args (e.g. --start-maximized) are passed to the servers"""
+        options = pytest_browser_server._browser_options(pytestconfig)
+
+        assert options["args"] == ["--start-maximized"]
+        assert options["launch_options"] == {}
@@ -0,0 +1,183 @@
+"""
+Unit Tests for Capture Store
+
+Tests the bounded, indexed storage behind APIInterceptor captures.
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from framework.api.api_interceptor import APIInterceptor
+from framework.api.body_capture import CapturedResponse
+from framework.api.capture_store import CaptureStore
+
+
+def _request(i, method="GET", url=None):
+    return {"method": method, "url": url or f"https://example.com/api/items/{i}"}
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestCaptureStore:
+    """Test CaptureStore behaviour"""
+
+    def test_list_compatibility(self):
+        """Test the store behaves like the list it replaces"""
+        store = CaptureStore()
+        store.extend([_request(1), _request(2)])
+
+        assert len(store) == 2
+        assert store[0]["url"].endswith("/1")
+        assert store[-1]["url"].endswith("/2")
+        assert [r["url"] for r in store] == [store[0]["url"], store[1]["url"]]
+        assert store == store.copy()
+        assert store.copy() is not store.copy()
+
+    def test_ring_buffer_bound(self):
+        """Test oldest entries are evicted past max_entries"""
+        store = CaptureStore(max_entries=3)
+        store.extend(_request(i) for i in range(10))
+
+        assert len(store) == 3
+        assert store.evicted == 7
+        assert [r["url"][-1] for r in store] == ["7", "8", "9"]
+
+    def test_positions_after_eviction(self):
+        """Test indexing, slicing and live iteration once the ring has wrapped"""
+        store = CaptureStore(max_entries=3)
+        store.extend(_request(i) for i in range(5))
+
+        assert store[0]["url"].endswith("/2")
+        assert store[-1]["url"].endswith("/4")
+        assert [r["url"][-1] for r in store[1:]] == ["3", "4"]
+        with pytest.raises(IndexError):
+            store[3]
+
+        seen = []
+        for entry in store:
+            seen.append(entry["url"][-1])
+            if len(seen) == 1:
+                store.append(_request(5))
+        assert seen == ["2", "3", "4", "5"]
+
+    def test_indexes_follow_eviction(self):
+        """Test index buckets drop evicted entries"""
+        store = CaptureStore(
+            indexes={"method": lambda e: e.get("method")},
+            max_entries=2,
+        )
+        store.append(_request(1, "POST"))
+        store.append(_request(2, "GET"))
+        store.append(_request(3, "GET"))
+
+        assert store.lookup("method", "POST") == []
+        assert [r["url"][-1] for r in store.lookup("method", "GET")] == ["2", "3"]
+        assert store.counts("method") == {"GET": 2}
+
+    def test_eviction_survives_entry_mutation(self):
+        """Test eviction uses the keys computed at insert time"""
+        store = CaptureStore(indexes={"method": lambda e: e.get("method")}, max_entries=1)
+        entry = _request(1, "GET")
+        store.append(entry)
+        entry["method"] = "DELETE"
+        store.append(_request(2, "POST"))
+
+        assert store.counts("method") == {"POST": 1}
+
+    def test_none_keys_are_not_indexed(self):
+        """Test entries whose key is None are left out of the index"""
+        store = CaptureStore(indexes={"status": lambda e: e.get("status")})
+        store.extend([{"status": 200}, {"url": "x"}])
+
+        assert store.counts("status") == {200: 1}
+        assert store.first("status", 404) is None
+
+    def test_spill_to_disk(self, tmp_path):
+        """Test evicted entries are appended to the JSONL spill file"""
+        spill = tmp_path / "spill" / "requests.jsonl"
+        store = CaptureStore(max_entries=2, spill_path=spill)
+        store.extend(_request(i) for i in range(5))
+
+        assert [r["url"][-1] for r in store.iter_spilled()] == ["0", "1", "2"]
+        assert [r["url"][-1] for r in store.iter_all()] == ["0", "1", "2", "3", "4"]
+
+        store.close()
+        lines = spill.read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[0])["url"].endswith("/0")
+
+    def test_spill_does_not_load_lazy_bodies(self, tmp_path):
+        """Test evicting a lazily captured response writes metadata without loading its body"""
+        spill = tmp_path / "responses.jsonl"
+        loader = Mock(return_value=({"id": 1}, None, None))
+        loaded = CapturedResponse({"url": "https://example.com/1", "status": 200}, loader)
+        loaded.materialize()
+        lazy_loader = Mock()
+        store = CaptureStore(max_entries=1, spill_path=spill)
+        store.extend([
+            loaded,
+            CapturedResponse({"url": "https://example.com/2", "status": 200}, lazy_loader),
+            {"url": "https://example.com/3", "status": 200},
+        ])
+        store.close()
+
+        lazy_loader.assert_not_called()
+        first, second = (json.loads(line) for line in spill.read_text(encoding="utf-8").splitlines())
+        assert first["body"] == {"id": 1}
+        assert second["url"].endswith("/2")
+        assert second["body"] is None
+        assert second["body_omitted"] == "not-loaded"
+
+    def test_invalid_bound(self):
+        """Test a non-positive bound is rejected"""
+        with pytest.raises(ValueError):
+            CaptureStore(max_entries=0)
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestAPIInterceptorCaptureStore:
+    """Test APIInterceptor lookups backed by the capture store"""
+
+    def _interceptor(self, **kwargs):
+        ui_engine = Mock()
+        ui_engine.__class__.__name__ = "PlaywrightEngine"
+        return APIInterceptor(ui_engine, **kwargs)
+
+    def test_bounded_capture(self):
+        """Test max_captured bounds both requests and responses"""
+        interceptor = self._interceptor(max_captured=5)
+        interceptor.captured_requests.extend(_request(i) for i in range(20))
+        interceptor.captured_responses.extend(
+            {"url": f"https://example.com/{i}", "status": 200} for i in range(20)
+        )
+
+        assert len(interceptor.captured_requests) == 5
+        assert len(interceptor.captured_responses) == 5
+
+    def test_indexed_lookups(self):
+        """Test method, URL, path and status lookups"""
+        interceptor = self._interceptor()
+        interceptor.captured_requests = [
+            {"method": "get", "url": "https://example.com/api/users?page=1"},
+            {"method": "POST", "url": "https://example.com/login"},
+        ]
+        interceptor.captured_responses = [
+            {"url": "https://example.com/login", "status": 302},
+            {"url": "https://example.com/login", "status": 200},
+        ]
+
+        assert len(interceptor.get_requests_by_method("GET")) == 1
+        assert len(interceptor.find_api_calls()) == 1
+        assert interceptor.captured_requests.lookup("path", "/api/users")[0]["method"] == "get"
+        assert interceptor.get_response_by_url("https://example.com/login")["status"] == 302
+        assert interceptor.captured_responses.counts("status") == {302: 1, 200: 1}
+
+    def test_spill_dir(self, tmp_path):
+        """Test evicted captures are spilled under spill_dir"""
+        interceptor = self._interceptor(max_captured=1, spill_dir=tmp_path)
+        interceptor.captured_requests.extend(_request(i) for i in range(3))
+        interceptor.captured_requests.close()
+
+        assert len((tmp_path / "requests.jsonl").read_text().splitlines()) == 2
@@ -0,0 +1,234 @@
+"""
+Unit Tests for ContextPool
+
+Uses in-memory stand-ins for the Playwright browser, contexts and pages,
+so reset, recycling, elastic sizing and statistics run without a browser.
+"""
+
+import threading
+import time
+
+import pytest
+
+from framework.ui.playwright_engine import ContextPool, ContextPoolExhausted, LatencyHistogram
+
+
+class FakeFrame:
+    def __init__(self, url):
+        self.url = url
+        self.parent_frame = None
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.handlers = []
+        self.closed = False
+
+    def on(self, event, handler):
+        self.handlers.append(handler)
+
+    def goto(self, url):
+        self.url = url
+        for handler in self.handlers:
+            handler(FakeFrame(url))
+
+    def evaluate(self, script):
+        self.context.storage_cleared.append(self.url)
+
+    def close(self):
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.pages = []
+        self.handlers = []
+        self.init_scripts = []
+        self.calls = []
+        self.storage_cleared = []
+        self.closed = False
+        self.fail_reset = False
+
+    def on(self, event, handler):
+        self.handlers.append(handler)
+
+    def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        for handler in self.handlers:
+            handler(page)
+        return page
+
+    def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    def clear_cookies(self):
+        if self.fail_reset:
+            raise RuntimeError("Target closed")
+        self.calls.append("clear_cookies")
+
+    def clear_permissions(self):
+        self.calls.append("clear_permissions")
+
+    def grant_permissions(self, permissions):
+        self.calls.append(("grant_permissions", permissions))
+
+    def unroute_all(self):
+        self.calls.append("unroute_all")
+
+    def set_offline(self, offline):
+        self.calls.append(("set_offline", offline))
+
+    def set_extra_http_headers(self, headers):
+        self.calls.append(("set_extra_http_headers", headers))
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **options):
+        context = FakeContext(options)
+        self.contexts.append(context)
+        return context
+
+
+@pytest.fixture
+def fake_browser():
+    return FakeBrowser()
+
+
+@pytest.mark.unit
+class TestContextPool:
+    """Test reset, recycling, sizing and statistics"""
+
+    def test_warm_spares_created_up_front_and_refilled(self, fake_browser):
+        """Test only the spares are created eagerly and are refilled on release"""
+        pool = ContextPool(fake_browser, max_size=4, warm_spares=2, init_scripts=["window.x = 1"])
+
+        assert len(fake_browser.contexts) == 2
+        assert fake_browser.contexts[0].init_scripts == ["window.x = 1"]
+        first = pool.acquire_context()
+        second = pool.acquire_context()
+        assert len(fake_browser.contexts) == 2
+
+        pool.release_context(first)
+        stats = pool.get_stats()
+        assert stats["contexts_available"] == 2 and stats["contexts_in_use"] == 1
+        assert stats["contexts_created"] == 3
+        pool.release_context(second)
+
+    def test_release_resets_state(self, fake_browser):
+        """Test pages are closed, storage cleared and context state reset"""
+        pool = ContextPool(fake_browser, pool_size=2, context_options={"permissions": ["geolocation"]})
+        context = pool.acquire_context()
+        page = context.new_page()
+        page.goto("https://app.example.com/login")
+
+        pool.release_context(context)
+
+        assert page.closed and not context.closed
+        assert context.storage_cleared == ["https://app.example.com/login"]
+        assert context.calls == [
+            "clear_cookies",
+            "clear_permissions",
+            ("grant_permissions", ["geolocation"]),
+            "unroute_all",
+            ("set_offline", False),
+            ("set_extra_http_headers", {}),
+        ]
+        assert pool.acquire_context() is context
+        assert pool.get_stats()["resets"] == 1
+
+    def test_recycles_after_max_uses_on_error_and_on_request(self, fake_browser):
+        """Test contexts are closed and replaced instead of reused"""
+        pool = ContextPool(fake_browser, pool_size=2, warm_spares=1, max_uses=2)
+
+        context = pool.acquire_context()
+        pool.release_context(context)
+        assert pool.acquire_context() is context
+        pool.release_context(context)  # second use
+        assert context.closed
+
+        failing = pool.acquire_context()
+        failing.fail_reset = True
+        pool.release_context(failing)
+        assert failing.closed
+
+        requested = pool.acquire_context()
+        pool.release_context(requested, recycle=True)
+
+        stats = pool.get_stats()
+        assert stats["recycle_reasons"] == {"max_uses": 1, "reset_error": 1, "requested": 1}
+        assert stats["contexts_open"] == 1 and stats["contexts_available"] == 1
+
+    def test_storage_of_closed_pages_forces_recycle(self, fake_browser):
+        """Test a context is recycled when a closed page's origin cannot be cleared"""
+        pool = ContextPool(fake_browser, pool_size=2)
+        context = pool.acquire_context()
+        page = context.new_page()
+        page.goto("https://app.example.com/")
+        page.close()
+
+        pool.release_context(context)
+
+        assert context.closed
+        assert pool.get_stats()["recycle_reasons"] == {"storage": 1}
+
+    def test_exhausted_then_available_after_release(self, fake_browser):
+        """Test the pool grows to max_size, then waits for a release"""
+        pool = ContextPool(fake_browser, pool_size=2, warm_spares=0)
+        contexts = [pool.acquire_context(), pool.acquire_context()]
+
+        with pytest.raises(ContextPoolExhausted):
+            pool.acquire_context(timeout=0.05)
+
+        threading.Timer(0.05, pool.release_context, args=(contexts[0],)).start()
+        assert pool.acquire_context(timeout=5) is contexts[0]
+        assert pool.get_stats()["wait_timeouts"] == 1
+
+    def test_idle_contexts_trimmed_to_floor(self, fake_browser):
+        """Test idle contexts above min_size/warm_spares are closed after idle_timeout"""
+        pool = ContextPool(fake_browser, pool_size=4, min_size=1, warm_spares=0, idle_timeout=0.01)
+        contexts = [pool.acquire_context() for _ in range(3)]
+        for context in contexts[:2]:
+            pool.release_context(context)
+        time.sleep(0.02)
+
+        pool.release_context(contexts[2])
+
+        stats = pool.get_stats()
+        assert stats["contexts_trimmed"] == 2
+        assert stats["contexts_open"] == 1
+
+    def test_acquire_latency_histogram(self, fake_browser):
+        """Test every acquisition is recorded in the latency histogram"""
+        pool = ContextPool(fake_browser, pool_size=2)
+        for _ in range(5):
+            pool.release_context(pool.acquire_context())
+
+        latency = pool.get_stats()["acquire_latency"]
+        assert latency["count"] == 5
+        assert sum(latency["buckets"].values()) == 5
+        assert latency["p50_ms"] <= latency["p95_ms"] <= latency["max_ms"]
+
+
+@pytest.mark.unit
+def test_latency_histogram_buckets():
+    """Test bucket boundaries are inclusive upper bounds"""
+    histogram = LatencyHistogram()
+    for ms in (0.5, 1, 3, 7000):
+        histogram.record(ms)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"]["<=1ms"] == 2
+    assert snapshot["buckets"]["<=5ms"] == 1
+    assert snapshot["buckets"][">5000ms"] == 1
+    assert snapshot["max_ms"] == 7000
@@ -0,0 +1,234 @@
+"""
+Unit Tests for DriverResolver and the Selenium DriverPool
+
+Fake driver managers and WebDriver sessions stand in for webdriver_manager
+and real browsers, so caching, reset and recycling run offline.
+"""
+
+import threading
+import time
+
+import pytest
+
+from framework.ui.driver_resolver import DriverResolver
+from framework.ui.selenium_engine import DriverPool, DriverPoolExhausted, SeleniumEngine
+
+
+class FakeManager:
+    installs = []
+
+    def __init__(self, path):
+        self.path = path
+
+    def install(self):
+        FakeManager.installs.append(self.path)
+        if self.path is None:
+            raise ConnectionError("offline")
+        return self.path
+
+
+@pytest.fixture
+def driver_binary(tmp_path):
+    path = tmp_path / "chromedriver"
+    path.write_text("")
+    FakeManager.installs = []
+    return str(path)
+
+
+def _resolver(tmp_path, path, version="120.0.1"):
+    return DriverResolver(
+        tmp_path / "cache" / "resolved.json",
+        managers={"chrome": lambda: FakeManager(path)},
+        version_reader=lambda _browser: version,
+    )
+
+
+@pytest.mark.unit
+class TestDriverResolver:
+    """Test driver resolution is cached per browser version"""
+
+    def test_cache_shared_across_instances(self, tmp_path, driver_binary):
+        """Test only the first resolver on the host runs the manager"""
+        assert _resolver(tmp_path, driver_binary).resolve("chrome") == driver_binary
+        assert _resolver(tmp_path, driver_binary).resolve("chrome") == driver_binary
+
+        assert FakeManager.installs == [driver_binary]
+
+    def test_browser_update_resolves_again(self, tmp_path, driver_binary):
+        """Test a new browser version, or a missing binary, is a cache miss"""
+        _resolver(tmp_path, driver_binary).resolve("chrome")
+        _resolver(tmp_path, driver_binary, version="121.0.0").resolve("chrome")
+        assert len(FakeManager.installs) == 2
+
+        _resolver(tmp_path, driver_binary).resolve("chrome", cache_valid_days=0)
+        assert len(FakeManager.installs) == 3
+
+    def test_unknown_version_is_not_cached(self, tmp_path, driver_binary):
+        """Test a browser whose version cannot be read is resolved without the host cache"""
+        resolver = _resolver(tmp_path, driver_binary, version=None)
+
+        assert resolver.resolve("chrome") == driver_binary
+        assert resolver.resolve("chrome") == driver_binary
+        assert _resolver(tmp_path, driver_binary, version=None).resolve("chrome") == driver_binary
+
+        assert len(FakeManager.installs) == 2
+        assert not resolver.cache_file.exists()
+
+    def test_failed_install_falls_back_to_selenium_manager(self, tmp_path):
+        """Test a failed download returns None and is not cached"""
+        FakeManager.installs = []
+
+        assert _resolver(tmp_path, None).resolve("chrome") is None
+        assert _resolver(tmp_path, None).resolve("chrome") is None
+        assert len(FakeManager.installs) == 2
+        assert _resolver(tmp_path, None).resolve("safari") is None
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class FakeDriver:
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.switch_to = FakeSwitchTo(self)
+        self.current = "main"
+        self.calls = []
+        self.quit_called = False
+        self.fail_reset = False
+
+    def close(self):
+        self.window_handles.remove(self.current)
+        self.calls.append(("close", self.current))
+
+    def execute_script(self, script):
+        self.calls.append("clear_storage")
+
+    def delete_all_cookies(self):
+        if self.fail_reset:
+            raise RuntimeError("invalid session id")
+        self.calls.append("delete_all_cookies")
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append(cmd)
+
+    def get(self, url):
+        self.calls.append(("get", url))
+
+    def find_elements(self, by, locator):
+        return []
+
+    def quit(self):
+        self.quit_called = True
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+@pytest.mark.unit
+class TestDriverPool:
+    """Test pre-launching, reset and recycling"""
+
+    def test_sessions_prelaunched_and_refilled(self):
+        """Test size sessions are launched up front and topped up after acquire"""
+        launched = []
+        pool = DriverPool(lambda: launched.append(FakeDriver()) or launched[-1], size=2)
+        _wait_for(lambda: pool.get_stats()["sessions_available"] == 2)
+
+        driver = pool.acquire()
+
+        assert driver is launched[0]
+        _wait_for(lambda: pool.get_stats()["sessions_available"] == 2)
+        stats = pool.get_stats()
+        assert stats["warm_acquisitions"] == 1 and stats["sessions_launched"] == 3
+        pool.close_all()
+        assert all(d.quit_called for d in launched)
+
+    def test_release_resets_instead_of_quitting(self):
+        """Test extra windows, storage and cookies are cleared and the session reused"""
+        pool = DriverPool(FakeDriver, size=1, prelaunch=False)
+        driver = pool.acquire()
+        driver.window_handles.append("popup")
+
+        pool.release(driver)
+
+        assert not driver.quit_called
+        assert driver.calls == [
+            ("close", "popup"),
+            "clear_storage",
+            "delete_all_cookies",
+            "Network.clearBrowserCookies",
+            ("get", "about:blank"),
+        ]
+        assert pool.acquire() is driver
+        pool.close_all()
+
+    def test_recycles_on_max_uses_error_and_request(self):
+        """Test sessions are quit and replaced instead of reused"""
+        pool = DriverPool(FakeDriver, size=0, max_uses=2, prelaunch=False)
+        driver = pool.acquire()
+        pool.release(driver)
+        assert pool.acquire() is driver
+        pool.release(driver)
+        assert driver.quit_called
+
+        failing = pool.acquire()
+        failing.fail_reset = True
+        pool.release(failing)
+        assert failing.quit_called
+
+        requested = pool.acquire()
+        pool.release(requested, recycle=True)
+        assert requested.quit_called
+        assert pool.get_stats()["sessions_recycled"] == 3
+
+    def test_failed_prelaunch_wakes_waiting_acquire(self):
+        """Test acquire launches a session itself as soon as a pre-launch fails"""
+        started = threading.Event()
+        calls = []
+
+        def factory():
+            calls.append(1)
+            if len(calls) == 1:
+                started.set()
+                time.sleep(0.2)
+                raise RuntimeError("session not created")
+            return FakeDriver()
+
+        pool = DriverPool(factory, size=1)
+        assert started.wait(2.0)
+
+        begin = time.monotonic()
+        driver = pool.acquire(timeout=5)
+
+        assert isinstance(driver, FakeDriver)
+        assert time.monotonic() - begin < 2.0
+        assert pool.get_stats()["launch_failures"] == 1
+        pool.close_all()
+
+    def test_exhausted_at_max_size(self):
+        """Test acquire times out when max_size sessions are in use"""
+        pool = DriverPool(FakeDriver, size=0, max_size=1, prelaunch=False)
+        pool.acquire()
+
+        with pytest.raises(DriverPoolExhausted):
+            pool.acquire(timeout=0.05)
+
+
+@pytest.mark.unit
+def test_is_visible_does_not_wait():
+    """Test a missing element is reported immediately (no implicit wait)"""
+    engine = SeleniumEngine(default_timeout=30)
+    engine.driver = FakeDriver()
+
+    started = time.monotonic()
+    assert engine.is_visible("#missing") is False
+    assert time.monotonic() - started < 1
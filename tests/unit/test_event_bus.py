@@ -0,0 +1,208 @@
+"""
+Unit Tests for the logging Event Bus
+
+Tests per-format memoized rendering, channel/level routing, sinks and
+backpressure of EventBus.
+"""
+
+import io
+import json
+import logging
+import threading
+
+import pytest
+import structlog
+
+from framework.observability.event_bus import (
+    BusHandler,
+    CallbackSink,
+    EventBus,
+    FileSink,
+    LogEvent,
+    Sink,
+    StreamSink,
+)
+from framework.observability.logging import LogConfig, configure_logging, get_logger
+
+
+@pytest.fixture
+def bus():
+    event_bus = EventBus(static_fields={"environment": "test"})
+    yield event_bus
+    event_bus.shutdown()
+
+
+def _event(channel="enterprise.app", level=logging.INFO, message="hello", **kwargs):
+    return LogEvent(channel, level, message, **kwargs)
+
+
+@pytest.mark.unit
+class TestEventBus:
+    """Test EventBus dispatch"""
+
+    def test_rendered_once_per_format(self, bus, tmp_path):
+        """Test several sinks of one format share a single rendering"""
+        calls = []
+
+        def counting_json(event, event_bus):
+            calls.append(event)
+            return json.dumps({"message": event.message})
+
+        bus.register_format("counted", counting_json)
+        for name in ("a", "b", "c"):
+            bus.subscribe(FileSink(tmp_path / f"{name}.log", format="counted"))
+
+        bus.publish(_event())
+        assert bus.flush()
+
+        assert len(calls) == 1
+        for name in ("a", "b", "c"):
+            assert (tmp_path / f"{name}.log").read_text() == '{"message": "hello"}\n'
+
+    def test_channel_and_level_routing(self, bus):
+        """Test sinks only receive matching channels and levels"""
+        audit, everything = [], []
+        bus.subscribe(CallbackSink(audit.append, channels={"enterprise.audit"}))
+        bus.subscribe(CallbackSink(everything.append, level=logging.WARNING))
+
+        bus.publish(_event("enterprise.audit", message="audit"))
+        bus.publish(_event("enterprise.app", logging.ERROR, message="error"))
+        bus.publish(_event("enterprise.app", logging.DEBUG, message="debug"))
+        bus.flush()
+
+        assert [d["message"] for d in audit] == ["audit"]
+        assert [d["message"] for d in everything] == ["error"]
+
+    def test_structured_document(self, bus):
+        """Test the dict format carries context, static fields and masked extra"""
+        bus.mask = lambda data: {**data, "masked": True}
+        received = []
+        bus.subscribe(CallbackSink(received.append))
+
+        bus.publish(_event(extra={"k": 1}, context=("corr-1", "req-1", None, None)))
+        bus.flush()
+
+        document = received[0]
+        assert document["correlation_id"] == "corr-1"
+        assert document["environment"] == "test"
+        assert document["extra"] == {"k": 1}
+        assert document["masked"] is True
+
+    def test_exception_captured_at_creation(self, bus):
+        """Test the traceback is formatted when the event is created"""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            event = _event(level=logging.ERROR, exc_info=True)
+
+        assert event.exception["type"] == "ValueError"
+        assert "boom" in event.exception["stacktrace"][-1]
+
+    def test_console_format(self, bus):
+        """Test console lines match the previous handler layout"""
+        stream = io.StringIO()
+        bus.subscribe(StreamSink(stream))
+
+        bus.publish(_event(source=("/x/page.py", "click", 12)))
+        bus.flush()
+
+        assert stream.getvalue().endswith("[    INFO] enterprise.app:12 - hello\n")
+
+    def test_full_queue_drops_and_counts(self):
+        """Test publishing into a full queue drops the event instead of blocking"""
+        release = threading.Event()
+        event_bus = EventBus(max_pending=1, batch_size=1)
+        event_bus.subscribe(CallbackSink(lambda _payload: release.wait(5)))
+        try:
+            results = [event_bus.publish(_event()) for _ in range(5)]
+
+            assert results[0] is True
+            assert False in results
+            assert event_bus.dropped == results.count(False)
+        finally:
+            release.set()
+            event_bus.shutdown()
+
+    def test_failing_sink_does_not_stop_others(self, bus, capsys):
+        """Test a sink error is reported and other sinks still receive events"""
+        received = []
+        bus.subscribe(CallbackSink(lambda _payload: 1 / 0))
+        bus.subscribe(CallbackSink(received.append))
+
+        bus.publish(_event())
+        bus.flush()
+
+        assert len(received) == 1
+        assert "ZeroDivisionError" in capsys.readouterr().err
+
+
+@pytest.mark.unit
+class TestFileSink:
+    """Test FileSink rotation"""
+
+    def test_size_rotation(self, bus, tmp_path):
+        """Test files roll over to .1, .2 when max_bytes is reached"""
+        path = tmp_path / "app.json"
+        bus.subscribe(FileSink(path, max_bytes=200, backup_count=2, format="console"))
+
+        for i in range(20):
+            bus.publish(_event(message=f"message {i:02d}"))
+        bus.flush()
+
+        assert path.exists()
+        assert (tmp_path / "app.json.1").exists()
+        assert (tmp_path / "app.json.2").exists()
+        assert not (tmp_path / "app.json.3").exists()
+        assert "message 19" in path.read_text()
+
+
+@pytest.mark.unit
+class TestBusHandler:
+    """Test standard logging integration"""
+
+    def test_records_published_with_context(self, bus):
+        """Test LogRecords become events carrying extra_fields and context"""
+        received = []
+        bus.subscribe(CallbackSink(received.append))
+        logger = logging.getLogger("test.event_bus")
+        logger.propagate = False
+        handler = BusHandler(bus, context=lambda: ("corr-9", None, None, None))
+        logger.addHandler(handler)
+        try:
+            logger.warning("hi %s", "there", extra={"extra_fields": {"a": 1}})
+            bus.flush()
+        finally:
+            logger.removeHandler(handler)
+
+        assert received[0]["message"] == "hi there"
+        assert received[0]["extra"] == {"a": 1}
+        assert received[0]["correlation_id"] == "corr-9"
+        assert received[0]["logger"] == "test.event_bus"
+
+
+@pytest.mark.unit
+def test_sink_requires_handle():
+    """Test Sink is abstract until handle() is implemented"""
+    with pytest.raises(TypeError):
+        Sink()
+
+
+@pytest.mark.unit
+def test_structlog_events_published_to_bus(bus):
+    """Test structlog events become bus events instead of being rendered by structlog"""
+    collected = []
+    bus.subscribe(CallbackSink(collected.append))
+    logging.getLogger("tests.structlog").setLevel(logging.INFO)
+    configure_logging(LogConfig(level="INFO", event_bus=bus))
+    try:
+        get_logger("tests.structlog").warning("test_started", test_name="t1")
+        assert bus.flush()
+    finally:
+        structlog.reset_defaults()
+
+    (document,) = collected
+    assert document["message"] == "test_started"
+    assert document["level"] == "WARNING"
+    assert document["logger"] == "tests.structlog"
+    assert document["function"] == "test_structlog_events_published_to_bus"
+    assert document["extra"] == {"test_name": "t1"}
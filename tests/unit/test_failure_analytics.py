@@ -0,0 +1,131 @@
+"""
+Unit Tests for Failure Analytics
+
+Tests the incremental aggregator behind MLTestOptimizer analytics.
+"""
+
+import random
+
+import pytest
+
+from framework.ml.failure_analytics import FailureAggregator, P2Quantile
+from framework.ml.ml_test_optimizer import MLTestOptimizer
+
+
+def _result(name, passed, duration=1.0, changed_files=None):
+    return {
+        "test_name": name,
+        "passed": passed,
+        "duration": duration,
+        "timestamp": "2026-01-01T00:00:00",
+        "error": None if passed else "boom",
+        "changed_files": changed_files or [],
+    }
+
+
+@pytest.mark.unit
+class TestP2Quantile:
+    """Test the streaming quantile sketch"""
+
+    def test_exact_for_few_values(self):
+        """Test small samples use the exact nearest rank"""
+        sketch = P2Quantile(0.9)
+        for value in (3.0, 1.0, 2.0):
+            sketch.add(value)
+        assert sketch.value() == 3.0
+
+    @pytest.mark.parametrize("p", [0.5, 0.9])
+    def test_estimate_close_to_exact(self, p):
+        """Test the estimate tracks the exact quantile on a large stream"""
+        rng = random.Random(5)
+        values = [rng.expovariate(1.0) for _ in range(20000)]
+        sketch = P2Quantile(p)
+        for value in values:
+            sketch.add(value)
+
+        exact = sorted(values)[int(p * len(values))]
+        assert sketch.value() == pytest.approx(exact, rel=0.05)
+
+
+@pytest.mark.unit
+class TestFailureAggregator:
+    """Test running counters, flakiness and the file index"""
+
+    def test_counters_and_durations(self):
+        """Test failure rate and mean duration"""
+        aggregator = FailureAggregator()
+        aggregator.extend(
+            [_result("a", True, 1.0), _result("a", False, 3.0), _result("b", True, 2.0)]
+        )
+
+        pattern = aggregator.pattern("a")
+        assert pattern["failure_rate"] == 0.5
+        assert pattern["total_runs"] == 2
+        assert pattern["avg_duration"] == 2.0
+
+    def test_flakiness_window_matches_rescan(self):
+        """Test incremental transitions equal a rescan of the last 20 runs"""
+        rng = random.Random(1)
+        aggregator = FailureAggregator()
+        outcomes = []
+        for _ in range(200):
+            passed = rng.random() > 0.4
+            outcomes.append(passed)
+            aggregator.add(_result("a", passed))
+
+            window = outcomes[-20:]
+            expected = (
+                sum(window[i] != window[i - 1] for i in range(1, len(window))) / (len(window) - 1)
+                if len(window) >= 5
+                else 0.0
+            )
+            assert aggregator.stats["a"].flakiness == pytest.approx(expected)
+
+    def test_file_index_tracks_recent_failures_only(self):
+        """Test failures leaving the recent window are removed from the index"""
+        aggregator = FailureAggregator()
+        aggregator.add(_result("a", False, changed_files=["old.py"]))
+        for _ in range(5):
+            aggregator.add(_result("a", False, changed_files=["new.py", "new.py"]))
+
+        assert aggregator.file_overlap(["old.py"]) == {}
+        assert aggregator.file_overlap(["new.py", "other.py"]) == {"a": 5}
+        assert aggregator.failures_touching("a", ["new.py"]) == 5
+
+
+@pytest.mark.unit
+class TestMLTestOptimizerAnalytics:
+    """Test MLTestOptimizer on top of the aggregator"""
+
+    @pytest.fixture
+    def optimizer(self, tmp_path):
+        optimizer = MLTestOptimizer(str(tmp_path / "history.jsonl"))
+        for _ in range(3):
+            optimizer.record_test_result("test_cart", False, 4.0, "boom", ["cart.py"])
+        for _ in range(3):
+            optimizer.record_test_result("test_login", True, 0.5)
+        optimizer.record_test_result("test_login", False, 0.5, "boom", ["auth.py"])
+        return optimizer
+
+    def test_order_and_recommendations(self, optimizer):
+        """Test ordering uses failure rate and changed-file impact"""
+        order = optimizer.get_optimal_test_order(["test_login", "test_new", "test_cart"], ["auth.py"])
+
+        assert [name for name, _ in order] == ["test_cart", "test_new", "test_login"]
+        assert dict(order)["test_login"] == pytest.approx(0.25 + 0.2)
+        assert optimizer.get_recommended_tests(["auth.py", "cart.py"]) == ["test_cart", "test_login"]
+        assert optimizer.predict_failure_probability("test_login", ["auth.py"]) == pytest.approx(0.45)
+
+    def test_results_visible_without_reanalysis(self, optimizer):
+        """Test newly recorded results update predictions immediately"""
+        before = optimizer.predict_failure_probability("test_login")
+        optimizer.record_test_result("test_login", False, 0.5)
+
+        assert optimizer.predict_failure_probability("test_login") > before
+
+    def test_reload_rebuilds_aggregates(self, optimizer):
+        """Test a reloaded optimizer reproduces the same patterns"""
+        reloaded = MLTestOptimizer(optimizer.history_file)
+
+        assert reloaded.analyze_failure_patterns() == optimizer.analyze_failure_patterns()
+        assert reloaded.get_slow_tests(50) == [("test_cart", 4.0)]
@@ -0,0 +1,177 @@
+"""
+Unit Tests for HAR Writer
+
+Tests streaming HAR export and recording in APIInterceptor.
+"""
+
+import gzip
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from framework.api.api_interceptor import APIInterceptor
+from framework.api.har_writer import HARWriter, har_entry
+
+
+def _entry(i):
+    return har_entry(
+        {"timestamp": "t", "method": "GET", "url": f"https://example.com/{i}", "headers": {}},
+        {"status": 200, "status_text": "OK", "headers": {}, "body": {"id": i}},
+    )
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestHARWriter:
+    """Test HARWriter output"""
+
+    def test_single_file_is_valid_har(self, tmp_path):
+        """Test streamed output parses as one HAR document"""
+        paths = HARWriter(tmp_path / "session.har").write_all(_entry(i) for i in range(3))
+
+        har = json.loads(paths[0].read_text(encoding="utf-8"))
+        assert paths == [tmp_path / "session.har"]
+        assert har["log"]["version"] == "1.2"
+        assert [e["request"]["url"][-1] for e in har["log"]["entries"]] == ["0", "1", "2"]
+        assert har["log"]["entries"][0]["response"]["content"]["text"] == '{"id": 0}'
+
+    def test_empty_export(self, tmp_path):
+        """Test an empty session still produces a valid HAR"""
+        paths = HARWriter(tmp_path / "empty.har").write_all([])
+
+        assert json.loads(paths[0].read_text())["log"]["entries"] == []
+
+    def test_gzip_and_chunks(self, tmp_path):
+        """Test chunked output stays under the bound and every chunk is valid"""
+        writer = HARWriter(tmp_path / "session.har", compress=True, max_bytes=1000)
+        paths = writer.write_all(_entry(i) for i in range(20))
+
+        assert len(paths) > 1
+        assert paths[0].name == "session.001.har.gz"
+        entries = []
+        for path in paths:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                text = f.read()
+            assert len(text) <= 1000
+            entries.extend(json.loads(text)["log"]["entries"])
+        assert len(entries) == writer.entry_count == 20
+
+    def test_chunk_bound_counts_bytes(self, tmp_path):
+        """Test the bound holds in encoded bytes for non-ASCII payloads"""
+        entries = [
+            har_entry({"url": f"https://example.com/{i}"}, {"status": 200, "body": "ü€" * 50})
+            for i in range(10)
+        ]
+        paths = HARWriter(tmp_path / "utf8.har", max_bytes=1500).write_all(entries)
+
+        assert len(paths) > 1
+        assert all(len(p.read_bytes()) <= 1500 for p in paths)
+
+    def test_oversized_entry_gets_own_chunk(self, tmp_path):
+        """Test an entry larger than the bound is written rather than dropped"""
+        writer = HARWriter(tmp_path / "big.har", max_bytes=100)
+        paths = writer.write_all(_entry(i) for i in range(2))
+
+        assert len(paths) == 2
+        assert all(len(json.loads(p.read_text())["log"]["entries"]) == 1 for p in paths)
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestInterceptorHAR:
+    """Test APIInterceptor HAR export and recording"""
+
+    def _interceptor(self):
+        ui_engine = Mock()
+        ui_engine.__class__.__name__ = "PlaywrightEngine"
+        interceptor = APIInterceptor(ui_engine)
+        return interceptor, ui_engine.get_page.return_value
+
+    def test_export_pairs_requests_and_responses(self, tmp_path):
+        """Test export matches responses by URL"""
+        interceptor, _ = self._interceptor()
+        interceptor.captured_requests = [
+            {"timestamp": "t", "method": "POST", "url": "https://x/api", "headers": {}, "post_data": "a=1"}
+        ]
+        interceptor.captured_responses = [
+            {"url": "https://x/api", "status": 201, "status_text": "Created", "headers": {}, "body": "ok"}
+        ]
+
+        paths = interceptor.export_to_har(str(tmp_path / "out.har"))
+        entry = json.loads(paths[0].read_text())["log"]["entries"][0]
+
+        assert entry["request"]["postData"] == {"text": "a=1"}
+        assert entry["response"]["status"] == 201
+        assert entry["response"]["content"]["text"] == "ok"
+
+    def test_export_includes_spilled_entries(self, tmp_path):
+        """Test requests and responses evicted to disk are still exported"""
+        ui_engine = Mock()
+        ui_engine.__class__.__name__ = "PlaywrightEngine"
+        interceptor = APIInterceptor(ui_engine, max_captured=2, spill_dir=tmp_path / "spill")
+        for i in range(5):
+            url = f"https://x/api/{i}"
+            interceptor.captured_requests.append({"timestamp": "t", "method": "GET", "url": url, "headers": {}})
+            interceptor.captured_responses.append({"url": url, "status": 200, "headers": {}, "body": str(i)})
+
+        paths = interceptor.export_to_har(str(tmp_path / "out.har"))
+        entries = json.loads(paths[0].read_text())["log"]["entries"]
+
+        assert [e["response"]["content"]["text"] for e in entries] == ["0", "1", "2", "3", "4"]
+
+    def test_export_after_clear_is_empty(self, tmp_path):
+        """Test clear() also drops entries spilled to disk"""
+        ui_engine = Mock()
+        ui_engine.__class__.__name__ = "PlaywrightEngine"
+        interceptor = APIInterceptor(ui_engine, max_captured=2, spill_dir=tmp_path / "spill")
+        for i in range(5):
+            url = f"https://x/api/{i}"
+            interceptor.captured_requests.append({"timestamp": "t", "method": "GET", "url": url, "headers": {}})
+            interceptor.captured_responses.append({"url": url, "status": 200, "headers": {}, "body": str(i)})
+
+        interceptor.clear()
+        paths = interceptor.export_to_har(str(tmp_path / "out.har"))
+
+        assert json.loads(paths[0].read_text())["log"]["entries"] == []
+        assert not list((tmp_path / "spill").glob("*.jsonl"))
+
+    def test_export_does_not_keep_lazy_bodies(self, tmp_path):
+        """Test exported bodies are read without being cached in the store"""
+        interceptor, page = self._interceptor()
+        listener = next(c.args[1] for c in page.on.call_args_list if c.args[0] == "response")
+        response = Mock(url="https://x/api", status=200, status_text="OK", headers={"content-type": "text/plain"})
+        response.request.method = "GET"
+        response.body.return_value = b"hello"
+        interceptor.captured_requests = [{"timestamp": "t", "method": "GET", "url": "https://x/api", "headers": {}}]
+        listener(response)
+
+        paths = interceptor.export_to_har(str(tmp_path / "out.har"))
+
+        assert json.loads(paths[0].read_text())["log"]["entries"][0]["response"]["content"]["text"] == "hello"
+        assert not interceptor.captured_responses[0].body_loaded
+
+    def test_recording_streams_responses(self, tmp_path):
+        """Test responses are written as they are captured"""
+        interceptor, page = self._interceptor()
+        listener = next(c.args[1] for c in page.on.call_args_list if c.args[0] == "response")
+        response = Mock(
+            url="https://x/api/users",
+            status=200,
+            status_text="OK",
+            headers={"content-type": "application/json"},
+        )
+        response.request.method = "GET"
+        response.request.headers = {"accept": "*/*"}
+
+        interceptor.start_har_recording(str(tmp_path / "live.har"))
+        listener(response)
+        listener(response)
+        paths = interceptor.stop_har_recording()
+
+        entries = json.loads(paths[0].read_text())["log"]["entries"]
+        assert len(entries) == 2
+        assert entries[0]["request"]["headers"] == [{"name": "accept", "value": "*/*"}]
+        assert "text" not in entries[0]["response"]["content"]
+        response.body.assert_not_called()
+        assert interceptor.stop_har_recording() == []
@@ -0,0 +1,144 @@
+"""
+Unit Tests for History Store
+
+Tests the append-only test history backends used by MLTestOptimizer.
+"""
+
+import json
+import multiprocessing
+
+import pytest
+
+from framework.ml import history_store
+from framework.ml.history_store import (
+    JSONLHistoryStore,
+    SQLiteHistoryStore,
+    open_history_store,
+)
+from framework.ml.ml_test_optimizer import MLTestOptimizer
+
+
+def _record(i, passed=True, **extra):
+    return {
+        "test_name": f"test_{i % 3}",
+        "passed": passed,
+        "duration": float(i),
+        "timestamp": "2026-01-01T12:00:00",
+        "error": None if passed else f"boom {i}",
+        "changed_files": [] if passed else ["app.py"],
+        **extra,
+    }
+
+
+def _append_many(path, worker, count):
+    store = JSONLHistoryStore(path)
+    for i in range(count):
+        store.append({"test_name": f"w{worker}", "passed": True, "duration": i})
+    store.close()
+
+
+@pytest.mark.unit
+class TestHistoryStores:
+    """Test JSONL and SQLite history backends"""
+
+    @pytest.mark.parametrize("filename", ["history.jsonl", "history.db"])
+    def test_append_and_load_columns(self, tmp_path, filename):
+        """Test records round-trip into per-test columns"""
+        store = open_history_store(tmp_path / filename)
+        store.extend([_record(0), _record(1, passed=False), _record(3)])
+        store.append(_record(4))
+
+        columns = store.load()
+
+        assert len(columns) == 4
+        assert list(columns.test_rows("test_0")) == [0, 2]
+        assert list(columns.passed) == [1, 0, 1, 1]
+        assert columns.errors == {1: "boom 1"}
+        assert columns.record(1)["changed_files"] == ["app.py"]
+        assert columns.record(1)["timestamp"] == "2026-01-01T12:00:00"
+        store.close()
+
+    def test_sqlite_backend_selected_by_suffix(self, tmp_path):
+        """Test .db paths use SQLite and others JSONL"""
+        assert isinstance(open_history_store(tmp_path / "h.db"), SQLiteHistoryStore)
+        assert isinstance(open_history_store(tmp_path / "h.jsonl"), JSONLHistoryStore)
+
+    def test_snapshot_covers_loaded_records(self, tmp_path, monkeypatch):
+        """Test loading from snapshot plus tail gives the same history"""
+        monkeypatch.setattr(history_store, "SNAPSHOT_MIN_TAIL", 2)
+        store = JSONLHistoryStore(tmp_path / "h.jsonl")
+        store.extend(_record(i, passed=i % 2 == 0) for i in range(5))
+        store.load()
+        assert store.snapshot_path.exists()
+
+        store.append(_record(5))
+        columns = store.load()
+
+        assert len(columns) == 6
+        assert list(columns.durations) == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+        assert sorted(columns.errors) == [1, 3]
+
+    def test_truncated_history_invalidates_snapshot(self, tmp_path):
+        """Test a rewritten history file is not combined with a stale snapshot"""
+        store = JSONLHistoryStore(tmp_path / "h.jsonl")
+        store.extend(_record(i) for i in range(5))
+        store.save_snapshot()
+        store.close()
+
+        (tmp_path / "h.jsonl").write_text(json.dumps(_record(9)) + "\n")
+
+        assert len(JSONLHistoryStore(tmp_path / "h.jsonl").load()) == 1
+
+    def test_partial_and_corrupt_lines(self, tmp_path):
+        """Test a corrupt line is skipped and a partial last line is deferred"""
+        path = tmp_path / "h.jsonl"
+        path.write_text(
+            json.dumps(_record(0)) + "\n{not json\n" + json.dumps(_record(1)) + '\n{"test_na'
+        )
+
+        assert len(JSONLHistoryStore(path).load()) == 2
+
+    def test_concurrent_writers(self, tmp_path):
+        """Test several processes appending at once lose no records"""
+        path = tmp_path / "h.jsonl"
+        context = multiprocessing.get_context("spawn")
+        workers = [context.Process(target=_append_many, args=(path, w, 200)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        columns = JSONLHistoryStore(path).load()
+        assert len(columns) == 800
+        assert all(len(columns.test_rows(f"w{w}")) == 200 for w in range(4))
+
+
+@pytest.mark.unit
+class TestMLTestOptimizerHistory:
+    """Test MLTestOptimizer on the append-only store"""
+
+    def test_record_appends_without_rewrite(self, tmp_path):
+        """Test each result is one appended line"""
+        path = tmp_path / "history.jsonl"
+        optimizer = MLTestOptimizer(str(path))
+        optimizer.record_test_result("test_a", True, 1.0)
+        optimizer.record_test_result("test_a", False, 2.0, error="boom", changed_files=["x.py"])
+
+        assert len(path.read_text().splitlines()) == 2
+        assert optimizer.test_history[1]["error"] == "boom"
+
+        reloaded = MLTestOptimizer(str(path))
+        patterns = reloaded.analyze_failure_patterns()
+        assert patterns["test_a"]["total_failures"] == 1
+        assert patterns["test_a"]["recent_failures"][0]["changed_files"] == ["x.py"]
+
+    def test_legacy_json_history_migrated(self, tmp_path):
+        """Test a legacy .json history is imported into .jsonl once"""
+        legacy = tmp_path / "test_history.json"
+        legacy.write_text(json.dumps([_record(0), _record(1, passed=False)]))
+
+        optimizer = MLTestOptimizer(str(legacy))
+        optimizer.record_test_result("test_new", True, 0.5)
+
+        assert len(MLTestOptimizer(str(legacy)).test_history) == 3
+        assert len((tmp_path / "test_history.jsonl").read_text().splitlines()) == 3
@@ -0,0 +1,156 @@
+"""
+Unit Tests for SegmentSink
+
+Tests date routing, size roll-over, compression, retention and recovery of
+the segmented log files.
+"""
+
+import gzip
+import logging
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from framework.observability.event_bus import EventBus, LogEvent
+from framework.observability.log_segments import SegmentMaintainer, SegmentSink, compress_segment
+
+
+@pytest.fixture
+def maintainer():
+    return SegmentMaintainer()
+
+
+@pytest.fixture
+def bus():
+    event_bus = EventBus()
+    yield event_bus
+    event_bus.shutdown()
+
+
+def _event(message="hello", created=None):
+    event = LogEvent("enterprise.app", logging.INFO, message)
+    if created is not None:
+        event.created = created
+    return event
+
+
+def _stamp(day):
+    return day.strftime("%Y%m%d")
+
+
+def _noon(day):
+    return time.mktime(datetime(day.year, day.month, day.day, 12).timetuple())
+
+
+def _gunzip(path):
+    with gzip.open(path, "rt") as f:
+        return f.read()
+
+
+@pytest.mark.unit
+class TestSegmentSink:
+    """Test SegmentSink behaviour"""
+
+    def test_lines_written_to_daily_segment(self, bus, maintainer, tmp_path):
+        """Test events land in prefix_YYYYMMDD.json after flush"""
+        sink = bus.subscribe(SegmentSink(tmp_path, "app", format="console", maintainer=maintainer))
+
+        for i in range(3):
+            bus.publish(_event(f"line {i}"))
+        assert bus.flush()
+
+        lines = (tmp_path / f"app_{_stamp(date.today())}.json").read_text().splitlines()
+        assert [line.rsplit(" - ", 1)[1] for line in lines] == ["line 0", "line 1", "line 2"]
+        assert sink.written == 3
+
+    def test_size_rollover_compresses_closed_segments(self, bus, maintainer, tmp_path):
+        """Test full segments are closed as .NNN and gzip-compressed"""
+        bus.subscribe(SegmentSink(tmp_path, "app", max_bytes=300, batch_size=1, maintainer=maintainer))
+
+        for i in range(20):
+            bus.publish(_event(f"message {i:02d}"))
+        bus.flush()
+        assert maintainer.wait()
+
+        stamp = _stamp(date.today())
+        closed = sorted(tmp_path.glob(f"app_{stamp}.*.json.gz"))
+        assert closed[0].name == f"app_{stamp}.001.json.gz"
+        assert not list(tmp_path.glob(f"app_{stamp}.*.json"))
+        text = "".join(_gunzip(p) for p in closed)
+        text += (tmp_path / f"app_{stamp}.json").read_text()
+        assert [f"message {i:02d}" in text for i in range(20)] == [True] * 20
+
+    def test_events_routed_by_creation_day(self, bus, maintainer, tmp_path):
+        """Test a run crossing midnight moves on to the next day's segment"""
+        yesterday = date.today() - timedelta(days=1)
+        bus.subscribe(SegmentSink(tmp_path, "app", format="console", compress=False, maintainer=maintainer))
+
+        bus.publish(_event("before midnight", created=_noon(yesterday)))
+        bus.flush()
+        bus.publish(_event("after midnight"))
+        bus.publish(_event("late", created=_noon(yesterday)))
+        bus.flush()
+        maintainer.wait()
+
+        closed = tmp_path / f"app_{_stamp(yesterday)}.001.json"
+        today = (tmp_path / f"app_{_stamp(date.today())}.json").read_text()
+        assert "before midnight" in closed.read_text()
+        assert "after midnight" in today and "late" in today
+
+    def test_retention_prunes_old_segments(self, maintainer, tmp_path):
+        """Test segments older than retention_days are deleted"""
+        today = date.today()
+        old = tmp_path / f"app_{_stamp(today - timedelta(days=10))}.001.json.gz"
+        kept = tmp_path / f"app_{_stamp(today - timedelta(days=2))}.001.json.gz"
+        other = tmp_path / "audit_20000101.001.json.gz"
+        for path in (old, kept, other):
+            path.write_bytes(b"")
+        sink = SegmentSink(tmp_path, "app", retention_days=5, maintainer=maintainer)
+        try:
+            maintainer.wait()
+
+            assert not old.exists()
+            assert kept.exists() and other.exists()
+        finally:
+            sink.close()
+
+    def test_recovery_closes_stale_active_segments(self, maintainer, tmp_path):
+        """Test an earlier run's active segment is closed and compressed on start-up"""
+        stale_day = date.today() - timedelta(days=1)
+        stale = tmp_path / f"app_{_stamp(stale_day)}.json"
+        stale.write_text("from last night\n")
+
+        sink = SegmentSink(tmp_path, "app", maintainer=maintainer)
+        try:
+            maintainer.wait()
+        finally:
+            sink.close()
+
+        assert not stale.exists()
+        compressed = tmp_path / f"app_{_stamp(stale_day)}.001.json.gz"
+        assert _gunzip(compressed) == "from last night\n"
+
+    def test_full_queue_drops_instead_of_blocking(self, maintainer, tmp_path):
+        """Test a sink whose writer falls behind drops lines and counts them"""
+        sink = SegmentSink(tmp_path, "app", flush_interval=60, max_pending=2, batch_size=100, maintainer=maintainer)
+        try:
+            for i in range(3):
+                sink.handle(_event(), f"line {i}")
+
+            assert sink.dropped == 1
+        finally:
+            sink.close()
+
+
+@pytest.mark.unit
+def test_compress_segment(tmp_path):
+    """Test compress_segment replaces the file with its .gz"""
+    path = tmp_path / "app_20260101.001.json"
+    path.write_text("data\n")
+
+    target = compress_segment(path)
+
+    assert target.name == "app_20260101.001.json.gz"
+    assert not path.exists()
+    assert _gunzip(target) == "data\n"
@@ -0,0 +1,149 @@
+"""
+Unit Tests for Log Serializer
+
+Tests the bounded summaries used by the instrumentation decorators.
+"""
+
+import json
+from dataclasses import dataclass
+
+import pytest
+
+from framework.observability.log_serializer import LogSerializer, SerializerLimits, repr_summarizer
+
+
+@dataclass
+class _Order:
+    order_id: int
+    items: list
+
+
+class _FakeResponse:
+    """requests.Response look-alike"""
+
+    status_code = 201
+    headers = {"Content-Length": "512"}
+
+    @property
+    def content(self):
+        raise AssertionError("body must not be read")
+
+
+class _Opaque:
+    def __repr__(self):
+        raise RuntimeError("repr failed")
+
+
+@pytest.fixture
+def serializer():
+    return LogSerializer(SerializerLimits(max_depth=3, max_items=5, max_string=20, max_bytes=400))
+
+
+@pytest.mark.unit
+class TestLogSerializer:
+    """Test LogSerializer summaries"""
+
+    def test_scalars_pass_through(self, serializer):
+        """Test scalars are kept as-is"""
+        assert serializer.summarize(42) == 42
+        assert serializer.summarize(None) is None
+        assert serializer.summarize("short") == "short"
+
+    def test_long_string_is_truncated(self, serializer):
+        """Test strings are cut at max_string with the dropped length"""
+        summary = serializer.summarize("x" * 1000)
+
+        assert summary.startswith("x" * 20)
+        assert summary.endswith("(+980 chars)")
+
+    def test_collections_keep_first_items(self, serializer):
+        """Test lists and dicts are capped at max_items"""
+        assert serializer.summarize(list(range(100))) == [0, 1, 2, 3, 4, "… +95 more"]
+
+        summary = serializer.summarize({f"k{i}": i for i in range(10)})
+        assert len(summary) == 6
+        assert summary["…"] == "+5 more"
+
+    def test_depth_cap(self, serializer):
+        """Test containers below max_depth become a type + length marker"""
+        nested = [[[[1, 2, 3]]]]
+
+        assert serializer.summarize(nested) == [[["<list len=3>"]]]
+
+    def test_output_bounded_for_large_payload(self, serializer):
+        """Test summary size does not grow with the payload"""
+        rows = [{"id": i, "name": "n" * 50, "tags": list(range(50))} for i in range(10000)]
+
+        small = json.dumps(serializer.summarize(rows[:10]))
+        large = json.dumps(serializer.summarize(rows))
+
+        assert len(large) < 1000
+        assert len(large) == len(small) + len("10000") - len("10")
+
+    def test_dataclass_fields(self, serializer):
+        """Test dataclasses are summarized field by field"""
+        summary = serializer.summarize(_Order(order_id=7, items=[1, 2]))
+
+        assert summary == {"type": "_Order", "order_id": 7, "items": [1, 2]}
+
+    def test_response_status_and_size(self, serializer):
+        """Test HTTP responses report status and size without reading the body"""
+        assert serializer.summarize(_FakeResponse()) == {
+            "type": "_FakeResponse",
+            "status": 201,
+            "size": 512,
+        }
+
+    def test_unknown_object_not_repr(self, serializer):
+        """Test arbitrary objects are summarized by class name, without calling __repr__"""
+
+        class _Plain:
+            pass
+
+        class _Large:
+            def __repr__(self):
+                raise AssertionError("repr must not be called")
+
+        assert serializer.summarize(_Plain()) == "<_Plain>"
+        assert serializer.summarize(_Large()) == "<_Large>"
+
+    def test_repr_summarizer_is_capped(self):
+        """Test repr_summarizer opts a type into its own repr, truncated to max_string"""
+
+        class _Page:
+            def __init__(self, url):
+                self.url = url
+
+            def __repr__(self):
+                return f"<_Page url={self.url}>"
+
+        serializer = LogSerializer(SerializerLimits(max_string=40))
+        serializer.register(_Page, repr_summarizer)
+        assert serializer.summarize(_Page("/login")) == "<_Page url=/login>"
+        assert len(serializer.summarize(_Page("/" + "x" * 500))) <= 40 + 20
+
+    def test_register_summarizer_and_memoized_handler(self, serializer):
+        """Test registered summarizers apply to subclasses and replace cached handlers"""
+        serializer.summarize(_Opaque())
+
+        serializer.register(_Opaque, lambda _value, _budget: {"kind": "opaque"})
+
+        class _Child(_Opaque):
+            pass
+
+        assert serializer.summarize(_Child()) == {"kind": "opaque"}
+        assert serializer.summarize(_Opaque()) == {"kind": "opaque"}
+
+    def test_failing_summarizer_is_contained(self, serializer):
+        """Test a summarizer error yields a marker instead of raising"""
+        serializer.register(_Opaque, lambda _value, _budget: 1 / 0)
+
+        assert "unserializable" in serializer.summarize(_Opaque())
+
+    def test_keys_not_cut_by_byte_budget(self):
+        """Test dict keys stay intact so key-based masking still applies"""
+        serializer = LogSerializer(SerializerLimits(max_string=50, max_bytes=12))
+
+        summary = serializer.summarize({"x": "y" * 8, "password": "secret"})
+
+        assert summary == {"x": "yyyyyyyy", "password": "…"}
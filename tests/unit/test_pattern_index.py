@@ -0,0 +1,127 @@
+"""
+Unit Tests for Pattern Index
+
+Tests compiled URL rule matching used by RequestModifier/ResponseModifier.
+"""
+
+import re
+
+import pytest
+
+from framework.api.api_interceptor import RequestModifier, ResponseModifier
+from framework.api.pattern_index import PatternIndex, literal_prefix
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestLiteralPrefix:
+    """Test required-literal extraction"""
+
+    @pytest.mark.parametrize(
+        "pattern, expected",
+        [
+            (r"/api/users/\d+", "/api/users/"),
+            (r"\.png$", ".png"),
+            (r"https://x\.com/api?", "https://x.com/ap"),
+            (r"/api/(users|orders)", "/api/"),
+            (r"users|orders", None),
+            (r"^/api", None),
+            (r"(?i)/API", None),
+        ],
+    )
+    def test_literal_prefix(self, pattern, expected):
+        """Test the leading literal run is extracted conservatively"""
+        assert literal_prefix(pattern) == expected
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestPatternIndex:
+    """Test PatternIndex matching semantics"""
+
+    PATTERNS = [r"/api/users/\d+", r"/api/", r"\.png$", r"orders|invoices", r"(?i)/ADMIN"]
+    URLS = [
+        "https://example.com/api/users/42",
+        "https://example.com/api/orders",
+        "https://example.com/static/logo.png",
+        "https://example.com/admin/panel",
+        "https://example.com/invoices/7",
+        "https://example.com/index.html",
+    ]
+
+    def test_matches_equal_re_search(self):
+        """Test results equal a per-rule re.search loop in registration order"""
+        index = PatternIndex()
+        for pattern in self.PATTERNS:
+            index.add(pattern)
+
+        for url in self.URLS:
+            expected = tuple(i for i, p in enumerate(self.PATTERNS) if re.search(p, url))
+            assert index.match(url) == expected
+            # Second lookup is served from the cache
+            assert index.match(url) == expected
+
+    def test_cache_invalidated_on_add(self):
+        """Test registering a rule drops cached lookups"""
+        index = PatternIndex()
+        index.add(r"/api/")
+        assert index.match("https://example.com/health") == ()
+
+        index.add(r"/health")
+        assert index.match("https://example.com/health") == (1,)
+
+    def test_cache_is_bounded(self):
+        """Test the LRU never exceeds its size"""
+        index = PatternIndex(cache_size=2)
+        index.add(r"/api/")
+        for i in range(5):
+            index.match(f"https://example.com/api/{i}")
+
+        assert len(index._cache) == 2
+
+    def test_backreferences_disable_combined_matcher(self):
+        """Test group references are matched per rule, not concatenated"""
+        index = PatternIndex()
+        index.add(r"(x)\1")
+        index.add(r"(y)\1")
+
+        assert index.match("yy") == (1,)
+
+    def test_invalid_pattern_rejected_at_registration(self):
+        """Test bad patterns fail when added, not per request"""
+        with pytest.raises(re.error):
+            PatternIndex().add(r"/api/(")
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestModifiersUseIndex:
+    """Test modifiers keep first-match and apply-in-order semantics"""
+
+    def test_first_mock_wins(self):
+        """Test get_mock_response returns the earliest registered match"""
+        modifier = ResponseModifier()
+        modifier.add_mock_response(r"/api/users", 200, {"first": True})
+        modifier.add_mock_response(r"/api/users/\d+", 201, {"first": False})
+
+        assert modifier.get_mock_response("https://x.com/api/users/1")["body"] == {"first": True}
+        assert modifier.get_mock_response("https://x.com/other") is None
+
+    def test_request_modifications_apply_in_order(self):
+        """Test all matching request rules apply in registration order"""
+        modifier = RequestModifier()
+        modifier.add_url_modification(r"/v1/", lambda url: url.replace("/v1/", "/v2/"))
+        modifier.add_url_modification(r"/v1/", lambda url: url + "?x=1")
+        modifier.add_header_modification(r"/api/", {"X-Test": "1"})
+
+        url, headers, _ = modifier.apply_modifications("https://x.com/api/v1/a", {}, None)
+
+        assert url == "https://x.com/api/v2/a?x=1"
+        assert headers == {"X-Test": "1"}
+
+    def test_directly_edited_rules_are_reindexed(self):
+        """Test rules appended to the public list are still matched"""
+        modifier = ResponseModifier()
+        modifier.modifications.append({"pattern": r"/api/", "modifier": lambda _body: "changed"})
+
+        assert modifier.apply_modifications("https://x.com/api/a", "body") == "changed"
@@ -0,0 +1,153 @@
+"""
+Unit Tests for SamplingPolicy
+
+Tests head-based sampling rules, per-key rate limits, failure escalation
+with replay, and the wiring into EnterpriseLogger.
+"""
+
+import logging
+
+import pytest
+
+from framework.observability.enterprise_logger import correlation_id_var, get_enterprise_logger
+from framework.observability.event_bus import LogEvent
+from framework.observability.log_segments import get_segment_maintainer
+from framework.observability.logging_config import PerformanceConfig, SamplingConfig
+from framework.observability.sampling_policy import (
+    KEEP,
+    RATE_LIMITED,
+    SAMPLED_OUT,
+    SamplingPolicy,
+    SamplingRule,
+    TokenBucket,
+)
+
+
+@pytest.mark.unit
+class TestSamplingPolicy:
+    """Test sampling decisions"""
+
+    def test_disabled_policy_keeps_everything(self):
+        """Test nothing is dropped while sampling is disabled"""
+        policy = SamplingPolicy(enabled=False, default_rate=0.0)
+
+        assert policy.decide("enterprise.app", logging.DEBUG) == KEEP
+
+    def test_first_matching_rule_wins(self):
+        """Test rules are matched by logger prefix, level and event type"""
+        policy = SamplingPolicy(
+            enabled=True,
+            default_rate=1.0,
+            rules=[
+                SamplingRule(rate=0.0, logger="framework.ui", max_level=logging.DEBUG),
+                SamplingRule(rate=0.0, event_type="heartbeat"),
+            ],
+        )
+
+        assert policy.decide("framework.ui.pages", logging.DEBUG) == SAMPLED_OUT
+        assert policy.decide("framework.ui.pages", logging.INFO) == KEEP
+        assert policy.decide("framework.uix", logging.DEBUG) == KEEP
+        assert policy.decide("enterprise.app", logging.INFO, "heartbeat") == SAMPLED_OUT
+
+    def test_errors_and_exempt_channels_always_kept(self):
+        """Test errors and audit/security events bypass sampling"""
+        policy = SamplingPolicy(enabled=True, default_rate=0.0)
+
+        assert policy.decide("enterprise.app", logging.ERROR) == KEEP
+        assert policy.decide("enterprise.audit", logging.INFO) == KEEP
+        assert policy.decide("enterprise.app", logging.INFO) == SAMPLED_OUT
+
+    def test_rate_limit_per_key(self):
+        """Test each event key gets its own token bucket"""
+        policy = SamplingPolicy(enabled=True, rate_limit=0.001, rate_burst=3)
+
+        decisions = [policy.decide("enterprise.app", logging.INFO, key="retry") for _ in range(5)]
+
+        assert decisions == [KEEP] * 3 + [RATE_LIMITED] * 2
+        assert policy.decide("enterprise.app", logging.INFO, key="other") == KEEP
+        assert policy.stats[RATE_LIMITED] == 2
+
+    def test_token_bucket_refills(self):
+        """Test tokens come back at the configured rate"""
+        bucket = TokenBucket(rate=10, burst=1)
+        bucket.updated = 0.0
+
+        assert bucket.take(0.0)
+        assert not bucket.take(0.0)
+        assert bucket.take(0.1)
+        assert not bucket.take(0.1)
+        assert bucket.take(0.2)
+
+    def test_token_bucket_refills_full_interval_at_any_clock_value(self):
+        """Test a full interval refills one token despite float rounding"""
+        for start in (0.3, 12345.678, 987654.321):
+            bucket = TokenBucket(rate=10, burst=1)
+            bucket.updated = start
+            bucket.tokens = 0.0
+
+            assert bucket.take(start + 0.1)
+
+    def test_escalation_keeps_scope_and_returns_held_events(self):
+        """Test a failed scope is kept in full and its dropped events are replayed"""
+        policy = SamplingPolicy(enabled=True, default_rate=0.0, hold_size=2)
+        policy.begin_scope("test-1")
+        for event in ("a", "b", "c"):
+            assert policy.decide("enterprise.app", logging.INFO, scope="test-1") == SAMPLED_OUT
+            policy.hold(event, "test-1")
+
+        assert policy.escalate("test-1") == ["b", "c"]
+        assert policy.decide("enterprise.app", logging.INFO, scope="test-1") == KEEP
+        assert policy.decide("enterprise.app", logging.INFO, scope="test-2") == SAMPLED_OUT
+
+    def test_from_config(self):
+        """Test SamplingConfig and PerformanceConfig are translated"""
+        policy = SamplingPolicy.from_config(
+            SamplingConfig(enabled=True, sample_rate=0.5, debug_sample_rate=0.0, rate_limit_per_second=5),
+            PerformanceConfig(slow_operation_threshold_ms=200),
+        )
+
+        assert policy.rate_for("enterprise.app", logging.DEBUG) == 0.0
+        assert policy.rate_for("enterprise.app", logging.INFO) == 0.5
+        assert policy.rate_limit == 5
+        assert not policy.keep_performance(50)
+        assert policy.keep_performance(250)
+
+
+@pytest.mark.unit
+class TestEnterpriseLoggerSampling:
+    """Test EnterpriseLogger enforces the shared policy"""
+
+    @pytest.fixture
+    def sampled_logger(self):
+        logger = get_enterprise_logger()
+        get_segment_maintainer().wait()  # config is applied there; let it finish first
+        policy = logger.sampling_policy
+        saved = {name: getattr(policy, name) for name in ("enabled", "default_rate", "rules")}
+        published = []
+        original = logger.event_bus.publish
+        logger.event_bus.publish = published.append
+        policy.configure(enabled=True, default_rate=0.0, rules=[])
+        try:
+            yield logger, published
+        finally:
+            logger.event_bus.publish = original
+            policy.configure(**saved)
+            policy.reset_escalations()
+
+    def test_sampled_out_events_replayed_on_escalation(self, sampled_logger):
+        """Test events dropped before a failure are written when it is escalated"""
+        logger, published = sampled_logger
+        token = correlation_id_var.set("corr-sampling-test")
+        try:
+            logger.sampling_policy.begin_scope("corr-sampling-test")
+            logger.info("step 1")
+            logger.error("boom")
+            assert [event.message for event in published] == ["boom"]
+
+            assert logger.escalate() == 1
+            logger.info("step 2")
+        finally:
+            correlation_id_var.reset(token)
+
+        assert [event.message for event in published] == ["boom", "step 1", "step 2"]
+        assert all(isinstance(event, LogEvent) for event in published)
@@ -0,0 +1,101 @@
+"""
+Unit Tests for SensitiveDataMasker
+
+Tests the combined-pattern scanner against the original sequential
+re.sub implementation, and copy-on-write masking of containers.
+"""
+
+import random
+import re
+
+import pytest
+
+from framework.observability.enterprise_logger import SensitiveDataMasker
+
+LEGACY_PATTERNS = [
+    (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+     lambda m: f"{m.group(0)[0]}***@{m.group(0).split('@')[1][0]}*****{m.group(0).split('@')[1].split('.')[-1]}"),
+    (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', '****-****-****-****'),
+    (r'\b\d{3}-\d{2}-\d{4}\b', '***-**-****'),
+    (r'\b\d{10,}\b', '**********'),
+]
+
+
+def legacy_mask_string(text: str) -> str:
+    """Original implementation: one re.sub per pattern"""
+    for pattern, replacement in LEGACY_PATTERNS:
+        text = re.sub(pattern, replacement, text)
+    return text
+
+
+@pytest.mark.unit
+class TestMaskString:
+    """Test pattern-based string masking"""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("contact john.doe@company.com", "contact j***@c*****com"),
+        ("card 4532-1234-5678-9010 ok", "card ****-****-****-**** ok"),
+        ("ssn 123-45-6789", "ssn ***-**-****"),
+        ("call 5551234567", "call **********"),
+        ("order 123 shipped", "order 123 shipped"),
+    ])
+    def test_patterns(self, text, expected):
+        """Test each pattern masks as before"""
+        assert SensitiveDataMasker.mask_string(text) == expected
+
+    def test_matches_sequential_implementation(self):
+        """Test single-pass scanning equals applying the patterns one by one"""
+        rng = random.Random(7)
+        alphabet = "0123456789" * 4 + "ab.-@ |_+%xZ"
+        for _ in range(20000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            assert SensitiveDataMasker.mask_string(text) == legacy_mask_string(text), text
+
+    def test_clean_string_returned_unchanged(self):
+        """Test strings without candidates are returned as the same object"""
+        text = "Navigating to dashboard page " * 20
+
+        assert SensitiveDataMasker.mask_string(text) is text
+
+    def test_cached_result(self):
+        """Test repeated short strings hit the cache"""
+        text = "user jane@example.org logged in"
+        first = SensitiveDataMasker.mask_string(text)
+
+        assert SensitiveDataMasker._cache[text] == first
+        assert SensitiveDataMasker.mask_string(text) is first
+
+    def test_non_string_passthrough(self):
+        """Test non-string input is returned as-is"""
+        assert SensitiveDataMasker.mask_string(1234567890) == 1234567890
+
+
+@pytest.mark.unit
+class TestMaskDict:
+    """Test copy-on-write dictionary masking"""
+
+    def test_unchanged_dict_not_copied(self):
+        """Test a dict without sensitive content is returned as-is"""
+        data = {"user": "jane", "items": [1, "two", {"id": 3}], "meta": {"page": 1}}
+
+        assert SensitiveDataMasker.mask_dict(data) is data
+
+    def test_masked_dict_copied_and_input_untouched(self):
+        """Test only containers on the path of a masked value are copied"""
+        untouched = {"page": 1}
+        data = {"user": {"password": "secret"}, "meta": untouched, "emails": ["a@b.com", "x"]}
+
+        masked = SensitiveDataMasker.mask_dict(data)
+
+        assert masked is not data
+        assert masked["user"] == {"password": "***MASKED***"}
+        assert masked["meta"] is untouched
+        assert masked["emails"] == ["a***@b*****com", "x"]
+        assert data["user"]["password"] == "secret"
+        assert data["emails"][0] == "a@b.com"
+
+    def test_sensitive_key_case_insensitive(self):
+        """Test key matching ignores case but not partial names"""
+        masked = SensitiveDataMasker.mask_dict({"Authorization": "Bearer x", "credentials": "ok"})
+
+        assert masked == {"Authorization": "***MASKED***", "credentials": "ok"}
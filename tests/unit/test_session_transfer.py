@@ -0,0 +1,139 @@
+"""
+Unit Tests for SessionManager extraction and injection round trips
+
+Fake drivers/pages record every call, so the number of browser round
+trips per transfer is asserted directly.
+"""
+
+import pytest
+
+from framework.core.session_manager import SessionManager
+
+
+class FakeDriver:
+    def __init__(self):
+        self.calls = []
+        self.cookies = [{"name": "sid", "value": "abc", "domain": "app.example.com", "path": "/"}]
+
+    def get_cookies(self):
+        self.calls.append("get_cookies")
+        return self.cookies
+
+    def execute_script(self, script):
+        self.calls.append("execute_script")
+        return {
+            "origin": "https://app.example.com",
+            "local": {"access_token": "tok", "user_id": "u1"},
+            "session": {"jwt": "j"},
+        }
+
+    def add_cookie(self, cookie):
+        self.calls.append(("add_cookie", cookie["name"]))
+
+
+class FakeContext:
+    def __init__(self):
+        self.calls = []
+        self.jar = []
+
+    def add_cookies(self, cookies):
+        self.calls.append("add_cookies")
+        self.jar.extend(cookies)
+
+    def cookies(self):
+        return list(self.jar)
+
+    def clear_cookies(self):
+        self.jar = []
+
+
+class FakePage:
+    def __init__(self, url="https://app.example.com/"):
+        self.url = url
+        self.context = FakeContext()
+
+    def evaluate(self, script):
+        self.context.calls.append("evaluate")
+
+
+@pytest.fixture
+def manager():
+    return SessionManager()
+
+
+@pytest.mark.unit
+class TestSessionTransfer:
+    """Test batched extraction/injection and fingerprint skipping"""
+
+    def test_extraction_uses_one_script(self, manager):
+        """Test cookies plus one execute_script capture storage and tokens"""
+        driver = FakeDriver()
+
+        session = manager.extract_session_from_selenium(driver)
+
+        assert driver.calls == ["get_cookies", "execute_script"]
+        assert session.origin == "https://app.example.com"
+        assert session.tokens == {"access_token": "tok", "session_jwt": "j"}
+        assert session.session_storage == {"jwt": "j"}
+        assert session.user_id == "u1"
+
+    def test_playwright_injection_is_batched_and_skipped_when_unchanged(self, manager):
+        """Test one cookie call and one script, and nothing for an unchanged session"""
+        session = manager.extract_session_from_selenium(FakeDriver())
+        page = FakePage()
+
+        assert manager.inject_session_to_playwright_sync(page, session)
+        assert page.context.calls == ["add_cookies", "evaluate"]
+
+        assert manager.inject_session_to_playwright_sync(page, session)
+        assert len(page.context.calls) == 2
+
+        session.local_storage["theme"] = "dark"
+        assert manager.inject_session_to_playwright_sync(page, session)
+        assert len(page.context.calls) == 4
+
+    def test_reinjected_after_cookies_cleared(self, manager):
+        """Test a context reset (e.g. by the context pool) is not mistaken for an injected session"""
+        session = manager.extract_session_from_selenium(FakeDriver())
+        page = FakePage()
+        manager.inject_session_to_playwright_sync(page, session)
+
+        page.context.clear_cookies()
+
+        assert manager.inject_session_to_playwright_sync(page, session)
+        assert page.context.calls == ["add_cookies", "evaluate"] * 2
+
+    def test_blank_page_is_not_remembered(self, manager):
+        """Test storage is applied on the next call once the page is on the site"""
+        session = manager.extract_session_from_selenium(FakeDriver())
+        page = FakePage("about:blank")
+
+        assert manager.inject_session_to_playwright_sync(page, session)
+        assert page.context.calls == ["add_cookies"]
+
+        page.url = "https://app.example.com/"
+        assert manager.inject_session_to_playwright_sync(page, session)
+        assert page.context.calls == ["add_cookies", "add_cookies", "evaluate"]
+
+    def test_injection_script_is_scoped_to_origin(self, manager):
+        """Test the script carries all storage and checks the origin"""
+        session = manager.extract_session_from_selenium(FakeDriver())
+
+        script = manager._generate_session_injection_code(session)
+
+        assert '"origin": "https://app.example.com"' in script
+        assert "window.location.origin !== state.origin" in script
+        assert '"session": {"jwt": "j"}' in script
+
+    def test_selenium_injection(self, manager):
+        """Test cookies are added individually and storage in one script"""
+        session = manager.extract_session_from_selenium(FakeDriver())
+        driver = FakeDriver()
+
+        assert manager.inject_session_to_selenium(driver, session)
+        assert driver.calls == [("add_cookie", "sid"), "execute_script"]
+
+        assert manager.inject_session_to_selenium(driver, session)
+        assert driver.calls[2:] == ["get_cookies"]
+        assert manager.inject_session_to_selenium(driver, session, force=True)
+        assert len(driver.calls) == 5
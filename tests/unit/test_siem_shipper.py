@@ -0,0 +1,219 @@
+"""
+Unit Tests for SIEM shipping
+
+Tests batching, compression, connection reuse, spooling and replay of the
+SIEM adapters against a local stub HTTP server.
+"""
+
+import gzip
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from framework.observability.siem_adapters import (
+    DatadogAdapter,
+    ElasticsearchAdapter,
+    SplunkAdapter,
+)
+
+
+class _StubSIEM(ThreadingHTTPServer):
+    """Records requests; answers with the queued status codes, then 200"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.requests = []
+        self.connections = set()
+        self.statuses = []
+        self.delay = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers), body))
+            server.connections.add(self.client_address)
+            status = server.statuses.pop(0) if server.statuses else 200
+        time.sleep(server.delay)
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = _StubSIEM()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _adapter(cls, stub, tmp_path, **kwargs):
+    options = {"batch_size": 10, "flush_interval": 60, "max_retries": 1, "spool_dir": tmp_path / "spool"}
+    options.update(kwargs)
+    if cls is DatadogAdapter:
+        adapter = cls(api_key="key", **options)
+        adapter.endpoint = f"{stub.url}/api/v2/logs"
+    elif cls is SplunkAdapter:
+        adapter = cls(stub.url, hec_token="token", **options)
+    else:
+        adapter = cls(stub.url, **options)
+    adapter.shipper.retry_backoff = 0
+    return adapter
+
+
+@pytest.mark.unit
+class TestSIEMShipping:
+    """Test asynchronous SIEM delivery"""
+
+    def test_bulk_batches_compressed_over_reused_connections(self, stub, tmp_path):
+        """Test events are cut into gzip bulk batches on pooled connections"""
+        adapter = _adapter(ElasticsearchAdapter, stub, tmp_path, max_in_flight=2)
+        try:
+            for i in range(25):
+                adapter.add_log({"message": f"event {i}", "timestamp": "t"})
+            assert adapter.flush()
+        finally:
+            adapter.close()
+
+        assert len(stub.requests) == 3
+        path, headers, body = stub.requests[0]
+        assert path == "/test-automation/_bulk"
+        assert headers["Content-Encoding"] == "gzip"
+        lines = body.decode().splitlines()
+        assert json.loads(lines[0]) == {"index": {"_index": "test-automation"}}
+        assert json.loads(lines[1])["@timestamp"] == "t"
+        assert len(stub.connections) <= 2
+        assert adapter.stats["events_sent"] == 25
+
+    def test_batches_cut_by_size(self, stub, tmp_path):
+        """Test max_batch_bytes limits the encoded size of a batch"""
+        adapter = _adapter(SplunkAdapter, stub, tmp_path, batch_size=1000, max_batch_bytes=1000)
+        try:
+            for _ in range(20):
+                adapter.add_log({"message": "x" * 200})
+            adapter.flush()
+        finally:
+            adapter.close()
+
+        assert len(stub.requests) > 1
+        events = [line for _, _, body in stub.requests for line in body.splitlines()]
+        assert len(events) == 20
+
+    def test_add_log_does_not_wait_for_endpoint(self, stub, tmp_path):
+        """Test the calling thread is not held up by a slow endpoint"""
+        stub.delay = 0.2
+        adapter = _adapter(DatadogAdapter, stub, tmp_path, batch_size=5)
+        try:
+            start = time.perf_counter()
+            for i in range(50):
+                adapter.add_log({"message": f"event {i}"})
+            elapsed = time.perf_counter() - start
+
+            assert elapsed < 0.15
+            assert adapter.flush()
+        finally:
+            adapter.close()
+        assert json.loads(stub.requests[0][2])[0]["service"] == "test-automation"
+
+    def test_outage_spooled_then_replayed(self, stub, tmp_path):
+        """Test failed batches go to the spool and are re-sent after recovery"""
+        stub.statuses = [503, 503]
+        adapter = _adapter(ElasticsearchAdapter, stub, tmp_path)
+        try:
+            for i in range(20):
+                adapter.add_log({"message": f"event {i}"})
+            adapter.flush()
+            assert adapter.stats["batches_spooled"] == 2
+            assert len(list((tmp_path / "spool").glob("*.gz"))) == 2
+
+            adapter.add_log({"message": "after recovery"})
+            adapter.flush()
+        finally:
+            adapter.close()
+
+        assert adapter.stats["batches_replayed"] == 2
+        assert not list((tmp_path / "spool").iterdir())
+        delivered = b"".join(body for _, _, body in stub.requests[2:])
+        assert all(f'"event {i}"'.encode() in delivered for i in range(20))
+
+    def test_stale_claims_recovered_on_start(self, stub, tmp_path):
+        """Test batches claimed by a dead process are re-sent, live claims are left alone"""
+        spool = tmp_path / "spool"
+        spool.mkdir()
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        body = gzip.compress(b'{"index": {}}\n{"message": "orphaned"}\n')
+        (spool / f"1-1-000001.gz.{dead.pid}.sending").write_bytes(body)
+        live_claim = spool / f"2-1-000001.gz.{os.getpid()}.sending"
+        live_claim.write_bytes(body)
+
+        adapter = _adapter(ElasticsearchAdapter, stub, tmp_path)
+        try:
+            assert adapter.flush()
+        finally:
+            adapter.close()
+
+        assert adapter.stats["batches_replayed"] == 1
+        assert b'"orphaned"' in stub.requests[0][2]
+        assert [path.name for path in spool.iterdir()] == [live_claim.name]
+
+    def test_cancelled_replay_returns_claim(self, stub, tmp_path):
+        """Test close() during a replay leaves the batch in the spool"""
+        spool = tmp_path / "spool"
+        spool.mkdir()
+        (spool / "1-1-000001.gz").write_bytes(gzip.compress(b'{"message": "pending"}\n'))
+        stub.delay = 1.0
+
+        adapter = _adapter(ElasticsearchAdapter, stub, tmp_path)
+        adapter.shipper.close(timeout=0.2)
+
+        assert [path.name for path in spool.iterdir()] == ["1-1-000001.gz"]
+
+    def test_rejected_batch_not_spooled(self, stub, tmp_path):
+        """Test a 4xx answer is counted as rejected instead of retried"""
+        stub.statuses = [400]
+        adapter = _adapter(ElasticsearchAdapter, stub, tmp_path, max_retries=3)
+        try:
+            adapter.add_log({"message": "bad"})
+            adapter.flush()
+        finally:
+            adapter.close()
+
+        assert len(stub.requests) == 1
+        assert adapter.stats["batches_rejected"] == 1
+        assert not (tmp_path / "spool").exists()
+
+    def test_format_log_leaves_shared_document_untouched(self):
+        """Test Elasticsearch formatting copies instead of mutating the event"""
+        adapter = ElasticsearchAdapter("http://localhost:9200")
+        document = {"timestamp": "t"}
+
+        assert adapter.format_log(document)["@timestamp"] == "t"
+        assert document == {"timestamp": "t"}
@@ -0,0 +1,94 @@
+"""
+Unit Tests for StackSampler / StackProfile
+
+Tests time attribution to categories and the collapsed-stack and
+speedscope outputs used by the per-test profiling plugin.
+"""
+
+import json
+import time
+
+import pytest
+
+from framework.observability.enterprise_logger import SensitiveDataMasker
+from framework.observability.stack_profiler import StackSampler
+
+
+def _human_pause():
+    time.sleep(0.15)
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _mask_many(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        SensitiveDataMasker.mask_dict({"password": "secret", "note": "x" * 200})
+
+
+@pytest.fixture(scope="module")
+def profile():
+    sampler = StackSampler(interval=0.002)
+    with sampler:
+        _human_pause()
+        _busy(0.1)
+        _mask_many(0.1)
+    return sampler.take()
+
+
+@pytest.mark.unit
+class TestStackProfiler:
+    """Test sampling and reports"""
+
+    def test_time_attributed_to_categories(self, profile):
+        """Test sleep, test code and masking are told apart"""
+        categories = profile.categories()
+
+        assert categories["sleep"] == pytest.approx(150, rel=0.3)
+        assert categories["test"] > 30
+        assert categories["masking"] > 30
+        assert profile.total_ms == pytest.approx(sum(categories.values()))
+        assert profile.samples > 10
+
+    def test_summary_lists_top_functions(self, profile):
+        """Test the summary is JSON-serializable and names the hot functions"""
+        summary = json.loads(json.dumps(profile.summary()))
+
+        names = [name for name, _ in summary["top_functions"]]
+        assert any(name.startswith("_human_pause (") for name in names)
+        assert summary["interval_ms"] == 2.0
+
+    def test_collapsed_stacks(self, profile):
+        """Test collapsed output is "frame;...;[category] microseconds" lines"""
+        lines = profile.collapsed().splitlines()
+
+        pause = [line for line in lines if "_human_pause" in line]
+        assert pause and all(line.split(" ")[-1].isdigit() for line in lines)
+        assert pause[0].startswith("run;")
+        assert pause[0].rsplit(" ", 1)[0].endswith(";[sleep]")
+
+    def test_speedscope_document(self, profile, tmp_path):
+        """Test the speedscope file references shared frames by index"""
+        paths = profile.write(tmp_path, "demo")
+        document = json.loads(paths["speedscope"].read_text())
+
+        (sampled,) = document["profiles"]
+        frames = document["shared"]["frames"]
+        assert sampled["type"] == "sampled"
+        assert len(sampled["samples"]) == len(sampled["weights"])
+        assert all(0 <= index < len(frames) for stack in sampled["samples"] for index in stack)
+        assert paths["collapsed"].read_text() == profile.collapsed()
+
+    def test_no_samples_without_phase(self):
+        """Test nothing is recorded while no phase is set"""
+        sampler = StackSampler(interval=0.001).start()
+        try:
+            time.sleep(0.02)
+        finally:
+            sampler.stop()
+
+        assert not sampler.take().weights
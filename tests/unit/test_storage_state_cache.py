@@ -0,0 +1,215 @@
+"""
+Unit Tests for StorageStateCache and cached logins in AuthenticationService
+
+Tests expiry from cookies/JWTs, persistence, single login across workers
+(threads with separate cache instances contend on the same file lock) and
+context creation from a cached state.
+"""
+
+import base64
+import json
+import threading
+import time
+
+import pytest
+
+from framework.auth import AuthenticationService, StorageStateCache
+from framework.auth.storage_state_cache import jwt_expiry, state_expiry
+from framework.core.session_manager import SessionData
+
+
+def _jwt(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({"sub": "u1", "exp": exp}).encode()).rstrip(b"=").decode()
+    return f"eyJhbGciOiJIUzI1NiJ9.{payload}.c2ln"
+
+
+def _state(cookie_expires=-1, token=None):
+    origins = [{"origin": "https://app.example.com", "localStorage": [{"name": "access_token", "value": token}]}]
+    return {
+        "storage_state": {
+            "cookies": [{"name": "sid", "value": "abc", "domain": "app.example.com", "path": "/",
+                         "expires": cookie_expires, "httpOnly": True, "secure": True, "sameSite": "Lax"}],
+            "origins": origins if token else [],
+        },
+        "session_storage": {"https://app.example.com": {"tab": "1"}},
+    }
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StorageStateCache(tmp_path, ttl=3600, skew=60)
+
+
+@pytest.mark.unit
+class TestStorageStateCache:
+    """Test validity, persistence and locking"""
+
+    def test_jwt_expiry(self):
+        """Test exp is read from JWTs, with or without a Bearer prefix"""
+        assert jwt_expiry(_jwt(1700000000)) == 1700000000
+        assert jwt_expiry("Bearer " + _jwt(1700000000)) == 1700000000
+        assert jwt_expiry("not-a-token") is None
+        assert jwt_expiry("a.b.c") is None
+
+    def test_expiry_is_earliest_of_ttl_cookies_and_tokens(self, cache):
+        """Test the entry expires with the first cookie or token"""
+        now = time.time()
+        state = _state(cookie_expires=now + 1800, token=_jwt(int(now + 900)))
+
+        assert state_expiry(state["storage_state"]) == pytest.approx(now + 900, abs=1)
+        entry = cache.put("bookslot", "staging", "admin", state)
+        assert entry["expires_at"] == pytest.approx(now + 900, abs=1)
+        assert cache.put("bookslot", "staging", "agent", _state())["expires_at"] == pytest.approx(now + 3600, abs=1)
+
+    def test_short_lived_cookies_do_not_limit_entry(self, cache):
+        """Test a cookie expiring within skew of the login (e.g. _gat) is ignored"""
+        now = time.time()
+        state = _state(cookie_expires=now + 1800)
+        state["storage_state"]["cookies"].append({"name": "_gat", "value": "1", "domain": "app.example.com",
+                                                  "path": "/", "expires": now + 30})
+
+        assert cache.put("bookslot", "staging", "admin", state)["expires_at"] == pytest.approx(now + 1800, abs=1)
+        assert cache.get("bookslot", "staging", "admin") is not None
+
+        strict = StorageStateCache(cache.directory, skew=60, auth_cookies=["_gat"])
+        assert strict.put("bookslot", "staging", "admin", state)["expires_at"] == pytest.approx(now + 30, abs=1)
+
+    def test_expiring_entry_is_not_used(self, cache):
+        """Test entries expiring within skew seconds are treated as missing"""
+        cache.put("bookslot", "staging", "admin", _state(token=_jwt(int(time.time() + 30))))
+
+        assert cache.get("bookslot", "staging", "admin") is None
+        assert cache.stats["expired"] == 1
+
+    def test_entries_persist_across_instances(self, cache, tmp_path):
+        """Test a state saved by one process is read by another"""
+        cache.put("bookslot", "staging", "admin", _state(), user={"role": "admin"})
+
+        entry = StorageStateCache(tmp_path).get("bookslot", "staging", "admin")
+        assert entry["storage_state"]["cookies"][0]["name"] == "sid"
+        assert entry["session_storage"] == {"https://app.example.com": {"tab": "1"}}
+        assert entry["user"] == {"role": "admin"}
+
+        cache.invalidate("bookslot", "staging", "admin")
+        assert StorageStateCache(tmp_path).get("bookslot", "staging", "admin") is None
+
+    def test_single_login_across_workers(self, tmp_path):
+        """Test concurrent workers wait for one login instead of logging in themselves"""
+        logins = []
+
+        def login():
+            logins.append(1)
+            time.sleep(0.2)
+            return _state()
+
+        results = []
+        workers = [
+            threading.Thread(target=lambda: results.append(
+                StorageStateCache(tmp_path).get_or_create("bookslot", "staging", "admin", login)
+            ))
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert len(logins) == 1
+        assert len(results) == 4 and all(entry["storage_state"] for entry in results)
+
+    def test_failed_login_is_not_cached(self, cache):
+        """Test a login returning None leaves no entry"""
+        assert cache.get_or_create("bookslot", "staging", "admin", lambda: None) is None
+        assert cache.get("bookslot", "staging", "admin") is None
+
+
+class FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.init_scripts = []
+        self.pages = []
+        self.closed = False
+
+    def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    def storage_state(self):
+        return _state()["storage_state"]
+
+    def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    def close(self):
+        self.closed = True
+
+
+class FakePage:
+    url = "https://app.example.com/home"
+
+    def evaluate(self, script):
+        return {"tab": "1"}
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **options):
+        context = FakeContext(options)
+        self.contexts.append(context)
+        return context
+
+
+@pytest.mark.unit
+class TestCachedAuthentication:
+    """Test AuthenticationService logs in once per role"""
+
+    def test_new_authenticated_context_logs_in_once(self, cache):
+        """Test later contexts are created from the cached state without login"""
+        browser = FakeBrowser()
+        service = AuthenticationService(state_cache=cache)
+        logins = []
+
+        first = service.new_authenticated_context(browser, "bookslot", "staging", "admin", logins.append)
+        second = service.new_authenticated_context(browser, "bookslot", "staging", "admin", logins.append)
+
+        assert len(logins) == 1
+        login_context = browser.contexts[0]
+        assert login_context.closed and "storage_state" not in login_context.options
+        for context in (first, second):
+            assert context.options["storage_state"]["cookies"][0]["name"] == "sid"
+            (script,) = context.init_scripts
+            assert '"https://app.example.com": {"tab": "1"}' in script
+        assert service.is_authenticated()
+        assert service.get_current_session().session_storage == {"tab": "1"}
+
+    def test_authenticate_cached_converts_session_data(self, cache):
+        """Test an engine login's SessionData is stored as a storage state"""
+        session = SessionData(
+            cookies=[{"name": "sid", "value": "abc", "domain": "", "path": "/"}],
+            local_storage={"access_token": "t"},
+            session_storage={"tab": "1"},
+            tokens={"access_token": "t"},
+            headers={"Authorization": "Bearer t"},
+            created_at="2026-01-01T00:00:00",
+            user_id="agent1",
+        )
+        service = AuthenticationService(state_cache=cache)
+
+        result = service.authenticate_cached("bookslot", "staging", "agent", lambda: session, "https://app.example.com/login")
+
+        state = cache.get("bookslot", "staging", "agent")["storage_state"]
+        assert state["cookies"][0]["domain"] == "app.example.com"
+        assert state["cookies"][0]["expires"] == -1
+        assert state["origins"] == [{"origin": "https://app.example.com",
+                                     "localStorage": [{"name": "access_token", "value": "t"}]}]
+        assert result.local_storage == {"access_token": "t"}
+
+        restored = AuthenticationService(state_cache=StorageStateCache(cache.directory)).authenticate_cached(
+            "bookslot", "staging", "agent", lambda: None, "https://app.example.com"
+        )
+        assert restored.tokens == {"access_token": "t"}
+        assert restored.headers == {"Authorization": "Bearer t"}
+        assert restored.user_id == "agent1"
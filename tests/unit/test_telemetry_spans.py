@@ -0,0 +1,125 @@
+"""
+Unit Tests for the TelemetryManager span pipeline
+
+Tests the tracing-off fast path, typed attributes, parent-based sampling
+and the local (memory and JSON-lines file) exporters.
+"""
+
+import asyncio
+import json
+
+import pytest
+from opentelemetry.trace import StatusCode
+
+from framework.observability.telemetry import TelemetryConfig, TelemetryManager, span_attributes
+
+
+def _manager(**kwargs) -> TelemetryManager:
+    options = {"enable_console": False, "enable_memory": True, "instrument_httpx": False, "sample_rate": 1.0}
+    options.update(kwargs)
+    manager = TelemetryManager(TelemetryConfig(**options))
+    manager.initialize()
+    return manager
+
+
+@pytest.fixture
+def telemetry():
+    manager = _manager()
+    yield manager
+    manager.shutdown()
+
+
+@pytest.mark.unit
+class TestSpanPipeline:
+    """Test span creation and export"""
+
+    def test_tracing_off_is_a_no_op(self):
+        """Test disabled telemetry yields no span and calls functions directly"""
+        manager = _manager(enabled=False)
+
+        with manager.span("work", {"n": 1}) as span:
+            assert span is None
+
+        @manager.trace_function()
+        def work():
+            return 42
+
+        assert work() == 42
+        assert not manager.enabled
+        assert manager.finished_spans() == ()
+
+    def test_attributes_keep_their_types(self, telemetry):
+        """Test primitives and homogeneous lists are not stringified"""
+        with telemetry.span("work", {"count": 3, "ratio": 0.5, "ok": True, "tags": ["a", "b"], "obj": {"k": 1}, "none": None}):
+            telemetry.set_attribute("retries", 2)
+        telemetry.force_flush()
+
+        (span,) = telemetry.finished_spans()
+        assert span.attributes["count"] == 3
+        assert span.attributes["ratio"] == 0.5
+        assert span.attributes["ok"] is True
+        assert span.attributes["tags"] == ("a", "b")
+        assert span.attributes["obj"] == "{'k': 1}"
+        assert span.attributes["retries"] == 2
+        assert "none" not in span.attributes
+
+    def test_mixed_sequence_stringified(self):
+        """Test sequences OpenTelemetry cannot store are converted to str"""
+        assert span_attributes({"mixed": [1, "a"], "empty": {}}) == {"mixed": "[1, 'a']", "empty": "{}"}
+
+    def test_exception_recorded(self, telemetry):
+        """Test an exception leaving a span marks it as failed"""
+        with pytest.raises(ValueError), telemetry.span("work"):
+            raise ValueError("boom")
+        telemetry.force_flush()
+
+        (span,) = telemetry.finished_spans()
+        assert span.status.status_code == StatusCode.ERROR
+        assert span.events[0].name == "exception"
+
+    def test_async_function_traced_as_child(self, telemetry):
+        """Test async spans nest under the current span"""
+        @telemetry.trace_async_function(attributes={"component": "api"})
+        async def fetch():
+            return "done"
+
+        async def run():
+            async with telemetry.async_span("request") as parent:
+                assert await fetch() == "done"
+                return parent
+
+        parent = asyncio.run(run())
+        telemetry.force_flush()
+
+        child = next(span for span in telemetry.finished_spans() if span.name == "fetch")
+        assert child.parent.span_id == parent.get_span_context().span_id
+        assert child.attributes["component"] == "api"
+
+    def test_children_follow_unsampled_parent(self):
+        """Test a trace not sampled at the root records no spans at all"""
+        manager = _manager(sample_rate=0.0)
+        try:
+            with manager.span("root") as root, manager.span("child") as child:
+                assert not child.is_recording()
+            assert not root.is_recording()
+            manager.force_flush()
+            assert manager.finished_spans() == ()
+        finally:
+            manager.shutdown()
+
+    def test_json_lines_export(self, tmp_path):
+        """Test spans are written to a local JSON-lines file"""
+        path = tmp_path / "spans.jsonl"
+        manager = _manager(enable_memory=False, export_path=path)
+        try:
+            with manager.span("parent", {"step": 1}), manager.span("child"):
+                pass
+            manager.force_flush()
+        finally:
+            manager.shutdown()
+
+        spans = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [span["name"] for span in spans] == ["child", "parent"]
+        assert spans[0]["parent_id"] == spans[1]["span_id"]
+        assert spans[1]["attributes"] == {"step": 1}
+        assert spans[1]["status"] == "UNSET"
@@ -0,0 +1,131 @@
+"""
+Unit Tests for Universal Logger Decorators
+
+Tests the level fast path, sampling and instrumentation-off mode of
+log_function / log_async_function.
+"""
+
+import asyncio
+import logging
+from unittest.mock import Mock
+
+import pytest
+
+from framework.observability import universal_logger
+from framework.observability.log_serializer import LogSerializer
+from framework.observability.universal_logger import (
+    configure_instrumentation,
+    log_async_function,
+    log_function,
+)
+
+
+class _FormatCounter:
+    """Argument that counts how often it is formatted"""
+
+    calls = 0
+
+
+def _count_format(value, budget):
+    _FormatCounter.calls += 1
+    return "<counter>"
+
+
+@pytest.fixture
+def fake_logger(monkeypatch):
+    """Replace the enterprise logger and reset instrumentation settings"""
+    fake = Mock()
+    fake.enabled_level = logging.DEBUG
+    fake.isEnabledFor.side_effect = lambda level: level >= fake.enabled_level
+    monkeypatch.setattr(universal_logger, "logger", fake)
+    monkeypatch.setattr(universal_logger, "_settings", universal_logger.InstrumentationSettings())
+    serializer = LogSerializer()
+    serializer.register(_FormatCounter, _count_format)
+    monkeypatch.setattr(universal_logger, "summarize", serializer.summarize)
+    _FormatCounter.calls = 0
+    return fake
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+@pytest.mark.unit
+class TestLogFunctionFastPath:
+    """Test decorator behaviour per mode"""
+
+    def test_full_logging_when_enabled(self, fake_logger):
+        """Test entry and exit are logged with formatted arguments"""
+        decorated = log_function()(lambda _value: 42)
+
+        assert decorated(_FormatCounter()) == 42
+        assert fake_logger.log.call_count == 2
+        assert _FormatCounter.calls == 1
+
+    def test_disabled_level_skips_formatting(self, fake_logger):
+        """Test nothing is formatted or logged when DEBUG is off"""
+        fake_logger.enabled_level = logging.INFO
+        decorated = log_function(log_level="DEBUG")(lambda _value: 42)
+
+        assert decorated(_FormatCounter()) == 42
+        fake_logger.log.assert_not_called()
+        assert _FormatCounter.calls == 0
+
+    def test_failures_logged_on_fast_path(self, fake_logger):
+        """Test exceptions are still reported when entry/exit logging is skipped"""
+        fake_logger.enabled_level = logging.INFO
+        decorated = log_function()(_fail)
+
+        with pytest.raises(ValueError):
+            decorated()
+        fake_logger.error.assert_called_once()
+        assert fake_logger.error.call_args.kwargs["exception_type"] == "ValueError"
+
+    def test_instrumentation_off(self, fake_logger):
+        """Test the global switch silences everything, failures included"""
+        decorated = log_function()(_fail)
+        configure_instrumentation(enabled=False)
+
+        with pytest.raises(ValueError):
+            decorated()
+        fake_logger.log.assert_not_called()
+        fake_logger.error.assert_not_called()
+
+        configure_instrumentation(enabled=True)
+        with pytest.raises(ValueError):
+            decorated()
+        fake_logger.error.assert_called_once()
+
+    def test_per_module_sampling(self, fake_logger, monkeypatch):
+        """Test module prefixes resolve their own sample rate"""
+        sampled = log_function()(lambda: None)
+        configure_instrumentation(sample_rates={__name__.rsplit(".", 1)[0]: 0.25})
+
+        monkeypatch.setattr(universal_logger.random, "random", lambda: 0.5)
+        sampled()
+        fake_logger.log.assert_not_called()
+
+        monkeypatch.setattr(universal_logger.random, "random", lambda: 0.1)
+        sampled()
+        assert fake_logger.log.call_count == 2
+
+    def test_longest_prefix_wins(self, fake_logger):
+        """Test the most specific module rate is used"""
+        configure_instrumentation(sample_rates={"framework": 0.0, "framework.database": 1.0})
+        settings = universal_logger.get_instrumentation_settings()
+
+        assert settings.sample_rate_for("framework.database.db_client") == 1.0
+        assert settings.sample_rate_for("framework.api.api_client") == 0.0
+        assert settings.sample_rate_for("frameworks") == 1.0
+
+    def test_async_fast_path(self, fake_logger):
+        """Test the async decorator shares the same fast path"""
+        fake_logger.enabled_level = logging.INFO
+
+        @log_async_function()
+        async def fetch(value):
+            return value
+
+        assert asyncio.run(fetch(_FormatCounter())) is not None
+        fake_logger.log.assert_not_called()
+        assert _FormatCounter.calls == 0
@@ -0,0 +1,285 @@
+"""
+Unit Tests for Visual Regression
+
+Tests the VisualRegression diff backends, tile-hash and batch comparison.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+
+import pytest
+from PIL import Image, ImageDraw
+
+from framework.testing.visual import PytestVisualPlugin, VisualConfig
+from framework.visual.batch import load_manifest
+from framework.visual.tile_hash import TileHashGrid, load_sidecar, write_sidecar
+from framework.visual.visual_regression import VisualRegression
+
+
+def _write_pair(tmp_path, changed_box=(10, 10, 29, 29)):
+    """Write a baseline and a current screenshot that differ inside changed_box"""
+    baseline = Image.new("RGB", (100, 50), (255, 255, 255))
+    current = baseline.copy()
+    if changed_box:
+        ImageDraw.Draw(current).rectangle(changed_box, fill=(0, 0, 0))
+
+    baseline_path = tmp_path / "baseline.png"
+    current_path = tmp_path / "current.png"
+    baseline.save(baseline_path)
+    current.save(current_path)
+    return baseline_path, current_path
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestVisualRegressionBackends:
+    """Test numpy and pillow diff backends"""
+
+    def test_default_backend_is_numpy(self, tmp_path, monkeypatch):
+        """Test numpy is selected when no backend is configured"""
+        monkeypatch.delenv("VISUAL_DIFF_BACKEND", raising=False)
+        visual = VisualRegression(str(tmp_path / "b"), str(tmp_path / "r"))
+
+        assert visual.diff_backend == "numpy"
+
+    def test_backend_from_environment(self, tmp_path, monkeypatch):
+        """Test backend selection via VISUAL_DIFF_BACKEND"""
+        monkeypatch.setenv("VISUAL_DIFF_BACKEND", "pillow")
+        visual = VisualRegression(str(tmp_path / "b"), str(tmp_path / "r"))
+
+        assert visual.diff_backend == "pillow"
+
+    def test_unknown_backend_rejected(self, tmp_path):
+        """Test invalid backend name raises ValueError"""
+        with pytest.raises(ValueError):
+            VisualRegression(str(tmp_path / "b"), str(tmp_path / "r"), diff_backend="opencv")
+
+    @pytest.mark.parametrize("backend", ["numpy", "pillow"])
+    def test_compare_detects_changed_pixels(self, tmp_path, backend):
+        """Test both backends report the same pixel difference"""
+        baseline_path, current_path = _write_pair(tmp_path)
+        visual = VisualRegression(
+            str(tmp_path / "b"), str(tmp_path / "r"), diff_backend=backend
+        )
+        visual.capture_baseline(str(baseline_path), "page")
+
+        result = visual.compare(str(current_path), "page")
+
+        # 20x20 changed pixels out of 100x50, weighted 0.7, plus perceptual hash term
+        assert result["difference_percentage"] >= 0.7 * 400 / 5000
+        assert result["diff_path"] is not None
+
+    def test_backends_agree(self, tmp_path):
+        """Test numpy and pillow produce identical scores and highlight overlays"""
+        _, current_path = _write_pair(tmp_path)
+        current = Image.open(current_path)
+        baseline = Image.open(tmp_path / "baseline.png")
+
+        numpy_visual = VisualRegression(
+            str(tmp_path / "n"), str(tmp_path / "nr"), diff_backend="numpy"
+        )
+        pillow_visual = VisualRegression(
+            str(tmp_path / "p"), str(tmp_path / "pr"), diff_backend="pillow"
+        )
+
+        assert numpy_visual._calculate_difference(current, baseline) == pytest.approx(
+            pillow_visual._calculate_difference(current, baseline)
+        )
+
+        numpy_diff = numpy_visual._generate_diff_image(current, baseline, "page", None)
+        pillow_diff = pillow_visual._generate_diff_image(current, baseline, "page", None)
+        assert list(Image.open(numpy_diff).getdata()) == list(Image.open(pillow_diff).getdata())
+
+    def test_identical_images_pass(self, tmp_path):
+        """Test identical screenshots produce zero difference"""
+        baseline_path, current_path = _write_pair(tmp_path, changed_box=None)
+        visual = VisualRegression(str(tmp_path / "b"), str(tmp_path / "r"))
+        visual.capture_baseline(str(baseline_path), "page")
+
+        result = visual.compare(str(current_path), "page")
+
+        assert result["difference_percentage"] == 0.0
+        assert result["passed"]
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestVisualRegressionTileHashing:
+    """Test tile-hash short-circuit and region-of-interest comparison"""
+
+    def _visual(self, tmp_path, **kwargs):
+        return VisualRegression(
+            str(tmp_path / "b"), str(tmp_path / "r"), diff_backend="numpy", tile_size=16, **kwargs
+        )
+
+    def test_capture_writes_sidecar(self, tmp_path):
+        """Test baselines are stored with a tile hash sidecar"""
+        baseline_path, _ = _write_pair(tmp_path)
+        visual = self._visual(tmp_path)
+        stored = visual.capture_baseline(str(baseline_path), "page")
+
+        grid = load_sidecar(stored)
+        assert grid is not None
+        assert (grid.columns, grid.rows) == (7, 4)
+
+    def test_unchanged_screenshot_skips_diff(self, tmp_path):
+        """Test identical screenshots are decided by hashing alone"""
+        baseline_path, current_path = _write_pair(tmp_path, changed_box=None)
+        visual = self._visual(tmp_path)
+        visual.capture_baseline(str(baseline_path), "page")
+
+        result = visual.compare(str(current_path), "page")
+
+        assert result["changed_tiles"] == 0
+        assert result["difference_percentage"] == 0.0
+        assert result["diff_path"] is None
+
+    def test_only_changed_tiles_are_diffed(self, tmp_path):
+        """Test tile-restricted diff matches the full-image diff"""
+        baseline_path, current_path = _write_pair(tmp_path, changed_box=(16, 16, 31, 31))
+        visual = self._visual(tmp_path)
+        visual.capture_baseline(str(baseline_path), "page")
+        full = VisualRegression(str(tmp_path / "p"), str(tmp_path / "pr"), diff_backend="pillow")
+        full.capture_baseline(str(baseline_path), "page")
+
+        result = visual.compare(str(current_path), "page")
+
+        assert result["changed_tiles"] == 1
+        assert result["difference_percentage"] == pytest.approx(
+            full.compare(str(current_path), "page")["difference_percentage"]
+        )
+
+    def test_ignore_regions_hide_changes(self, tmp_path):
+        """Test changes inside ignored regions do not count"""
+        baseline_path, current_path = _write_pair(tmp_path, changed_box=(16, 16, 31, 31))
+        visual = self._visual(tmp_path)
+        visual.capture_baseline(str(baseline_path), "page")
+
+        result = visual.compare(str(current_path), "page", ignore_regions=[(0, 0, 48, 48)])
+
+        assert result["changed_tiles"] == 0
+        assert result["passed"]
+
+    def test_regions_limit_comparison(self, tmp_path):
+        """Test only pixels inside regions are compared"""
+        baseline_path, current_path = _write_pair(tmp_path, changed_box=(10, 10, 29, 29))
+        visual = self._visual(tmp_path)
+        visual.capture_baseline(str(baseline_path), "page")
+
+        outside = visual.compare(str(current_path), "page", regions=[(50, 0, 100, 50)])
+        partial = visual.compare(str(current_path), "page", regions=[(0, 0, 20, 20)])
+        full = visual.compare(str(current_path), "page")
+
+        assert outside["changed_tiles"] == 0
+        assert 0 < partial["difference_percentage"] < full["difference_percentage"]
+
+    def test_stale_sidecar_is_ignored(self, tmp_path):
+        """Test a sidecar is discarded once its image is rewritten"""
+        baseline_path, current_path = _write_pair(tmp_path)
+        grid = TileHashGrid.from_image(Image.open(baseline_path), 16)
+        write_sidecar(baseline_path, grid=grid)
+        assert load_sidecar(baseline_path) == grid
+
+        Image.open(current_path).save(baseline_path)
+        os.utime(baseline_path, ns=(0, 0))
+
+        assert load_sidecar(baseline_path) is None
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestBatchComparison:
+    """Test process-pool batch comparison"""
+
+    def _manifest(self, tmp_path, visual, count=3):
+        baseline_path, current_path = _write_pair(tmp_path)
+        manifest = []
+        for index in range(count):
+            visual.capture_baseline(str(baseline_path), f"page_{index}")
+            screenshot = current_path if index % 2 else baseline_path
+            manifest.append({"screenshot_path": str(screenshot), "name": f"page_{index}"})
+        return manifest
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_compare_batch_matches_sequential(self, tmp_path, max_workers):
+        """Test batch results match one-at-a-time compare() and stream into results"""
+        visual = VisualRegression(str(tmp_path / "b"), str(tmp_path / "r"))
+        manifest = self._manifest(tmp_path, visual)
+
+        results = visual.compare_batch(manifest, max_workers=max_workers)
+
+        assert [r["name"] for r in results] == ["page_0", "page_1", "page_2"]
+        assert [r["changed_tiles"] == 0 for r in results] == [True, False, True]
+        assert len(visual.results) == 3
+        expected = VisualRegression(str(tmp_path / "b"), str(tmp_path / "r2")).compare(
+            manifest[1]["screenshot_path"], "page_1"
+        )
+        assert results[1]["difference_percentage"] == pytest.approx(
+            expected["difference_percentage"]
+        )
+
+    def test_compare_batch_from_manifest_file(self, tmp_path):
+        """Test JSON manifest files and tuple entries are accepted"""
+        visual = VisualRegression(str(tmp_path / "b"), str(tmp_path / "r"))
+        manifest = self._manifest(tmp_path, visual, count=1)
+        manifest_path = tmp_path / "manifest.json"
+        manifest_path.write_text(json.dumps(manifest))
+
+        from_file = visual.compare_batch(manifest_path, max_workers=1)
+        from_tuple = visual.compare_batch([(manifest[0]["screenshot_path"], "page_0")], max_workers=1)
+
+        assert from_file[0]["passed"] and from_tuple[0]["passed"]
+
+    def test_compare_batch_reports_errors(self, tmp_path):
+        """Test a failing item is reported without aborting the batch"""
+        visual = VisualRegression(str(tmp_path / "b"), str(tmp_path / "r"))
+        manifest = self._manifest(tmp_path, visual, count=1)
+        manifest.append({"screenshot_path": str(tmp_path / "missing.png"), "name": "page_0"})
+
+        results = visual.compare_batch(manifest, max_workers=1)
+
+        assert results[0]["passed"]
+        assert results[1]["status"] == "error"
+        assert not results[1]["passed"]
+
+    def test_unknown_manifest_keys_rejected(self):
+        """Test typos in manifest entries are reported"""
+        with pytest.raises(ValueError):
+            load_manifest([{"screenshot_path": "a.png", "name": "a", "treshold": 0.1}])
+
+
+class _FakePage:
+    """Minimal async page whose screenshots copy a fixed image"""
+
+    def __init__(self, source):
+        self.source = source
+
+    async def screenshot(self, path, **kwargs):
+        shutil.copy(self.source, path)
+
+
+@pytest.mark.modern_spa
+@pytest.mark.unit
+class TestPytestVisualPluginBatch:
+    """Test deferred capture + parallel comparison in PytestVisualPlugin"""
+
+    def test_capture_then_compare_pending(self, tmp_path):
+        """Test captured screenshots are compared by compare_pending()"""
+        baseline_path, current_path = _write_pair(tmp_path)
+        plugin = PytestVisualPlugin(
+            VisualConfig(baseline_dir=str(tmp_path / "b"), diff_dir=str(tmp_path / "d"), tile_size=16)
+        )
+
+        asyncio.run(plugin.capture_page(_FakePage(baseline_path), "home"))
+        asyncio.run(plugin.capture_page(_FakePage(baseline_path), "home"))
+        asyncio.run(plugin.capture_page(_FakePage(current_path), "home", threshold=0.5))
+        assert len(plugin.pending) == 2
+
+        details = plugin.compare_pending(max_workers=1)
+
+        assert plugin.pending == []
+        assert details[0]["changed_tiles"] == 0 and details[0]["is_match"]
+        assert details[1]["diff_pixels"] > 0
+        assert [r["result"] for r in plugin.results] == [True, True, True]
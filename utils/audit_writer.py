@@ -0,0 +1,264 @@
+"""
+Audit Writer - Batched, non-blocking JSONL writer for the audit trail
+
+Audit events are appended to an in-process deque by the caller (no lock,
+no encoding, no I/O) and written by one background thread:
+- records are encoded off the caller thread (orjson when installed, json otherwise)
+- each batch is written to the file with a single append
+- the file rolls over at midnight like the previous TimedRotatingFileHandler
+  (audit.log -> audit.log.YYYYMMDD, oldest backups pruned)
+- bounded backpressure: when max_pending records are waiting, callers either
+  block briefly until the writer catches up or the record is dropped and counted
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import date
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """
+    Encode one record as a JSON line
+
+    Any value is accepted: unknown types are written as str(), and strings
+    that are not valid UTF-8 (lone surrogates from decoded binary data) fall
+    back to ASCII-escaped JSON, so a record never breaks the line format.
+
+    Args:
+        record: Record dictionary
+
+    Returns:
+        UTF-8 JSON bytes terminated by a newline
+    """
+    if orjson is not None:
+        with contextlib.suppress(TypeError, orjson.JSONEncodeError):
+            return orjson.dumps(
+                record, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+            )
+    return (json.dumps(record, default=str) + "\n").encode("utf-8")
+
+
+class AuditWriter:
+    """Background, batching JSONL appender"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 512,
+        flush_interval: float = 0.2,
+        max_pending: int = 10000,
+        block_timeout: float = 1.0,
+        backup_count: int = 90,
+        base_fields: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize audit writer and start its thread
+
+        Args:
+            path: JSONL file to append to
+            batch_size: Maximum records per write
+            flush_interval: Seconds the writer waits before writing a partial batch
+            max_pending: Records that may wait in the queue before backpressure applies
+            block_timeout: Seconds a caller waits for room when the queue is full
+                before the record is dropped (0 = drop immediately)
+            backup_count: Daily rolled files to keep (0 = keep all)
+            base_fields: Defaults for fields a record does not set itself
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.block_timeout = block_timeout
+        self.backup_count = backup_count
+        self.base_fields = base_fields or {}
+        self.dropped = 0
+        self.written = 0
+
+        self._queue: Deque[Any] = deque()
+        self._wakeup = threading.Event()
+        self._room = threading.Condition()
+        self._closed = False
+        self._fd: Optional[int] = None
+        self._day: Optional[date] = None
+        self._last_second: Optional[int] = None
+        self._last_timestamp = ""
+
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        Queue a record for writing
+
+        Args:
+            record: JSON-ready record; must not be mutated afterwards
+
+        Returns:
+            False if the record was dropped because the queue stayed full
+            or the writer is closed
+        """
+        if self._closed:
+            self.dropped += 1
+            return False
+        queue = self._queue
+        if len(queue) >= self.max_pending and not self._wait_for_room():
+            self.dropped += 1
+            return False
+        queue.append(record)
+        if len(queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Block until every record submitted so far has been written
+
+        Args:
+            timeout: Seconds to wait (None = no limit)
+
+        Returns:
+            True if the queue was flushed within the timeout
+        """
+        if self._closed or not self._thread.is_alive():
+            return not self._queue
+        marker = threading.Event()
+        self._queue.append(marker)
+        self._wakeup.set()
+        return marker.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Write everything still queued and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def _wait_for_room(self) -> bool:
+        if self.block_timeout <= 0 or self._closed:
+            return False
+        self._wakeup.set()
+        deadline = time.monotonic() + self.block_timeout
+        with self._room:
+            while len(self._queue) >= self.max_pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._room.wait(remaining)
+        return True
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        try:
+            while True:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                self._drain()
+                if self._closed:
+                    self._drain()
+                    break
+        finally:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def _drain(self) -> None:
+        queue = self._queue
+        while queue:
+            lines: List[bytes] = []
+            markers: List[threading.Event] = []
+            while queue and len(lines) < self.batch_size:
+                item = queue.popleft()
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                    break
+                lines.append(self._encode(item))
+            if lines:
+                self._write(b"".join(lines))
+                self.written += len(lines)
+            with self._room:
+                self._room.notify_all()
+            for marker in markers:
+                marker.set()
+
+    def _encode(self, record: Dict[str, Any]) -> bytes:
+        # Submitted records belong to the writer, so they are completed in place
+        if "timestamp_ms" in record:
+            record["timestamp"] = self._format_second(int(record["timestamp_ms"] // 1000))
+        # Record fields (e.g. the level of the log call) win over the defaults
+        for key, value in self.base_fields.items():
+            record.setdefault(key, value)
+        try:
+            return encode_record(record)
+        except Exception as e:
+            # e.g. circular references: keep the event, drop its payload
+            return encode_record({"encode_error": f"{type(e).__name__}: {e}", **self.base_fields})
+
+    def _format_second(self, second: int) -> str:
+        # Consecutive records mostly share a second; format each second once
+        if second != self._last_second:
+            self._last_second = second
+            self._last_timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        return self._last_timestamp
+
+    def _write(self, data: bytes) -> None:
+        try:
+            today = date.today()
+            if self._fd is None or today != self._day:
+                self._open(today)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
+        except OSError:
+            # Keep the writer alive; the batch is lost but later ones are retried
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def _open(self, today: date) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._rollover(self._day)
+        elif self.path.exists():
+            modified = date.fromtimestamp(self.path.stat().st_mtime)
+            if modified != today:
+                self._rollover(modified)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # O_APPEND: each batch is one write, so concurrent writers (xdist
+        # workers) interleave whole batches rather than partial lines
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._day = today
+
+    def _rollover(self, day: date) -> None:
+        target = self.path.with_name(f"{self.path.name}.{day:%Y%m%d}")
+        # FileNotFoundError: another process rolled the file over first
+        with contextlib.suppress(FileNotFoundError):
+            if not target.exists():
+                os.replace(self.path, target)
+        if self.backup_count:
+            backups = sorted(self.path.parent.glob(f"{self.path.name}.????????"))
+            for old in backups[: -self.backup_count]:
+                old.unlink(missing_ok=True)
+
+
+__all__ = ["AuditWriter", "ORJSON_AVAILABLE", "encode_record"]
@@ -3,7 +3,7 @@
 
 Provides consistent logging across the framework with:
 - Multi-level logging (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-- Separate audit trail for compliance
+- Separate audit trail for compliance (batched, written off the caller thread)
 - Log rotation for disk management
 - Structured logging with contextual information
 - Action and event tracking
@@ -12,11 +12,13 @@
 import logging
 import sys
 import json
+import time
 from pathlib import Path
-from datetime import datetime
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 from typing import Optional, Dict, Any
 
+from utils.audit_writer import AuditWriter
+
 
 class _SafeAuditJsonFormatter(logging.Formatter):
     """Flat, safe JSON formatter for the audit log.
@@ -30,6 +32,10 @@ class _SafeAuditJsonFormatter(logging.Formatter):
     """
 
     def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(self.to_dict(record), default=str)
+
+    def to_dict(self, record: logging.LogRecord) -> Dict[str, Any]:
+        """Build the flat audit document of a record"""
         base = {
             "timestamp": self.formatTime(record, "%Y-%m-%d %H:%M:%S"),
             "level": record.levelname,
@@ -42,13 +48,52 @@ def format(self, record: logging.LogRecord) -> str:
             if isinstance(payload, dict):
                 # Merge event fields into root — action_type, correlation_id, etc.
                 # Fields in ``base`` (timestamp, level, logger) take precedence.
-                return json.dumps({**payload, **base}, default=str)
+                return {**payload, **base}
         except (json.JSONDecodeError, TypeError):
             pass
 
-        # Plain-text message: wrap safely with json.dumps to escape special chars.
+        # Plain-text message: kept as a string field
         base["message"] = raw
-        return json.dumps(base, default=str)
+        return base
+
+
+class _AuditWriterHandler(logging.Handler):
+    """Forwards records of the 'audit' logger to the audit writer"""
+
+    def __init__(self, writer: AuditWriter):
+        super().__init__(logging.INFO)
+        self.writer = writer
+        self.setFormatter(_SafeAuditJsonFormatter(datefmt='%Y-%m-%d %H:%M:%S'))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.writer.submit(self.formatter.to_dict(record))
+        except Exception:
+            self.handleError(record)
+
+
+_trace_id_getters = None
+
+
+def _trace_ids():
+    """(correlation_id, trace_id, request_id) of the enterprise CorrelationContext"""
+    global _trace_id_getters
+    if _trace_id_getters is None:
+        # Resolved lazily — avoids a circular import at module load time
+        try:
+            from framework.observability.enterprise_logger import (
+                correlation_id_var,
+                request_id_var,
+                trace_id_var,
+            )
+            _trace_id_getters = (correlation_id_var.get, trace_id_var.get, request_id_var.get)
+        except Exception:
+            # Enterprise logger not available — IDs remain None.
+            _trace_id_getters = ()
+    if not _trace_id_getters:
+        return None, None, None
+    get_correlation_id, get_trace_id, get_request_id = _trace_id_getters
+    return get_correlation_id(), get_trace_id(), get_request_id()
 
 # Self-instrumentation for utils.logger module
 try:
@@ -119,34 +164,37 @@ class TestAuditLogger:
     """
     
     @log_function()
-    def __init__(self):
+    def __init__(self, writer: Optional[AuditWriter] = None):
+        """
+        Initialize audit logger
+
+        Args:
+            writer: Audit writer to use (defaults to the shared writer of
+                logs/audit/audit.log)
+        """
+        self.writer = writer or _get_audit_writer()
         self.logger = logging.getLogger('audit')
         self.logger.setLevel(logging.INFO)
         
         # Prevent propagation to root logger
         self.logger.propagate = False
         
-        # Only configure once
+        # Only configure once: plain logger calls go through the same writer
         if not self.logger.handlers:
-            # Daily rotating audit log
-            audit_file = AUDIT_DIR / "audit.log"
-            audit_handler = TimedRotatingFileHandler(
-                audit_file,
-                when='midnight',
-                interval=1,
-                backupCount=90,  # Keep 90 days of audit logs
-                encoding='utf-8'
-            )
-            audit_handler.suffix = "%Y%m%d"  # Add date suffix to rotated files
-            audit_handler.setLevel(logging.INFO)
-            
-            # JSON format for easy parsing and compliance tools
-            # Use safe JSON formatter to prevent malformed JSON from message content
-            audit_format = _SafeAuditJsonFormatter(datefmt='%Y-%m-%d %H:%M:%S')
-            audit_handler.setFormatter(audit_format)
-            self.logger.addHandler(audit_handler)
+            self.logger.addHandler(_AuditWriterHandler(self.writer))
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Wait until every queued audit entry is on disk
+
+        Args:
+            timeout: Seconds to wait (None = no limit)
+
+        Returns:
+            True if everything was written within the timeout
+        """
+        return self.writer.flush(timeout)
     
-    @log_function(log_args=True)
     def log_action(self, action_type: str, details: Dict[str, Any], status: str = "success"):
         """
         Log test action with structured data.
@@ -156,39 +204,26 @@ def log_action(self, action_type: str, details: Dict[str, Any], status: str = "s
         pytest_enterprise_logging plugin) so every audit entry is traceable
         across the ELK / SIEM pipeline.
 
+        The entry is only queued here; encoding and file I/O happen on the
+        audit writer thread. ``details`` is copied one level deep, so nested
+        values must not be mutated after the call.
+
         Args:
             action_type: Type of action (ui_click, api_call, db_query, etc.)
             details: Action details as dictionary
             status: Action status (success, failure, warning)
         """
-        # Lazily resolve distributed-trace context variables — avoids circular
-        # import at module load time while still carrying IDs in every entry.
-        correlation_id: Optional[str] = None
-        trace_id: Optional[str] = None
-        request_id: Optional[str] = None
-        try:
-            from framework.observability.enterprise_logger import CorrelationContext
-            correlation_id = CorrelationContext.get_correlation_id()
-            trace_id = CorrelationContext.get_trace_id()
-            request_id = CorrelationContext.get_request_id()
-        except Exception:
-            # Enterprise logger not available — IDs remain None.
-            # This is expected before the enterprise plugin initialises; no
-            # logging here to avoid recursion or noisy startup stderr output.
-            pass
-
-        event = {
+        correlation_id, trace_id, request_id = _trace_ids()
+        self.writer.submit({
             "action_type": action_type,
             "status": status,
-            "details": details,
-            "timestamp_ms": datetime.now().timestamp() * 1000,
+            "details": dict(details) if isinstance(details, dict) else details,
+            "timestamp_ms": time.time() * 1000,
             "correlation_id": correlation_id,
             "trace_id": trace_id,
             "request_id": request_id,
-        }
-        self.logger.info(json.dumps(event))
+        })
     
-    @log_function(log_args=True)
     def log_test_start(self, test_name: str, test_file: str):
         """Log test execution start"""
         self.log_action("test_start", {
@@ -196,7 +231,6 @@ def log_test_start(self, test_name: str, test_file: str):
             "test_file": test_file
         })
     
-    @log_function(log_args=True)
     def log_test_end(self, test_name: str, status: str, duration: float):
         """Log test execution end"""
         self.log_action("test_end", {
@@ -205,7 +239,6 @@ def log_test_end(self, test_name: str, status: str, duration: float):
             "result": status
         }, status=status)
     
-    @log_function(log_args=True)
     def log_ui_action(self, action: str, element: str, value: Optional[str] = None):
         """Log UI interaction"""
         details = {"action": action, "element": element}
@@ -213,7 +246,6 @@ def log_ui_action(self, action: str, element: str, value: Optional[str] = None):
             details["value"] = value
         self.log_action("ui_action", details)
     
-    @log_function(log_args=True)
     def log_api_call(self, method: str, url: str, status_code: int, 
                      duration_ms: float, request_body: Optional[Dict] = None,
                      response_body: Optional[Dict] = None):
@@ -232,7 +264,6 @@ def log_api_call(self, method: str, url: str, status_code: int,
         status = "success" if 200 <= status_code < 300 else "failure"
         self.log_action("api_call", details, status=status)
     
-    @log_function(log_args=True)
     def log_db_operation(self, operation: str, table: str, query: str, 
                         rows_affected: int = 0, duration_ms: float = 0):
         """Log database operation"""
@@ -244,7 +275,6 @@ def log_db_operation(self, operation: str, table: str, query: str,
             "duration_ms": duration_ms
         })
     
-    @log_function(log_args=True)
     def log_error(self, error_type: str, error_message: str, stack_trace: Optional[str] = None):
         """Log error with details"""
         details = {
@@ -255,7 +285,6 @@ def log_error(self, error_type: str, error_message: str, stack_trace: Optional[s
             details["stack_trace"] = stack_trace
         self.log_action("error", details, status="failure")
 
-    @log_function(log_args=True)
     def log_warning(self, warning_category: str, warning_message: str,
                     source_file: Optional[str] = None, source_line: Optional[int] = None):
         """
@@ -281,7 +310,6 @@ def log_warning(self, warning_category: str, warning_message: str,
             details["source_line"] = source_line
         self.log_action("warning", details, status="warning")
 
-    @log_function(log_args=True)
     def log_step(self, step_description: str, step_number: Optional[int] = None,
                  test_name: Optional[str] = None):
         """
@@ -302,7 +330,6 @@ def log_step(self, step_description: str, step_number: Optional[int] = None,
             details["test_name"] = test_name
         self.log_action("test_step", details, status="success")
 
-    @log_function(log_args=True)
     def log_fixture_event(self, fixture_name: str, event: str,
                           scope: str = "function", test_name: Optional[str] = None):
         """
@@ -323,7 +350,6 @@ def log_fixture_event(self, fixture_name: str, event: str,
             details["test_name"] = test_name
         self.log_action("fixture_event", details, status="success")
 
-    @log_function(log_args=True)
     def log_page_load(self, page_name: str, url: str, load_time_ms: float = 0):
         """
         Log page load/navigation event.
@@ -339,7 +365,6 @@ def log_page_load(self, page_name: str, url: str, load_time_ms: float = 0):
             "load_time_ms": load_time_ms
         }, status="success")
 
-    @log_function(log_args=True)
     def log_element_interaction(self, action: str, element: str, page: str = "",
                                 value: Optional[str] = None, success: bool = True):
         """
@@ -364,7 +389,6 @@ def log_element_interaction(self, action: str, element: str, page: str = "",
         self.log_action("element_interaction", details,
                        status="success" if success else "failure")
 
-    @log_function(log_args=True)
     def log_validation(self, validation_type: str, expected: Any, actual: Any,
                       passed: bool, message: str = ""):
         """
@@ -389,7 +413,6 @@ def log_validation(self, validation_type: str, expected: Any, actual: Any,
         self.log_action("validation", details,
                        status="success" if passed else "failure")
 
-    @log_function(log_args=True)
     def log_wait_event(self, wait_type: str, condition: str, timeout_ms: int,
                       success: bool, elapsed_ms: float = 0):
         """
@@ -410,7 +433,6 @@ def log_wait_event(self, wait_type: str, condition: str, timeout_ms: int,
             "success": success
         }, status="success" if success else "failure")
 
-    @log_function(log_args=True)
     def log_screenshot(self, screenshot_path: str, reason: str = "capture",
                       test_name: Optional[str] = None):
         """
@@ -430,7 +452,6 @@ def log_screenshot(self, screenshot_path: str, reason: str = "capture",
         
         self.log_action("screenshot", details, status="success")
 
-    @log_function(log_args=True)
     def log_config_change(self, config_name: str, old_value: Any, new_value: Any,
                          source: str = "runtime"):
         """
@@ -449,7 +470,6 @@ def log_config_change(self, config_name: str, old_value: Any, new_value: Any,
             "source": source
         }, status="success")
 
-    @log_function(log_args=True)
     def log_network_request(self, url: str, method: str, status_code: int,
                            duration_ms: float, request_type: str = "XHR"):
         """
@@ -473,6 +493,19 @@ def log_network_request(self, url: str, method: str, status_code: int,
 
 # Singleton audit logger instance
 _audit_logger = None
+_audit_writer: Optional[AuditWriter] = None
+
+
+def _get_audit_writer() -> AuditWriter:
+    """Shared writer of the daily audit log"""
+    global _audit_writer
+    if _audit_writer is None:
+        _audit_writer = AuditWriter(
+            AUDIT_DIR / "audit.log",
+            backup_count=90,  # Keep 90 days of audit logs
+            base_fields={"level": "INFO", "logger": "audit"},
+        )
+    return _audit_writer
 
 @log_function(log_result=True)
 def get_audit_logger() -> TestAuditLogger: